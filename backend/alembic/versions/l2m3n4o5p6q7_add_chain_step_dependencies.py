@@ -0,0 +1,35 @@
+"""add chain step dependencies and parallelism
+
+Revision ID: l2m3n4o5p6q7
+Revises: k1l2m3n4o5p6
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "l2m3n4o5p6q7"
+down_revision: Union[str, None] = "k1l2m3n4o5p6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add depends_on to chain_steps and max_parallel_steps to task_chains."""
+    op.add_column("chain_steps", sa.Column("depends_on", postgresql.JSONB(), nullable=True))
+    op.add_column(
+        "task_chains",
+        sa.Column("max_parallel_steps", sa.Integer(), nullable=False, server_default=sa.text("1")),
+    )
+
+
+def downgrade() -> None:
+    """Drop chain step dependency columns."""
+    op.drop_column("task_chains", "max_parallel_steps")
+    op.drop_column("chain_steps", "depends_on")
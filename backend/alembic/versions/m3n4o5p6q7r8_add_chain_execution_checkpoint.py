@@ -0,0 +1,30 @@
+"""add checkpoint to chain_executions
+
+Revision ID: m3n4o5p6q7r8
+Revises: l2m3n4o5p6q7
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "m3n4o5p6q7r8"
+down_revision: Union[str, None] = "l2m3n4o5p6q7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add checkpoint to chain_executions table."""
+    op.add_column("chain_executions", sa.Column("checkpoint", postgresql.JSONB(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove checkpoint from chain_executions table."""
+    op.drop_column("chain_executions", "checkpoint")
@@ -0,0 +1,34 @@
+"""add schedule jitter to workspaces and cron_tasks
+
+Revision ID: n4o5p6q7r8s9
+Revises: m3n4o5p6q7r8
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "n4o5p6q7r8s9"
+down_revision: Union[str, None] = "m3n4o5p6q7r8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add schedule_jitter_seconds to workspaces and cron_tasks tables."""
+    op.add_column(
+        "workspaces",
+        sa.Column("schedule_jitter_seconds", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column("cron_tasks", sa.Column("schedule_jitter_seconds", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove schedule_jitter_seconds from workspaces and cron_tasks tables."""
+    op.drop_column("cron_tasks", "schedule_jitter_seconds")
+    op.drop_column("workspaces", "schedule_jitter_seconds")
@@ -0,0 +1,39 @@
+"""add http phase timings to executions
+
+Revision ID: o5p6q7r8s9t0
+Revises: n4o5p6q7r8s9
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "o5p6q7r8s9t0"
+down_revision: Union[str, None] = "n4o5p6q7r8s9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add HTTP phase timing columns to executions table."""
+    op.add_column("executions", sa.Column("http_dns_time", sa.Float(), nullable=True))
+    op.add_column("executions", sa.Column("http_connect_time", sa.Float(), nullable=True))
+    op.add_column("executions", sa.Column("http_tls_time", sa.Float(), nullable=True))
+    op.add_column("executions", sa.Column("http_first_byte_time", sa.Float(), nullable=True))
+    op.add_column("executions", sa.Column("http_transfer_time", sa.Float(), nullable=True))
+    op.add_column("executions", sa.Column("http_connection_reused", sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove HTTP phase timing columns from executions table."""
+    op.drop_column("executions", "http_connection_reused")
+    op.drop_column("executions", "http_transfer_time")
+    op.drop_column("executions", "http_first_byte_time")
+    op.drop_column("executions", "http_tls_time")
+    op.drop_column("executions", "http_connect_time")
+    op.drop_column("executions", "http_dns_time")
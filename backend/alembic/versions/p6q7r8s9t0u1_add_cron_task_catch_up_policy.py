@@ -0,0 +1,50 @@
+"""add catch-up policy to cron_tasks
+
+Revision ID: p6q7r8s9t0u1
+Revises: o5p6q7r8s9t0
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "p6q7r8s9t0u1"
+down_revision: Union[str, None] = "o5p6q7r8s9t0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add catch_up_policy and max_staleness_seconds to cron_tasks table."""
+    op.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'catchuppolicy') THEN
+                CREATE TYPE catchuppolicy AS ENUM ('run_once', 'skip_missed');
+            END IF;
+        END
+        $$;
+    """)
+    op.add_column(
+        "cron_tasks",
+        sa.Column(
+            "catch_up_policy",
+            postgresql.ENUM("run_once", "skip_missed", name="catchuppolicy", create_type=False),
+            nullable=False,
+            server_default="run_once",
+        ),
+    )
+    op.add_column("cron_tasks", sa.Column("max_staleness_seconds", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove catch_up_policy and max_staleness_seconds from cron_tasks table."""
+    op.drop_column("cron_tasks", "max_staleness_seconds")
+    op.drop_column("cron_tasks", "catch_up_policy")
+    op.execute("DROP TYPE IF EXISTS catchuppolicy")
@@ -1,31 +1,36 @@
+from collections.abc import AsyncGenerator
 from datetime import datetime, timedelta, timezone
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import Depends, Header, HTTPException, Path, status
+from fastapi import Depends, Header, HTTPException, Path, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import decode_token
 from app.db.database import get_db
-from app.db.repositories.users import UserRepository
 from app.db.repositories.workspaces import WorkspaceRepository
 from app.models.plan import Plan
-from app.models.subscription import Subscription, SubscriptionStatus
+from app.models.subscription import SubscriptionStatus
 from app.models.user import User
 from app.models.worker import Worker
 from app.models.workspace import Workspace
+from app.services.principal_cache import Principal, principal_cache
+from app.services.user_activity import user_activity_service
+from app.services.workspace_summary import workspace_summary_service
 
 security = HTTPBearer()
 worker_security = HTTPBearer(auto_error=False)
 
 
-async def get_current_user(
+async def get_current_principal(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> User:
-    """Get current authenticated user from JWT token."""
+) -> Principal:
+    """Get current authenticated principal (user, subscription status) from JWT token.
+
+    Served from the short-TTL principal cache, so a typical request costs no DB queries here.
+    """
     token = credentials.credentials
     payload = decode_token(token)
 
@@ -37,24 +42,36 @@ async def get_current_user(
         )
 
     user_id = UUID(payload["sub"])
-    user_repo = UserRepository(db)
-    user = await user_repo.get_by_id(user_id)
+    principal = await principal_cache.get(db, user_id)
 
-    if user is None or not user.is_active:
+    if principal is None or not principal.user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Update last_login_at on each visit (throttled to every 5 minutes)
-    await _update_last_activity(db, user)
+    # Track last_login_at on each visit (throttled to every 5 minutes)
+    await _update_last_activity(db, principal.user)
 
-    return user
+    return principal
+
+
+async def get_current_user(
+    principal: Annotated[Principal, Depends(get_current_principal)],
+) -> User:
+    """Get current authenticated user from JWT token."""
+    return principal.user
 
 
 async def _update_last_activity(db: AsyncSession, user: User) -> None:
-    """Update user's last_login_at timestamp if more than 5 minutes have passed."""
+    """Record user activity for the write-behind last_login_at flush.
+
+    Falls back to a direct throttled update if Redis is unavailable.
+    """
+    if await user_activity_service.record(user.id):
+        return
+
     now = datetime.now(timezone.utc)
     throttle_interval = timedelta(minutes=5)
 
@@ -94,10 +111,11 @@ async def get_verified_user(
 
 async def get_workspace(
     workspace_id: Annotated[UUID, Path(description="Workspace ID")],
-    current_user: Annotated[User, Depends(get_current_user)],
+    principal: Annotated[Principal, Depends(get_current_principal)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> Workspace:
     """Get workspace by ID and verify user has access."""
+    current_user = principal.user
     workspace_repo = WorkspaceRepository(db)
     workspace = await workspace_repo.get_by_id(workspace_id)
 
@@ -160,8 +178,7 @@ async def get_current_worker(
 
 async def require_active_subscription(
     workspace: Annotated[Workspace, Depends(get_workspace)],
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    principal: Annotated[Principal, Depends(get_current_principal)],
 ) -> Workspace:
     """
     Check that workspace is not blocked and user has valid subscription.
@@ -181,16 +198,15 @@ async def require_active_subscription(
             },
         )
 
-    # Get subscription for USER (not workspace)
-    result = await db.execute(select(Subscription).where(Subscription.user_id == current_user.id))
-    subscription = result.scalar_one_or_none()
+    # Subscription status for USER (not workspace), from the principal cache
+    subscription_status = principal.subscription_status
 
     # No subscription = free plan, allowed (limits checked in endpoints)
-    if subscription is None:
+    if subscription_status is None:
         return workspace
 
     # Active or past_due subscription - allowed
-    if subscription.status in (SubscriptionStatus.ACTIVE, SubscriptionStatus.PAST_DUE):
+    if subscription_status in (SubscriptionStatus.ACTIVE, SubscriptionStatus.PAST_DUE):
         return workspace
 
     # Expired or cancelled - block write operations
@@ -199,7 +215,7 @@ async def require_active_subscription(
         detail={
             "error": "subscription_expired",
             "message": "Your subscription has expired. Please renew to create or modify tasks.",
-            "subscription_status": subscription.status.value,
+            "subscription_status": subscription_status.value,
         },
     )
 
@@ -211,7 +227,25 @@ async def get_user_language(
     return current_user.preferred_language or "en"
 
 
+async def invalidate_workspace_summary(
+    request: Request,
+    workspace: Annotated[Workspace, Depends(get_workspace)],
+) -> AsyncGenerator[None, None]:
+    """Invalidate the cached workspace summary after a successful write request.
+
+    Added as a router dependency to routers whose writes change the summary.
+    Resolving get_workspace first means it only runs for callers authorized
+    for the workspace, and an error anywhere in the request (validation,
+    the endpoint itself) skips the invalidation. Endpoints commit before
+    returning, so this runs after the commit.
+    """
+    yield
+    if request.method not in ("GET", "HEAD", "OPTIONS"):
+        await workspace_summary_service.invalidate(workspace.id)
+
+
 # Type aliases for dependency injection
+CurrentPrincipal = Annotated[Principal, Depends(get_current_principal)]
 CurrentUser = Annotated[User, Depends(get_current_user)]
 VerifiedUser = Annotated[User, Depends(get_verified_user)]
 CurrentSuperuser = Annotated[User, Depends(get_current_active_superuser)]
@@ -5,7 +5,7 @@ from typing import Annotated
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
-from sqlalchemy import func, select
+from sqlalchemy import Select, Subquery, func, select
 from sqlalchemy.orm import selectinload
 
 from app.api.deps import DB, CurrentUser
@@ -15,7 +15,6 @@ from app.models import (
     DelayedTask,
     Execution,
     Heartbeat,
-    Payment,
     Plan,
     SSLMonitor,
     Subscription,
@@ -24,12 +23,13 @@ from app.models import (
     Workspace,
 )
 from app.models.notification_template import NotificationChannel, NotificationTemplate
-from app.models.payment import PaymentStatus
 from app.models.subscription import SubscriptionStatus
+from app.services.admin_stats import admin_stats_service
 from app.services.auth import AuthService
 from app.services.billing import billing_service
 from app.services.email import email_service
 from app.services.i18n import t
+from app.services.principal_cache import principal_cache
 from app.services.template_service import template_service
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
@@ -74,6 +74,7 @@ class AdminStatsResponse(BaseModel):
     active_subscriptions: int
     paid_subscriptions: int  # Subscriptions with actual payments (excludes admin-assigned)
     revenue_this_month: float
+    computed_at: datetime | None = None  # When the stats snapshot was taken
 
 
 class UserListItem(BaseModel):
@@ -156,115 +157,67 @@ class AssignPlanRequest(BaseModel):
 
 
 @router.get("/stats", response_model=AdminStatsResponse)
-async def get_admin_stats(admin: AdminUser, db: DB):
-    """Get admin dashboard statistics."""
-    now = datetime.utcnow()
-    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    week_ago = today - timedelta(days=7)
-    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-    # User stats
-    total_users = await db.scalar(select(func.count(User.id)))
-    active_users = await db.scalar(select(func.count(User.id)).where(User.is_active.is_(True)))
-    verified_users = await db.scalar(select(func.count(User.id)).where(User.email_verified.is_(True)))
-
-    # Workspace stats
-    total_workspaces = await db.scalar(select(func.count(Workspace.id)))
-
-    # Task stats
-    total_cron = await db.scalar(select(func.count(CronTask.id)))
-    active_cron = await db.scalar(select(func.count(CronTask.id)).where(CronTask.is_active.is_(True)))
-    total_delayed = await db.scalar(select(func.count(DelayedTask.id)))
-    pending_delayed = await db.scalar(select(func.count(DelayedTask.id)).where(DelayedTask.status == "pending"))
-
-    # Task chains stats
-    total_chains = await db.scalar(select(func.count(TaskChain.id)))
-    active_chains = await db.scalar(select(func.count(TaskChain.id)).where(TaskChain.is_active.is_(True)))
-
-    # Heartbeat stats (active = not paused)
-    total_heartbeats = await db.scalar(select(func.count(Heartbeat.id)))
-    active_heartbeats = await db.scalar(select(func.count(Heartbeat.id)).where(Heartbeat.status != "paused"))
-
-    # SSL monitor stats (active = not paused)
-    total_ssl_monitors = await db.scalar(select(func.count(SSLMonitor.id)))
-    active_ssl_monitors = await db.scalar(select(func.count(SSLMonitor.id)).where(SSLMonitor.is_paused.is_(False)))
-
-    # Execution stats
-    total_executions = await db.scalar(select(func.count(Execution.id)))
-    executions_today = await db.scalar(select(func.count(Execution.id)).where(Execution.started_at >= today))
-    executions_this_week = await db.scalar(select(func.count(Execution.id)).where(Execution.started_at >= week_ago))
-
-    # Success rate (last 7 days)
-    successful = await db.scalar(
-        select(func.count(Execution.id)).where(
-            Execution.started_at >= week_ago,
-            Execution.status == "success",
-        )
-    )
-    total_recent = await db.scalar(
-        select(func.count(Execution.id)).where(
-            Execution.started_at >= week_ago,
-            Execution.status.in_(["success", "failed"]),
+async def get_admin_stats(admin: AdminUser, db: DB, refresh: bool = False):
+    """Get admin dashboard statistics.
+
+    Served from a cached snapshot, recomputed when it has expired;
+    `refresh=true` recomputes it first.
+    """
+    stats = await admin_stats_service.refresh(db) if refresh else await admin_stats_service.get(db)
+    return AdminStatsResponse(**stats)
+
+
+def _active_plans(user_ids) -> Subquery:
+    """Latest active subscription plan per user, one row each."""
+    ranked = (
+        select(
+            Subscription.user_id,
+            Plan.name.label("plan_name"),
+            Subscription.current_period_end,
+            func.row_number()
+            .over(partition_by=Subscription.user_id, order_by=Subscription.created_at.desc())
+            .label("rank"),
         )
-    )
-    success_rate = ((successful or 0) / total_recent * 100) if total_recent else 0
-
-    # Subscription stats
-    active_subs = await db.scalar(
-        select(func.count(Subscription.id)).where(
+        .outerjoin(Plan, Subscription.plan_id == Plan.id)
+        .where(
+            Subscription.user_id.in_(user_ids),
             Subscription.status == SubscriptionStatus.ACTIVE,
-            Subscription.current_period_end > now,
         )
+        .subquery()
     )
+    return select(ranked).where(ranked.c.rank == 1).subquery()
 
-    # Paid subscriptions - count active subscriptions that were paid via YooKassa
-    # Admin-assigned subscriptions don't have yookassa_payment_method_id set
-    paid_subs = await db.scalar(
-        select(func.count(Subscription.id)).where(
-            Subscription.status == SubscriptionStatus.ACTIVE,
-            Subscription.current_period_end > now,
-            Subscription.yookassa_payment_method_id.isnot(None),
-        )
-    )
 
-    # Revenue (this month) - sum of successful payments via payment system only
-    # Exclude manual plan assignments by admin (they don't have yookassa_payment_id)
-    revenue = (
-        await db.scalar(
-            select(func.sum(Payment.amount)).where(
-                Payment.created_at >= month_start,
-                Payment.status == PaymentStatus.SUCCEEDED,
-                Payment.yookassa_payment_id.isnot(None),
-            )
-        )
-        or 0
+def _count_by_owner(model, user_ids) -> Subquery:
+    """Rows of a workspace-scoped model per workspace owner."""
+    return (
+        select(Workspace.owner_id.label("key"), func.count(model.id).label("count"))
+        .join(Workspace, model.workspace_id == Workspace.id)
+        .where(Workspace.owner_id.in_(user_ids))
+        .group_by(Workspace.owner_id)
+        .subquery()
     )
 
-    return AdminStatsResponse(
-        total_users=total_users or 0,
-        active_users=active_users or 0,
-        verified_users=verified_users or 0,
-        total_workspaces=total_workspaces or 0,
-        total_cron_tasks=total_cron or 0,
-        active_cron_tasks=active_cron or 0,
-        total_delayed_tasks=total_delayed or 0,
-        pending_delayed_tasks=pending_delayed or 0,
-        total_task_chains=total_chains or 0,
-        active_task_chains=active_chains or 0,
-        total_heartbeats=total_heartbeats or 0,
-        active_heartbeats=active_heartbeats or 0,
-        total_ssl_monitors=total_ssl_monitors or 0,
-        active_ssl_monitors=active_ssl_monitors or 0,
-        total_executions=total_executions or 0,
-        executions_today=executions_today or 0,
-        executions_this_week=executions_this_week or 0,
-        success_rate=round(success_rate, 1),
-        active_subscriptions=active_subs or 0,
-        paid_subscriptions=paid_subs or 0,
-        revenue_this_month=float(revenue) / 100,  # Convert from kopeks to rubles
+
+def _count_by_workspace(model, workspace_ids) -> Subquery:
+    """Rows of a workspace-scoped model per workspace."""
+    return (
+        select(model.workspace_id.label("key"), func.count(model.id).label("count"))
+        .where(model.workspace_id.in_(workspace_ids))
+        .group_by(model.workspace_id)
+        .subquery()
     )
 
 
+def _with_counts(query: Select, key_column, counts: dict[str, Subquery]) -> Select:
+    """Outer join grouped count subqueries and select them as named columns."""
+    for name, counts_subquery in counts.items():
+        query = query.add_columns(func.coalesce(counts_subquery.c.count, 0).label(name)).outerjoin(
+            counts_subquery, counts_subquery.c.key == key_column
+        )
+    return query
+
+
 @router.get("/users", response_model=UserListResponse)
 async def list_users(
     admin: AdminUser,
@@ -292,42 +245,36 @@ async def list_users(
     result = await db.execute(query)
     users = result.scalars().all()
 
-    # Get workspace and task counts for each user
-    user_items = []
-    for user in users:
-        workspace_count = await db.scalar(select(func.count(Workspace.id)).where(Workspace.owner_id == user.id))
-        cron_tasks_count = await db.scalar(
-            select(func.count(CronTask.id)).join(Workspace).where(Workspace.owner_id == user.id)
-        )
-        delayed_tasks_count = await db.scalar(
-            select(func.count(DelayedTask.id)).join(Workspace).where(Workspace.owner_id == user.id)
-        )
-        task_chains_count = await db.scalar(
-            select(func.count(TaskChain.id)).join(Workspace).where(Workspace.owner_id == user.id)
-        )
-        heartbeats_count = await db.scalar(
-            select(func.count(Heartbeat.id)).join(Workspace).where(Workspace.owner_id == user.id)
+    # Get workspace, task and subscription data for the whole page at once
+    user_ids = [user.id for user in users]
+    rows = {}
+    if user_ids:
+        workspace_counts = (
+            select(Workspace.owner_id.label("key"), func.count(Workspace.id).label("count"))
+            .where(Workspace.owner_id.in_(user_ids))
+            .group_by(Workspace.owner_id)
+            .subquery()
         )
-        ssl_monitors_count = await db.scalar(
-            select(func.count(SSLMonitor.id)).join(Workspace).where(Workspace.owner_id == user.id)
-        )
-        executions_count = await db.scalar(
-            select(func.count(Execution.id)).join(Workspace).where(Workspace.owner_id == user.id)
-        )
-
-        # Get active subscription
-        sub = await db.scalar(
-            select(Subscription)
-            .options(selectinload(Subscription.plan))
-            .where(
-                Subscription.user_id == user.id,
-                Subscription.status == SubscriptionStatus.ACTIVE,
-            )
-            .order_by(Subscription.created_at.desc())
+        plans = _active_plans(user_ids)
+        stats_query = _with_counts(
+            select(User.id, plans.c.plan_name, plans.c.current_period_end),
+            User.id,
+            {
+                "workspaces_count": workspace_counts,
+                "cron_tasks_count": _count_by_owner(CronTask, user_ids),
+                "delayed_tasks_count": _count_by_owner(DelayedTask, user_ids),
+                "task_chains_count": _count_by_owner(TaskChain, user_ids),
+                "heartbeats_count": _count_by_owner(Heartbeat, user_ids),
+                "ssl_monitors_count": _count_by_owner(SSLMonitor, user_ids),
+                "executions_count": _count_by_owner(Execution, user_ids),
+            },
         )
-        plan_name = sub.plan.name if sub and sub.plan else "free"
-        subscription_ends_at = sub.current_period_end if sub else None
+        stats_query = stats_query.outerjoin(plans, plans.c.user_id == User.id).where(User.id.in_(user_ids))
+        rows = {row.id: row for row in await db.execute(stats_query)}
 
+    user_items = []
+    for user in users:
+        row = rows.get(user.id)
         user_items.append(
             UserListItem(
                 id=str(user.id),
@@ -339,15 +286,15 @@ async def list_users(
                 telegram_username=user.telegram_username,
                 created_at=user.created_at,
                 last_login_at=user.last_login_at,
-                workspaces_count=workspace_count or 0,
-                cron_tasks_count=cron_tasks_count or 0,
-                delayed_tasks_count=delayed_tasks_count or 0,
-                task_chains_count=task_chains_count or 0,
-                heartbeats_count=heartbeats_count or 0,
-                ssl_monitors_count=ssl_monitors_count or 0,
-                executions_count=executions_count or 0,
-                plan_name=plan_name,
-                subscription_ends_at=subscription_ends_at,
+                workspaces_count=row.workspaces_count if row else 0,
+                cron_tasks_count=row.cron_tasks_count if row else 0,
+                delayed_tasks_count=row.delayed_tasks_count if row else 0,
+                task_chains_count=row.task_chains_count if row else 0,
+                heartbeats_count=row.heartbeats_count if row else 0,
+                ssl_monitors_count=row.ssl_monitors_count if row else 0,
+                executions_count=row.executions_count if row else 0,
+                plan_name=(row.plan_name if row else None) or "free",
+                subscription_ends_at=row.current_period_end if row else None,
             )
         )
 
@@ -441,6 +388,7 @@ async def update_user(admin: AdminUser, db: DB, user_id: str, data: UpdateUserRe
 
     await db.commit()
     await db.refresh(user)
+    await principal_cache.invalidate(user.id)
 
     return {"message": "User updated successfully"}
 
@@ -460,8 +408,10 @@ async def delete_user(admin: AdminUser, db: DB, user_id: str):
         )
 
     # Delete user (cascade will handle related data)
+    deleted_user_id = user.id
     await db.delete(user)
     await db.commit()
+    await principal_cache.invalidate(deleted_user_id)
 
 
 @router.post("/users/{user_id}/resend-verification")
@@ -552,6 +502,7 @@ async def assign_user_plan(
     )
     db.add(subscription)
     await db.commit()
+    await billing_service.invalidate_user_caches(user.id)
 
     return {"message": f"Plan '{plan.display_name}' assigned to user for {data.duration_days} days"}
 
@@ -619,27 +570,30 @@ async def list_workspaces(
     result = await db.execute(query)
     workspaces = result.scalars().all()
 
-    # Build response with counts
-    workspace_items = []
-    for ws in workspaces:
-        cron_count = await db.scalar(select(func.count(CronTask.id)).where(CronTask.workspace_id == ws.id))
-        delayed_count = await db.scalar(select(func.count(DelayedTask.id)).where(DelayedTask.workspace_id == ws.id))
-        chains_count = await db.scalar(select(func.count(TaskChain.id)).where(TaskChain.workspace_id == ws.id))
-        heartbeats_count = await db.scalar(select(func.count(Heartbeat.id)).where(Heartbeat.workspace_id == ws.id))
-        exec_count = await db.scalar(select(func.count(Execution.id)).where(Execution.workspace_id == ws.id))
-
-        # Get subscription plan
-        sub = await db.scalar(
-            select(Subscription)
-            .options(selectinload(Subscription.plan))
-            .where(
-                Subscription.user_id == ws.owner_id,
-                Subscription.status == SubscriptionStatus.ACTIVE,
-            )
-            .order_by(Subscription.created_at.desc())
+    # Get task counts and owner plans for the whole page at once
+    workspace_ids = [ws.id for ws in workspaces]
+    rows = {}
+    if workspace_ids:
+        plans = _active_plans({ws.owner_id for ws in workspaces})
+        stats_query = _with_counts(
+            select(Workspace.id, plans.c.plan_name),
+            Workspace.id,
+            {
+                "cron_tasks_count": _count_by_workspace(CronTask, workspace_ids),
+                "delayed_tasks_count": _count_by_workspace(DelayedTask, workspace_ids),
+                "task_chains_count": _count_by_workspace(TaskChain, workspace_ids),
+                "heartbeats_count": _count_by_workspace(Heartbeat, workspace_ids),
+                "executions_count": _count_by_workspace(Execution, workspace_ids),
+            },
+        )
+        stats_query = stats_query.outerjoin(plans, plans.c.user_id == Workspace.owner_id).where(
+            Workspace.id.in_(workspace_ids)
         )
-        plan_name = sub.plan.name if sub and sub.plan else "free"
+        rows = {row.id: row for row in await db.execute(stats_query)}
 
+    workspace_items = []
+    for ws in workspaces:
+        row = rows.get(ws.id)
         workspace_items.append(
             WorkspaceListItem(
                 id=str(ws.id),
@@ -647,12 +601,12 @@ async def list_workspaces(
                 slug=ws.slug,
                 owner_email=ws.owner.email,
                 owner_name=ws.owner.name,
-                plan_name=plan_name,
-                cron_tasks_count=cron_count or 0,
-                delayed_tasks_count=delayed_count or 0,
-                task_chains_count=chains_count or 0,
-                heartbeats_count=heartbeats_count or 0,
-                executions_count=exec_count or 0,
+                plan_name=(row.plan_name if row else None) or "free",
+                cron_tasks_count=row.cron_tasks_count if row else 0,
+                delayed_tasks_count=row.delayed_tasks_count if row else 0,
+                task_chains_count=row.task_chains_count if row else 0,
+                heartbeats_count=row.heartbeats_count if row else 0,
+                executions_count=row.executions_count if row else 0,
                 created_at=ws.created_at,
             )
         )
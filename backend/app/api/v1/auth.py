@@ -28,6 +28,7 @@ from app.schemas.user import UserLogin, UserResponse, UserUpdate
 from app.services.auth import TELEGRAM_LINK_EXPIRE, AuthService
 from app.services.email import email_service
 from app.services.i18n import t
+from app.services.principal_cache import principal_cache
 from app.services.telegram import telegram_service
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -198,6 +199,8 @@ async def update_me(data: UserUpdate, current_user: CurrentUser, db: DB):
         return UserResponse.model_validate(current_user)
 
     updated_user = await user_repo.update(current_user, **update_data)
+    await db.commit()
+    await principal_cache.invalidate(current_user.id)
     return UserResponse.model_validate(updated_user)
 
 
@@ -419,6 +422,8 @@ async def upload_avatar(
     avatar_url = f"/uploads/avatars/{filename}"
     user_repo = UserRepository(db)
     updated_user = await user_repo.update(current_user, avatar_url=avatar_url)
+    await db.commit()
+    await principal_cache.invalidate(current_user.id)
 
     return UserResponse.model_validate(updated_user)
 
@@ -438,6 +443,8 @@ async def delete_avatar(current_user: CurrentUser, db: DB):
     # Update user
     user_repo = UserRepository(db)
     await user_repo.update(current_user, avatar_url=None)
+    await db.commit()
+    await principal_cache.invalidate(current_user.id)
 
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
@@ -459,3 +466,5 @@ async def delete_account(
 
     user_repo = UserRepository(db)
     await user_repo.update(current_user, is_active=False)
+    await db.commit()
+    await principal_cache.invalidate(current_user.id)
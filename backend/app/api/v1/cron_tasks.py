@@ -1,11 +1,16 @@
 from datetime import datetime
-from uuid import UUID
+from uuid import UUID, uuid4
 
-import pytz
-from croniter import croniter
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from app.api.deps import DB, ActiveSubscriptionWorkspace, CurrentWorkspace, UserLanguage, UserPlan
+from app.api.deps import (
+    DB,
+    ActiveSubscriptionWorkspace,
+    CurrentWorkspace,
+    UserLanguage,
+    UserPlan,
+    invalidate_workspace_summary,
+)
 from app.db.repositories.cron_tasks import CronTaskRepository
 from app.db.repositories.workspaces import WorkspaceRepository
 from app.schemas.cron_task import (
@@ -16,35 +21,13 @@ from app.schemas.cron_task import (
     PaginationMeta,
 )
 from app.services.i18n import t
+from app.services.schedule import calculate_min_interval_minutes, calculate_next_run, get_task_jitter_offset
 
-router = APIRouter(prefix="/workspaces/{workspace_id}/cron", tags=["Cron Tasks"])
-
-
-def calculate_next_run(schedule: str, timezone: str) -> datetime:
-    """Calculate next run time based on cron schedule and timezone."""
-    tz = pytz.timezone(timezone)
-    now = datetime.now(tz)
-    cron = croniter(schedule, now)
-    next_run = cron.get_next(datetime)
-    # Convert to UTC for storage
-    return next_run.astimezone(pytz.UTC).replace(tzinfo=None)
-
-
-def calculate_min_interval_minutes(schedule: str, timezone: str) -> int:
-    """Calculate minimum interval between cron runs in minutes."""
-    tz = pytz.timezone(timezone)
-    now = datetime.now(tz)
-    cron = croniter(schedule, now)
-
-    # Get several consecutive run times to find minimum interval
-    run_times = [cron.get_next(datetime) for _ in range(10)]
-
-    min_interval = float("inf")
-    for i in range(1, len(run_times)):
-        interval = (run_times[i] - run_times[i - 1]).total_seconds() / 60
-        min_interval = min(min_interval, interval)
-
-    return int(min_interval)
+router = APIRouter(
+    prefix="/workspaces/{workspace_id}/cron",
+    tags=["Cron Tasks"],
+    dependencies=[Depends(invalidate_workspace_summary)],
+)
 
 
 @router.get("", response_model=CronTaskListResponse)
@@ -123,14 +106,17 @@ async def create_cron_task(
             detail=t("errors.overlap_prevention_not_available", lang),
         )
 
-    # Calculate next run time
-    next_run_at = calculate_next_run(data.schedule, data.timezone)
+    # Calculate next run time (the id is assigned up front as it seeds the jitter offset)
+    task_id = uuid4()
+    offset = get_task_jitter_offset(task_id, data.schedule_jitter_seconds, workspace.schedule_jitter_seconds)
+    next_run_at = calculate_next_run(data.schedule, data.timezone, offset_seconds=offset)
 
     # Convert schema to dict, automatically including all fields
     # mode="json" ensures HttpUrl and enums are serialized to primitives
     task_data = data.model_dump(mode="json")
 
     # Add system fields
+    task_data["id"] = task_id
     task_data["workspace_id"] = workspace.id
     task_data["is_active"] = True
     task_data["is_paused"] = False
@@ -202,13 +188,19 @@ async def update_cron_task(
                 detail=t("errors.overlap_prevention_not_available", lang),
             )
 
-    # If schedule or timezone changed, recalculate next_run_at and validate interval
-    if "schedule" in update_data or "timezone" in update_data:
+    # If schedule, timezone or jitter changed, recalculate next_run_at
+    if "schedule" in update_data or "timezone" in update_data or "schedule_jitter_seconds" in update_data:
         schedule = update_data.get("schedule", task.schedule)
         timezone = update_data.get("timezone", task.timezone)
-        update_data["next_run_at"] = calculate_next_run(schedule, timezone)
+        offset = get_task_jitter_offset(
+            task.id,
+            update_data.get("schedule_jitter_seconds", task.schedule_jitter_seconds),
+            workspace.schedule_jitter_seconds,
+        )
+        update_data["next_run_at"] = calculate_next_run(schedule, timezone, offset_seconds=offset)
 
-        # Check minimum interval against user's plan
+    # Check minimum interval against user's plan
+    if "schedule" in update_data or "timezone" in update_data:
         interval_minutes = calculate_min_interval_minutes(schedule, timezone)
         if interval_minutes < user_plan.min_cron_interval_minutes:
             raise HTTPException(
@@ -291,6 +283,7 @@ async def run_cron_task(
     try:
         from arq import create_pool
 
+        from app.workers.queues import queue_for
         from app.workers.settings import get_redis_settings
 
         redis = await create_pool(get_redis_settings())
@@ -299,6 +292,7 @@ async def run_cron_task(
             task_id=str(task_id),
             retry_attempt=0,
             manual_run=True,
+            _queue_name=queue_for("execute_cron_task"),
         )
         await redis.close()
 
@@ -364,7 +358,8 @@ async def resume_cron_task(
             detail="Task is not paused",
         )
 
-    next_run_at = calculate_next_run(task.schedule, task.timezone)
+    offset = get_task_jitter_offset(task.id, task.schedule_jitter_seconds, workspace.schedule_jitter_seconds)
+    next_run_at = calculate_next_run(task.schedule, task.timezone, offset_seconds=offset)
     task = await cron_repo.resume(task, next_run_at)
     await db.commit()
 
@@ -431,12 +426,17 @@ async def copy_cron_task(
             detail=t("errors.cannot_copy_task_with_overlap", lang),
         )
 
-    # Calculate next run time
-    next_run_at = calculate_next_run(original_task.schedule, original_task.timezone)
+    # Calculate next run time (the copy gets its own jitter offset)
+    new_task_id = uuid4()
+    offset = get_task_jitter_offset(
+        new_task_id, original_task.schedule_jitter_seconds, workspace.schedule_jitter_seconds
+    )
+    next_run_at = calculate_next_run(original_task.schedule, original_task.timezone, offset_seconds=offset)
 
     # Create copy with new name
     new_name = f"{original_task.name} (copy)"
     new_task = await cron_repo.create(
+        id=new_task_id,
         workspace_id=workspace.id,
         name=new_name,
         description=original_task.description,
@@ -446,6 +446,9 @@ async def copy_cron_task(
         body=original_task.body,
         schedule=original_task.schedule,
         timezone=original_task.timezone,
+        schedule_jitter_seconds=original_task.schedule_jitter_seconds,
+        catch_up_policy=original_task.catch_up_policy,
+        max_staleness_seconds=original_task.max_staleness_seconds,
         timeout_seconds=original_task.timeout_seconds,
         retry_count=original_task.retry_count,
         retry_delay_seconds=original_task.retry_delay_seconds,
@@ -1,9 +1,16 @@
 from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query, status
-
-from app.api.deps import DB, ActiveSubscriptionWorkspace, CurrentWorkspace, UserLanguage, UserPlan
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.api.deps import (
+    DB,
+    ActiveSubscriptionWorkspace,
+    CurrentWorkspace,
+    UserLanguage,
+    UserPlan,
+    invalidate_workspace_summary,
+)
 from app.db.repositories.delayed_tasks import DelayedTaskRepository
 from app.db.repositories.workspaces import WorkspaceRepository
 from app.models.cron_task import TaskStatus
@@ -17,7 +24,11 @@ from app.schemas.delayed_task import (
 )
 from app.services.i18n import t
 
-router = APIRouter(prefix="/workspaces/{workspace_id}/delayed", tags=["Delayed Tasks"])
+router = APIRouter(
+    prefix="/workspaces/{workspace_id}/delayed",
+    tags=["Delayed Tasks"],
+    dependencies=[Depends(invalidate_workspace_summary)],
+)
 
 
 @router.get("", response_model=DelayedTaskListResponse)
@@ -1,9 +1,9 @@
 from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from app.api.deps import DB, ActiveSubscriptionWorkspace, CurrentWorkspace, UserPlan
+from app.api.deps import DB, ActiveSubscriptionWorkspace, CurrentWorkspace, UserPlan, invalidate_workspace_summary
 from app.config import settings
 from app.db.repositories.heartbeats import HeartbeatPingRepository, HeartbeatRepository
 from app.db.repositories.workspaces import WorkspaceRepository
@@ -19,7 +19,11 @@ from app.schemas.heartbeat import (
     parse_interval_to_seconds,
 )
 
-router = APIRouter(prefix="/workspaces/{workspace_id}/heartbeats", tags=["Heartbeats"])
+router = APIRouter(
+    prefix="/workspaces/{workspace_id}/heartbeats",
+    tags=["Heartbeats"],
+    dependencies=[Depends(invalidate_workspace_summary)],
+)
 
 
 def build_ping_url(ping_token: str) -> str:
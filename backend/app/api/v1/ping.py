@@ -12,6 +12,7 @@ from app.db.database import get_db
 from app.db.repositories.heartbeats import HeartbeatRepository
 from app.schemas.heartbeat import HeartbeatPingCreate, PingSuccessResponse
 from app.services.heartbeat import heartbeat_service
+from app.services.workspace_summary import workspace_summary_service
 
 router = APIRouter(prefix="/ping", tags=["Ping"])
 
@@ -44,6 +45,8 @@ async def _process_ping(
     source_ip = request.client.host if request.client else None
     user_agent = request.headers.get("user-agent")
 
+    previous_status = heartbeat.status
+
     # Process ping
     if data:
         await heartbeat_service.process_ping(
@@ -63,6 +66,9 @@ async def _process_ping(
             user_agent=user_agent,
         )
 
+    if heartbeat.status != previous_status:
+        await workspace_summary_service.invalidate(heartbeat.workspace_id)
+
     return PingSuccessResponse(
         ok=True,
         message="pong",
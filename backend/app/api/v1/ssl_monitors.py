@@ -1,9 +1,9 @@
 from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from app.api.deps import DB, ActiveSubscriptionWorkspace, CurrentWorkspace, UserPlan
+from app.api.deps import DB, ActiveSubscriptionWorkspace, CurrentWorkspace, UserPlan, invalidate_workspace_summary
 from app.db.repositories.ssl_monitors import SSLMonitorRepository
 from app.db.repositories.workspaces import WorkspaceRepository
 from app.models.ssl_monitor import SSLMonitorStatus
@@ -16,7 +16,11 @@ from app.schemas.ssl_monitor import (
 )
 from app.services.ssl_monitor import ssl_monitor_service
 
-router = APIRouter(prefix="/workspaces/{workspace_id}/ssl-monitors", tags=["SSL Monitors"])
+router = APIRouter(
+    prefix="/workspaces/{workspace_id}/ssl-monitors",
+    tags=["SSL Monitors"],
+    dependencies=[Depends(invalidate_workspace_summary)],
+)
 
 
 @router.get("", response_model=SSLMonitorListResponse)
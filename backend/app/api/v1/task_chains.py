@@ -3,11 +3,16 @@
 from datetime import datetime
 from uuid import UUID
 
-import pytz
-from croniter import croniter
-from fastapi import APIRouter, HTTPException, Query, status
-
-from app.api.deps import DB, ActiveSubscriptionWorkspace, CurrentWorkspace, UserLanguage, UserPlan
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.api.deps import (
+    DB,
+    ActiveSubscriptionWorkspace,
+    CurrentWorkspace,
+    UserLanguage,
+    UserPlan,
+    invalidate_workspace_summary,
+)
 from app.db.repositories.chain_executions import ChainExecutionRepository
 from app.db.repositories.task_chains import ChainStepRepository, TaskChainRepository
 from app.db.repositories.workspaces import WorkspaceRepository
@@ -29,35 +34,13 @@ from app.schemas.task_chain import (
     TaskChainUpdate,
 )
 from app.services.i18n import t
+from app.services.schedule import calculate_min_interval_minutes, calculate_next_run
 
-router = APIRouter(prefix="/workspaces/{workspace_id}/chains", tags=["Task Chains"])
-
-
-def calculate_next_run(schedule: str, timezone: str) -> datetime:
-    """Calculate next run time based on cron schedule and timezone."""
-    tz = pytz.timezone(timezone)
-    now = datetime.now(tz)
-    cron = croniter(schedule, now)
-    next_run = cron.get_next(datetime)
-    return next_run.astimezone(pytz.UTC).replace(tzinfo=None)
-
-
-def calculate_min_interval_minutes(schedule: str, timezone: str) -> int:
-    """Calculate minimum interval between cron runs in minutes."""
-    tz = pytz.timezone(timezone)
-    now = datetime.now(tz)
-    cron = croniter(schedule, now)
-    run_times = [cron.get_next(datetime) for _ in range(10)]
-    min_interval = float("inf")
-    for i in range(1, len(run_times)):
-        interval = (run_times[i] - run_times[i - 1]).total_seconds() / 60
-        min_interval = min(min_interval, interval)
-    return int(min_interval)
-
-
-# ============================================================================
-# Chain CRUD Endpoints
-# ============================================================================
+router = APIRouter(
+    prefix="/workspaces/{workspace_id}/chains",
+    tags=["Task Chains"],
+    dependencies=[Depends(invalidate_workspace_summary)],
+)
 
 
 @router.get("", response_model=TaskChainListResponse)
@@ -187,6 +170,7 @@ async def create_task_chain(
         execute_at=execute_at_naive,
         stop_on_failure=data.stop_on_failure,
         timeout_seconds=data.timeout_seconds,
+        max_parallel_steps=data.max_parallel_steps,
         notify_on_failure=data.notify_on_failure,
         notify_on_success=data.notify_on_success,
         notify_on_partial=data.notify_on_partial,
@@ -212,6 +196,7 @@ async def create_task_chain(
             condition=step_data.condition.model_dump() if step_data.condition else None,
             extract_variables=step_data.extract_variables,
             continue_on_failure=step_data.continue_on_failure,
+            depends_on=step_data.depends_on,
         )
         created_steps.append(step)
 
@@ -387,6 +372,7 @@ async def run_task_chain(
     try:
         from arq import create_pool
 
+        from app.workers.queues import queue_for
         from app.workers.settings import get_redis_settings
 
         redis = await create_pool(get_redis_settings())
@@ -395,6 +381,7 @@ async def run_task_chain(
             chain_id=str(chain_id),
             initial_variables=data.initial_variables if data else {},
             manual_run=True,
+            _queue_name=queue_for("execute_chain"),
         )
         await redis.close()
     except Exception as e:
@@ -576,6 +563,12 @@ async def create_chain_step(
     max_order = await step_repo.get_max_step_order(chain_id)
     step_order = data.step_order if data.step_order <= max_order + 1 else max_order + 1
 
+    if data.depends_on and max(data.depends_on) >= step_order:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="depends_on may only reference earlier steps",
+        )
+
     step = await step_repo.create(
         chain_id=chain_id,
         step_order=step_order,
@@ -590,7 +583,9 @@ async def create_chain_step(
         condition=data.condition.model_dump() if data.condition else None,
         extract_variables=data.extract_variables,
         continue_on_failure=data.continue_on_failure,
+        depends_on=data.depends_on,
     )
+    await chain_repo.touch(chain)
     await db.commit()
 
     return ChainStepResponse.model_validate(step)
@@ -628,7 +623,14 @@ async def reorder_chain_steps(
                 )
             step_orders.append({"step_id": UUID(step_id), "step_order": order})
 
-    await step_repo.reorder_steps(chain_id, step_orders)
+    try:
+        await step_repo.reorder_steps(chain_id, step_orders)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+    await chain_repo.touch(chain)
     await db.commit()
 
     steps = await step_repo.get_by_chain(chain_id)
@@ -673,6 +675,12 @@ async def update_chain_step(
                 detail=t("errors.chain_variable_substitution_not_available", lang),
             )
 
+    if update_data.get("depends_on") and max(update_data["depends_on"]) >= step.step_order:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="depends_on may only reference earlier steps",
+        )
+
     # Convert HttpUrl to string if present
     if "url" in update_data and update_data["url"] is not None:
         update_data["url"] = str(update_data["url"])
@@ -681,6 +689,7 @@ async def update_chain_step(
 
     if update_data:
         step = await step_repo.update(step, **update_data)
+        await chain_repo.touch(chain)
         await db.commit()
 
     return ChainStepResponse.model_validate(step)
@@ -711,7 +720,8 @@ async def delete_chain_step(
             detail="Step not found",
         )
 
-    await step_repo.delete(step)
+    await step_repo.delete_step(step)
+    await chain_repo.touch(chain)
     await db.commit()
 
 
@@ -3,10 +3,8 @@
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, status
-from sqlalchemy import func, select
 
 from app.api.deps import DB, CurrentWorkspace
-from app.models.task_queue import TaskQueue
 from app.schemas.task_queue import (
     OverlapStatsResponse,
     TaskQueueListResponse,
@@ -32,8 +30,7 @@ async def list_queued_tasks(
     items = await overlap_service.get_queued_tasks(db, workspace.id, limit=limit)
 
     # Get total count
-    result = await db.execute(select(func.count(TaskQueue.id)).where(TaskQueue.workspace_id == workspace.id))
-    total = result.scalar() or 0
+    total = await overlap_service.count_queued_tasks(db, workspace.id)
 
     return TaskQueueListResponse(
         items=[TaskQueueResponse.model_validate(item) for item in items],
@@ -53,22 +50,15 @@ async def remove_from_queue(
     db: DB,
 ) -> None:
     """Remove a task from the queue."""
-    # Verify the queue item belongs to this workspace
-    result = await db.execute(
-        select(TaskQueue).where(
-            TaskQueue.id == queue_id,
-            TaskQueue.workspace_id == workspace.id,
-        )
-    )
-    queue_item = result.scalar_one_or_none()
+    # Only remove the queue item if it belongs to this workspace
+    removed = await overlap_service.remove_from_queue(db, queue_id, workspace_id=workspace.id)
 
-    if not queue_item:
+    if not removed:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Queue item not found",
         )
 
-    await db.delete(queue_item)
     await db.commit()
 
 
@@ -83,9 +73,7 @@ async def clear_workspace_queue(
     db: DB,
 ) -> None:
     """Clear all queued tasks for the workspace."""
-    from sqlalchemy import delete
-
-    await db.execute(delete(TaskQueue).where(TaskQueue.workspace_id == workspace.id))
+    await overlap_service.clear_workspace_queue(db, workspace.id)
     await db.commit()
 
 
@@ -101,8 +89,7 @@ async def get_overlap_stats(
 ) -> OverlapStatsResponse:
     """Get overlap prevention statistics."""
     # Get current queue size
-    result = await db.execute(select(func.count(TaskQueue.id)).where(TaskQueue.workspace_id == workspace.id))
-    current_queue_size = result.scalar() or 0
+    current_queue_size = await overlap_service.count_queued_tasks(db, workspace.id)
 
     # Calculate overlap rate
     # This would need execution history to be accurate
@@ -164,16 +151,7 @@ async def get_cron_task_queue(
     db: DB,
 ) -> TaskQueueListResponse:
     """Get queue for a specific cron task."""
-    result = await db.execute(
-        select(TaskQueue)
-        .where(
-            TaskQueue.workspace_id == workspace.id,
-            TaskQueue.task_type == "cron",
-            TaskQueue.task_id == task_id,
-        )
-        .order_by(TaskQueue.priority.desc(), TaskQueue.queued_at.asc())
-    )
-    items = result.scalars().all()
+    items = await overlap_service.get_task_queue(db, workspace.id, "cron", task_id)
 
     return TaskQueueListResponse(
         items=[TaskQueueResponse.model_validate(item) for item in items],
@@ -193,16 +171,7 @@ async def get_chain_queue(
     db: DB,
 ) -> TaskQueueListResponse:
     """Get queue for a specific task chain."""
-    result = await db.execute(
-        select(TaskQueue)
-        .where(
-            TaskQueue.workspace_id == workspace.id,
-            TaskQueue.task_type == "chain",
-            TaskQueue.task_id == chain_id,
-        )
-        .order_by(TaskQueue.priority.desc(), TaskQueue.queued_at.asc())
-    )
-    items = result.scalars().all()
+    items = await overlap_service.get_task_queue(db, workspace.id, "chain", chain_id)
 
     return TaskQueueListResponse(
         items=[TaskQueueResponse.model_validate(item) for item in items],
@@ -1,9 +1,10 @@
 """Worker management API endpoints."""
 
 from datetime import datetime, timezone
+from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Path, status
+from fastapi import APIRouter, HTTPException, Path, Query, status
 
 from app.api.deps import DB, CurrentWorker, CurrentWorkspace
 from app.schemas.worker import (
@@ -14,9 +15,11 @@ from app.schemas.worker import (
     WorkerPollResponse,
     WorkerResponse,
     WorkerTaskResult,
+    WorkerTaskResultBatch,
+    WorkerTaskResultBatchResponse,
     WorkerUpdate,
 )
-from app.services.worker import worker_service
+from app.services.worker import MAX_POLL_WAIT_SECONDS, worker_service
 
 router = APIRouter()
 
@@ -210,19 +213,29 @@ async def worker_heartbeat(
 )
 async def poll_tasks(
     worker: CurrentWorker,
-    max_tasks: int = 10,
+    db: DB,
+    max_tasks: Annotated[int, Query(ge=1, le=100)] = 10,
+    wait: Annotated[
+        int,
+        Query(ge=0, le=MAX_POLL_WAIT_SECONDS, description="Long-poll: wait up to N seconds for tasks"),
+    ] = 0,
 ) -> WorkerPollResponse:
     """
     Poll for pending tasks assigned to this worker.
 
     Returns up to `max_tasks` tasks. Call this endpoint regularly
-    (suggested interval: 5 seconds) to receive tasks.
+    (suggested interval: 5 seconds) to receive tasks, or pass `wait`
+    to hold the request open until tasks arrive and poll again right away.
     """
-    tasks = await worker_service.poll_tasks(worker.id, max_tasks)
+    # Authentication was the only query: give the connection back to the
+    # pool before a long-poll blocks on Redis for up to MAX_POLL_WAIT_SECONDS
+    await db.close()
+
+    tasks = await worker_service.poll_tasks(worker.id, max_tasks, wait_seconds=wait)
 
     return WorkerPollResponse(
         tasks=tasks,
-        poll_interval_seconds=5,
+        poll_interval_seconds=0 if wait else 5,
     )
 
 
@@ -253,6 +266,28 @@ async def submit_task_result(
     return {"status": "ok", "task_id": str(result.task_id)}
 
 
+@router.post(
+    "/worker/tasks/results",
+    response_model=WorkerTaskResultBatchResponse,
+    summary="Submit task results in batch",
+    tags=["worker-api"],
+)
+async def submit_task_results(
+    worker: CurrentWorker,
+    batch: WorkerTaskResultBatch,
+    db: DB,
+) -> WorkerTaskResultBatchResponse:
+    """
+    Submit results of several task executions at once (up to 500).
+
+    Preferred over the single-result endpoint for busy workers. Results for
+    unknown tasks are reported in `rejected` and should not be retried.
+    """
+    accepted, rejected = await worker_service.process_task_results(db, worker, batch.results)
+
+    return WorkerTaskResultBatchResponse(accepted=accepted, rejected=rejected)
+
+
 @router.get(
     "/worker/info",
     response_model=WorkerResponse,
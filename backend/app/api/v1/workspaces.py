@@ -10,6 +10,7 @@ from app.schemas.workspace import (
     WorkspaceUpdate,
     WorkspaceWithStats,
 )
+from app.services.workspace_summary import workspace_summary_service
 
 router = APIRouter(prefix="/workspaces", tags=["Workspaces"])
 
@@ -78,59 +79,7 @@ async def get_workspace(
     db: DB,
 ):
     """Get a specific workspace with statistics."""
-    # Calculate additional stats
-    from datetime import datetime, timedelta
-
-    from app.db.repositories.cron_tasks import CronTaskRepository
-    from app.db.repositories.delayed_tasks import DelayedTaskRepository
-    from app.db.repositories.executions import ExecutionRepository
-    from app.db.repositories.heartbeats import HeartbeatRepository
-    from app.db.repositories.ssl_monitors import SSLMonitorRepository
-    from app.db.repositories.task_chains import TaskChainRepository
-    from app.models.cron_task import TaskStatus
-    from app.models.heartbeat import HeartbeatStatus
-    from app.models.ssl_monitor import SSLMonitorStatus
-
-    cron_repo = CronTaskRepository(db)
-    delayed_repo = DelayedTaskRepository(db)
-    exec_repo = ExecutionRepository(db)
-    heartbeat_repo = HeartbeatRepository(db)
-    ssl_repo = SSLMonitorRepository(db)
-    chain_repo = TaskChainRepository(db)
-
-    active_cron = await cron_repo.count_by_workspace(workspace.id, is_active=True)
-    pending_delayed = await delayed_repo.count_by_workspace(workspace.id, status=TaskStatus.PENDING)
-
-    # Today's executions
-    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    exec_today = await exec_repo.count_by_workspace(workspace.id, start_date=today_start)
-
-    # 7-day success rate
-    week_ago = datetime.utcnow() - timedelta(days=7)
-    stats_7d = await exec_repo.get_stats(workspace.id, start_date=week_ago)
-
-    # Heartbeats stats
-    heartbeats_total = await heartbeat_repo.count_by_workspace(workspace.id)
-    heartbeats_healthy = await heartbeat_repo.count_by_status(workspace.id, [HeartbeatStatus.HEALTHY])
-    heartbeats_unhealthy = await heartbeat_repo.count_by_status(
-        workspace.id, [HeartbeatStatus.LATE, HeartbeatStatus.DEAD]
-    )
-
-    # SSL monitors stats
-    ssl_monitors_total = await ssl_repo.count_by_workspace(workspace.id)
-    ssl_expiring_soon = await ssl_repo.count_by_status(workspace.id, [SSLMonitorStatus.EXPIRING])
-
-    # Task chains stats
-    chains_total = await chain_repo.count_by_workspace(workspace.id)
-    chains_active = await chain_repo.count_by_workspace(workspace.id, is_active=True)
-
-    # Needs Attention stats
-    attention_cron_failing = await cron_repo.count_failing(workspace.id)
-    attention_heartbeats = heartbeats_unhealthy  # Already calculated (LATE + DEAD)
-    attention_ssl = await ssl_repo.count_by_status(
-        workspace.id, [SSLMonitorStatus.EXPIRING, SSLMonitorStatus.EXPIRED, SSLMonitorStatus.ERROR]
-    )
-    attention_chains_failing = await chain_repo.count_failing(workspace.id)
+    summary = await workspace_summary_service.get(db, workspace.id)
 
     return WorkspaceWithStats(
         id=workspace.id,
@@ -142,28 +91,11 @@ async def get_workspace(
         cron_tasks_count=workspace.cron_tasks_count,
         delayed_tasks_this_month=workspace.delayed_tasks_this_month,
         default_timezone=workspace.default_timezone,
+        schedule_jitter_seconds=workspace.schedule_jitter_seconds,
         created_at=workspace.created_at,
         updated_at=workspace.updated_at,
         plan_name=user_plan.display_name,
-        active_cron_tasks=active_cron,
-        pending_delayed_tasks=pending_delayed,
-        executions_today=exec_today,
-        success_rate_7d=stats_7d["success_rate"],
-        # Heartbeats
-        heartbeats_total=heartbeats_total,
-        heartbeats_healthy=heartbeats_healthy,
-        heartbeats_unhealthy=heartbeats_unhealthy,
-        # SSL monitors
-        ssl_monitors_total=ssl_monitors_total,
-        ssl_expiring_soon=ssl_expiring_soon,
-        # Task chains
-        chains_total=chains_total,
-        chains_active=chains_active,
-        # Needs Attention
-        attention_cron_failing=attention_cron_failing,
-        attention_heartbeats=attention_heartbeats,
-        attention_ssl=attention_ssl,
-        attention_chains_failing=attention_chains_failing,
+        **summary,
     )
 
 
@@ -177,6 +109,8 @@ async def update_workspace(
     workspace_repo = WorkspaceRepository(db)
 
     update_data = data.model_dump(exclude_unset=True)
+    if update_data.get("schedule_jitter_seconds", 0) is None:
+        update_data.pop("schedule_jitter_seconds")
     if update_data:
         workspace = await workspace_repo.update(workspace, **update_data)
         await db.commit()
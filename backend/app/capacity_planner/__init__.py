@@ -0,0 +1,9 @@
+# Schedule-driven capacity planner
+
+from app.capacity_planner.planner import CapacityReport, PlannedSchedule, plan_capacity
+
+__all__ = [
+    "CapacityReport",
+    "PlannedSchedule",
+    "plan_capacity",
+]
@@ -0,0 +1,125 @@
+"""Command line entry point for the capacity planner.
+
+Usage:
+    python -m app.capacity_planner --horizon-hours 24 --target-lag 5
+    python -m app.capacity_planner --database-url postgresql+asyncpg://.../snapshot --export plan.json
+    python -m app.capacity_planner --from-json plan.json --max-jobs 20
+
+Without --from-json, schedules are read from the database (settings.database_url
+unless --database-url points at a restored snapshot).
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from app.capacity_planner.planner import DEFAULT_DURATION_SECONDS, CapacityReport, plan_capacity
+from app.capacity_planner.sources import export_snapshot, load_snapshot
+
+# Matches WorkerSettings.max_jobs
+DEFAULT_MAX_JOBS = 10
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="cronbox-capacity-plan",
+        description="Size worker replicas from task schedules and recent execution durations",
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--from-json", type=Path, help="Plan from an exported snapshot instead of the database")
+    source.add_argument("--database-url", help="Database to read (default: DATABASE_URL)")
+    parser.add_argument("--export", type=Path, help="Write the database snapshot to this JSON file")
+    parser.add_argument("--history-days", type=int, default=7, help="Days of executions used for average durations")
+    parser.add_argument("--start", type=datetime.fromisoformat, help="Simulation start, naive UTC (default: now)")
+    parser.add_argument("--horizon-hours", type=float, default=24, help="Simulated period in hours")
+    parser.add_argument("--max-jobs", type=int, default=DEFAULT_MAX_JOBS, help="Concurrent jobs per worker replica")
+    parser.add_argument(
+        "--target-lag",
+        type=float,
+        default=5.0,
+        help="Maximum acceptable seconds between a run's due time and its start",
+    )
+    parser.add_argument(
+        "--default-duration",
+        type=float,
+        default=DEFAULT_DURATION_SECONDS,
+        help="Seconds assumed for schedules without execution history",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.export and args.from_json:
+        parser.error("--export reads from the database and cannot be combined with --from-json")
+    if args.max_jobs < 1:
+        parser.error("--max-jobs must be at least 1")
+    return args
+
+
+async def read_database(database_url: str | None, history_days: int) -> dict:
+    """Export a snapshot from the configured (or given) database."""
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from app.config import settings
+
+    engine = create_async_engine(database_url or settings.database_url)
+    try:
+        async with AsyncSession(engine) as db:
+            return await export_snapshot(db, history_days)
+    finally:
+        await engine.dispose()
+
+
+def format_report(report: CapacityReport) -> str:
+    hours = report.horizon.total_seconds() / 3600
+    lines = [
+        f"Capacity plan: {report.start.isoformat()} +{hours:g}h, {report.schedules} schedules",
+        f"  runs:                     {report.runs} ({report.cloud_runs} on cloud workers)",
+        f"  dispatch per minute:      peak {report.peak_dispatch_per_minute}, "
+        f"p95 {report.p95_dispatch_per_minute}, mean {report.mean_dispatch_per_minute:.2f}",
+        f"  peak concurrent runs:     {report.peak_concurrency}",
+        f"  slots for <= {report.target_lag_seconds:g}s lag:   {report.required_slots} "
+        f"(worst lag {report.max_lag_seconds:.2f}s)",
+        f"  replicas at max_jobs={report.max_jobs}: {report.required_replicas}",
+        f"  process monitor pings:    {report.monitor_pings} (peak {report.peak_monitor_pings_per_minute}/min)",
+    ]
+    if report.busiest_minutes:
+        lines.append("  busiest minutes (UTC):")
+        lines.extend(f"    {minute:%Y-%m-%d %H:%M}  {runs} runs" for minute, runs in report.busiest_minutes)
+    if report.invalid:
+        lines.append(f"  skipped {len(report.invalid)} invalid schedules:")
+        lines.extend(f"    {entry}" for entry in report.invalid)
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+
+    try:
+        if args.from_json:
+            snapshot = json.loads(args.from_json.read_text())
+        else:
+            snapshot = asyncio.run(read_database(args.database_url, args.history_days))
+            if args.export:
+                args.export.write_text(json.dumps(snapshot, indent=2))
+        items = load_snapshot(snapshot)
+    except Exception as e:
+        print(f"Failed to load schedules: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    start = args.start or datetime.utcnow().replace(second=0, microsecond=0)
+    report = plan_capacity(
+        items,
+        start=start,
+        horizon=timedelta(hours=args.horizon_hours),
+        max_jobs=args.max_jobs,
+        target_lag_seconds=args.target_lag,
+        default_duration_seconds=args.default_duration,
+    )
+    print(json.dumps(report.to_dict(), indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    main()
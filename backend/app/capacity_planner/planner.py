@@ -0,0 +1,266 @@
+"""Schedule-driven capacity planning.
+
+Expands every schedule over a horizon with the same schedule engine the
+scheduler uses, turns each fire time into a job lasting the schedule's recent
+average duration, and derives dispatch rates, peak concurrency and the number
+of worker slots needed to keep queueing lag under a target.
+"""
+
+import heapq
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.models.process_monitor import ScheduleType
+from app.services.process_monitor import process_monitor_service
+from app.services.schedule import get_schedule
+
+# Duration assumed for schedules without execution history
+DEFAULT_DURATION_SECONDS = 1.0
+
+# Largest schedule jitter window (see CronTaskBase.schedule_jitter_seconds)
+MAX_OFFSET = timedelta(seconds=300)
+
+# Fire times computed per schedule engine call while expanding
+EXPAND_BATCH = 256
+
+
+@dataclass
+class PlannedSchedule:
+    """A schedule to expand, with the load each of its runs puts on workers."""
+
+    kind: str  # cron, chain, monitor
+    id: str
+    name: str
+    timezone: str = "Europe/Moscow"
+    schedule: str | None = None  # Cron expression
+    offset_seconds: int = 0  # Schedule jitter offset
+    avg_duration_seconds: float | None = None
+    # Runs executed by cloud (arq) workers; external-worker runs only count
+    # towards dispatch rates
+    uses_cloud_workers: bool = True
+    # Process monitors only
+    schedule_type: str | None = None
+    schedule_interval: int | None = None
+    schedule_exact_time: str | None = None
+
+
+@dataclass
+class CapacityReport:
+    """Result of a capacity simulation."""
+
+    start: datetime
+    horizon: timedelta
+    schedules: int
+    runs: int
+    cloud_runs: int
+    monitor_pings: int
+    max_jobs: int
+    target_lag_seconds: float
+    peak_dispatch_per_minute: int = 0
+    p95_dispatch_per_minute: int = 0
+    mean_dispatch_per_minute: float = 0.0
+    peak_concurrency: int = 0
+    required_slots: int = 0
+    required_replicas: int = 0
+    max_lag_seconds: float = 0.0
+    peak_monitor_pings_per_minute: int = 0
+    busiest_minutes: list[tuple[datetime, int]] = field(default_factory=list)
+    invalid: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "start": self.start.isoformat(),
+            "horizon_seconds": int(self.horizon.total_seconds()),
+            "schedules": self.schedules,
+            "runs": self.runs,
+            "cloud_runs": self.cloud_runs,
+            "monitor_pings": self.monitor_pings,
+            "max_jobs": self.max_jobs,
+            "target_lag_seconds": self.target_lag_seconds,
+            "peak_dispatch_per_minute": self.peak_dispatch_per_minute,
+            "p95_dispatch_per_minute": self.p95_dispatch_per_minute,
+            "mean_dispatch_per_minute": round(self.mean_dispatch_per_minute, 2),
+            "peak_concurrency": self.peak_concurrency,
+            "required_slots": self.required_slots,
+            "required_replicas": self.required_replicas,
+            "max_lag_seconds": round(self.max_lag_seconds, 3),
+            "peak_monitor_pings_per_minute": self.peak_monitor_pings_per_minute,
+            "busiest_minutes": [{"minute": m.isoformat(), "runs": n} for m, n in self.busiest_minutes],
+            "invalid": self.invalid,
+        }
+
+
+def expand_cron(schedule: str, timezone: str, start: datetime, end: datetime) -> list[datetime]:
+    """Get all fire times of a cron schedule in [start, end) as naive UTC."""
+    compiled = get_schedule(schedule, timezone)
+    fires: list[datetime] = []
+    # Fire times are strictly after the start point; step back so `start` itself is included
+    moment = start - timedelta(microseconds=1)
+    while True:
+        for fire in compiled.next_fires(EXPAND_BATCH, moment):
+            if fire >= end:
+                return fires
+            fires.append(fire)
+        moment = fires[-1]
+
+
+def expand_fire_times(
+    item: PlannedSchedule,
+    start: datetime,
+    end: datetime,
+    cron_cache: dict[tuple[str, str], list[datetime]] | None = None,
+) -> list[datetime]:
+    """Get all fire times of a schedule in [start, end) as naive UTC.
+
+    Cron expansions are shared through `cron_cache` between schedules with
+    the same expression and timezone; jitter offsets are applied on top.
+
+    Raises:
+        ValueError: If the schedule cannot be expanded
+    """
+    if item.kind == "monitor":
+        monitor = SimpleNamespace(
+            schedule_type=ScheduleType(item.schedule_type),
+            schedule_cron=item.schedule,
+            schedule_interval=item.schedule_interval,
+            schedule_exact_time=item.schedule_exact_time,
+            timezone=item.timezone,
+        )
+        fires: list[datetime] = []
+        moment = start - timedelta(microseconds=1)
+        while True:
+            moment = process_monitor_service.calculate_next_expected_start(monitor, moment)
+            if moment is None or moment >= end:
+                return fires
+            fires.append(moment)
+
+    if not item.schedule:
+        return []
+
+    key = (item.schedule, item.timezone)
+    if cron_cache is None:
+        cron_cache = {}
+    if key not in cron_cache:
+        # Expanded from MAX_OFFSET early so any jitter offset can be applied
+        cron_cache[key] = expand_cron(item.schedule, item.timezone, start - MAX_OFFSET, end)
+
+    offset = timedelta(seconds=item.offset_seconds)
+    return [fire + offset for fire in cron_cache[key] if start <= fire + offset < end]
+
+
+def required_slots_for_lag(
+    jobs: list[tuple[datetime, float]], target_lag_seconds: float, upper: int
+) -> tuple[int, float]:
+    """Find the fewest worker slots keeping every job's queueing lag within target.
+
+    `jobs` are (start, duration_seconds) pairs sorted by start. Returns the
+    slot count and the worst lag it produces.
+    """
+    if not jobs:
+        return 0, 0.0
+
+    def max_lag(slots: int) -> float:
+        # Slot free times, as seconds relative to the first job
+        free = [0.0] * slots
+        origin = jobs[0][0]
+        worst = 0.0
+        for started, duration in jobs:
+            due = (started - origin).total_seconds()
+            available = heapq.heappop(free)
+            begin = max(due, available)
+            worst = max(worst, begin - due)
+            heapq.heappush(free, begin + duration)
+        return worst
+
+    low, high = 1, max(upper, 1)
+    while low < high:
+        middle = (low + high) // 2
+        if max_lag(middle) <= target_lag_seconds:
+            high = middle
+        else:
+            low = middle + 1
+    return low, max_lag(low)
+
+
+def peak_concurrency(jobs: list[tuple[datetime, float]]) -> int:
+    """Get the most jobs running at once if every job starts on time."""
+    events: list[tuple[datetime, int]] = []
+    for started, duration in jobs:
+        events.append((started, 1))
+        events.append((started + timedelta(seconds=duration), -1))
+    # Ends sort before starts at the same instant
+    events.sort()
+
+    running = peak = 0
+    for _, delta in events:
+        running += delta
+        peak = max(peak, running)
+    return peak
+
+
+def plan_capacity(
+    items: list[PlannedSchedule],
+    start: datetime,
+    horizon: timedelta,
+    max_jobs: int = 10,
+    target_lag_seconds: float = 5.0,
+    default_duration_seconds: float = DEFAULT_DURATION_SECONDS,
+    top: int = 5,
+) -> CapacityReport:
+    """Simulate running all schedules over the horizon."""
+    end = start + horizon
+    report = CapacityReport(
+        start=start,
+        horizon=horizon,
+        schedules=len(items),
+        runs=0,
+        cloud_runs=0,
+        monitor_pings=0,
+        max_jobs=max_jobs,
+        target_lag_seconds=target_lag_seconds,
+    )
+
+    per_minute: Counter[datetime] = Counter()
+    monitor_per_minute: Counter[datetime] = Counter()
+    jobs: list[tuple[datetime, float]] = []
+    cron_cache: dict[tuple[str, str], list[datetime]] = {}
+    for item in items:
+        try:
+            fires = expand_fire_times(item, start, end, cron_cache)
+        except Exception as e:
+            report.invalid.append(f"{item.kind} {item.id}: {e}")
+            continue
+
+        # Process monitors are pinged by the user's own jobs, not dispatched
+        if item.kind == "monitor":
+            report.monitor_pings += len(fires)
+            monitor_per_minute.update(fire.replace(second=0, microsecond=0) for fire in fires)
+            continue
+
+        report.runs += len(fires)
+        per_minute.update(fire.replace(second=0, microsecond=0) for fire in fires)
+        if item.uses_cloud_workers:
+            duration = item.avg_duration_seconds or default_duration_seconds
+            jobs.extend((fire, duration) for fire in fires)
+
+    jobs.sort()
+    report.cloud_runs = len(jobs)
+
+    minutes = max(math.ceil(horizon.total_seconds() / 60), 1)
+    # Minutes without any run count as zero
+    rates = sorted([0] * max(minutes - len(per_minute), 0) + list(per_minute.values()))
+    report.peak_dispatch_per_minute = rates[-1]
+    report.p95_dispatch_per_minute = rates[min(len(rates) - 1, math.ceil(len(rates) * 0.95) - 1)]
+    report.mean_dispatch_per_minute = report.runs / minutes
+    report.busiest_minutes = sorted(per_minute.items(), key=lambda entry: (-entry[1], entry[0]))[:top]
+    report.peak_monitor_pings_per_minute = max(monitor_per_minute.values(), default=0)
+
+    report.peak_concurrency = peak_concurrency(jobs)
+    report.required_slots, report.max_lag_seconds = required_slots_for_lag(
+        jobs, target_lag_seconds, upper=report.peak_concurrency
+    )
+    report.required_replicas = math.ceil(report.required_slots / max_jobs) if report.required_slots else 0
+    return report
@@ -0,0 +1,184 @@
+"""Schedule snapshots for the capacity planner.
+
+A snapshot is a JSON-serializable dict of every active schedule and its
+recent average duration. It is exported from a database (production or a
+restored snapshot) and can be planned against later, fully offline.
+"""
+
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.capacity_planner.planner import PlannedSchedule
+from app.models.chain_execution import ChainExecution
+from app.models.cron_task import CronTask
+from app.models.execution import Execution
+from app.models.process_monitor import ProcessMonitor
+from app.models.task_chain import TaskChain, TriggerType
+from app.models.workspace import Workspace
+from app.services.schedule import get_jitter_offset
+
+SNAPSHOT_VERSION = 1
+
+
+def _average_ms(value) -> int | None:
+    return int(value) if value is not None else None
+
+
+async def export_snapshot(db: AsyncSession, history_days: int = 7) -> dict:
+    """Export active schedules with average durations over the last `history_days`."""
+    since = datetime.utcnow() - timedelta(days=history_days)
+
+    cron_durations = (
+        select(Execution.task_id, func.avg(Execution.duration_ms).label("avg_ms"))
+        .where(
+            Execution.task_type == "cron",
+            Execution.started_at >= since,
+            Execution.duration_ms.is_not(None),
+        )
+        .group_by(Execution.task_id)
+        .subquery()
+    )
+    cron_rows = await db.execute(
+        select(
+            CronTask.id,
+            CronTask.name,
+            CronTask.schedule,
+            CronTask.timezone,
+            CronTask.worker_id,
+            func.coalesce(CronTask.schedule_jitter_seconds, Workspace.schedule_jitter_seconds).label("jitter"),
+            cron_durations.c.avg_ms,
+        )
+        .join(Workspace, CronTask.workspace_id == Workspace.id)
+        .outerjoin(cron_durations, cron_durations.c.task_id == CronTask.id)
+        .where(
+            CronTask.is_active.is_(True),
+            CronTask.is_paused.is_(False),
+            Workspace.is_blocked.is_(False),
+        )
+    )
+
+    chain_durations = (
+        select(ChainExecution.chain_id, func.avg(ChainExecution.duration_ms).label("avg_ms"))
+        .where(ChainExecution.started_at >= since, ChainExecution.duration_ms.is_not(None))
+        .group_by(ChainExecution.chain_id)
+        .subquery()
+    )
+    chain_rows = await db.execute(
+        select(
+            TaskChain.id,
+            TaskChain.name,
+            TaskChain.schedule,
+            TaskChain.timezone,
+            TaskChain.worker_id,
+            chain_durations.c.avg_ms,
+        )
+        .join(Workspace, TaskChain.workspace_id == Workspace.id)
+        .outerjoin(chain_durations, chain_durations.c.chain_id == TaskChain.id)
+        .where(
+            TaskChain.is_active.is_(True),
+            TaskChain.is_paused.is_(False),
+            TaskChain.trigger_type == TriggerType.CRON,
+            TaskChain.schedule.is_not(None),
+            Workspace.is_blocked.is_(False),
+        )
+    )
+
+    monitors = await db.execute(select(ProcessMonitor).where(ProcessMonitor.is_paused.is_(False)))
+
+    return {
+        "version": SNAPSHOT_VERSION,
+        "exported_at": datetime.utcnow().isoformat(),
+        "history_days": history_days,
+        "cron_tasks": [
+            {
+                "id": str(row.id),
+                "name": row.name,
+                "schedule": row.schedule,
+                "timezone": row.timezone,
+                "jitter_window_seconds": row.jitter or 0,
+                "external_worker": row.worker_id is not None,
+                "avg_duration_ms": _average_ms(row.avg_ms),
+            }
+            for row in cron_rows
+        ],
+        "chains": [
+            {
+                "id": str(row.id),
+                "name": row.name,
+                "schedule": row.schedule,
+                "timezone": row.timezone,
+                "external_worker": row.worker_id is not None,
+                "avg_duration_ms": _average_ms(row.avg_ms),
+            }
+            for row in chain_rows
+        ],
+        "process_monitors": [
+            {
+                "id": str(monitor.id),
+                "name": monitor.name,
+                "schedule_type": monitor.schedule_type.value,
+                "schedule_cron": monitor.schedule_cron,
+                "schedule_interval": monitor.schedule_interval,
+                "schedule_exact_time": monitor.schedule_exact_time,
+                "timezone": monitor.timezone,
+            }
+            for monitor in monitors.scalars()
+        ],
+    }
+
+
+def load_snapshot(data: dict) -> list[PlannedSchedule]:
+    """Turn an exported snapshot into schedules to plan.
+
+    Raises:
+        ValueError: If the snapshot version is not supported
+    """
+    if data.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {data.get('version')}")
+
+    def seconds(ms: int | None) -> float | None:
+        return ms / 1000 if ms is not None else None
+
+    items = [
+        PlannedSchedule(
+            kind="cron",
+            id=task["id"],
+            name=task["name"],
+            schedule=task["schedule"],
+            timezone=task["timezone"],
+            offset_seconds=get_jitter_offset(UUID(task["id"]), task.get("jitter_window_seconds")),
+            avg_duration_seconds=seconds(task.get("avg_duration_ms")),
+            uses_cloud_workers=not task.get("external_worker", False),
+        )
+        for task in data.get("cron_tasks", [])
+    ]
+    items.extend(
+        PlannedSchedule(
+            kind="chain",
+            id=chain["id"],
+            name=chain["name"],
+            schedule=chain["schedule"],
+            timezone=chain["timezone"],
+            avg_duration_seconds=seconds(chain.get("avg_duration_ms")),
+            uses_cloud_workers=not chain.get("external_worker", False),
+        )
+        for chain in data.get("chains", [])
+    )
+    items.extend(
+        PlannedSchedule(
+            kind="monitor",
+            id=monitor["id"],
+            name=monitor["name"],
+            schedule=monitor.get("schedule_cron"),
+            timezone=monitor["timezone"],
+            uses_cloud_workers=False,
+            schedule_type=monitor["schedule_type"],
+            schedule_interval=monitor.get("schedule_interval"),
+            schedule_exact_time=monitor.get("schedule_exact_time"),
+        )
+        for monitor in data.get("process_monitors", [])
+    )
+    return items
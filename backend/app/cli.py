@@ -4,14 +4,85 @@ import asyncio
 import sys
 
 
+def parse_queues(value: str) -> list[str]:
+    """Parse a comma-separated list of queue names."""
+    import argparse
+
+    from app.workers.queues import QUEUE_NAMES
+
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in QUEUE_NAMES]
+    if not names or unknown:
+        raise argparse.ArgumentTypeError(f"expected queues from: {', '.join(QUEUE_NAMES)}")
+    return list(dict.fromkeys(names))
+
+
+def parse_processes(value: str) -> int:
+    """Parse a positive number of processes."""
+    import argparse
+
+    if not value.isdigit() or int(value) < 1:
+        raise argparse.ArgumentTypeError("expected a positive number")
+    return int(value)
+
+
 def run_worker():
-    """Run the arq worker."""
-    from arq import run_worker as arq_run_worker
+    """Run the arq workers."""
+    import argparse
+
+    from app.config import settings
+    from app.core.supervisor import Supervisor, pool_environment
+    from app.workers.queues import QUEUE_NAMES
+    from app.workers.runner import run_queue_workers
+
+    parser = argparse.ArgumentParser(prog="cronbox-worker", description="Run CronBox job workers")
+    parser.add_argument(
+        "--queues",
+        type=parse_queues,
+        default=QUEUE_NAMES,
+        help=f"Comma-separated queues to consume (default: {','.join(QUEUE_NAMES)})",
+    )
+    parser.add_argument(
+        "--processes",
+        type=parse_processes,
+        default=1,
+        help="Worker processes to run under a supervisor (default: 1)",
+    )
+    args = parser.parse_args(sys.argv[2:] if sys.argv[1:2] == ["worker"] else sys.argv[1:])
+
+    print(f"Starting CronBox worker for queues: {', '.join(args.queues)}...")
+    if args.processes == 1:
+        run_queue_workers(args.queues)
+        return
 
-    from app.workers.settings import WorkerSettings
+    pool_env = pool_environment(args.processes)
 
-    print("Starting CronBox worker...")
-    arq_run_worker(WorkerSettings)
+    def child_env(index: int) -> dict[str, str]:
+        # Each process serves its metrics on its own port
+        if not settings.worker_metrics_port:
+            return pool_env
+        return {**pool_env, "WORKER_METRICS_PORT": str(settings.worker_metrics_port + index)}
+
+    Supervisor(
+        "app.workers.runner:run_queue_workers",
+        (args.queues,),
+        processes=args.processes,
+        child_env=child_env,
+    ).run()
+
+
+def run_external_worker():
+    """Run the external worker runtime (self-hosted task execution)."""
+    from app.external_worker.__main__ import main as external_worker_main
+
+    external_worker_main(sys.argv[2:] if sys.argv[1:2] == ["external-worker"] else None)
+
+
+def run_capacity_planner():
+    """Estimate worker capacity from task schedules."""
+    from app.capacity_planner.__main__ import main as capacity_planner_main
+
+    capacity_planner_main(sys.argv[2:] if sys.argv[1:2] == ["capacity-plan"] else None)
 
 
 def run_scheduler():
@@ -24,13 +95,38 @@ def run_scheduler():
 
 def run_server():
     """Run the API server."""
+    import argparse
+    import os
+
     import uvicorn
 
+    from app.core.supervisor import pool_environment
+
+    parser = argparse.ArgumentParser(prog="cronbox-server", description="Run the CronBox API server")
+    parser.add_argument(
+        "--processes",
+        type=parse_processes,
+        default=1,
+        help="Server processes; more than one disables reload (default: 1)",
+    )
+    args = parser.parse_args(sys.argv[2:] if sys.argv[1:2] == ["server"] else sys.argv[1:])
+
+    if args.processes == 1:
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+        )
+        return
+
+    # uvicorn spawns the processes and restarts them if they die; they inherit the pool sizes
+    os.environ.update(pool_environment(args.processes))
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        workers=args.processes,
     )
 
 
@@ -53,15 +149,19 @@ def run_max_bot():
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python -m app.cli <command>")
-        print("Commands: worker, scheduler, server, bot, max-bot")
+        print("Commands: worker, external-worker, scheduler, server, bot, max-bot, capacity-plan")
         sys.exit(1)
 
     command = sys.argv[1]
 
     if command == "worker":
         run_worker()
+    elif command == "external-worker":
+        run_external_worker()
     elif command == "scheduler":
         run_scheduler()
+    elif command == "capacity-plan":
+        run_capacity_planner()
     elif command == "server":
         run_server()
     elif command == "bot":
@@ -1,15 +1,67 @@
 """Rate limiting middleware using Redis."""
 
-from datetime import datetime
-from typing import Callable
+import math
+import time
+from typing import Callable, NamedTuple
 
+import structlog
 from fastapi import HTTPException, Request, status
 from fastapi.responses import JSONResponse
+from redis.commands.core import AsyncScript
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.config import settings
 from app.core.redis import redis_client
 
+logger = structlog.get_logger()
+
+# GCRA (generic cell rate algorithm) check in a single round trip.
+# The key stores the theoretical arrival time (TAT) in milliseconds; one
+# token is emitted every window/limit ms and up to `limit` can be spent
+# in a burst. Up to ARGV[3] tokens are granted at once so callers can
+# keep a local budget.
+#
+# Returns {granted, remaining, retry_after_ms, reset_after_ms}.
+GCRA_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local interval = window / limit
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+
+-- Half a millisecond of slack absorbs rounding of the stored TAT
+local available = math.floor((now + window - tat + 0.5) / interval)
+if available < 1 then
+    return {0, 0, math.ceil(tat + interval - window - now), math.ceil(tat - now)}
+end
+
+local granted = math.min(requested, available)
+tat = tat + granted * interval
+redis.call('SET', KEYS[1], string.format('%.3f', tat), 'PX', math.ceil(tat - now))
+return {granted, available - granted, 0, math.ceil(tat - now)}
+"""
+
+# Local token budgets are only trusted for a short time so an idle
+# process does not hold on to another process's share of the limit.
+LOCAL_BUDGET_TTL = 1.0  # seconds
+LOCAL_BUDGET_MAX_ENTRIES = 10_000
+
+
+class RateLimitResult(NamedTuple):
+    """Outcome of a rate limit check."""
+
+    allowed: bool
+    remaining: int
+    reset_after: int  # seconds until the limit is fully replenished
+    retry_after: int  # seconds until the next request is allowed (0 if allowed)
+
 
 class RateLimitExceeded(HTTPException):
     """Exception raised when rate limit is exceeded."""
@@ -27,53 +79,96 @@ class RateLimitExceeded(HTTPException):
 
 
 class RateLimiter:
-    """Rate limiter using Redis sliding window counter."""
+    """Rate limiter using an atomic Redis GCRA check.
+
+    With ``local_budget`` > 1 each Redis call reserves up to that many tokens
+    and the process spends them locally, skipping Redis for hot identifiers.
+    Reserved tokens count against the shared limit even if left unused.
+    """
 
     def __init__(
         self,
         requests_per_minute: int = 100,
         key_prefix: str = "ratelimit",
+        local_budget: int = 0,
     ):
         self.requests_per_minute = requests_per_minute
         self.key_prefix = key_prefix
         self.window_seconds = 60
+        self.local_budget = local_budget
+        self._script: AsyncScript | None = None
+        # identifier -> (tokens left, remaining in Redis at grant, reset_after, expires at)
+        self._budgets: dict[str, tuple[int, int, int, float]] = {}
 
     def _get_key(self, identifier: str) -> str:
         """Generate Redis key for rate limiting."""
-        minute = datetime.utcnow().strftime("%Y%m%d%H%M")
-        return f"{self.key_prefix}:{identifier}:{minute}"
-
-    async def is_allowed(self, identifier: str) -> tuple[bool, int, int]:
-        """
-        Check if request is allowed.
-
-        Returns:
-            tuple of (is_allowed, current_count, remaining)
-        """
-        key = self._get_key(identifier)
-
+        return f"{self.key_prefix}:{identifier}"
+
+    def _get_script(self) -> AsyncScript:
+        """Get the GCRA script registered on the current Redis client."""
+        client = redis_client.client
+        if self._script is None or self._script.registered_client is not client:
+            self._script = client.register_script(GCRA_SCRIPT)
+        return self._script
+
+    def _take_local_token(self, identifier: str) -> RateLimitResult | None:
+        """Spend a token from the local budget if one is available."""
+        budget = self._budgets.get(identifier)
+        if budget is None:
+            return None
+
+        tokens, remaining, reset_after, expires_at = budget
+        if time.monotonic() >= expires_at:
+            del self._budgets[identifier]
+            return None
+
+        tokens -= 1
+        if tokens > 0:
+            self._budgets[identifier] = (tokens, remaining, reset_after, expires_at)
+        else:
+            del self._budgets[identifier]
+        return RateLimitResult(True, remaining + tokens, reset_after, 0)
+
+    def _store_local_budget(self, identifier: str, tokens: int, remaining: int, reset_after: int) -> None:
+        """Keep tokens reserved from Redis for subsequent local checks."""
+        if len(self._budgets) >= LOCAL_BUDGET_MAX_ENTRIES:
+            now = time.monotonic()
+            self._budgets = {key: value for key, value in self._budgets.items() if value[3] > now}
+            if len(self._budgets) >= LOCAL_BUDGET_MAX_ENTRIES:
+                self._budgets.clear()
+        self._budgets[identifier] = (tokens, remaining, reset_after, time.monotonic() + LOCAL_BUDGET_TTL)
+
+    async def is_allowed(self, identifier: str) -> RateLimitResult:
+        """Check if request is allowed, consuming one token if so."""
+        if self.local_budget > 1:
+            result = self._take_local_token(identifier)
+            if result is not None:
+                return result
+
+        requested = max(1, self.local_budget)
         try:
-            # Increment counter
-            count = await redis_client.incr(key)
-
-            # Set expiration on first request
-            if count == 1:
-                await redis_client.expire(key, self.window_seconds)
-
-            remaining = max(0, self.requests_per_minute - count)
-            is_allowed = count <= self.requests_per_minute
+            granted, remaining, retry_after_ms, reset_after_ms = await self._get_script()(
+                keys=[self._get_key(identifier)],
+                args=[self.requests_per_minute, self.window_seconds * 1000, requested],
+            )
+        except Exception as e:
+            # If Redis fails, allow the request (fail open)
+            logger.warning("Rate limit check failed", error=str(e))
+            return RateLimitResult(True, self.requests_per_minute, 0, 0)
 
-            return is_allowed, count, remaining
+        reset_after = math.ceil(reset_after_ms / 1000)
+        if not granted:
+            return RateLimitResult(False, 0, reset_after, max(1, math.ceil(retry_after_ms / 1000)))
 
-        except Exception:
-            # If Redis fails, allow the request (fail open)
-            return True, 0, self.requests_per_minute
+        if granted > 1:
+            self._store_local_budget(identifier, granted - 1, remaining, reset_after)
+        return RateLimitResult(True, remaining + granted - 1, reset_after, 0)
 
     async def check(self, identifier: str) -> None:
         """Check rate limit and raise exception if exceeded."""
-        allowed, _, _ = await self.is_allowed(identifier)
-        if not allowed:
-            raise RateLimitExceeded(retry_after=self.window_seconds)
+        result = await self.is_allowed(identifier)
+        if not result.allowed:
+            raise RateLimitExceeded(retry_after=result.retry_after)
 
 
 # Default rate limiters for different tiers
@@ -115,7 +210,10 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
     def __init__(self, app, default_requests_per_minute: int = 100):
         super().__init__(app)
-        self.default_limiter = RateLimiter(requests_per_minute=default_requests_per_minute)
+        self.default_limiter = RateLimiter(
+            requests_per_minute=default_requests_per_minute,
+            local_budget=settings.rate_limit_local_budget,
+        )
         # Cache allowed origins for CORS
         self.allowed_origins = set(settings.cors_origins)
 
@@ -149,14 +247,15 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         self,
         request: Request,
         limiter: RateLimiter,
+        result: RateLimitResult,
         message: str = "Too many requests. Please try again later.",
     ) -> JSONResponse:
         """Create 429 response with CORS headers."""
         headers = {
-            "Retry-After": "60",
+            "Retry-After": str(result.retry_after),
             "X-RateLimit-Limit": str(limiter.requests_per_minute),
             "X-RateLimit-Remaining": "0",
-            "X-RateLimit-Reset": str(60),
+            "X-RateLimit-Reset": str(result.reset_after),
         }
 
         # Add CORS headers if origin is allowed
@@ -171,7 +270,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             content={
                 "error": "rate_limit_exceeded",
                 "message": message,
-                "retry_after": 60,
+                "retry_after": result.retry_after,
             },
             headers=headers,
         )
@@ -191,11 +290,12 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             # For auth endpoints, always use IP-based limiting
             ip_identifier = self._get_ip_identifier(request)
             try:
-                is_allowed, count, remaining = await auth_limiter.is_allowed(ip_identifier)
-                if not is_allowed:
+                result = await auth_limiter.is_allowed(ip_identifier)
+                if not result.allowed:
                     return self._create_rate_limit_response(
                         request,
                         auth_limiter,
+                        result,
                         "Too many attempts. Please try again later.",
                     )
             except Exception:
@@ -205,29 +305,29 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         if path in self.PUBLIC_ENDPOINTS:
             ip_identifier = self._get_ip_identifier(request)
             try:
-                is_allowed, count, remaining = await self.public_limiter.is_allowed(ip_identifier)
-                if not is_allowed:
-                    return self._create_rate_limit_response(request, self.public_limiter)
+                result = await self.public_limiter.is_allowed(ip_identifier)
+                if not result.allowed:
+                    return self._create_rate_limit_response(request, self.public_limiter, result)
             except Exception:
                 pass  # Continue with default rate limiting
 
         # Check default rate limit
         try:
-            is_allowed, count, remaining = await self.default_limiter.is_allowed(identifier)
+            result = await self.default_limiter.is_allowed(identifier)
         except Exception:
             # If rate limiting fails, allow the request
             return await call_next(request)
 
-        if not is_allowed:
-            return self._create_rate_limit_response(request, self.default_limiter)
+        if not result.allowed:
+            return self._create_rate_limit_response(request, self.default_limiter, result)
 
         # Process request and add rate limit headers
         response = await call_next(request)
 
         # Add rate limit headers to response
         response.headers["X-RateLimit-Limit"] = str(self.default_limiter.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(60)
+        response.headers["X-RateLimit-Remaining"] = str(result.remaining)
+        response.headers["X-RateLimit-Reset"] = str(result.reset_after)
 
         return response
 
@@ -280,7 +380,7 @@ async def rate_limit_check(
             identifier = request.client.host if request.client else "unknown"
 
     limiter = get_limiter_for_plan(plan)
-    is_allowed, _, _ = await limiter.is_allowed(identifier)
+    result = await limiter.is_allowed(identifier)
 
-    if not is_allowed:
-        raise RateLimitExceeded(retry_after=60)
+    if not result.allowed:
+        raise RateLimitExceeded(retry_after=result.retry_after)
@@ -39,13 +39,13 @@ class RedisClient:
         """Set a value in Redis with optional expiration."""
         await self.client.set(key, value, ex=expire)
 
-    async def delete(self, key: str) -> int:
-        """Delete a key from Redis.
+    async def delete(self, *keys: str) -> int:
+        """Delete one or more keys from Redis.
 
         Returns:
-            Number of keys deleted (0 or 1).
+            Number of keys deleted.
         """
-        return await self.client.delete(key)
+        return await self.client.delete(*keys)
 
     async def exists(self, key: str) -> bool:
         """Check if a key exists in Redis."""
@@ -0,0 +1,166 @@
+"""Run several processes of one entry point under a supervisor.
+
+Children are spawned, not forked: each imports the app from scratch with
+its own settings, DB engine and Redis connections, and shares nothing
+with its siblings. The supervisor restarts children that exit, backing
+off while they keep crashing, and on SIGINT or SIGTERM forwards the
+signal and waits for the children to finish before killing stragglers.
+
+The app settings are read at import time, so this module must not import
+them at the top: a child imports it before applying its environment.
+"""
+
+import importlib
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections.abc import Callable
+
+import structlog
+
+logger = structlog.get_logger()
+
+MIN_UPTIME_SECONDS = 10  # Children exiting sooner are crash-looping
+MAX_RESTART_DELAY_SECONDS = 30
+
+
+def _run_child(target: str, args: tuple, env: dict[str, str]) -> None:
+    """Entry point of a child process."""
+    os.environ.update(env)
+    module, _, function = target.partition(":")
+    getattr(importlib.import_module(module), function)(*args)
+
+
+def pool_environment(processes: int) -> dict[str, str]:
+    """Get the DB pool settings that keep all processes within the connection budget.
+
+    Splits settings.database_max_connections between the processes, two
+    thirds as persistent connections and the rest as overflow. Without a
+    budget every process keeps the configured pool.
+    """
+    from app.config import settings
+
+    if not settings.database_max_connections:
+        logger.warning(
+            "No database connection budget, each process keeps its own pool",
+            processes=processes,
+            max_connections=processes * (settings.database_pool_size + settings.database_max_overflow),
+        )
+        return {}
+
+    per_process = max(1, settings.database_max_connections // processes)
+    pool_size = max(1, per_process * 2 // 3)
+    return {
+        "DATABASE_POOL_SIZE": str(pool_size),
+        "DATABASE_MAX_OVERFLOW": str(per_process - pool_size),
+    }
+
+
+class Supervisor:
+    """Keeps `processes` children of an entry point running until stopped.
+
+    Args:
+        target: Entry point as "module:function", imported in the child
+        args: Arguments of the entry point
+        processes: Number of children
+        child_env: Environment overrides of the child with the given index
+        shutdown_timeout: Seconds children get to exit after a signal
+    """
+
+    def __init__(
+        self,
+        target: str,
+        args: tuple = (),
+        processes: int = 1,
+        child_env: Callable[[int], dict[str, str]] | None = None,
+        shutdown_timeout: float = 30,
+    ):
+        self.target = target
+        self.args = args
+        self.processes = processes
+        self.child_env = child_env or (lambda index: {})
+        self.shutdown_timeout = shutdown_timeout
+        self.restarts = 0
+        self._context = multiprocessing.get_context("spawn")
+        self._children: list[multiprocessing.process.BaseProcess | None] = [None] * processes
+        self._started_at = [0.0] * processes
+        self._restart_delay = [1.0] * processes
+        self._restart_at = [0.0] * processes
+        self._stop = threading.Event()
+        self._signal = signal.SIGTERM
+
+    def _start(self, index: int) -> None:
+        child = self._context.Process(
+            target=_run_child,
+            args=(self.target, self.args, self.child_env(index)),
+            name=f"{self.target}[{index}]",
+        )
+        child.start()
+        self._children[index] = child
+        self._started_at[index] = time.monotonic()
+        logger.info("Started child process", index=index, pid=child.pid)
+
+    def _check(self, index: int) -> None:
+        child = self._children[index]
+        now = time.monotonic()
+        if child is not None:
+            if child.is_alive():
+                return
+            uptime = now - self._started_at[index]
+            # Back off while the child keeps crashing right after start
+            if uptime < MIN_UPTIME_SECONDS:
+                self._restart_delay[index] = min(self._restart_delay[index] * 2, MAX_RESTART_DELAY_SECONDS)
+            else:
+                self._restart_delay[index] = 1.0
+            self._restart_at[index] = now + self._restart_delay[index]
+            self._children[index] = None
+            logger.error(
+                "Child process exited, restarting",
+                index=index,
+                pid=child.pid,
+                exitcode=child.exitcode,
+                delay=self._restart_delay[index],
+            )
+            return
+
+        if now >= self._restart_at[index]:
+            self.restarts += 1
+            self._start(index)
+
+    def _handle_signal(self, signum: int, frame) -> None:
+        self._signal = signal.Signals(signum)
+        self._stop.set()
+
+    def stop(self) -> None:
+        """Stop the children and return from run()."""
+        self._stop.set()
+
+    def _shutdown(self) -> None:
+        children = [child for child in self._children if child is not None and child.is_alive()]
+        logger.info("Stopping child processes", signal=self._signal.name, children=len(children))
+        for child in children:
+            os.kill(child.pid, self._signal)
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        for child in children:
+            child.join(max(deadline - time.monotonic(), 0))
+            if child.is_alive():
+                logger.warning("Child process did not stop in time, killing it", pid=child.pid)
+                child.kill()
+                child.join()
+
+    def run(self) -> None:
+        """Start the children and supervise them until stopped or signalled."""
+        previous = {signum: signal.signal(signum, self._handle_signal) for signum in (signal.SIGINT, signal.SIGTERM)}
+        try:
+            for index in range(self.processes):
+                self._start(index)
+            while not self._stop.wait(0.5):
+                for index in range(self.processes):
+                    self._check(index)
+        finally:
+            self._shutdown()
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
@@ -109,6 +109,7 @@ class ChainExecutionRepository(BaseRepository[ChainExecution]):
         started_at = execution.started_at.replace(tzinfo=None) if execution.started_at.tzinfo else execution.started_at
         execution.duration_ms = int((now - started_at).total_seconds() * 1000)
         execution.error_message = error_message
+        execution.checkpoint = None
         await self.db.flush()
         await self.db.refresh(execution)
         return execution
@@ -135,6 +136,12 @@ class ChainExecutionRepository(BaseRepository[ChainExecution]):
         await self.db.refresh(execution)
         return execution
 
+    async def save_checkpoint(self, execution: ChainExecution, checkpoint: dict) -> ChainExecution:
+        """Save the state of an execution waiting to resume."""
+        execution.checkpoint = checkpoint
+        await self.db.flush()
+        return execution
+
     async def delete_old_executions(self, workspace_id: UUID, keep_days: int) -> int:
         """Delete executions older than keep_days."""
         cutoff = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
@@ -1,8 +1,9 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import ColumnElement, and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
 
 from app.db.repositories.base import BaseRepository
 from app.models.cron_task import CronTask, TaskStatus
@@ -58,16 +59,30 @@ class CronTaskRepository(BaseRepository[CronTask]):
         result = await self.db.execute(stmt)
         return result.scalar_one()
 
-    async def get_due_tasks(self, now: datetime, limit: int = 100) -> list[CronTask]:
+    async def get_due_tasks(
+        self,
+        now: datetime,
+        limit: int = 100,
+        partition_filter: ColumnElement[bool] | None = None,
+        backlog_before: datetime | None = None,
+        include_backlog: bool = True,
+    ) -> list[CronTask]:
         """Get tasks due for execution.
 
         Uses SELECT FOR UPDATE SKIP LOCKED to prevent race conditions
         when multiple scheduler instances are running.
-        Excludes tasks from blocked workspaces.
+        Excludes tasks from blocked workspaces. The workspace is loaded with
+        the task (for its schedule jitter default).
+        A partition_filter restricts the claim to a scheduler replica's partitions.
+        Tasks due before backlog_before are claimed after the on-time ones, or
+        not at all without include_backlog. The two are claimed by separate
+        queries, each ordered by the next_run_at index, so a large backlog is
+        never sorted to find the on-time rows.
         """
         stmt = (
             select(CronTask)
             .join(Workspace, CronTask.workspace_id == Workspace.id)
+            .options(contains_eager(CronTask.workspace))
             .where(
                 and_(
                     CronTask.is_active.is_(True),
@@ -77,16 +92,27 @@ class CronTaskRepository(BaseRepository[CronTask]):
                 )
             )
             .order_by(CronTask.next_run_at)
-            .limit(limit)
             .with_for_update(skip_locked=True)
         )
-        result = await self.db.execute(stmt)
-        return list(result.scalars().all())
+        if partition_filter is not None:
+            stmt = stmt.where(partition_filter)
+        if backlog_before is None:
+            result = await self.db.execute(stmt.limit(limit))
+            return list(result.scalars().all())
+
+        result = await self.db.execute(stmt.where(CronTask.next_run_at >= backlog_before).limit(limit))
+        tasks = list(result.scalars().all())
+        if include_backlog and len(tasks) < limit:
+            result = await self.db.execute(stmt.where(CronTask.next_run_at < backlog_before).limit(limit - len(tasks)))
+            tasks.extend(result.scalars().all())
+        return tasks
 
     async def get_tasks_needing_next_run_update(self, limit: int = 100) -> list[CronTask]:
-        """Get active tasks that need next_run_at calculated."""
+        """Get active tasks that need next_run_at calculated, with their workspace."""
         stmt = (
             select(CronTask)
+            .join(Workspace, CronTask.workspace_id == Workspace.id)
+            .options(contains_eager(CronTask.workspace))
             .where(
                 and_(
                     CronTask.is_active.is_(True),
@@ -127,6 +153,14 @@ class CronTaskRepository(BaseRepository[CronTask]):
         await self.db.refresh(task)
         return task
 
+    async def get_schedule_jitter_seconds(self, task: CronTask) -> int:
+        """Get a task's jitter window: its own override or the workspace default."""
+        if task.schedule_jitter_seconds is not None:
+            return task.schedule_jitter_seconds
+        stmt = select(Workspace.schedule_jitter_seconds).where(Workspace.id == task.workspace_id)
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none() or 0
+
     async def resume(self, task: CronTask, next_run_at: datetime) -> CronTask:
         """Resume a task."""
         task.is_paused = False
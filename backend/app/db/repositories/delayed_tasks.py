@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import ColumnElement, and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.repositories.base import BaseRepository
@@ -60,12 +60,24 @@ class DelayedTaskRepository(BaseRepository[DelayedTask]):
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def get_due_tasks(self, now: datetime, limit: int = 100) -> list[DelayedTask]:
+    async def get_due_tasks(
+        self,
+        now: datetime,
+        limit: int = 100,
+        partition_filter: ColumnElement[bool] | None = None,
+        backlog_before: datetime | None = None,
+        include_backlog: bool = True,
+    ) -> list[DelayedTask]:
         """Get tasks due for execution.
 
         Uses SELECT FOR UPDATE SKIP LOCKED to prevent race conditions
         when multiple scheduler instances are running.
         Excludes tasks from blocked workspaces.
+        A partition_filter restricts the claim to a scheduler replica's partitions.
+        Tasks due before backlog_before are claimed after the on-time ones, or
+        not at all without include_backlog. The two are claimed by separate
+        queries, each ordered by the execute_at index, so a large backlog is
+        never sorted to find the on-time rows.
         """
         stmt = (
             select(DelayedTask)
@@ -78,11 +90,22 @@ class DelayedTaskRepository(BaseRepository[DelayedTask]):
                 )
             )
             .order_by(DelayedTask.execute_at)
-            .limit(limit)
             .with_for_update(skip_locked=True)
         )
-        result = await self.db.execute(stmt)
-        return list(result.scalars().all())
+        if partition_filter is not None:
+            stmt = stmt.where(partition_filter)
+        if backlog_before is None:
+            result = await self.db.execute(stmt.limit(limit))
+            return list(result.scalars().all())
+
+        result = await self.db.execute(stmt.where(DelayedTask.execute_at >= backlog_before).limit(limit))
+        tasks = list(result.scalars().all())
+        if include_backlog and len(tasks) < limit:
+            result = await self.db.execute(
+                stmt.where(DelayedTask.execute_at < backlog_before).limit(limit - len(tasks))
+            )
+            tasks.extend(result.scalars().all())
+        return tasks
 
     async def get_pending_count_this_month(
         self,
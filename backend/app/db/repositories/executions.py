@@ -172,8 +172,12 @@ class ExecutionRepository(BaseRepository[Execution]):
         response_size_bytes: int | None = None,
         error_message: str | None = None,
         error_type: str | None = None,
+        http_timings: dict | None = None,
     ) -> Execution:
-        """Complete an HTTP execution record."""
+        """Complete an HTTP execution record.
+
+        http_timings are the phase timings returned by execute_http_task.
+        """
         now = datetime.utcnow()
         execution.status = status
         execution.finished_at = now
@@ -184,6 +188,13 @@ class ExecutionRepository(BaseRepository[Execution]):
         execution.response_size_bytes = response_size_bytes
         execution.error_message = error_message
         execution.error_type = error_type
+        if http_timings:
+            execution.http_dns_time = http_timings.get("dns_ms")
+            execution.http_connect_time = http_timings.get("connect_ms")
+            execution.http_tls_time = http_timings.get("tls_ms")
+            execution.http_first_byte_time = http_timings.get("ttfb_ms")
+            execution.http_transfer_time = http_timings.get("transfer_ms")
+            execution.http_connection_reused = http_timings.get("connection_reused")
 
         await self.db.flush()
         await self.db.refresh(execution)
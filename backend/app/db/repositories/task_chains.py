@@ -3,7 +3,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy import ColumnElement, and_, delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -67,11 +67,14 @@ class TaskChainRepository(BaseRepository[TaskChain]):
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def get_due_chains(self, now: datetime, limit: int = 100) -> list[TaskChain]:
+    async def get_due_chains(
+        self, now: datetime, limit: int = 100, partition_filter: ColumnElement[bool] | None = None
+    ) -> list[TaskChain]:
         """Get chains due for execution.
 
         Uses SELECT FOR UPDATE SKIP LOCKED to prevent race conditions.
         Excludes chains from blocked workspaces.
+        A partition_filter restricts the claim to a scheduler replica's partitions.
         """
         stmt = (
             select(TaskChain)
@@ -90,6 +93,8 @@ class TaskChainRepository(BaseRepository[TaskChain]):
             .limit(limit)
             .with_for_update(skip_locked=True)
         )
+        if partition_filter is not None:
+            stmt = stmt.where(partition_filter)
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
@@ -151,6 +156,14 @@ class TaskChainRepository(BaseRepository[TaskChain]):
         await self.db.refresh(chain)
         return chain
 
+    async def touch(self, chain: TaskChain) -> None:
+        """Bump updated_at after a change to the chain's steps.
+
+        The chain's updated_at versions its compiled execution plan.
+        """
+        chain.updated_at = func.now()
+        await self.db.flush()
+
     async def deactivate(self, chain: TaskChain) -> TaskChain:
         """Deactivate a chain."""
         chain.is_active = False
@@ -178,6 +191,7 @@ class TaskChainRepository(BaseRepository[TaskChain]):
             timezone=chain.timezone,
             stop_on_failure=chain.stop_on_failure,
             timeout_seconds=chain.timeout_seconds,
+            max_parallel_steps=chain.max_parallel_steps,
             notify_on_failure=chain.notify_on_failure,
             notify_on_success=chain.notify_on_success,
             notify_on_partial=chain.notify_on_partial,
@@ -203,6 +217,7 @@ class TaskChainRepository(BaseRepository[TaskChain]):
                 condition=step.condition.copy() if step.condition else None,
                 extract_variables=step.extract_variables.copy() if step.extract_variables else {},
                 continue_on_failure=step.continue_on_failure,
+                depends_on=list(step.depends_on) if step.depends_on else None,
             )
             self.db.add(new_step)
 
@@ -264,24 +279,48 @@ class ChainStepRepository(BaseRepository[ChainStep]):
     async def reorder_steps(self, chain_id: UUID, step_orders: list[dict]) -> None:
         """Reorder steps in a chain.
 
+        depends_on holds step orders, so it is rewritten to the new orders
+        of the steps it referenced.
+
         Args:
             chain_id: The chain ID
             step_orders: List of {"step_id": UUID, "step_order": int}
+
+        Raises:
+            ValueError: If a step would come before a step it depends on
         """
-        for item in step_orders:
-            stmt = (
-                update(ChainStep)
-                .where(
-                    and_(
-                        ChainStep.chain_id == chain_id,
-                        ChainStep.id == item["step_id"],
-                    )
-                )
-                .values(step_order=item["step_order"])
-            )
-            await self.db.execute(stmt)
+        steps = await self.get_by_chain(chain_id)
+        new_orders = {step.id: step.step_order for step in steps}
+        new_orders.update((item["step_id"], item["step_order"]) for item in step_orders)
+        order_map = {step.step_order: new_orders[step.id] for step in steps}
+
+        depends_on = {}
+        for step in steps:
+            if not step.depends_on:
+                continue
+            remapped = sorted({order_map[order] for order in step.depends_on if order in order_map})
+            if remapped and max(remapped) >= new_orders[step.id]:
+                raise ValueError(f"Step '{step.name}' would come before a step it depends on")
+            depends_on[step.id] = remapped or None
+
+        for step in steps:
+            step.step_order = new_orders[step.id]
+            if step.id in depends_on:
+                step.depends_on = depends_on[step.id]
         await self.db.flush()
 
+    async def delete_step(self, step: ChainStep) -> None:
+        """Delete a step.
+
+        Steps that depended on it inherit its dependencies, so they still
+        wait for everything it waited for.
+        """
+        for other in await self.get_by_chain(step.chain_id):
+            if other.id != step.id and other.depends_on and step.step_order in other.depends_on:
+                inherited = set(other.depends_on) - {step.step_order} | set(step.depends_on or [])
+                other.depends_on = sorted(inherited) or None
+        await self.delete(step)
+
     async def delete_by_chain(self, chain_id: UUID) -> int:
         """Delete all steps for a chain."""
         stmt = delete(ChainStep).where(ChainStep.chain_id == chain_id)
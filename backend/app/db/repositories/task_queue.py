@@ -22,6 +22,26 @@ class TaskQueueRepository(BaseRepository[TaskQueue]):
         result = await self.db.execute(stmt)
         return result.scalar() or 0
 
+    async def count_by_workspace(self, workspace_id: UUID) -> int:
+        """Count queued items of a workspace."""
+        stmt = select(func.count(TaskQueue.id)).where(TaskQueue.workspace_id == workspace_id)
+        result = await self.db.execute(stmt)
+        return result.scalar() or 0
+
+    async def get_by_task(self, workspace_id: UUID, task_type: str, task_id: UUID) -> list[TaskQueue]:
+        """Get queued items of a workspace's task, ordered by priority and time."""
+        stmt = (
+            select(TaskQueue)
+            .where(
+                TaskQueue.workspace_id == workspace_id,
+                TaskQueue.task_type == task_type,
+                TaskQueue.task_id == task_id,
+            )
+            .order_by(TaskQueue.priority.desc(), TaskQueue.queued_at.asc())
+        )
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
     async def get_by_workspace(self, workspace_id: UUID, limit: int = 100) -> list[TaskQueue]:
         """Get queued tasks for a workspace, ordered by priority and time."""
         stmt = (
@@ -50,8 +70,21 @@ class TaskQueueRepository(BaseRepository[TaskQueue]):
 
         return count
 
+    async def delete_by_workspace(self, workspace_id: UUID) -> int:
+        """Delete all queued items of a workspace.
+
+        Returns the number of items deleted.
+        """
+        stmt = delete(TaskQueue).where(TaskQueue.workspace_id == workspace_id)
+        result = await self.db.execute(stmt)
+        return result.rowcount
+
     async def get_next_by_task(self, task_type: str, task_id: UUID) -> TaskQueue | None:
-        """Get and remove next item from queue for a specific task."""
+        """Get and remove next item from queue for a specific task.
+
+        The row is locked and skipped by concurrent pops, so two finishing
+        executions never start the same queued one.
+        """
         stmt = (
             select(TaskQueue)
             .where(
@@ -60,6 +93,7 @@ class TaskQueueRepository(BaseRepository[TaskQueue]):
             )
             .order_by(TaskQueue.priority.desc(), TaskQueue.queued_at.asc())
             .limit(1)
+            .with_for_update(skip_locked=True)
         )
         result = await self.db.execute(stmt)
         item = result.scalar_one_or_none()
@@ -69,12 +103,14 @@ class TaskQueueRepository(BaseRepository[TaskQueue]):
 
         return item
 
-    async def delete_by_id(self, queue_item_id: UUID) -> bool:
-        """Delete a queue item by ID.
+    async def delete_by_id(self, queue_item_id: UUID, workspace_id: UUID | None = None) -> bool:
+        """Delete a queue item by ID, optionally only if it belongs to a workspace.
 
         Returns True if item was deleted, False if not found.
         """
         stmt = select(TaskQueue).where(TaskQueue.id == queue_item_id)
+        if workspace_id is not None:
+            stmt = stmt.where(TaskQueue.workspace_id == workspace_id)
         result = await self.db.execute(stmt)
         item = result.scalar_one_or_none()
 
@@ -4,6 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.repositories.base import BaseRepository
+from app.models.subscription import Subscription, SubscriptionStatus
 from app.models.user import User
 
 
@@ -13,6 +14,16 @@ class UserRepository(BaseRepository[User]):
     def __init__(self, db: AsyncSession):
         super().__init__(User, db)
 
+    async def get_principal(self, user_id: UUID) -> tuple[User, SubscriptionStatus | None] | None:
+        """Get user with subscription status in one query."""
+        subscription_status = select(Subscription.status).where(Subscription.user_id == User.id).scalar_subquery()
+        stmt = select(User, subscription_status).where(User.id == user_id)
+        result = await self.db.execute(stmt)
+        row = result.one_or_none()
+        if row is None:
+            return None
+        return row[0], row[1]
+
     async def get_by_email(self, email: str) -> User | None:
         """Get user by email."""
         stmt = select(User).where(User.email == email)
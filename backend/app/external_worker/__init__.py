@@ -0,0 +1,8 @@
+# External worker runtime
+
+from app.external_worker.runtime import ExternalWorker, WorkerConfig
+
+__all__ = [
+    "ExternalWorker",
+    "WorkerConfig",
+]
@@ -0,0 +1,90 @@
+"""Command line entry point for the external worker runtime.
+
+Usage:
+    python -m app.external_worker --api-url https://api.cronbox.ru/v1 --key wk_...
+
+Every option falls back to its CRONBOX_* environment variable.
+"""
+
+import argparse
+import asyncio
+import signal
+import sys
+
+from app.external_worker.runtime import ExternalWorker, WorkerConfig
+
+
+def parse_args(argv: list[str] | None = None) -> WorkerConfig:
+    """Build worker config from command line arguments and environment."""
+    config = WorkerConfig.from_env()
+
+    parser = argparse.ArgumentParser(prog="cronbox-external-worker", description="Run a CronBox external worker")
+    parser.add_argument("--api-url", default=config.api_url, help="CronBox API URL (CRONBOX_API_URL)")
+    parser.add_argument("--key", default=config.worker_key, help="Worker API key (CRONBOX_WORKER_KEY)")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=config.concurrency,
+        help="Maximum tasks executing at once (CRONBOX_MAX_CONCURRENT)",
+    )
+    parser.add_argument(
+        "--poll-wait",
+        type=int,
+        default=config.poll_wait,
+        help="Long-poll wait in seconds, 0 to disable (CRONBOX_POLL_WAIT)",
+    )
+    parser.add_argument(
+        "--result-batch-size",
+        type=int,
+        default=config.result_batch_size,
+        help="Results per submission (CRONBOX_RESULT_BATCH_SIZE)",
+    )
+    parser.add_argument(
+        "--drain-timeout",
+        type=float,
+        default=config.drain_timeout,
+        help="Seconds to wait for running tasks on shutdown (CRONBOX_DRAIN_TIMEOUT)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=config.metrics_port,
+        help="Port for Prometheus metrics, 0 to disable (CRONBOX_METRICS_PORT)",
+    )
+    args = parser.parse_args(argv)
+
+    if not args.key:
+        parser.error("worker API key is required (--key or CRONBOX_WORKER_KEY)")
+
+    config.api_url = args.api_url
+    config.worker_key = args.key
+    config.concurrency = args.concurrency
+    config.poll_wait = args.poll_wait
+    config.result_batch_size = args.result_batch_size
+    config.drain_timeout = args.drain_timeout
+    config.metrics_port = args.metrics_port
+    return config
+
+
+async def run(config: WorkerConfig) -> None:
+    """Run the worker until SIGTERM/SIGINT, then drain."""
+    worker = ExternalWorker(config)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+
+    await worker.run()
+
+
+def main(argv: list[str] | None = None) -> None:
+    config = parse_args(argv)
+    try:
+        asyncio.run(run(config))
+    except Exception as e:
+        print(f"External worker failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Prometheus metrics for the external worker runtime.
+
+Metrics live in a dedicated registry so the runtime can expose them on its
+own port without pulling in anything registered by the API process.
+"""
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, start_http_server
+
+registry = CollectorRegistry()
+
+TASKS_TOTAL = Counter(
+    "cronbox_external_worker_tasks_total",
+    "Tasks executed by this worker",
+    ["result"],  # success, failure
+    registry=registry,
+)
+
+TASK_DURATION = Histogram(
+    "cronbox_external_worker_task_duration_seconds",
+    "Duration of task HTTP requests",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+    registry=registry,
+)
+
+TASKS_IN_FLIGHT = Gauge(
+    "cronbox_external_worker_tasks_in_flight",
+    "Tasks currently executing",
+    registry=registry,
+)
+
+POLLS_TOTAL = Counter(
+    "cronbox_external_worker_polls_total",
+    "Task polls against the API",
+    ["outcome"],  # tasks, empty, error
+    registry=registry,
+)
+
+RESULTS_PENDING = Gauge(
+    "cronbox_external_worker_results_pending",
+    "Results waiting to be submitted",
+    registry=registry,
+)
+
+RESULT_BATCHES_TOTAL = Counter(
+    "cronbox_external_worker_result_batches_total",
+    "Result batch submissions",
+    ["outcome"],  # ok, retry, dropped
+    registry=registry,
+)
+
+
+def start_metrics_server(port: int) -> None:
+    """Expose metrics over HTTP on the given port."""
+    start_http_server(port, registry=registry)
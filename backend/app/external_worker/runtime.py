@@ -0,0 +1,352 @@
+"""External worker runtime.
+
+Long-polls the CronBox API for tasks assigned to this worker, executes them
+in a bounded asyncio pool over a pooled HTTP client and submits results in
+batches with retries. On stop it lets a poll in progress finish (the
+server has already handed its tasks over), stops polling, drains in-flight
+tasks and flushes pending results before exiting.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+import httpx
+import structlog
+
+from app.external_worker import metrics
+
+logger = structlog.get_logger()
+
+# Server-side limits of the worker API
+MAX_POLL_BATCH = 100
+MAX_RESULT_BATCH = 500
+
+# Delay before polling again after a failed poll
+POLL_ERROR_BACKOFF_SECONDS = 5
+
+
+@dataclass
+class WorkerConfig:
+    """External worker settings."""
+
+    api_url: str
+    worker_key: str
+    concurrency: int = 50  # Maximum tasks executing at once
+    poll_wait: int = 20  # Long-poll wait in seconds (0 = plain polling)
+    result_batch_size: int = 100
+    result_flush_interval: float = 0.5  # Max seconds a result waits for its batch to fill
+    result_max_attempts: int = 5
+    result_retry_delay: float = 0.5  # Base delay, doubled on each attempt
+    heartbeat_interval: int = 30
+    drain_timeout: float = 30.0  # Seconds to wait for in-flight tasks on shutdown
+    metrics_port: int = 0  # 0 disables the metrics endpoint
+
+    @classmethod
+    def from_env(cls) -> "WorkerConfig":
+        """Build config from CRONBOX_* environment variables."""
+        return cls(
+            api_url=os.environ.get("CRONBOX_API_URL", "http://localhost:8000/v1"),
+            worker_key=os.environ.get("CRONBOX_WORKER_KEY", ""),
+            concurrency=int(os.environ.get("CRONBOX_MAX_CONCURRENT", "50")),
+            poll_wait=int(os.environ.get("CRONBOX_POLL_WAIT", "20")),
+            result_batch_size=int(os.environ.get("CRONBOX_RESULT_BATCH_SIZE", "100")),
+            drain_timeout=float(os.environ.get("CRONBOX_DRAIN_TIMEOUT", "30")),
+            metrics_port=int(os.environ.get("CRONBOX_METRICS_PORT", "0")),
+        )
+
+
+class ExternalWorker:
+    """CronBox external worker runtime."""
+
+    def __init__(
+        self,
+        config: WorkerConfig,
+        api_transport: httpx.AsyncBaseTransport | None = None,
+        http_transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.config = config
+        self.running = False
+
+        self._stopping = asyncio.Event()
+        self._slot_freed = asyncio.Event()
+        self._in_flight: set[asyncio.Task] = set()
+        self._results: asyncio.Queue[dict] = asyncio.Queue()
+
+        # API client carries the worker key; the task client never does
+        self.api = httpx.AsyncClient(
+            base_url=config.api_url.rstrip("/"),
+            headers={"X-Worker-Key": config.worker_key},
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            transport=api_transport,
+        )
+        self.http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=config.concurrency,
+                max_keepalive_connections=config.concurrency,
+            ),
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            transport=http_transport,
+        )
+
+    @property
+    def in_flight(self) -> int:
+        """Number of tasks currently executing."""
+        return len(self._in_flight)
+
+    async def run(self) -> None:
+        """Run until stop() is called, then drain and shut down."""
+        info = await self.get_worker_info()
+        logger.info(
+            "External worker started",
+            worker=info.get("name"),
+            worker_id=info.get("id"),
+            concurrency=self.config.concurrency,
+            poll_wait=self.config.poll_wait,
+        )
+
+        if self.config.metrics_port:
+            metrics.start_metrics_server(self.config.metrics_port)
+
+        self.running = True
+        poller = asyncio.create_task(self._poll_loop())
+        heartbeat = asyncio.create_task(self._heartbeat_loop())
+        submitter = asyncio.create_task(self._submit_loop())
+
+        await self._stopping.wait()
+        logger.info("External worker draining", in_flight=self.in_flight)
+
+        # Cancelling a long-poll would lose the tasks the server already popped
+        await asyncio.gather(poller, return_exceptions=True)
+        heartbeat.cancel()
+        await asyncio.gather(heartbeat, return_exceptions=True)
+
+        if self._in_flight:
+            _, pending = await asyncio.wait(self._in_flight, timeout=self.config.drain_timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.warning("Drain timeout, abandoning tasks", abandoned=len(pending))
+
+        # The submitter flushes everything queued before exiting
+        self.running = False
+        await submitter
+
+        await self.send_heartbeat(status="offline")
+        await self.close()
+        logger.info("External worker stopped")
+
+    def stop(self) -> None:
+        """Request a graceful shutdown."""
+        self._stopping.set()
+        # Wake the poller if it waits for a free slot
+        self._slot_freed.set()
+
+    async def close(self) -> None:
+        """Close HTTP clients."""
+        await self.api.aclose()
+        await self.http.aclose()
+
+    # === API calls ===
+
+    async def get_worker_info(self) -> dict:
+        """Get worker information from API."""
+        response = await self.api.get("/worker/info")
+        response.raise_for_status()
+        return response.json()
+
+    async def send_heartbeat(self, status: str | None = None) -> None:
+        """Send heartbeat to API."""
+        if status is None:
+            status = "busy" if self._in_flight else "online"
+        try:
+            response = await self.api.post(
+                "/worker/heartbeat",
+                json={"status": status, "current_tasks": self.in_flight},
+            )
+            response.raise_for_status()
+        except Exception as e:
+            logger.warning("Heartbeat failed", error=str(e))
+
+    async def poll_tasks(self, max_tasks: int) -> tuple[list[dict], float]:
+        """Poll for pending tasks.
+
+        Returns the tasks and the delay before the next poll.
+        """
+        try:
+            response = await self.api.get(
+                "/worker/tasks",
+                params={"max_tasks": max_tasks, "wait": self.config.poll_wait},
+                # The server holds long-poll requests open for up to poll_wait seconds
+                timeout=httpx.Timeout(self.config.poll_wait + 30.0, connect=10.0),
+            )
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            metrics.POLLS_TOTAL.labels(outcome="error").inc()
+            logger.warning("Poll failed", error=str(e))
+            return [], POLL_ERROR_BACKOFF_SECONDS
+
+        tasks = data.get("tasks", [])
+        metrics.POLLS_TOTAL.labels(outcome="tasks" if tasks else "empty").inc()
+        return tasks, data.get("poll_interval_seconds", 0)
+
+    async def submit_results(self, batch: list[dict]) -> bool:
+        """Submit a batch of results, retrying transient failures.
+
+        Returns False if the batch was dropped.
+        """
+        for attempt in range(1, self.config.result_max_attempts + 1):
+            try:
+                response = await self.api.post("/worker/tasks/results", json={"results": batch})
+            except httpx.TransportError as e:
+                error = str(e)
+            else:
+                if response.is_success:
+                    rejected = response.json().get("rejected", [])
+                    if rejected:
+                        logger.warning("Results rejected by API", rejected=rejected)
+                    metrics.RESULT_BATCHES_TOTAL.labels(outcome="ok").inc()
+                    return True
+                if response.status_code != 429 and response.status_code < 500:
+                    # Client errors won't succeed on retry
+                    error = f"HTTP {response.status_code}"
+                    break
+                error = f"HTTP {response.status_code}"
+
+            if attempt < self.config.result_max_attempts:
+                metrics.RESULT_BATCHES_TOTAL.labels(outcome="retry").inc()
+                await asyncio.sleep(self.config.result_retry_delay * 2 ** (attempt - 1))
+
+        metrics.RESULT_BATCHES_TOTAL.labels(outcome="dropped").inc()
+        logger.error("Dropping result batch", size=len(batch), error=error)
+        return False
+
+    # === Task execution ===
+
+    async def execute_task(self, task: dict) -> dict:
+        """Execute a single HTTP task and build its result."""
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        result: dict[str, Any] = {
+            "task_id": task["task_id"],
+            "task_type": task["task_type"],
+            "started_at": started_at.isoformat(),
+        }
+
+        try:
+            response = await self.http.request(
+                method=task["method"],
+                url=task["url"],
+                headers=task.get("headers") or {},
+                content=task.get("body"),
+                timeout=task.get("timeout_seconds", 30),
+            )
+            result.update(
+                {
+                    "status_code": response.status_code,
+                    "response_body": response.text[:10000] if response.text else None,
+                    "response_headers": dict(response.headers),
+                }
+            )
+        except httpx.TimeoutException:
+            result.update({"error": "Request timed out", "error_type": "timeout"})
+        except httpx.ConnectError as e:
+            result.update({"error": str(e), "error_type": "connection_error"})
+        except Exception as e:
+            result.update({"error": str(e), "error_type": "unknown"})
+
+        elapsed = time.perf_counter() - started
+        result["finished_at"] = datetime.now(timezone.utc).isoformat()
+        result["duration_ms"] = int(elapsed * 1000)
+
+        metrics.TASK_DURATION.observe(elapsed)
+        metrics.TASKS_TOTAL.labels(result="failure" if "error" in result else "success").inc()
+        return result
+
+    def _start_task(self, task: dict) -> None:
+        """Run a task in the pool, queueing its result on completion."""
+        job = asyncio.create_task(self._run_task(task))
+        self._in_flight.add(job)
+        metrics.TASKS_IN_FLIGHT.set(self.in_flight)
+        job.add_done_callback(self._task_done)
+
+    def _task_done(self, job: asyncio.Task) -> None:
+        self._in_flight.discard(job)
+        metrics.TASKS_IN_FLIGHT.set(self.in_flight)
+        self._slot_freed.set()
+
+    async def _run_task(self, task: dict) -> None:
+        result = await self.execute_task(task)
+        self._results.put_nowait(result)
+        metrics.RESULTS_PENDING.set(self._results.qsize())
+
+    # === Loops ===
+
+    async def _poll_loop(self) -> None:
+        """Fetch tasks whenever the pool has free slots, until stopped.
+
+        Stopping is checked between polls only: tasks returned by a poll
+        are always started, even if stop() was called while it waited.
+        """
+        while not self._stopping.is_set():
+            free = self.config.concurrency - self.in_flight
+            if free <= 0:
+                self._slot_freed.clear()
+                await self._slot_freed.wait()
+                continue
+
+            tasks, delay = await self.poll_tasks(min(free, MAX_POLL_BATCH))
+            for task in tasks:
+                self._start_task(task)
+
+            if delay:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), delay)
+                except TimeoutError:
+                    pass
+
+    async def _heartbeat_loop(self) -> None:
+        while self.running:
+            await self.send_heartbeat()
+            await asyncio.sleep(self.config.heartbeat_interval)
+
+    async def _submit_loop(self) -> None:
+        """Submit results in batches until stopped and the queue is empty."""
+        while self.running or not self._results.empty():
+            batch = await self._next_batch()
+            metrics.RESULTS_PENDING.set(self._results.qsize())
+            if batch:
+                await self.submit_results(batch)
+
+    async def _next_batch(self) -> list[dict]:
+        """Collect up to result_batch_size results.
+
+        Waits at most result_flush_interval for a batch to fill; when shutting
+        down only takes what is already queued.
+        """
+        batch_size = min(self.config.result_batch_size, MAX_RESULT_BATCH)
+        batch: list[dict] = []
+
+        if not self.running:
+            while len(batch) < batch_size and not self._results.empty():
+                batch.append(self._results.get_nowait())
+            return batch
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.config.result_flush_interval
+        while len(batch) < batch_size:
+            if not self._results.empty():
+                batch.append(self._results.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0 or not self.running:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._results.get(), timeout))
+            except TimeoutError:
+                break
+        return batch
@@ -60,6 +60,9 @@ class ChainExecution(Base, UUIDMixin):
     # Error info
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    # Saved state of a run waiting for a deferred step retry (None when not waiting)
+    checkpoint: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+
     # Overlap prevention
     skipped_reason: Mapped[str | None] = mapped_column(String(100), nullable=True)
 
@@ -47,6 +47,13 @@ class OverlapPolicy(str, enum.Enum):
     QUEUE = "queue"  # Queue new executions if task is already running
 
 
+class CatchUpPolicy(str, enum.Enum):
+    """What to do with a run missed while the scheduler was behind."""
+
+    RUN_ONCE = "run_once"  # Run once for all missed runs (default)
+    SKIP_MISSED = "skip_missed"  # Skip runs that are late, wait for the next one
+
+
 class CronTask(Base, UUIDMixin, TimestampMixin):
     """Cron task model - recurring HTTP requests."""
 
@@ -90,6 +97,15 @@ class CronTask(Base, UUIDMixin, TimestampMixin):
     # Schedule
     schedule: Mapped[str] = mapped_column(String(100))  # Cron expression
     timezone: Mapped[str] = mapped_column(String(50), default="Europe/Moscow")
+    # Jitter window overriding the workspace default (None = inherit, 0 = disabled)
+    schedule_jitter_seconds: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Missed runs (e.g. after scheduler downtime)
+    catch_up_policy: Mapped[CatchUpPolicy] = mapped_column(
+        SQLEnum(CatchUpPolicy, values_callable=lambda x: [e.value for e in x], create_type=False),
+        default=CatchUpPolicy.RUN_ONCE,
+    )
+    # Missed runs later than this are skipped (None = scheduler default)
+    max_staleness_seconds: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     # Execution settings
     timeout_seconds: Mapped[int] = mapped_column(Integer, default=30)
@@ -1,8 +1,8 @@
 from datetime import datetime
 from uuid import UUID
 
+from sqlalchemy import Boolean, Float, ForeignKey, Integer, String, Text
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import Float, ForeignKey, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -89,6 +89,14 @@ class Execution(Base, UUIDMixin):
     # TCP results
     tcp_connection_time: Mapped[float | None] = mapped_column(Float, nullable=True)  # ms
 
+    # HTTP phase timings
+    http_dns_time: Mapped[float | None] = mapped_column(Float, nullable=True)  # ms
+    http_connect_time: Mapped[float | None] = mapped_column(Float, nullable=True)  # ms
+    http_tls_time: Mapped[float | None] = mapped_column(Float, nullable=True)  # ms
+    http_first_byte_time: Mapped[float | None] = mapped_column(Float, nullable=True)  # ms
+    http_transfer_time: Mapped[float | None] = mapped_column(Float, nullable=True)  # ms
+    http_connection_reused: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+
     # Overlap prevention
     skipped_reason: Mapped[str | None] = mapped_column(String(100), nullable=True)
 
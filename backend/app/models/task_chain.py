@@ -66,6 +66,8 @@ class TaskChain(Base, UUIDMixin, TimestampMixin):
     # Execution settings
     stop_on_failure: Mapped[bool] = mapped_column(Boolean, default=True)
     timeout_seconds: Mapped[int] = mapped_column(Integer, default=300)  # Total chain timeout
+    # Steps allowed to run at once; 1 runs steps strictly in order
+    max_parallel_steps: Mapped[int] = mapped_column(Integer, default=1)
 
     # State
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, index=True)
@@ -141,6 +143,11 @@ class ChainStep(Base, UUIDMixin, TimestampMixin):
     # Example: {"order_id": "$.data.id", "status": "$.data.status"}
     extract_variables: Mapped[dict] = mapped_column(JSONB, default=dict)
 
+    # step_order values of earlier steps that must finish before this one starts,
+    # in addition to the steps providing the {{variables}} it uses
+    # Example: [0, 2]
+    depends_on: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+
     # Continue even if this step fails
     continue_on_failure: Mapped[bool] = mapped_column(Boolean, default=False)
 
@@ -41,6 +41,8 @@ class Workspace(Base, UUIDMixin, TimestampMixin):
 
     # Settings
     default_timezone: Mapped[str] = mapped_column(String(50), default="Europe/Moscow")
+    # Default schedule jitter window for cron tasks (0 = disabled)
+    schedule_jitter_seconds: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     webhook_secret: Mapped[str] = mapped_column(String(255))
 
     # Relationships
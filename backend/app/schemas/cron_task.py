@@ -5,7 +5,7 @@ import pytz
 from croniter import croniter
 from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_serializer, field_validator, model_validator
 
-from app.models.cron_task import HttpMethod, OverlapPolicy, ProtocolType, TaskStatus
+from app.models.cron_task import CatchUpPolicy, HttpMethod, OverlapPolicy, ProtocolType, TaskStatus
 
 
 class CronTaskBase(BaseModel):
@@ -34,6 +34,12 @@ class CronTaskBase(BaseModel):
     # Schedule
     schedule: str = Field(..., description="Cron expression (e.g., '0 3 * * *')")
     timezone: str = Field(default="Europe/Moscow")
+    schedule_jitter_seconds: int | None = Field(
+        None,
+        ge=0,
+        le=300,
+        description="Spread runs by a stable offset within this many seconds. None uses the workspace default.",
+    )
     timeout_seconds: int = Field(default=30, ge=1, le=300)
     retry_count: int = Field(default=0, ge=0, le=10)
     retry_delay_seconds: int = Field(default=60, ge=10, le=3600)
@@ -53,6 +59,17 @@ class CronTaskBase(BaseModel):
     execution_timeout: int | None = Field(
         None, ge=60, le=86400, description="Execution timeout in seconds (auto-release running instances)"
     )
+    # Missed runs
+    catch_up_policy: CatchUpPolicy = Field(
+        default=CatchUpPolicy.RUN_ONCE,
+        description="Handling of runs missed while the scheduler was behind: run_once or skip_missed",
+    )
+    max_staleness_seconds: int | None = Field(
+        None,
+        ge=60,
+        le=604800,
+        description="Skip a missed run that is later than this many seconds. None uses the scheduler default.",
+    )
 
     @field_validator("schedule")
     @classmethod
@@ -122,6 +139,7 @@ class CronTaskUpdate(BaseModel):
     # Schedule
     schedule: str | None = None
     timezone: str | None = None
+    schedule_jitter_seconds: int | None = Field(None, ge=0, le=300)
     timeout_seconds: int | None = Field(None, ge=1, le=300)
     retry_count: int | None = Field(None, ge=0, le=10)
     is_active: bool | None = None
@@ -133,6 +151,9 @@ class CronTaskUpdate(BaseModel):
     max_instances: int | None = Field(None, ge=1, le=10)
     max_queue_size: int | None = Field(None, ge=1, le=100)
     execution_timeout: int | None = Field(None, ge=60, le=86400)
+    # Missed runs
+    catch_up_policy: CatchUpPolicy | None = None
+    max_staleness_seconds: int | None = Field(None, ge=60, le=604800)
 
     @field_validator("schedule")
     @classmethod
@@ -174,6 +195,7 @@ class CronTaskResponse(BaseModel):
     # Schedule
     schedule: str
     timezone: str
+    schedule_jitter_seconds: int | None = None
     timeout_seconds: int
     retry_count: int
     retry_delay_seconds: int
@@ -191,6 +213,9 @@ class CronTaskResponse(BaseModel):
     max_queue_size: int
     execution_timeout: int | None
     running_instances: int
+    # Missed runs
+    catch_up_policy: CatchUpPolicy = CatchUpPolicy.RUN_ONCE
+    max_staleness_seconds: int | None = None
     created_at: datetime
     updated_at: datetime
 
@@ -71,6 +71,13 @@ class ExecutionDetailResponse(ExecutionResponse):
     response_headers: dict | None = None
     response_body: str | None = None
     response_size_bytes: int | None = None
+    # HTTP phase timings
+    http_dns_time: float | None = None  # ms
+    http_connect_time: float | None = None  # ms
+    http_tls_time: float | None = None  # ms
+    http_first_byte_time: float | None = None  # ms
+    http_transfer_time: float | None = None  # ms
+    http_connection_reused: bool | None = None
     # Chain execution details (optional)
     chain_variables: dict | None = None
 
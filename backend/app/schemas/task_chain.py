@@ -5,7 +5,7 @@ from uuid import UUID
 
 import pytz
 from croniter import croniter
-from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_serializer, field_validator
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_serializer, field_validator, model_validator
 
 from app.models.chain_execution import StepStatus
 from app.models.cron_task import HttpMethod, OverlapPolicy
@@ -33,6 +33,15 @@ class StepCondition(BaseModel):
     )
 
 
+def _normalize_depends_on(v: list[int] | None) -> list[int] | None:
+    """Validate step dependencies and return them sorted without duplicates."""
+    if v is None:
+        return v
+    if any(order < 0 for order in v):
+        raise ValueError("depends_on must contain step orders (>= 0)")
+    return sorted(set(v))
+
+
 class ChainStepBase(BaseModel):
     """Base chain step schema."""
 
@@ -60,6 +69,15 @@ class ChainStepBase(BaseModel):
         default=True,
         description="Whether this step is enabled (disabled steps are skipped during execution)",
     )
+    depends_on: list[int] | None = Field(
+        None,
+        description="Orders of earlier steps that must finish first, in addition to steps providing its variables",
+    )
+
+    @field_validator("depends_on")
+    @classmethod
+    def validate_depends_on(cls, v: list[int] | None) -> list[int] | None:
+        return _normalize_depends_on(v)
 
 
 class ChainStepCreate(ChainStepBase):
@@ -67,6 +85,13 @@ class ChainStepCreate(ChainStepBase):
 
     step_order: int = Field(..., ge=0, description="Position of step in the chain (0-based)")
 
+    @model_validator(mode="after")
+    def validate_dependencies_are_earlier(self) -> "ChainStepCreate":
+        """A step may only depend on steps that come before it."""
+        if self.depends_on and max(self.depends_on) >= self.step_order:
+            raise ValueError("depends_on may only reference earlier steps")
+        return self
+
 
 class ChainStepUpdate(BaseModel):
     """Schema for updating a chain step."""
@@ -83,6 +108,12 @@ class ChainStepUpdate(BaseModel):
     extract_variables: dict[str, str] | None = None
     continue_on_failure: bool | None = None
     is_enabled: bool | None = None
+    depends_on: list[int] | None = None
+
+    @field_validator("depends_on")
+    @classmethod
+    def validate_depends_on(cls, v: list[int] | None) -> list[int] | None:
+        return _normalize_depends_on(v)
 
 
 class ChainStepResponse(BaseModel):
@@ -105,6 +136,7 @@ class ChainStepResponse(BaseModel):
     extract_variables: dict
     continue_on_failure: bool
     is_enabled: bool
+    depends_on: list[int] | None
     created_at: datetime
     updated_at: datetime
 
@@ -155,6 +187,15 @@ class TaskChainBase(BaseModel):
         le=3600,
         description="Total chain timeout in seconds",
     )
+    max_parallel_steps: int = Field(
+        default=1,
+        ge=1,
+        le=20,
+        description=(
+            "Maximum steps running at once; independent steps run concurrently when above 1. "
+            "With stop_on_failure, steps after one without continue_on_failure wait for it"
+        ),
+    )
     notify_on_failure: bool = True
     notify_on_success: bool = False
     notify_on_partial: bool = True
@@ -200,6 +241,14 @@ class TaskChainCreate(TaskChainBase):
         description="Steps to create with the chain",
     )
 
+    @model_validator(mode="after")
+    def validate_step_dependencies(self) -> "TaskChainCreate":
+        """Steps are ordered by position, so dependencies must point to earlier positions."""
+        for i, step in enumerate(self.steps):
+            if step.depends_on and max(step.depends_on) >= i:
+                raise ValueError(f"Step {i} depends_on may only reference earlier steps")
+        return self
+
 
 class TaskChainUpdate(BaseModel):
     """Schema for updating a task chain."""
@@ -213,6 +262,7 @@ class TaskChainUpdate(BaseModel):
     execute_at: datetime | None = None
     stop_on_failure: bool | None = None
     timeout_seconds: int | None = Field(None, ge=1, le=3600)
+    max_parallel_steps: int | None = Field(None, ge=1, le=20)
     is_active: bool | None = None
     notify_on_failure: bool | None = None
     notify_on_success: bool | None = None
@@ -262,6 +312,7 @@ class TaskChainResponse(BaseModel):
     execute_at: datetime | None
     stop_on_failure: bool
     timeout_seconds: int
+    max_parallel_steps: int
     is_active: bool
     is_paused: bool
     last_run_at: datetime | None
@@ -87,7 +87,11 @@ class WorkerTaskInfo(BaseModel):
 
 
 class WorkerTaskResult(BaseModel):
-    """Result submitted by worker after task execution."""
+    """Result submitted by worker after task execution.
+
+    task_id and started_at identify the result: resubmitting it unchanged
+    (e.g. retrying a batch) does not record a second execution.
+    """
 
     task_id: UUID
     task_type: str = Field(..., description="'cron' or 'delayed'")
@@ -107,6 +111,22 @@ class WorkerTaskResult(BaseModel):
     error_type: str | None = None  # e.g., "timeout", "connection_error", "http_error"
 
 
+class WorkerTaskResultBatch(BaseModel):
+    """Batch of results submitted by a worker."""
+
+    results: list[WorkerTaskResult] = Field(..., min_length=1, max_length=500)
+
+
+class WorkerTaskResultBatchResponse(BaseModel):
+    """Response for batch result submission."""
+
+    accepted: int = Field(..., description="Number of results recorded, including ones already recorded before")
+    rejected: list[UUID] = Field(
+        default_factory=list,
+        description="Task IDs whose results were not recorded (unknown task or processing error)",
+    )
+
+
 class WorkerPollResponse(BaseModel):
     """Response for task polling."""
 
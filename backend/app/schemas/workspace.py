@@ -22,6 +22,7 @@ class WorkspaceUpdate(BaseModel):
 
     name: str | None = Field(None, min_length=1, max_length=255)
     default_timezone: str | None = Field(None, max_length=50)
+    schedule_jitter_seconds: int | None = Field(None, ge=0, le=300)
 
 
 class WorkspaceResponse(WorkspaceBase):
@@ -34,6 +35,7 @@ class WorkspaceResponse(WorkspaceBase):
     owner_id: UUID
     is_blocked: bool = False
     blocked_at: datetime | None = None
+    schedule_jitter_seconds: int = 0
     cron_tasks_count: int
     delayed_tasks_this_month: int
     created_at: datetime
@@ -0,0 +1,168 @@
+"""Cached snapshot of global admin dashboard statistics.
+
+The admin dashboard totals scan whole tables (executions in particular), so
+they are computed in a single aggregate query and stored in Redis for
+settings.admin_stats_cache_ttl_seconds. A dashboard view computes them only
+when the snapshot has expired, so nothing is scanned while nobody looks.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import structlog
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.redis import redis_client
+from app.models import (
+    CronTask,
+    DelayedTask,
+    Execution,
+    Heartbeat,
+    Payment,
+    SSLMonitor,
+    Subscription,
+    TaskChain,
+    User,
+    Workspace,
+)
+from app.models.payment import PaymentStatus
+from app.models.subscription import SubscriptionStatus
+
+logger = structlog.get_logger()
+
+# Cache key for the stats snapshot
+ADMIN_STATS_CACHE_KEY = "cache:admin:stats"
+
+
+def _count(column, *conditions):
+    count = func.count(column)
+    return count.filter(*conditions) if conditions else count
+
+
+def build_admin_stats_query(now: datetime):
+    """Build one statement returning every dashboard total as a single row."""
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    week_ago = today - timedelta(days=7)
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    active_subscription = (Subscription.status == SubscriptionStatus.ACTIVE, Subscription.current_period_end > now)
+
+    users = select(
+        _count(User.id).label("total_users"),
+        _count(User.id, User.is_active.is_(True)).label("active_users"),
+        _count(User.id, User.email_verified.is_(True)).label("verified_users"),
+    ).subquery()
+    workspaces = select(_count(Workspace.id).label("total_workspaces")).subquery()
+    cron_tasks = select(
+        _count(CronTask.id).label("total_cron_tasks"),
+        _count(CronTask.id, CronTask.is_active.is_(True)).label("active_cron_tasks"),
+    ).subquery()
+    delayed_tasks = select(
+        _count(DelayedTask.id).label("total_delayed_tasks"),
+        _count(DelayedTask.id, DelayedTask.status == "pending").label("pending_delayed_tasks"),
+    ).subquery()
+    task_chains = select(
+        _count(TaskChain.id).label("total_task_chains"),
+        _count(TaskChain.id, TaskChain.is_active.is_(True)).label("active_task_chains"),
+    ).subquery()
+    # Active = not paused
+    heartbeats = select(
+        _count(Heartbeat.id).label("total_heartbeats"),
+        _count(Heartbeat.id, Heartbeat.status != "paused").label("active_heartbeats"),
+    ).subquery()
+    ssl_monitors = select(
+        _count(SSLMonitor.id).label("total_ssl_monitors"),
+        _count(SSLMonitor.id, SSLMonitor.is_paused.is_(False)).label("active_ssl_monitors"),
+    ).subquery()
+    executions = select(
+        _count(Execution.id).label("total_executions"),
+        _count(Execution.id, Execution.started_at >= today).label("executions_today"),
+        _count(Execution.id, Execution.started_at >= week_ago).label("executions_this_week"),
+        # Success rate (last 7 days)
+        _count(Execution.id, Execution.started_at >= week_ago, Execution.status == "success").label(
+            "successful_this_week"
+        ),
+        _count(Execution.id, Execution.started_at >= week_ago, Execution.status.in_(["success", "failed"])).label(
+            "finished_this_week"
+        ),
+    ).subquery()
+    subscriptions = select(
+        _count(Subscription.id, *active_subscription).label("active_subscriptions"),
+        # Admin-assigned subscriptions don't have yookassa_payment_method_id set
+        _count(Subscription.id, *active_subscription, Subscription.yookassa_payment_method_id.isnot(None)).label(
+            "paid_subscriptions"
+        ),
+    ).subquery()
+    # Revenue (this month) - successful payments via payment system only,
+    # manual plan assignments by admin don't have yookassa_payment_id
+    revenue = (
+        select(
+            func.coalesce(func.sum(Payment.amount), 0).label("revenue_kopeks"),
+        )
+        .where(
+            Payment.created_at >= month_start,
+            Payment.status == PaymentStatus.SUCCEEDED,
+            Payment.yookassa_payment_id.isnot(None),
+        )
+        .subquery()
+    )
+
+    # Every subquery returns exactly one row, so the cross join is one row too
+    return select(
+        users,
+        workspaces,
+        cron_tasks,
+        delayed_tasks,
+        task_chains,
+        heartbeats,
+        ssl_monitors,
+        executions,
+        subscriptions,
+        revenue,
+    )
+
+
+async def compute_admin_stats(db: AsyncSession) -> dict:
+    """Compute dashboard totals live."""
+    now = datetime.utcnow()
+    row = (await db.execute(build_admin_stats_query(now))).one()._mapping
+
+    stats = {key: row[key] or 0 for key in row.keys()}
+    successful = stats.pop("successful_this_week")
+    finished = stats.pop("finished_this_week")
+    revenue_kopeks = stats.pop("revenue_kopeks")
+
+    stats["success_rate"] = round(successful / finished * 100, 1) if finished else 0
+    stats["revenue_this_month"] = float(revenue_kopeks) / 100  # Convert from kopeks to rubles
+    stats["computed_at"] = now.isoformat()
+    return stats
+
+
+class AdminStatsService:
+    """Service for the admin dashboard statistics snapshot."""
+
+    async def refresh(self, db: AsyncSession) -> dict:
+        """Recompute the snapshot and store it (best-effort)."""
+        stats = await compute_admin_stats(db)
+        try:
+            await redis_client.set(
+                ADMIN_STATS_CACHE_KEY, json.dumps(stats), expire=settings.admin_stats_cache_ttl_seconds
+            )
+        except Exception as e:
+            logger.warning("Failed to cache admin stats", error=str(e))
+        return stats
+
+    async def get(self, db: AsyncSession) -> dict:
+        """Get the cached snapshot, computing it if it has expired."""
+        try:
+            cached = await redis_client.get(ADMIN_STATS_CACHE_KEY)
+            if cached:
+                return json.loads(cached)
+        except Exception as e:
+            logger.warning("Failed to get admin stats from cache", error=str(e))
+        return await self.refresh(db)
+
+
+# Global instance
+admin_stats_service = AdminStatsService()
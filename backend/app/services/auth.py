@@ -18,6 +18,7 @@ from app.core.security import (
 from app.db.repositories.users import UserRepository
 from app.models.user import User
 from app.schemas.auth import TokenResponse
+from app.services.principal_cache import principal_cache
 
 logger = structlog.get_logger()
 
@@ -162,6 +163,8 @@ class AuthService:
 
     async def change_password(self, user: User, current_password: str, new_password: str) -> None:
         """Change user's password."""
+        # Cached principals are loaded without the password hash
+        await self.db.refresh(user, attribute_names=["password_hash"])
         if not verify_password(current_password, user.password_hash):
             raise BadRequestError("Current password is incorrect")
 
@@ -201,6 +204,8 @@ class AuthService:
 
         # Update user's Telegram info
         user = await self.user_repo.update_telegram(user, telegram_id, telegram_username)
+        await self.db.commit()
+        await principal_cache.invalidate(user.id)
         logger.info(
             "Telegram account linked successfully",
             user_id=str(user.id),
@@ -254,6 +259,8 @@ class AuthService:
             raise BadRequestError("Email already verified")
 
         user = await self.user_repo.verify_email(user)
+        await self.db.commit()
+        await principal_cache.invalidate(user.id)
         logger.info("Email verified successfully", user_id=str(user.id))
         return user
 
@@ -312,6 +319,8 @@ class AuthService:
             raise BadRequestError("No Telegram account linked")
 
         user = await self.user_repo.update(user, telegram_id=None, telegram_username=None)
+        await self.db.commit()
+        await principal_cache.invalidate(user.id)
         logger.info("Telegram account unlinked", user_id=str(user.id))
         return user
 
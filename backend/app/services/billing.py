@@ -7,7 +7,8 @@ from uuid import UUID
 
 import httpx
 import structlog
-from sqlalchemy import select
+from redis.commands.core import AsyncScript
+from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
@@ -18,6 +19,7 @@ from app.models.subscription import Subscription, SubscriptionStatus
 from app.models.user import User
 from app.models.workspace import Workspace
 from app.services.i18n import t
+from app.services.principal_cache import principal_cache
 
 logger = structlog.get_logger()
 
@@ -43,6 +45,73 @@ def _get_receipt_description(plan_name: str, billing_period: str, lang: str) ->
 PLANS_CACHE_KEY = "cache:plans:public"
 PLANS_CACHE_TTL = 3600  # 1 hour
 
+# Effective plan cache: user -> plan id, plus a hash of plan id -> plan data.
+# Plan data is shared between users, so invalidate_plans_cache only has to
+# drop the hash; a user's plan id only changes with their subscription.
+USER_PLAN_CACHE_KEY = "cache:plan:user:{user_id}"
+USER_PLAN_CACHE_TTL = 300  # 5 minutes
+PLANS_BY_ID_CACHE_KEY = "cache:plans:by_id"
+
+# Look up the user's cached plan id (KEYS[1]) and return that plan's data
+# from the plans hash (KEYS[2]), or nil. One round trip, one plan.
+GET_USER_PLAN_SCRIPT = """
+local plan_id = redis.call('GET', KEYS[1])
+if not plan_id then
+    return false
+end
+return redis.call('HGET', KEYS[2], plan_id)
+"""
+
+# Subscription statuses that grant the subscribed plan
+PLAN_GRANTING_STATUSES = (SubscriptionStatus.ACTIVE, SubscriptionStatus.PAST_DUE)
+
+
+def _plan_to_cache_dict(plan: Plan) -> dict:
+    """Serialize plan fields for Redis caching."""
+    return {
+        "id": str(plan.id),
+        "name": plan.name,
+        "display_name": plan.display_name,
+        "description": plan.description,
+        "price_monthly": plan.price_monthly,
+        "price_yearly": plan.price_yearly,
+        "max_cron_tasks": plan.max_cron_tasks,
+        "max_delayed_tasks_per_month": plan.max_delayed_tasks_per_month,
+        "max_workspaces": plan.max_workspaces,
+        "max_execution_history_days": plan.max_execution_history_days,
+        "min_cron_interval_minutes": plan.min_cron_interval_minutes,
+        "telegram_notifications": plan.telegram_notifications,
+        "email_notifications": plan.email_notifications,
+        "max_notifications": plan.max_notifications,
+        "webhook_callbacks": plan.webhook_callbacks,
+        "custom_headers": plan.custom_headers,
+        "retry_on_failure": plan.retry_on_failure,
+        # Task chain limits
+        "max_task_chains": plan.max_task_chains,
+        "max_chain_steps": plan.max_chain_steps,
+        "chain_variable_substitution": plan.chain_variable_substitution,
+        "min_chain_interval_minutes": plan.min_chain_interval_minutes,
+        # Heartbeat monitor limits
+        "max_heartbeats": plan.max_heartbeats,
+        "min_heartbeat_interval_minutes": plan.min_heartbeat_interval_minutes,
+        # SSL monitor limits
+        "max_ssl_monitors": plan.max_ssl_monitors,
+        # Process monitor limits
+        "max_process_monitors": plan.max_process_monitors,
+        "min_process_monitor_interval_minutes": plan.min_process_monitor_interval_minutes,
+        # Overlap prevention settings
+        "overlap_prevention_enabled": plan.overlap_prevention_enabled,
+        "max_queue_size": plan.max_queue_size,
+        "is_active": plan.is_active,
+        "is_public": plan.is_public,
+        "sort_order": plan.sort_order,
+    }
+
+
+def _plan_from_cache_dict(data: dict) -> Plan:
+    """Reconstruct a Plan object from cached data."""
+    return Plan(**{**data, "id": UUID(data["id"])})
+
 
 class BillingService:
     """Service for managing subscriptions and payments via YooKassa."""
@@ -51,6 +120,7 @@ class BillingService:
         self.shop_id = settings.yookassa_shop_id
         self.secret_key = settings.yookassa_secret_key
         self.base_url = "https://api.yookassa.ru/v3"
+        self._plan_script: AsyncScript | None = None
 
     @property
     def is_configured(self) -> bool:
@@ -68,13 +138,7 @@ class BillingService:
                 if cached:
                     plans_data = json.loads(cached)
                     # Reconstruct Plan objects from cached data
-                    plans = []
-                    for data in plans_data:
-                        # Convert id string to UUID
-                        data["id"] = UUID(data["id"])
-                        plan = Plan(**data)
-                        plans.append(plan)
-                    return plans
+                    return [_plan_from_cache_dict(data) for data in plans_data]
             except Exception as e:
                 logger.warning("Failed to get plans from cache", error=str(e))
 
@@ -89,47 +153,7 @@ class BillingService:
         # Cache public plans
         if only_public and plans:
             try:
-                plans_data = [
-                    {
-                        "id": str(p.id),
-                        "name": p.name,
-                        "display_name": p.display_name,
-                        "description": p.description,
-                        "price_monthly": p.price_monthly,
-                        "price_yearly": p.price_yearly,
-                        "max_cron_tasks": p.max_cron_tasks,
-                        "max_delayed_tasks_per_month": p.max_delayed_tasks_per_month,
-                        "max_workspaces": p.max_workspaces,
-                        "max_execution_history_days": p.max_execution_history_days,
-                        "min_cron_interval_minutes": p.min_cron_interval_minutes,
-                        "telegram_notifications": p.telegram_notifications,
-                        "email_notifications": p.email_notifications,
-                        "max_notifications": p.max_notifications,
-                        "webhook_callbacks": p.webhook_callbacks,
-                        "custom_headers": p.custom_headers,
-                        "retry_on_failure": p.retry_on_failure,
-                        # Task chain limits
-                        "max_task_chains": p.max_task_chains,
-                        "max_chain_steps": p.max_chain_steps,
-                        "chain_variable_substitution": p.chain_variable_substitution,
-                        "min_chain_interval_minutes": p.min_chain_interval_minutes,
-                        # Heartbeat monitor limits
-                        "max_heartbeats": p.max_heartbeats,
-                        "min_heartbeat_interval_minutes": p.min_heartbeat_interval_minutes,
-                        # SSL monitor limits
-                        "max_ssl_monitors": p.max_ssl_monitors,
-                        # Process monitor limits
-                        "max_process_monitors": p.max_process_monitors,
-                        "min_process_monitor_interval_minutes": p.min_process_monitor_interval_minutes,
-                        # Overlap prevention settings
-                        "overlap_prevention_enabled": p.overlap_prevention_enabled,
-                        "max_queue_size": p.max_queue_size,
-                        "is_active": p.is_active,
-                        "is_public": p.is_public,
-                        "sort_order": p.sort_order,
-                    }
-                    for p in plans
-                ]
+                plans_data = [_plan_to_cache_dict(p) for p in plans]
                 await redis_client.set(PLANS_CACHE_KEY, json.dumps(plans_data), expire=PLANS_CACHE_TTL)
             except Exception as e:
                 logger.warning("Failed to cache plans", error=str(e))
@@ -144,7 +168,7 @@ class BillingService:
         since cache has TTL and will eventually expire.
         """
         try:
-            deleted = await redis_client.delete(PLANS_CACHE_KEY)
+            deleted = await redis_client.delete(PLANS_CACHE_KEY, PLANS_BY_ID_CACHE_KEY)
             if deleted:
                 logger.info("Plans cache invalidated successfully")
             else:
@@ -154,6 +178,19 @@ class BillingService:
             logger.error("Failed to invalidate plans cache - cache will expire in 1 hour", error=str(e))
             return False
 
+    async def invalidate_user_caches(self, *user_ids: uuid_module.UUID) -> None:
+        """Invalidate per-user caches after a subscription change is committed.
+
+        Best-effort: errors are logged, entries expire with their TTL anyway.
+        """
+        if not user_ids:
+            return
+        await principal_cache.invalidate(*user_ids)
+        try:
+            await redis_client.delete(*(USER_PLAN_CACHE_KEY.format(user_id=user_id) for user_id in user_ids))
+        except Exception as e:
+            logger.warning("Failed to invalidate user plan cache", error=str(e))
+
     async def get_plan_by_name(self, db: AsyncSession, name: str) -> Plan | None:
         """Get a plan by name."""
         result = await db.execute(select(Plan).where(Plan.name == name))
@@ -181,20 +218,90 @@ class BillingService:
         return result.scalar_one_or_none()
 
     async def get_user_plan(self, db: AsyncSession, user_id: uuid_module.UUID) -> Plan:
-        """Get user's current plan (from subscription or free)."""
-        subscription = await self.get_user_subscription(db, user_id)
-        if subscription and subscription.status in (
-            SubscriptionStatus.ACTIVE,
-            SubscriptionStatus.PAST_DUE,
-        ):
-            plan = await self.get_plan_by_id(db, subscription.plan_id)
-            if plan:
-                return plan
-        # Fallback to free plan
-        free_plan = await self.get_plan_by_name(db, "free")
-        if not free_plan:
-            raise RuntimeError("Free plan not found in database")
-        return free_plan
+        """Get user's current plan (from subscription or free).
+
+        Served from cache when possible; a miss is resolved in one query.
+        """
+        plan = await self._get_cached_user_plan(user_id)
+        if plan:
+            return plan
+
+        plans = await self.get_user_plans(db, [user_id])
+        plan = plans[user_id]
+        await self._cache_user_plans(plans)
+        return plan
+
+    async def get_user_plans(self, db: AsyncSession, user_ids: list[uuid_module.UUID]) -> dict[uuid_module.UUID, Plan]:
+        """Resolve current plans for many users in a single query.
+
+        Users without an active (or past due) subscription, unknown users and
+        users whose subscribed plan no longer exists get the free plan.
+        Bypasses the cache; intended for bulk callers like background jobs.
+        """
+        if not user_ids:
+            return {}
+
+        free_plan_id = select(Plan.id).where(Plan.name == "free").scalar_subquery()
+        result = await db.execute(
+            select(User.id, Plan)
+            .select_from(User)
+            .outerjoin(
+                Subscription,
+                and_(
+                    Subscription.user_id == User.id,
+                    Subscription.status.in_(PLAN_GRANTING_STATUSES),
+                ),
+            )
+            .join(Plan, Plan.id == func.coalesce(Subscription.plan_id, free_plan_id))
+            .where(User.id.in_(user_ids))
+        )
+        plans = {user_id: plan for user_id, plan in result.all()}
+
+        missing = [user_id for user_id in user_ids if user_id not in plans]
+        if missing:
+            free_plan = next((plan for plan in plans.values() if plan.name == "free"), None)
+            if free_plan is None:
+                free_plan = await self.get_plan_by_name(db, "free")
+            if not free_plan:
+                raise RuntimeError("Free plan not found in database")
+            for user_id in missing:
+                plans[user_id] = free_plan
+
+        return plans
+
+    def _get_plan_script(self) -> AsyncScript:
+        """Get the cached plan lookup script registered on the current Redis client."""
+        client = redis_client.client
+        if self._plan_script is None or self._plan_script.registered_client is not client:
+            self._plan_script = client.register_script(GET_USER_PLAN_SCRIPT)
+        return self._plan_script
+
+    async def _get_cached_user_plan(self, user_id: uuid_module.UUID) -> Plan | None:
+        """Get user's plan from cache in a single round trip."""
+        try:
+            plan_data = await self._get_plan_script()(
+                keys=[USER_PLAN_CACHE_KEY.format(user_id=user_id), PLANS_BY_ID_CACHE_KEY]
+            )
+            if plan_data:
+                return _plan_from_cache_dict(json.loads(plan_data))
+        except Exception as e:
+            logger.warning("Failed to get user plan from cache", user_id=str(user_id), error=str(e))
+        return None
+
+    async def _cache_user_plans(self, plans: dict[uuid_module.UUID, Plan]) -> None:
+        """Store resolved user plans in cache (best-effort)."""
+        try:
+            async with redis_client.client.pipeline(transaction=False) as pipe:
+                for user_id, plan in plans.items():
+                    pipe.set(USER_PLAN_CACHE_KEY.format(user_id=user_id), str(plan.id), ex=USER_PLAN_CACHE_TTL)
+                pipe.hset(
+                    PLANS_BY_ID_CACHE_KEY,
+                    mapping={str(plan.id): json.dumps(_plan_to_cache_dict(plan)) for plan in plans.values()},
+                )
+                pipe.expire(PLANS_BY_ID_CACHE_KEY, PLANS_CACHE_TTL)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Failed to cache user plans", error=str(e))
 
     async def create_payment(
         self,
@@ -490,6 +597,8 @@ class BillingService:
             )
 
         await db.commit()
+        if plan_id and user_id:
+            await self.invalidate_user_caches(uuid_module.UUID(user_id))
         logger.info("Payment succeeded", payment_id=str(payment.id))
         return True
 
@@ -602,6 +711,7 @@ class BillingService:
             subscription.cancelled_at = datetime.now(timezone.utc)
 
         await db.commit()
+        await self.invalidate_user_caches(user_id)
         logger.info(
             "Subscription cancelled",
             user_id=str(user_id),
@@ -920,7 +1030,7 @@ class BillingService:
     async def _resume_workspace_tasks(self, db: AsyncSession, workspace_id: uuid_module.UUID) -> int:
         """Resume paused tasks in a workspace."""
         from app.db.repositories.cron_tasks import CronTaskRepository
-        from app.workers.utils import calculate_next_run
+        from app.services.schedule import calculate_next_run, get_jitter_offset
 
         cron_repo = CronTaskRepository(db)
         tasks = await cron_repo.get_by_workspace(
@@ -932,7 +1042,8 @@ class BillingService:
         count = 0
         for task in tasks:
             if task.is_paused:
-                next_run = calculate_next_run(task.schedule, task.timezone)
+                offset = get_jitter_offset(task.id, await cron_repo.get_schedule_jitter_seconds(task))
+                next_run = calculate_next_run(task.schedule, task.timezone, offset_seconds=offset)
                 await cron_repo.resume(task, next_run)
                 count += 1
                 logger.info(
@@ -1057,6 +1168,7 @@ class BillingService:
 
         if affected_users:
             await db.commit()
+            await self.invalidate_user_caches(*(user_id for user_id, _, _ in affected_users))
             logger.info(
                 "Expired subscriptions processed",
                 count=len(affected_users),
@@ -1131,6 +1243,7 @@ class BillingService:
             await self.auto_pause_excess_tasks(db, first_workspace.id, new_plan.max_cron_tasks)
 
         await db.commit()
+        await self.invalidate_user_caches(subscription.user_id)
 
         logger.info(
             "Scheduled plan change applied",
@@ -1293,6 +1406,7 @@ class BillingService:
                         subscription.yookassa_payment_method_id = payment_method["id"]
 
                     await db.commit()
+                    await self.invalidate_user_caches(subscription.user_id)
                     logger.info(
                         "Subscription auto-renewed successfully",
                         subscription_id=str(subscription.id),
@@ -2,10 +2,12 @@
 
 import json
 import re
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
 import structlog
+from jsonpath_ng import JSONPath
 from jsonpath_ng import parse as jsonpath_parse
 from jsonpath_ng.exceptions import JsonPathParserError
 
@@ -31,6 +33,65 @@ class ConditionEvaluationError(Exception):
     pass
 
 
+class ResponseDocument:
+    """A step response body, parsed as JSON at most once.
+
+    Shared by the variable extractors of the step and the condition of the
+    step after it, so the same body is never decoded twice.
+    """
+
+    __slots__ = ("body", "_data", "_error", "_parsed")
+
+    def __init__(self, body: str | None):
+        self.body = body
+        self._data: Any = None
+        self._error: json.JSONDecodeError | None = None
+        self._parsed = False
+
+    def json(self) -> Any:
+        """Get the parsed body.
+
+        Raises:
+            json.JSONDecodeError: If the body is not valid JSON
+        """
+        if not self._parsed:
+            self._parsed = True
+            try:
+                self._data = json.loads(self.body)
+            except json.JSONDecodeError as e:
+                self._error = e
+        if self._error is not None:
+            raise self._error
+        return self._data
+
+
+def as_response_document(response: "str | ResponseDocument | None") -> ResponseDocument:
+    """Wrap a raw response body in a ResponseDocument."""
+    if isinstance(response, ResponseDocument):
+        return response
+    return ResponseDocument(response)
+
+
+def compile_jsonpath(jsonpath_expr: str) -> JSONPath | None:
+    """Parse a JSONPath expression, returning None if it is invalid."""
+    try:
+        return jsonpath_parse(jsonpath_expr)
+    except JsonPathParserError as e:
+        logger.warning(
+            "Invalid JSONPath expression",
+            jsonpath=jsonpath_expr,
+            error=str(e),
+        )
+        return None
+    except Exception as e:
+        logger.warning(
+            "JSONPath extraction failed",
+            jsonpath=jsonpath_expr,
+            error=str(e),
+        )
+        return None
+
+
 def substitute_variables(template: str, variables: dict[str, Any]) -> str:
     """Substitute {{variable}} placeholders in a string.
 
@@ -63,56 +124,54 @@ def substitute_variables_in_dict(data: dict[str, str], variables: dict[str, Any]
     return {key: substitute_variables(value, variables) for key, value in data.items()}
 
 
-def extract_variable_from_jsonpath(data: dict | list, jsonpath_expr: str) -> Any | None:
+def extract_variable_from_jsonpath(data: dict | list, jsonpath_expr: str | JSONPath | None) -> Any | None:
     """Extract a value from JSON data using JSONPath.
 
     Args:
         data: JSON data (dict or list)
-        jsonpath_expr: JSONPath expression (e.g., "$.data.id")
+        jsonpath_expr: JSONPath expression (e.g., "$.data.id"), or one
+            compiled with compile_jsonpath (None if it was invalid)
 
     Returns:
         Extracted value or None if not found
     """
+    expr = compile_jsonpath(jsonpath_expr) if isinstance(jsonpath_expr, str) else jsonpath_expr
+    if expr is None:
+        return None
     try:
-        expr = jsonpath_parse(jsonpath_expr)
         matches = expr.find(data)
         if matches:
             return matches[0].value
         return None
-    except JsonPathParserError as e:
-        logger.warning(
-            "Invalid JSONPath expression",
-            jsonpath=jsonpath_expr,
-            error=str(e),
-        )
-        return None
     except Exception as e:
         logger.warning(
             "JSONPath extraction failed",
-            jsonpath=jsonpath_expr,
+            jsonpath=str(expr),
             error=str(e),
         )
         return None
 
 
 def extract_variables_from_response(
-    response_body: str | None,
-    extract_config: dict[str, str],
+    response_body: str | ResponseDocument | None,
+    extract_config: dict[str, str] | dict[str, JSONPath | None],
 ) -> dict[str, Any]:
     """Extract variables from response body using JSONPath expressions.
 
     Args:
-        response_body: JSON response body string
+        response_body: JSON response body string or parsed document
         extract_config: Dict of variable_name -> JSONPath expression
+            (as a string or compiled)
 
     Returns:
         Dict of extracted variables
     """
-    if not response_body or not extract_config:
+    document = as_response_document(response_body)
+    if not document.body or not extract_config:
         return {}
 
     try:
-        data = json.loads(response_body)
+        data = document.json()
     except json.JSONDecodeError:
         logger.warning("Response body is not valid JSON for variable extraction")
         return {}
@@ -125,24 +184,60 @@ def extract_variables_from_response(
             logger.debug(
                 "Extracted variable",
                 variable=var_name,
-                jsonpath=jsonpath_expr,
+                jsonpath=str(jsonpath_expr),
                 value=str(value)[:100],  # Limit log length
             )
 
     return extracted
 
 
+@dataclass(frozen=True)
+class CompiledCondition:
+    """A step condition with its JSONPath field and regex compiled."""
+
+    operator: str
+    field: str | None
+    value: Any
+    field_expr: JSONPath | None = None
+    pattern: re.Pattern | None = None
+    pattern_error: str | None = None
+
+
+def compile_condition(condition: dict) -> CompiledCondition:
+    """Compile a condition config for repeated evaluation."""
+    operator = condition.get("operator", "").lower()
+    field = condition.get("field")
+    value = condition.get("value")
+
+    pattern = None
+    pattern_error = None
+    if operator == "regex":
+        try:
+            pattern = re.compile(str(value))
+        except re.error as e:
+            pattern_error = str(e)
+
+    return CompiledCondition(
+        operator=operator,
+        field=field,
+        value=value,
+        field_expr=compile_jsonpath(field) if field else None,
+        pattern=pattern,
+        pattern_error=pattern_error,
+    )
+
+
 def evaluate_condition(
-    condition: dict,
+    condition: dict | CompiledCondition | None,
     previous_status_code: int | None,
-    previous_response_body: str | None,
+    previous_response_body: str | ResponseDocument | None,
 ) -> tuple[bool, str]:
     """Evaluate a step condition.
 
     Args:
-        condition: Condition config dict
+        condition: Condition config dict, or one compiled with compile_condition
         previous_status_code: Status code from previous step
-        previous_response_body: Response body from previous step
+        previous_response_body: Response body (or parsed document) from previous step
 
     Returns:
         Tuple of (condition_met: bool, details: str)
@@ -150,11 +245,15 @@ def evaluate_condition(
     if not condition:
         return True, "No condition specified"
 
-    operator = condition.get("operator", "").lower()
-    field = condition.get("field")
-    expected_value = condition.get("value")
-
     try:
+        if not isinstance(condition, CompiledCondition):
+            condition = compile_condition(condition)
+
+        operator = condition.operator
+        field = condition.field
+        expected_value = condition.value
+        document = as_response_document(previous_response_body)
+
         # Status code conditions
         if operator == "status_code_in":
             if not isinstance(expected_value, list):
@@ -177,15 +276,15 @@ def evaluate_condition(
             if not field:
                 return False, f"Operator '{operator}' requires 'field' parameter"
 
-            if not previous_response_body:
+            if not document.body:
                 return False, "No response body to evaluate"
 
             try:
-                data = json.loads(previous_response_body)
+                data = document.json()
             except json.JSONDecodeError:
                 return False, "Response body is not valid JSON"
 
-            actual_value = extract_variable_from_jsonpath(data, field)
+            actual_value = extract_variable_from_jsonpath(data, condition.field_expr)
 
             if operator == "equals":
                 met = actual_value == expected_value
@@ -204,15 +303,13 @@ def evaluate_condition(
                 return met, f"{field} = {actual_value} {'does not contain' if met else 'contains'} {expected_value}"
 
             elif operator == "regex":
-                try:
-                    pattern = re.compile(str(expected_value))
-                    met = bool(pattern.search(str(actual_value))) if actual_value else False
-                    return (
-                        met,
-                        f"{field} = {actual_value} {'matches' if met else 'does not match'} regex {expected_value}",
-                    )
-                except re.error as e:
-                    return False, f"Invalid regex pattern: {e}"
+                if condition.pattern is None:
+                    return False, f"Invalid regex pattern: {condition.pattern_error}"
+                met = bool(condition.pattern.search(str(actual_value))) if actual_value else False
+                return (
+                    met,
+                    f"{field} = {actual_value} {'matches' if met else 'does not match'} regex {expected_value}",
+                )
 
             # Should not reach here, but satisfy mypy
             return False, f"Unknown field operator: {operator}"
@@ -221,11 +318,11 @@ def evaluate_condition(
         elif operator == "exists":
             if not field:
                 return False, "Operator 'exists' requires 'field' parameter"
-            if not previous_response_body:
+            if not document.body:
                 return False, "No response body to evaluate"
             try:
-                data = json.loads(previous_response_body)
-                actual_value = extract_variable_from_jsonpath(data, field)
+                data = document.json()
+                actual_value = extract_variable_from_jsonpath(data, condition.field_expr)
                 met = actual_value is not None
                 return met, f"{field} {'exists' if met else 'does not exist'}"
             except json.JSONDecodeError:
@@ -234,11 +331,11 @@ def evaluate_condition(
         elif operator == "not_exists":
             if not field:
                 return False, "Operator 'not_exists' requires 'field' parameter"
-            if not previous_response_body:
+            if not document.body:
                 return True, "No response body - field does not exist"
             try:
-                data = json.loads(previous_response_body)
-                actual_value = extract_variable_from_jsonpath(data, field)
+                data = document.json()
+                actual_value = extract_variable_from_jsonpath(data, condition.field_expr)
                 met = actual_value is None
                 return met, f"{field} {'does not exist' if met else 'exists'}"
             except json.JSONDecodeError:
@@ -297,6 +394,125 @@ def prepare_step_request(step: ChainStep, variables: dict[str, Any]) -> tuple[st
     return url, headers, body
 
 
+def get_step_variable_references(step: ChainStep) -> set[str]:
+    """Get names of {{variables}} used in a step's URL, headers and body."""
+    references = set(VARIABLE_PATTERN.findall(step.url or ""))
+    for value in (step.headers or {}).values():
+        references.update(VARIABLE_PATTERN.findall(value))
+    if step.body:
+        references.update(VARIABLE_PATTERN.findall(step.body))
+    return references
+
+
+def build_step_dependencies(steps: list[ChainStep], stop_on_failure: bool = False) -> dict[int, set[int]]:
+    """Build the dependency graph of chain steps.
+
+    A step depends on:
+    - the steps listed in its depends_on,
+    - for each {{variable}} it uses, the latest earlier step extracting it,
+    - the immediately preceding step if it has a condition, since
+      conditions are evaluated against the previous step's response,
+    - with stop_on_failure, the latest earlier step without
+      continue_on_failure, since its failure stops the chain before any
+      later step would have started.
+
+    Only earlier steps can be dependencies, so the graph is always acyclic.
+
+    Args:
+        steps: Chain steps ordered by step_order
+        stop_on_failure: Whether the chain stops on a failed step
+
+    Returns:
+        Dict of step_order -> set of step_orders it waits for
+    """
+    dependencies: dict[int, set[int]] = {}
+    stopping: int | None = None
+    for i, step in enumerate(steps):
+        earlier = steps[:i]
+        earlier_orders = {s.step_order for s in earlier}
+        deps = {order for order in (step.depends_on or []) if order in earlier_orders}
+
+        for var_name in get_step_variable_references(step):
+            for provider in reversed(earlier):
+                if var_name in (provider.extract_variables or {}):
+                    deps.add(provider.step_order)
+                    break
+
+        if step.condition and earlier:
+            deps.add(earlier[-1].step_order)
+
+        if stopping is not None:
+            deps.add(stopping)
+        if stop_on_failure and not step.continue_on_failure:
+            stopping = step.step_order
+
+        dependencies[step.step_order] = deps
+    return dependencies
+
+
+class StepScheduler:
+    """Decides which chain steps may start.
+
+    Steps start in step_order as soon as their dependencies have finished,
+    with at most max_parallel steps running at once. With max_parallel=1
+    steps run strictly in order, exactly like a sequential chain.
+    """
+
+    def __init__(
+        self,
+        steps: list[ChainStep],
+        max_parallel: int = 1,
+        dependencies: dict[int, set[int]] | None = None,
+    ):
+        self.dependencies = dependencies if dependencies is not None else build_step_dependencies(steps)
+        self.max_parallel = max(1, max_parallel)
+        self.pending: dict[int, ChainStep] = {step.step_order: step for step in steps}
+        self.running: set[int] = set()
+        self.finished: set[int] = set()
+        self.stopped = False
+        self._previous_order = {
+            step.step_order: steps[i - 1].step_order if i > 0 else None for i, step in enumerate(steps)
+        }
+
+    def next_ready(self) -> list[ChainStep]:
+        """Take the steps that can start now and mark them as running."""
+        if self.stopped:
+            return []
+
+        ready = []
+        slots = self.max_parallel - len(self.running)
+        for order, step in self.pending.items():
+            if len(ready) >= slots:
+                break
+            if self.dependencies[order] <= self.finished:
+                ready.append(step)
+
+        for step in ready:
+            del self.pending[step.step_order]
+            self.running.add(step.step_order)
+        return ready
+
+    def finish(self, step: ChainStep) -> None:
+        """Mark a running step as finished."""
+        self.running.discard(step.step_order)
+        self.finished.add(step.step_order)
+
+    def stop(self) -> None:
+        """Start no further steps; running steps are still allowed to finish."""
+        self.stopped = True
+
+    def restore(self, finished: set[int], running: set[int]) -> None:
+        """Restore progress of a resumed execution."""
+        for order in finished | running:
+            self.pending.pop(order, None)
+        self.finished = set(finished)
+        self.running = set(running)
+
+    def previous_step_order(self, step: ChainStep) -> int | None:
+        """Get the step_order of the step immediately before this one."""
+        return self._previous_order.get(step.step_order)
+
+
 class ChainExecutionContext:
     """Context for chain execution."""
 
@@ -306,7 +522,8 @@ class ChainExecutionContext:
         initial_variables: dict[str, Any] | None = None,
     ):
         self.chain = chain
-        self.variables: dict[str, Any] = initial_variables.copy() if initial_variables else {}
+        self.initial_variables: dict[str, Any] = initial_variables.copy() if initial_variables else {}
+        self.variables: dict[str, Any] = self.initial_variables.copy()
         self.completed_steps = 0
         self.failed_steps = 0
         self.skipped_steps = 0
@@ -314,6 +531,9 @@ class ChainExecutionContext:
         self.previous_response_body: str | None = None
         self.error_message: str | None = None
         self.started_at = datetime.utcnow()
+        # Per-step results, keyed by step_order
+        self.step_responses: dict[int, tuple[int | None, str | None]] = {}
+        self.step_variables: dict[int, dict[str, Any]] = {}
 
     def update_from_step_result(
         self,
@@ -321,8 +541,13 @@ class ChainExecutionContext:
         status_code: int | None = None,
         response_body: str | None = None,
         extracted_variables: dict[str, Any] | None = None,
+        step_order: int | None = None,
     ) -> None:
-        """Update context after step execution."""
+        """Update context after step execution.
+
+        When step_order is given the result is also recorded per step, and
+        variables are merged in step order regardless of completion order.
+        """
         if status == StepStatus.SUCCESS:
             self.completed_steps += 1
         elif status == StepStatus.FAILED:
@@ -333,8 +558,66 @@ class ChainExecutionContext:
         self.previous_status_code = status_code
         self.previous_response_body = response_body
 
+        if step_order is None:
+            if extracted_variables:
+                self.variables.update(extracted_variables)
+            return
+
+        self.step_responses[step_order] = (status_code, response_body)
         if extracted_variables:
-            self.variables.update(extracted_variables)
+            self.step_variables[step_order] = extracted_variables
+            self.variables = self.get_variables_for_step(None)
+
+    def get_variables_for_step(self, step_order: int | None) -> dict[str, Any]:
+        """Get variables visible to a step.
+
+        These are the initial variables plus those extracted by earlier
+        finished steps, applied in step order, so a step sees the same
+        values it would in a sequential run. None includes all steps.
+        """
+        variables = self.initial_variables.copy()
+        for order in sorted(self.step_variables):
+            if step_order is not None and order >= step_order:
+                break
+            variables.update(self.step_variables[order])
+        return variables
+
+    def get_step_response(self, step_order: int | None) -> tuple[int | None, str | None]:
+        """Get (status_code, response_body) recorded for a step."""
+        if step_order is None:
+            return None, None
+        return self.step_responses.get(step_order, (None, None))
+
+    def to_checkpoint(self) -> dict[str, Any]:
+        """Serialize execution state so the run can resume in a later job."""
+        return {
+            "initial_variables": self.initial_variables,
+            "step_responses": {str(order): list(response) for order, response in self.step_responses.items()},
+            "step_variables": {str(order): variables for order, variables in self.step_variables.items()},
+            "completed_steps": self.completed_steps,
+            "failed_steps": self.failed_steps,
+            "skipped_steps": self.skipped_steps,
+            "error_message": self.error_message,
+            "started_at": self.started_at.isoformat(),
+        }
+
+    @classmethod
+    def from_checkpoint(cls, chain: TaskChain, checkpoint: dict[str, Any]) -> "ChainExecutionContext":
+        """Rebuild a context saved with to_checkpoint."""
+        context = cls(chain, checkpoint.get("initial_variables"))
+        context.step_responses = {
+            int(order): (response[0], response[1]) for order, response in checkpoint.get("step_responses", {}).items()
+        }
+        context.step_variables = {
+            int(order): variables for order, variables in checkpoint.get("step_variables", {}).items()
+        }
+        context.variables = context.get_variables_for_step(None)
+        context.completed_steps = checkpoint.get("completed_steps", 0)
+        context.failed_steps = checkpoint.get("failed_steps", 0)
+        context.skipped_steps = checkpoint.get("skipped_steps", 0)
+        context.error_message = checkpoint.get("error_message")
+        context.started_at = datetime.fromisoformat(checkpoint["started_at"])
+        return context
 
     def should_continue(self, step: ChainStep, step_status: StepStatus) -> bool:
         """Check if chain execution should continue after this step."""
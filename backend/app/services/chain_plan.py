@@ -0,0 +1,151 @@
+"""Compiled chain execution plans.
+
+Executing a step used to re-parse its JSONPath expressions, regexes and
+{{variable}} templates on every run. A plan compiles all of them once per
+chain version. Plans are cached per worker process, keyed by chain id and
+versioned by the chain's and its steps' updated_at, so a chain is only
+recompiled after it or one of its steps changes.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from jsonpath_ng import JSONPath
+
+from app.models.task_chain import ChainStep, TaskChain
+from app.services.chain_executor import (
+    VARIABLE_PATTERN,
+    CompiledCondition,
+    VariableSubstitutionError,
+    build_step_dependencies,
+    compile_condition,
+    compile_jsonpath,
+)
+
+# Maximum number of chain plans kept per process
+CHAIN_PLAN_CACHE_SIZE = 256
+
+
+class CompiledTemplate:
+    """A {{variable}} template split into literal text and variable names."""
+
+    __slots__ = ("template", "_parts")
+
+    def __init__(self, template: str):
+        self.template = template
+        # Alternating literal text and variable names: [text, var, text, ...]
+        self._parts = VARIABLE_PATTERN.split(template)
+
+    @property
+    def variables(self) -> list[str]:
+        """Names of variables used in the template."""
+        return self._parts[1::2]
+
+    def render(self, variables: dict[str, Any]) -> str:
+        """Substitute variables, like substitute_variables.
+
+        Raises:
+            VariableSubstitutionError: If a required variable is missing
+        """
+        if len(self._parts) == 1:
+            return self.template
+
+        rendered = []
+        for i, part in enumerate(self._parts):
+            if i % 2 == 0:
+                rendered.append(part)
+                continue
+            if part not in variables:
+                raise VariableSubstitutionError(f"Variable '{part}' not found")
+            value = variables[part]
+            rendered.append(str(value) if value is not None else "")
+        return "".join(rendered)
+
+
+@dataclass
+class CompiledStep:
+    """Pre-compiled request templates, condition and extractors of a step."""
+
+    url: CompiledTemplate
+    headers: dict[str, CompiledTemplate]
+    body: CompiledTemplate | None
+    condition: CompiledCondition | None
+    extractors: dict[str, JSONPath | None]
+
+    def prepare_request(self, variables: dict[str, Any]) -> tuple[str, dict[str, str], str | None]:
+        """Prepare the step request, like prepare_step_request.
+
+        Raises:
+            VariableSubstitutionError: If variable substitution fails
+        """
+        url = self.url.render(variables)
+        headers = {key: value.render(variables) for key, value in self.headers.items()}
+        body = self.body.render(variables) if self.body else None
+        return url, headers, body
+
+
+@dataclass
+class CompiledChainPlan:
+    """Everything needed to execute a chain version without re-parsing."""
+
+    version: tuple
+    steps: dict[int, CompiledStep]  # step_order -> compiled step
+    dependencies: dict[int, set[int]]  # step_order -> step_orders it waits for
+
+
+def compile_step(step: ChainStep) -> CompiledStep:
+    """Compile a single chain step."""
+    return CompiledStep(
+        url=CompiledTemplate(step.url),
+        headers={key: CompiledTemplate(value) for key, value in (step.headers or {}).items()},
+        body=CompiledTemplate(step.body) if step.body else None,
+        condition=compile_condition(step.condition) if step.condition else None,
+        extractors={name: compile_jsonpath(expr) for name, expr in (step.extract_variables or {}).items()},
+    )
+
+
+def get_chain_plan_version(chain: TaskChain) -> tuple:
+    """Get the version a chain's plan is valid for.
+
+    Step fingerprints are included so a plan never outlives a step change,
+    even one that did not touch the chain itself.
+    """
+    return (
+        chain.updated_at,
+        tuple((step.id, step.step_order, step.updated_at) for step in chain.steps),
+    )
+
+
+def compile_chain_plan(chain: TaskChain) -> CompiledChainPlan:
+    """Compile all steps of a chain (with steps loaded) into a plan."""
+    return CompiledChainPlan(
+        version=get_chain_plan_version(chain),
+        steps={step.step_order: compile_step(step) for step in chain.steps},
+        dependencies=build_step_dependencies(chain.steps, chain.stop_on_failure),
+    )
+
+
+_plan_cache: OrderedDict[UUID, CompiledChainPlan] = OrderedDict()
+
+
+def get_chain_plan(chain: TaskChain) -> CompiledChainPlan:
+    """Get the compiled plan of a chain, compiling it if not cached."""
+    version = get_chain_plan_version(chain)
+    plan = _plan_cache.get(chain.id)
+    if plan is not None and plan.version == version:
+        _plan_cache.move_to_end(chain.id)
+        return plan
+
+    plan = compile_chain_plan(chain)
+    _plan_cache[chain.id] = plan
+    _plan_cache.move_to_end(chain.id)
+    while len(_plan_cache) > CHAIN_PLAN_CACHE_SIZE:
+        _plan_cache.popitem(last=False)
+    return plan
+
+
+def clear_chain_plan_cache() -> None:
+    """Drop all cached plans."""
+    _plan_cache.clear()
@@ -0,0 +1,62 @@
+"""HTTP request phase timings from httpcore trace events.
+
+httpcore reports the phases of a request to an optional ``trace`` request
+extension as ``<prefix>.<phase>.started`` / ``.complete`` events. The
+trace below timestamps them with a monotonic clock and derives connect,
+TLS, time-to-first-byte and body transfer durations.
+
+httpcore does not report name resolution separately, so the caller times
+the lookup done by SSRF validation; for hostnames the connect phase still
+includes the connection's own lookup.
+"""
+
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+
+@dataclass
+class HttpTimings:
+    """Durations of the phases of one HTTP request, in ms.
+
+    Phases that did not happen (e.g. TLS over plain HTTP, connect on a
+    reused connection) are None.
+    """
+
+    dns_ms: float | None = None
+    connect_ms: float | None = None
+    tls_ms: float | None = None
+    ttfb_ms: float | None = None  # Request sent until response headers received
+    transfer_ms: float | None = None  # Response body
+    connection_reused: bool | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class HttpTimingTrace:
+    """httpcore ``trace`` extension collecting phase timestamps."""
+
+    def __init__(self):
+        self._events: dict[str, float] = {}
+
+    async def __call__(self, event_name: str, info: dict) -> None:
+        # Drop the "connection." / "http11." / "http2." prefix
+        self._events[event_name.split(".", 1)[-1]] = time.perf_counter()
+
+    def _between(self, start: str, end: str) -> float | None:
+        if start not in self._events or end not in self._events:
+            return None
+        return round((self._events[end] - self._events[start]) * 1000, 3)
+
+    def timings(self, dns_ms: float | None = None) -> HttpTimings:
+        """Get the phase durations of the traced request."""
+        return HttpTimings(
+            dns_ms=dns_ms,
+            connect_ms=self._between("connect_tcp.started", "connect_tcp.complete"),
+            tls_ms=self._between("start_tls.started", "start_tls.complete"),
+            ttfb_ms=self._between("send_request_body.complete", "receive_response_headers.complete"),
+            transfer_ms=self._between("receive_response_body.started", "receive_response_body.complete"),
+            # A request on a new connection always connects first
+            connection_reused=("connect_tcp.started" not in self._events) if self._events else None,
+        )
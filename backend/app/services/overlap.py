@@ -1,12 +1,24 @@
-"""Overlap Prevention Service for managing concurrent task executions."""
-
+"""Overlap Prevention Service for managing concurrent task executions.
+
+Running instances are tracked either with counters on the task rows
+(``overlap_backend = "database"``) or with expiring Redis leases
+(``overlap_backend = "redis"``, see overlap_leases). With leases the
+scheduler takes a slot when it enqueues an execution, passes the lease ID
+with the job and the worker holds it with ``hold_lease`` while it runs.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime, timedelta
 from enum import Enum
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import structlog
+from arq import ArqRedis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.db.repositories.cron_tasks import CronTaskRepository
 from app.db.repositories.task_chains import TaskChainRepository
 from app.db.repositories.task_queue import TaskQueueRepository
@@ -14,6 +26,9 @@ from app.db.repositories.workspaces import WorkspaceRepository
 from app.models.cron_task import CronTask, OverlapPolicy
 from app.models.task_chain import TaskChain
 from app.models.task_queue import TaskQueue
+from app.schemas.worker import WorkerTaskInfo
+from app.services.overlap_leases import overlap_lease_store
+from app.services.worker import worker_service
 
 logger = structlog.get_logger()
 
@@ -35,10 +50,12 @@ class OverlapResult:
         action: OverlapAction,
         message: str | None = None,
         queue_position: int | None = None,
+        lease_id: str | None = None,
     ):
         self.action = action
         self.message = message
         self.queue_position = queue_position
+        self.lease_id = lease_id  # Slot lease to pass to the execution (redis backend)
 
     @property
     def should_execute(self) -> bool:
@@ -53,9 +70,32 @@ class OverlapResult:
         return None
 
 
+class HeldLease:
+    """Lease held by a running execution."""
+
+    def __init__(self, task_type: str, task_id: UUID, lease_id: str):
+        self.task_type = task_type
+        self.task_id = task_id
+        self.lease_id = lease_id
+        self.handoff_ttl: int | None = None
+
+    def hand_off(self, ttl_seconds: int) -> None:
+        """Keep the slot for a follow-up job of the same execution.
+
+        Instead of being released on exit, the lease is extended to
+        ``ttl_seconds`` for the job continuing with the same lease ID.
+        """
+        self.handoff_ttl = ttl_seconds
+
+
 class OverlapService:
     """Service for managing overlap prevention."""
 
+    @property
+    def uses_leases(self) -> bool:
+        """Whether running instances are tracked with Redis leases."""
+        return settings.overlap_backend == "redis"
+
     async def check_cron_task_overlap(
         self,
         db: AsyncSession,
@@ -70,6 +110,9 @@ class OverlapService:
         Returns:
             OverlapResult indicating whether execution should proceed
         """
+        if self.uses_leases:
+            return await self._check_lease_overlap(db, "cron", task)
+
         # Allow policy - always execute
         if task.overlap_policy == OverlapPolicy.ALLOW:
             await self._increment_running_instances(db, "cron", task.id)
@@ -130,6 +173,9 @@ class OverlapService:
         Returns:
             OverlapResult indicating whether execution should proceed
         """
+        if self.uses_leases:
+            return await self._check_lease_overlap(db, "chain", chain, initial_variables)
+
         # Allow policy - always execute
         if chain.overlap_policy == OverlapPolicy.ALLOW:
             await self._increment_running_instances(db, "chain", chain.id)
@@ -179,53 +225,95 @@ class OverlapService:
         self,
         db: AsyncSession,
         task: CronTask,
+        arq_redis: ArqRedis,
+        lease_id: str | None = None,
     ) -> None:
-        """Release running instance slot for cron task and check queue.
+        """Release running instance slot for cron task and start the next queued one.
 
         Args:
             db: Database session
             task: Cron task that finished execution
+            arq_redis: Job queue to enqueue a queued execution to
+            lease_id: Slot lease of the execution (redis backend)
         """
-        await self._decrement_running_instances(db, "cron", task.id)
-
-        # Check if there are queued executions
-        if task.overlap_policy == OverlapPolicy.QUEUE:
-            queued_task = await self._pop_from_queue(
-                db=db,
-                task_type="cron",
-                task_id=task.id,
-            )
-            if queued_task:
-                logger.info(
-                    "Processing queued cron task",
-                    task_id=str(task.id),
-                    queue_item_id=str(queued_task.id),
-                )
+        await self._release_or_hand_off(db, arq_redis, "cron", task, lease_id)
 
     async def release_chain(
         self,
         db: AsyncSession,
         chain: TaskChain,
+        arq_redis: ArqRedis,
+        lease_id: str | None = None,
     ) -> TaskQueue | None:
-        """Release running instance slot for chain and check queue.
+        """Release running instance slot for chain and start the next queued one.
 
         Args:
             db: Database session
             chain: Task chain that finished execution
+            arq_redis: Job queue to enqueue a queued execution to
+            lease_id: Slot lease of the execution (redis backend)
 
         Returns:
-            Queued task if one was found, None otherwise
+            Queued task if one was started, None otherwise
         """
-        await self._decrement_running_instances(db, "chain", chain.id)
+        return await self._release_or_hand_off(db, arq_redis, "chain", chain, lease_id)
 
-        # Check if there are queued executions
-        if chain.overlap_policy == OverlapPolicy.QUEUE:
-            return await self._pop_from_queue(
-                db=db,
-                task_type="chain",
-                task_id=chain.id,
+    async def dispatch_queued(
+        self,
+        arq_redis: ArqRedis,
+        task_type: str,
+        task: CronTask | TaskChain,
+        queued: TaskQueue,
+        lease_id: str | None = None,
+    ) -> None:
+        """Enqueue an execution taken from the queue to its worker.
+
+        Args:
+            arq_redis: Job queue of the cloud workers
+            task_type: Type of task ('cron' or 'chain')
+            task: Task of the queued execution
+            queued: Queue item that was popped
+            lease_id: Slot lease to pass to the execution (redis backend)
+        """
+        # app.workers imports this module
+        from app.workers.queues import queue_for
+
+        if task_type == "chain":
+            await arq_redis.enqueue_job(
+                "execute_chain",
+                chain_id=str(task.id),
+                initial_variables=queued.initial_variables or {},
+                lease_id=lease_id,
+                _queue_name=queue_for("execute_chain"),
             )
-        return None
+            logger.info("Started queued chain", chain_id=str(task.id), queue_item_id=str(queued.id))
+            return
+
+        if task.worker_id:
+            # Enqueue for external worker (polling)
+            task_info = WorkerTaskInfo(
+                task_id=task.id,
+                task_type="cron",
+                url=task.url,
+                method=task.method.value,
+                headers=task.headers or {},
+                body=task.body,
+                timeout_seconds=task.timeout_seconds,
+                retry_count=task.retry_count,
+                retry_delay_seconds=task.retry_delay_seconds,
+                workspace_id=task.workspace_id,
+                task_name=task.name,
+            )
+            await worker_service.enqueue_task_for_worker(task.worker_id, task_info)
+        else:
+            await arq_redis.enqueue_job(
+                "execute_cron_task",
+                task_id=str(task.id),
+                retry_attempt=queued.retry_attempt,
+                lease_id=lease_id,
+                _queue_name=queue_for("execute_cron_task"),
+            )
+        logger.info("Started queued cron task", task_id=str(task.id), queue_item_id=str(queued.id))
 
     async def get_queue_size(
         self,
@@ -243,6 +331,8 @@ class OverlapService:
         Returns:
             Number of items in queue
         """
+        if self.uses_leases:
+            return await overlap_lease_store.queue_size(task_type, task_id)
         queue_repo = TaskQueueRepository(db)
         return await queue_repo.count_by_task(task_type, task_id)
 
@@ -262,25 +352,94 @@ class OverlapService:
         Returns:
             List of queued tasks
         """
+        if self.uses_leases:
+            return await overlap_lease_store.list_workspace(workspace_id, limit)
         queue_repo = TaskQueueRepository(db)
         return await queue_repo.get_by_workspace(workspace_id, limit)
 
+    async def count_queued_tasks(
+        self,
+        db: AsyncSession,
+        workspace_id: UUID,
+    ) -> int:
+        """Get the number of queued tasks of a workspace.
+
+        Args:
+            db: Database session
+            workspace_id: Workspace ID
+
+        Returns:
+            Number of items in the workspace's queues
+        """
+        if self.uses_leases:
+            return await overlap_lease_store.count_workspace(workspace_id)
+        queue_repo = TaskQueueRepository(db)
+        return await queue_repo.count_by_workspace(workspace_id)
+
+    async def get_task_queue(
+        self,
+        db: AsyncSession,
+        workspace_id: UUID,
+        task_type: str,
+        task_id: UUID,
+    ) -> list[TaskQueue]:
+        """Get the queued executions of a task in execution order.
+
+        Args:
+            db: Database session
+            workspace_id: Workspace ID
+            task_type: Type of task ('cron' or 'chain')
+            task_id: Task ID
+
+        Returns:
+            List of queued tasks
+        """
+        if self.uses_leases:
+            items = await overlap_lease_store.list_task(task_type, task_id)
+            return [item for item in items if item.workspace_id == workspace_id]
+        queue_repo = TaskQueueRepository(db)
+        return await queue_repo.get_by_task(workspace_id, task_type, task_id)
+
     async def remove_from_queue(
         self,
         db: AsyncSession,
         queue_item_id: UUID,
+        workspace_id: UUID | None = None,
     ) -> bool:
         """Remove a task from the queue.
 
         Args:
             db: Database session
             queue_item_id: Queue item ID
+            workspace_id: Only remove the item if it belongs to this workspace
+                (required with the redis backend)
 
         Returns:
             True if item was removed, False if not found
         """
+        if self.uses_leases:
+            return await overlap_lease_store.remove(workspace_id, queue_item_id)
+        queue_repo = TaskQueueRepository(db)
+        return await queue_repo.delete_by_id(queue_item_id, workspace_id)
+
+    async def clear_workspace_queue(
+        self,
+        db: AsyncSession,
+        workspace_id: UUID,
+    ) -> int:
+        """Clear all queued executions of a workspace.
+
+        Args:
+            db: Database session
+            workspace_id: Workspace ID
+
+        Returns:
+            Number of items removed
+        """
+        if self.uses_leases:
+            return await overlap_lease_store.clear_workspace(workspace_id)
         queue_repo = TaskQueueRepository(db)
-        return await queue_repo.delete_by_id(queue_item_id)
+        return await queue_repo.delete_by_workspace(workspace_id)
 
     async def clear_task_queue(
         self,
@@ -298,6 +457,8 @@ class OverlapService:
         Returns:
             Number of items removed
         """
+        if self.uses_leases:
+            return await overlap_lease_store.clear_task(task_type, task_id)
         queue_repo = TaskQueueRepository(db)
         return await queue_repo.delete_by_task(task_type, task_id)
 
@@ -318,6 +479,10 @@ class OverlapService:
         """
         cleaned = 0
 
+        # Expired leases free their slots on their own
+        if self.uses_leases:
+            return cleaned
+
         # Cleanup cron tasks with execution_timeout set
         if timeout_threshold is None:
             # Use individual task timeouts
@@ -356,6 +521,194 @@ class OverlapService:
 
         return cleaned
 
+    def lease_ttl(self, task: CronTask | TaskChain) -> int:
+        """Get the lease TTL of an execution until a worker starts holding it.
+
+        Executions of external workers never renew their lease, so it lasts
+        for all their attempts instead.
+        """
+        ttl = settings.overlap_pending_lease_ttl_seconds
+        if getattr(task, "worker_id", None):
+            attempts = task.retry_count + 1
+            ttl = max(ttl, task.timeout_seconds * attempts + task.retry_delay_seconds * task.retry_count)
+        return ttl
+
+    async def release_lease(self, task_type: str, task_id: UUID, lease_id: str) -> None:
+        """Release a slot lease (best-effort, an unreleased lease expires)."""
+        try:
+            await overlap_lease_store.release(task_type, task_id, lease_id)
+        except Exception as e:
+            logger.warning("Failed to release overlap lease", task_type=task_type, task_id=str(task_id), error=str(e))
+
+    @asynccontextmanager
+    async def hold_lease(
+        self,
+        task_type: str,
+        task_id: UUID | str,
+        lease_id: str | None,
+    ) -> AsyncIterator[HeldLease | None]:
+        """Hold the slot lease of an execution while it runs.
+
+        The lease is switched to the running TTL, renewed in the background
+        and released on exit unless it was handed off. Executions without a
+        lease (database backend, manual runs, retries) are left alone.
+        """
+        if not lease_id:
+            yield None
+            return
+
+        lease = HeldLease(task_type, UUID(str(task_id)), lease_id)
+        ttl = settings.overlap_lease_ttl_seconds
+        await self._renew_lease(lease, ttl)
+        renewer = asyncio.create_task(self._keep_lease(lease, ttl))
+        try:
+            yield lease
+        finally:
+            renewer.cancel()
+            with suppress(asyncio.CancelledError):
+                await renewer
+            if lease.handoff_ttl is not None:
+                await self._renew_lease(lease, lease.handoff_ttl)
+            else:
+                await self.release_lease(lease.task_type, lease.task_id, lease.lease_id)
+
+    async def _renew_lease(self, lease: HeldLease, ttl_seconds: int) -> bool:
+        """Extend a held lease, logging when it can't be."""
+        try:
+            renewed = await overlap_lease_store.renew(lease.task_type, lease.task_id, lease.lease_id, ttl_seconds)
+        except Exception as e:
+            logger.warning("Failed to renew overlap lease", task_id=str(lease.task_id), error=str(e))
+            return True  # Retry on the next renewal
+        if not renewed:
+            # The slot may already be taken by another execution
+            logger.warning("Overlap lease expired", task_type=lease.task_type, task_id=str(lease.task_id))
+        return renewed
+
+    async def _keep_lease(self, lease: HeldLease, ttl_seconds: int) -> None:
+        """Renew a lease every third of its TTL until it is lost."""
+        while True:
+            await asyncio.sleep(ttl_seconds / 3)
+            if not await self._renew_lease(lease, ttl_seconds):
+                return
+
+    async def _check_lease_overlap(
+        self,
+        db: AsyncSession,
+        task_type: str,
+        task: CronTask | TaskChain,
+        initial_variables: dict | None = None,
+    ) -> OverlapResult:
+        """Check overlap with Redis leases, taking a slot if one is free."""
+        # Allow policy - always execute, nothing to track
+        if task.overlap_policy == OverlapPolicy.ALLOW:
+            return OverlapResult(OverlapAction.ALLOW)
+
+        lease_id = await overlap_lease_store.acquire(task_type, task.id, task.max_instances, self.lease_ttl(task))
+        if lease_id:
+            return OverlapResult(
+                OverlapAction.ALLOW,
+                f"Running at most {task.max_instances} instances",
+                lease_id=lease_id,
+            )
+
+        label = "Task" if task_type == "cron" else "Chain"
+
+        # All slots are held - handle based on policy
+        if task.overlap_policy == OverlapPolicy.SKIP:
+            await self._increment_skipped_count(db, task.workspace_id)
+            logger.info(
+                "Skipping task due to overlap",
+                task_type=task_type,
+                task_id=str(task.id),
+                task_name=task.name,
+                max_instances=task.max_instances,
+            )
+            return OverlapResult(
+                OverlapAction.SKIP,
+                f"{label} already running ({task.max_instances}/{task.max_instances} instances)",
+            )
+
+        # Queue policy - add to queue if not full
+        if task.overlap_policy == OverlapPolicy.QUEUE:
+            return await self._add_to_queue(
+                db=db,
+                workspace_id=task.workspace_id,
+                task_type=task_type,
+                task_id=task.id,
+                task_name=task.name,
+                max_queue_size=task.max_queue_size,
+                initial_variables=initial_variables,
+            )
+
+        return OverlapResult(OverlapAction.ALLOW)
+
+    async def _release_or_hand_off(
+        self,
+        db: AsyncSession,
+        arq_redis: ArqRedis,
+        task_type: str,
+        task: CronTask | TaskChain,
+        lease_id: str | None,
+    ) -> TaskQueue | None:
+        """Hand the slot of a finished execution to the next queued one, or release it.
+
+        The queue item is removed and the slot kept in the caller's
+        transaction (with the redis backend the lease is swapped atomically)
+        and the execution is enqueued before the caller commits, like the
+        scheduler does for due tasks.
+        """
+        queued = None
+        if task.overlap_policy == OverlapPolicy.QUEUE:
+            queued = await self._pop_from_queue(db=db, task_type=task_type, task_id=task.id)
+        if not queued:
+            await self._release_slot(db, task_type, task.id, lease_id)
+            return None
+
+        next_lease_id = None
+        if self.uses_leases:
+            next_lease_id = await overlap_lease_store.transfer(
+                task_type, task.id, lease_id, task.max_instances, self.lease_ttl(task)
+            )
+            if not next_lease_id:
+                # Our lease expired and the slot was taken meanwhile
+                await self._requeue(db, queued)
+                return None
+
+        try:
+            await self.dispatch_queued(arq_redis, task_type, task, queued, next_lease_id)
+        except Exception as e:
+            logger.error(
+                "Failed to start queued execution",
+                task_type=task_type,
+                task_id=str(task.id),
+                error=str(e),
+            )
+            await self._requeue(db, queued)
+            await self._release_slot(db, task_type, task.id, next_lease_id)
+            return None
+        return queued
+
+    async def _requeue(self, db: AsyncSession, queued: TaskQueue) -> None:
+        """Put a popped item back at the head of its queue."""
+        if self.uses_leases:
+            await overlap_lease_store.push_front(queued)
+        else:
+            # Cancels the pending delete
+            db.expunge(queued)
+
+    async def _release_slot(
+        self,
+        db: AsyncSession,
+        task_type: str,
+        task_id: UUID,
+        lease_id: str | None,
+    ) -> None:
+        """Release the running instance slot of a finished execution."""
+        if not self.uses_leases:
+            await self._decrement_running_instances(db, task_type, task_id)
+        elif lease_id:
+            await self.release_lease(task_type, task_id, lease_id)
+
     async def _increment_running_instances(
         self,
         db: AsyncSession,
@@ -413,10 +766,31 @@ class OverlapService:
         initial_variables: dict | None = None,
     ) -> OverlapResult:
         """Add task execution to queue."""
-        # Check current queue size
-        queue_size = await self.get_queue_size(db, task_type, task_id)
+        queue_item = TaskQueue(
+            workspace_id=workspace_id,
+            task_type=task_type,
+            task_id=task_id,
+            task_name=task_name,
+            priority=0,
+            queued_at=datetime.utcnow(),
+            initial_variables=initial_variables or {},
+        )
 
-        if queue_size >= max_queue_size:
+        if self.uses_leases:
+            # Nothing is flushed, so set the column defaults here
+            queue_item.id = uuid4()
+            queue_item.retry_attempt = 0
+            queue_item.created_at = queue_item.queued_at
+            # The size check and the push are one atomic step
+            queued, queue_size = await overlap_lease_store.push(queue_item, max_queue_size)
+            if queued:
+                queue_size -= 1
+        else:
+            # Check current queue size
+            queue_size = await self.get_queue_size(db, task_type, task_id)
+            queued = queue_size < max_queue_size
+
+        if not queued:
             await self._increment_skipped_count(db, workspace_id)
             logger.info(
                 "Queue full, skipping task",
@@ -431,16 +805,8 @@ class OverlapService:
             )
 
         # Add to queue
-        queue_item = TaskQueue(
-            workspace_id=workspace_id,
-            task_type=task_type,
-            task_id=task_id,
-            task_name=task_name,
-            priority=0,
-            queued_at=datetime.utcnow(),
-            initial_variables=initial_variables or {},
-        )
-        db.add(queue_item)
+        if not self.uses_leases:
+            db.add(queue_item)
         await self._increment_queued_count(db, workspace_id)
 
         logger.info(
@@ -463,6 +829,8 @@ class OverlapService:
         task_id: UUID,
     ):
         """Get and remove next item from queue."""
+        if self.uses_leases:
+            return await overlap_lease_store.pop(task_type, task_id)
         queue_repo = TaskQueueRepository(db)
         return await queue_repo.get_next_by_task(task_type, task_id)
 
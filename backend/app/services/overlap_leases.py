@@ -0,0 +1,350 @@
+"""Redis-backed concurrency slots and queues for overlap prevention.
+
+Each running execution of a task holds a lease: a member of the task's
+slots sorted set scored with its expiry time. Acquiring a slot drops
+expired leases first, so a lease leaked by a crashed worker frees its slot
+as soon as it is no longer renewed. Workers renew their lease while the
+execution runs and remove it when it finishes.
+
+Executions queued by the queue policy are kept in a Redis list per task.
+Sets of the task queues of each workspace (and of all queues) index the
+lists for the API and the scheduler; entries of drained lists are pruned
+lazily by the readers.
+"""
+
+import json
+from datetime import datetime
+from uuid import UUID, uuid4
+
+from redis.commands.core import AsyncScript
+
+from app.core.redis import redis_client
+from app.models.task_queue import TaskQueue
+
+# Redis keys
+OVERLAP_SLOTS_KEY = "overlap:slots:{task_type}:{task_id}"  # Sorted set of lease id -> expiry (ms)
+OVERLAP_QUEUE_KEY = "overlap:queue:{task_type}:{task_id}"  # List of queued execution payloads
+OVERLAP_WORKSPACE_QUEUES_KEY = "overlap:queues:{workspace_id}"  # Set of the workspace's task queues
+OVERLAP_QUEUES_KEY = "overlap:queued"  # Set of all task queues
+
+# Take a slot if fewer than ARGV[2] unexpired leases are held, after
+# dropping lease ARGV[4] if given (handing its slot over).
+# The key expires with its longest lease. Returns 1 if acquired.
+ACQUIRE_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+if ARGV[4] ~= '' then
+    redis.call('ZREM', KEYS[1], ARGV[4])
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[2]) then
+    return 0
+end
+
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[3]), ARGV[1])
+local last = redis.call('ZRANGE', KEYS[1], -1, -1, 'WITHSCORES')
+redis.call('PEXPIREAT', KEYS[1], last[2])
+return 1
+"""
+
+# Extend a lease to ARGV[2] ms from now. A lease that already expired may
+# have been replaced by another execution, so it is dropped instead.
+# Returns 1 if renewed.
+RENEW_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local expires = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if not expires or tonumber(expires) <= now then
+    redis.call('ZREM', KEYS[1], ARGV[1])
+    return 0
+end
+
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[1])
+local last = redis.call('ZRANGE', KEYS[1], -1, -1, 'WITHSCORES')
+redis.call('PEXPIREAT', KEYS[1], last[2])
+return 1
+"""
+
+# Count unexpired leases
+COUNT_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+return redis.call('ZCOUNT', KEYS[1], '(' .. now, '+inf')
+"""
+
+# Append to a task queue holding fewer than ARGV[2] items and index it.
+# Returns {pushed, queue size}.
+PUSH_SCRIPT = """
+local size = redis.call('LLEN', KEYS[1])
+if size >= tonumber(ARGV[2]) then
+    return {0, size}
+end
+
+redis.call('RPUSH', KEYS[1], ARGV[1])
+redis.call('SADD', KEYS[2], ARGV[3])
+redis.call('SADD', KEYS[3], ARGV[3])
+return {1, size + 1}
+"""
+
+# Remove a task queue from the index sets KEYS[2..] if it is empty
+PRUNE_SCRIPT = """
+if redis.call('LLEN', KEYS[1]) > 0 then
+    return 0
+end
+for i = 2, #KEYS do
+    redis.call('SREM', KEYS[i], ARGV[1])
+end
+return 1
+"""
+
+_DATETIME_FIELDS = ("queued_at", "scheduled_for", "created_at")
+
+
+def _queue_name(task_type: str, task_id: UUID) -> str:
+    """Get the index set member of a task queue."""
+    return f"{task_type}:{task_id}"
+
+
+def _queue_key(queue_name: str) -> str:
+    task_type, task_id = queue_name.split(":", 1)
+    return OVERLAP_QUEUE_KEY.format(task_type=task_type, task_id=task_id)
+
+
+def _serialize_item(item: TaskQueue) -> str:
+    data = {}
+    for column in TaskQueue.__table__.columns:
+        value = getattr(item, column.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, UUID):
+            value = str(value)
+        data[column.key] = value
+    return json.dumps(data)
+
+
+def _deserialize_item(raw: str) -> TaskQueue:
+    """Rebuild a transient TaskQueue instance from a queued payload."""
+    data = json.loads(raw)
+    for key in ("id", "workspace_id", "task_id"):
+        data[key] = UUID(data[key])
+    for key in _DATETIME_FIELDS:
+        if data.get(key):
+            data[key] = datetime.fromisoformat(data[key])
+    return TaskQueue(**data)
+
+
+class RedisOverlapStore:
+    """Lease-based concurrency slots and task queues in Redis."""
+
+    def __init__(self):
+        self._scripts: dict[str, AsyncScript] = {}
+
+    def _script(self, source: str) -> AsyncScript:
+        """Get a script registered on the current Redis client."""
+        client = redis_client.client
+        script = self._scripts.get(source)
+        if script is None or script.registered_client is not client:
+            script = self._scripts[source] = client.register_script(source)
+        return script
+
+    def _slots_key(self, task_type: str, task_id: UUID) -> str:
+        return OVERLAP_SLOTS_KEY.format(task_type=task_type, task_id=task_id)
+
+    async def acquire(self, task_type: str, task_id: UUID, limit: int, ttl_seconds: int) -> str | None:
+        """Take a slot for a new execution.
+
+        Returns:
+            Lease ID, or None if all slots are held
+        """
+        return await self.transfer(task_type, task_id, None, limit, ttl_seconds)
+
+    async def transfer(
+        self,
+        task_type: str,
+        task_id: UUID,
+        lease_id: str | None,
+        limit: int,
+        ttl_seconds: int,
+    ) -> str | None:
+        """Atomically swap a held lease for a new one of another execution.
+
+        If the old lease already expired, a slot is only taken if one is free.
+
+        Returns:
+            New lease ID, or None if all slots are held
+        """
+        new_lease_id = uuid4().hex
+        acquired = await self._script(ACQUIRE_SCRIPT)(
+            keys=[self._slots_key(task_type, task_id)],
+            args=[new_lease_id, limit, ttl_seconds * 1000, lease_id or ""],
+        )
+        return new_lease_id if acquired else None
+
+    async def renew(self, task_type: str, task_id: UUID, lease_id: str, ttl_seconds: int) -> bool:
+        """Extend a lease. Returns False if it already expired."""
+        renewed = await self._script(RENEW_SCRIPT)(
+            keys=[self._slots_key(task_type, task_id)],
+            args=[lease_id, ttl_seconds * 1000],
+        )
+        return bool(renewed)
+
+    async def release(self, task_type: str, task_id: UUID, lease_id: str) -> bool:
+        """Free a slot. Returns False if the lease was not held."""
+        return bool(await redis_client.client.zrem(self._slots_key(task_type, task_id), lease_id))
+
+    async def count_running(self, task_type: str, task_id: UUID) -> int:
+        """Count executions holding an unexpired lease."""
+        return int(await self._script(COUNT_SCRIPT)(keys=[self._slots_key(task_type, task_id)]))
+
+    async def push(self, item: TaskQueue, max_size: int) -> tuple[bool, int]:
+        """Append an execution to its task's queue unless the queue is full.
+
+        Returns:
+            Whether the item was queued, and the queue size
+        """
+        queue_name = _queue_name(item.task_type, item.task_id)
+        pushed, size = await self._script(PUSH_SCRIPT)(
+            keys=[
+                _queue_key(queue_name),
+                OVERLAP_WORKSPACE_QUEUES_KEY.format(workspace_id=item.workspace_id),
+                OVERLAP_QUEUES_KEY,
+            ],
+            args=[_serialize_item(item), max_size, queue_name],
+        )
+        return bool(pushed), int(size)
+
+    async def push_front(self, item: TaskQueue) -> None:
+        """Return a popped execution to the head of its task's queue."""
+        queue_name = _queue_name(item.task_type, item.task_id)
+        async with redis_client.client.pipeline(transaction=True) as pipe:
+            pipe.lpush(_queue_key(queue_name), _serialize_item(item))
+            pipe.sadd(OVERLAP_WORKSPACE_QUEUES_KEY.format(workspace_id=item.workspace_id), queue_name)
+            pipe.sadd(OVERLAP_QUEUES_KEY, queue_name)
+            await pipe.execute()
+
+    async def pop(self, task_type: str, task_id: UUID) -> TaskQueue | None:
+        """Remove and return the oldest queued execution of a task."""
+        raw = await redis_client.client.lpop(_queue_key(_queue_name(task_type, task_id)))
+        return _deserialize_item(raw) if raw else None
+
+    async def queue_size(self, task_type: str, task_id: UUID) -> int:
+        """Get the number of queued executions of a task."""
+        return await redis_client.client.llen(_queue_key(_queue_name(task_type, task_id)))
+
+    async def list_task(self, task_type: str, task_id: UUID) -> list[TaskQueue]:
+        """Get the queued executions of a task in queue order."""
+        raws = await redis_client.client.lrange(_queue_key(_queue_name(task_type, task_id)), 0, -1)
+        return [_deserialize_item(raw) for raw in raws]
+
+    async def list_workspace(self, workspace_id: UUID, limit: int = 100) -> list[TaskQueue]:
+        """Get a workspace's queued executions, ordered by priority and time."""
+        queues = await self._workspace_queues(workspace_id)
+        if not queues:
+            return []
+
+        async with redis_client.client.pipeline(transaction=False) as pipe:
+            for queue_name in queues:
+                pipe.lrange(_queue_key(queue_name), 0, -1)
+            results = await pipe.execute()
+
+        items = [_deserialize_item(raw) for raws in results for raw in raws]
+        await self._prune(workspace_id, [name for name, raws in zip(queues, results) if not raws])
+        items.sort(key=lambda item: (-item.priority, item.queued_at))
+        return items[:limit]
+
+    async def count_workspace(self, workspace_id: UUID) -> int:
+        """Get the number of a workspace's queued executions."""
+        queues = await self._workspace_queues(workspace_id)
+        if not queues:
+            return 0
+
+        async with redis_client.client.pipeline(transaction=False) as pipe:
+            for queue_name in queues:
+                pipe.llen(_queue_key(queue_name))
+            sizes = await pipe.execute()
+
+        await self._prune(workspace_id, [name for name, size in zip(queues, sizes) if not size])
+        return sum(sizes)
+
+    async def remove(self, workspace_id: UUID, queue_item_id: UUID) -> bool:
+        """Remove one queued execution of a workspace.
+
+        Returns:
+            True if the item was removed, False if not found
+        """
+        client = redis_client.client
+        for queue_name in await self._workspace_queues(workspace_id):
+            for raw in await client.lrange(_queue_key(queue_name), 0, -1):
+                if json.loads(raw)["id"] == str(queue_item_id):
+                    removed = await client.lrem(_queue_key(queue_name), 1, raw)
+                    await self._prune(workspace_id, [queue_name])
+                    return bool(removed)
+        return False
+
+    async def clear_task(self, task_type: str, task_id: UUID) -> int:
+        """Remove all queued executions of a task. Returns the number removed."""
+        key = _queue_key(_queue_name(task_type, task_id))
+        async with redis_client.client.pipeline(transaction=True) as pipe:
+            pipe.llen(key)
+            pipe.delete(key)
+            size, _ = await pipe.execute()
+        return size
+
+    async def clear_workspace(self, workspace_id: UUID) -> int:
+        """Remove all queued executions of a workspace. Returns the number removed."""
+        queues = await self._workspace_queues(workspace_id)
+        if not queues:
+            return 0
+
+        keys = [_queue_key(queue_name) for queue_name in queues]
+        async with redis_client.client.pipeline(transaction=True) as pipe:
+            for key in keys:
+                pipe.llen(key)
+            pipe.delete(*keys)
+            pipe.delete(OVERLAP_WORKSPACE_QUEUES_KEY.format(workspace_id=workspace_id))
+            pipe.srem(OVERLAP_QUEUES_KEY, *queues)
+            results = await pipe.execute()
+        return sum(results[: len(keys)])
+
+    async def queued_tasks(self) -> list[tuple[str, UUID]]:
+        """Get the (task type, task ID) of every task with queued executions."""
+        client = redis_client.client
+        queues = sorted(await client.smembers(OVERLAP_QUEUES_KEY))
+        if not queues:
+            return []
+
+        async with client.pipeline(transaction=False) as pipe:
+            for queue_name in queues:
+                pipe.llen(_queue_key(queue_name))
+            sizes = await pipe.execute()
+
+        tasks = []
+        for queue_name, size in zip(queues, sizes):
+            if size:
+                task_type, task_id = queue_name.split(":", 1)
+                tasks.append((task_type, UUID(task_id)))
+            else:
+                await self._script(PRUNE_SCRIPT)(keys=[_queue_key(queue_name), OVERLAP_QUEUES_KEY], args=[queue_name])
+        return tasks
+
+    async def _workspace_queues(self, workspace_id: UUID) -> list[str]:
+        members = await redis_client.client.smembers(OVERLAP_WORKSPACE_QUEUES_KEY.format(workspace_id=workspace_id))
+        return sorted(members)
+
+    async def _prune(self, workspace_id: UUID, queue_names: list[str]) -> None:
+        """Drop drained task queues from the index sets."""
+        for queue_name in queue_names:
+            await self._script(PRUNE_SCRIPT)(
+                keys=[
+                    _queue_key(queue_name),
+                    OVERLAP_WORKSPACE_QUEUES_KEY.format(workspace_id=workspace_id),
+                    OVERLAP_QUEUES_KEY,
+                ],
+                args=[queue_name],
+            )
+
+
+# Global instance
+overlap_lease_store = RedisOverlapStore()
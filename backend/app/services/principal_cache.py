@@ -0,0 +1,143 @@
+"""Short-TTL cache of the authenticated principal.
+
+Every authenticated request needs the user row and their subscription
+status. These change rarely, so they are cached in Redis for a short time
+and invalidated explicitly after the transaction that changes them commits.
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+import structlog
+from sqlalchemy import DateTime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+
+from app.core.redis import redis_client
+from app.models.subscription import SubscriptionStatus
+from app.models.user import User
+
+logger = structlog.get_logger()
+
+# Cache key for a user's principal
+PRINCIPAL_CACHE_KEY = "cache:principal:{user_id}"
+PRINCIPAL_CACHE_TTL = 60  # 1 minute
+
+# Columns that are never written to Redis. They stay unloaded on cached
+# users and are fetched on demand (e.g. change_password refreshes the hash).
+PRINCIPAL_EXCLUDED_COLUMNS = frozenset({"password_hash"})
+
+
+@dataclass
+class Principal:
+    """Authenticated user with the data needed by request dependencies."""
+
+    user: User
+    subscription_status: SubscriptionStatus | None = None
+
+
+def _serialize_user(user: User) -> dict:
+    """Serialize user columns to JSON-compatible values."""
+    data = {}
+    for column in User.__table__.columns:
+        if column.key in PRINCIPAL_EXCLUDED_COLUMNS:
+            continue
+        value = getattr(user, column.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, UUID):
+            value = str(value)
+        data[column.key] = value
+    return data
+
+
+def _deserialize_user(data: dict) -> User:
+    """Rebuild a detached User instance from cached column values."""
+    values = {}
+    for column in User.__table__.columns:
+        if column.key not in data:
+            continue
+        value = data[column.key]
+        if value is not None:
+            if isinstance(column.type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif column.key == "id":
+                value = UUID(value)
+        values[column.key] = value
+
+    user = User(**values)
+    # Mark as persistent-but-detached so attaching it to a session
+    # does not emit an INSERT and later updates emit a plain UPDATE.
+    make_transient_to_detached(user)
+    return user
+
+
+class PrincipalCache:
+    """Redis-backed cache of authenticated principals."""
+
+    def _key(self, user_id: UUID) -> str:
+        return PRINCIPAL_CACHE_KEY.format(user_id=user_id)
+
+    async def get(self, db: AsyncSession, user_id: UUID) -> Principal | None:
+        """Get a principal from cache, loading it in one query on a miss.
+
+        The returned user is attached to ``db`` so endpoints can modify and
+        flush it as if it had been loaded by the session itself.
+        """
+        try:
+            cached = await redis_client.get(self._key(user_id))
+            if cached:
+                data = json.loads(cached)
+                # Reuse the session's instance if this user is already loaded
+                user = db.identity_map.get(identity_key(User, user_id))
+                if user is None:
+                    user = _deserialize_user(data["user"])
+                    db.add(user)
+                return Principal(
+                    user=user,
+                    subscription_status=(
+                        SubscriptionStatus(data["subscription_status"]) if data["subscription_status"] else None
+                    ),
+                )
+        except Exception as e:
+            logger.warning("Failed to get principal from cache", user_id=str(user_id), error=str(e))
+
+        from app.db.repositories.users import UserRepository
+
+        row = await UserRepository(db).get_principal(user_id)
+        if row is None:
+            return None
+
+        principal = Principal(user=row[0], subscription_status=row[1])
+        await self.set(principal)
+        return principal
+
+    async def set(self, principal: Principal) -> None:
+        """Store a principal in cache (best-effort)."""
+        try:
+            data = {
+                "user": _serialize_user(principal.user),
+                "subscription_status": (principal.subscription_status.value if principal.subscription_status else None),
+            }
+            await redis_client.set(self._key(principal.user.id), json.dumps(data), expire=PRINCIPAL_CACHE_TTL)
+        except Exception as e:
+            logger.warning("Failed to cache principal", user_id=str(principal.user.id), error=str(e))
+
+    async def invalidate(self, *user_ids: UUID) -> None:
+        """Drop cached principals. Call this AFTER commit of the change.
+
+        Best-effort: errors are logged, the entry expires with its TTL anyway.
+        """
+        if not user_ids:
+            return
+        try:
+            await redis_client.client.delete(*(self._key(user_id) for user_id in user_ids))
+        except Exception as e:
+            logger.warning("Failed to invalidate principal cache", error=str(e))
+
+
+# Global instance
+principal_cache = PrincipalCache()
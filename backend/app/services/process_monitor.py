@@ -5,7 +5,6 @@ from datetime import datetime, time, timedelta, timezone
 
 import pytz
 import structlog
-from croniter import croniter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.repositories.executions import ExecutionRepository
@@ -23,6 +22,7 @@ from app.models.process_monitor import (
 )
 from app.services.i18n import t
 from app.services.notifications import notification_service
+from app.services.schedule import get_schedule
 
 logger = structlog.get_logger()
 
@@ -93,9 +93,7 @@ class ProcessMonitorService:
         if monitor.schedule_type == ScheduleType.CRON:
             if not monitor.schedule_cron:
                 return None
-            cron = croniter(monitor.schedule_cron, local_time)
-            next_run = cron.get_next(datetime)
-            return next_run.astimezone(pytz.UTC).replace(tzinfo=None)
+            return get_schedule(monitor.schedule_cron, tz.zone).next_fire(local_time)
 
         elif monitor.schedule_type == ScheduleType.INTERVAL:
             if not monitor.schedule_interval:
@@ -0,0 +1,149 @@
+"""Cron schedule engine.
+
+Every next-run computation (API, scheduler, workers, process monitors) goes
+through here. Parsing a cron expression and resolving its timezone happens
+once per (expression, timezone) pair; compiled schedules are kept in an LRU
+and reused for every later call.
+
+Results are identical to the previous inline
+``croniter(expr, datetime.now(pytz.timezone(tz))).get_next(datetime)``
+sequence: the same croniter arithmetic runs from the same localized start
+time, so DST gaps and overlaps resolve exactly as before. All returned times
+are naive UTC, as stored in the database.
+
+Cron tasks may opt into deterministic jitter: each task gets a stable offset
+within a configured window, derived from its id, and its whole schedule is
+shifted by that offset. Tasks on popular expressions like ``*/5 * * * *``
+then spread across the window instead of all falling due at second 0.
+"""
+
+import threading
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from uuid import UUID
+
+import pytz
+import structlog
+from croniter import croniter
+
+logger = structlog.get_logger()
+
+# Maximum number of compiled (expression, timezone) schedules kept per process
+SCHEDULE_CACHE_SIZE = 4096
+
+# Consecutive fire times sampled to find a schedule's minimum interval
+MIN_INTERVAL_SAMPLES = 10
+
+
+class CompiledSchedule:
+    """A parsed cron expression bound to a resolved timezone."""
+
+    __slots__ = ("expression", "timezone", "tz", "_cron", "_lock")
+
+    def __init__(self, expression: str, timezone: str):
+        self.expression = expression
+        self.timezone = timezone
+        self.tz = pytz.timezone(timezone)
+        # Parsed once; each computation only resets its start time
+        self._cron = croniter(expression, datetime.now(self.tz))
+        self._lock = threading.Lock()
+
+    def _local_start(self, after: datetime | None) -> datetime:
+        """Convert a start time (naive UTC, aware, or None for now) to local time."""
+        if after is None:
+            return datetime.now(self.tz)
+        if after.tzinfo is None:
+            after = after.replace(tzinfo=timezone.utc)
+        return after.astimezone(self.tz)
+
+    def next_fire(self, after: datetime | None = None) -> datetime:
+        """Get the first fire time after `after` (default: now) as naive UTC."""
+        return self.next_fires(1, after)[0]
+
+    def next_fires(self, count: int, after: datetime | None = None) -> list[datetime]:
+        """Get `count` consecutive fire times after `after` as naive UTC."""
+        start = self._local_start(after)
+        # The croniter instance is stateful and shared by all callers
+        with self._lock:
+            fires = [self._cron.get_next(datetime, start_time=start)]
+            fires.extend(self._cron.get_next(datetime) for _ in range(count - 1))
+        return [fire.astimezone(pytz.UTC).replace(tzinfo=None) for fire in fires]
+
+
+@lru_cache(maxsize=SCHEDULE_CACHE_SIZE)
+def get_schedule(expression: str, timezone: str) -> CompiledSchedule:
+    """Get the compiled schedule for an expression and timezone.
+
+    Raises:
+        ValueError: If the cron expression is invalid
+        pytz.UnknownTimeZoneError: If the timezone is unknown
+    """
+    return CompiledSchedule(expression, timezone)
+
+
+def get_jitter_offset(key: UUID, window_seconds: int | None) -> int:
+    """Get the stable offset in [0, window_seconds) for a task id."""
+    if not window_seconds or window_seconds <= 0:
+        return 0
+    return key.int % window_seconds
+
+
+def get_task_jitter_offset(task_id: UUID, task_window: int | None, workspace_window: int | None) -> int:
+    """Get a cron task's offset; the task's window overrides the workspace default."""
+    return get_jitter_offset(task_id, workspace_window if task_window is None else task_window)
+
+
+def calculate_next_run(
+    schedule: str,
+    timezone: str,
+    after: datetime | None = None,
+    offset_seconds: int = 0,
+) -> datetime:
+    """Calculate next run time based on cron schedule and timezone.
+
+    A non-zero offset shifts every fire time of the schedule by that many
+    seconds, so exactly one run still happens per schedule slot.
+    """
+    compiled = get_schedule(schedule, timezone)
+    if not offset_seconds:
+        return compiled.next_fire(after)
+
+    offset = timedelta(seconds=offset_seconds)
+    if after is None:
+        after = datetime.utcnow()
+    return compiled.next_fire(after - offset) + offset
+
+
+def calculate_next_runs(
+    schedules: Iterable[tuple[str, str, int]],
+    after: datetime | None = None,
+) -> list[datetime | None]:
+    """Calculate next run times for many (schedule, timezone, offset_seconds) items.
+
+    All items share one start time and each distinct item is computed once,
+    so a batch of tasks on common schedules costs a handful of croniter
+    calls. Invalid schedules or timezones yield None (and are logged) instead
+    of failing the whole batch.
+    """
+    if after is None:
+        after = datetime.utcnow()
+
+    computed: dict[tuple[str, str, int], datetime | None] = {}
+    results = []
+    for key in schedules:
+        if key not in computed:
+            schedule, timezone, offset_seconds = key
+            try:
+                computed[key] = calculate_next_run(schedule, timezone, after, offset_seconds)
+            except Exception as e:
+                logger.warning("Invalid schedule", schedule=schedule, timezone=timezone, error=str(e))
+                computed[key] = None
+        results.append(computed[key])
+    return results
+
+
+def calculate_min_interval_minutes(schedule: str, timezone: str) -> int:
+    """Calculate minimum interval between cron runs in minutes."""
+    run_times = get_schedule(schedule, timezone).next_fires(MIN_INTERVAL_SAMPLES)
+    return int(min((b - a).total_seconds() / 60 for a, b in zip(run_times, run_times[1:])))
@@ -0,0 +1,78 @@
+"""Write-behind tracking of user activity (last_login_at).
+
+Authenticated requests record activity in Redis instead of committing
+the user row mid-request. The scheduler periodically flushes pending
+timestamps to the database with a single bulk UPDATE.
+"""
+
+from datetime import datetime, timezone
+from uuid import UUID
+
+import structlog
+from sqlalchemy import bindparam, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.redis import redis_client
+from app.models.user import User
+
+logger = structlog.get_logger()
+
+# Redis keys
+ACTIVITY_PENDING_KEY = "activity:last_seen"  # Hash of user_id -> ISO timestamp
+ACTIVITY_THROTTLE_KEY = "activity:throttle:{user_id}"
+
+# Record activity at most once per interval per user
+ACTIVITY_THROTTLE_SECONDS = 300  # 5 minutes
+
+
+class UserActivityService:
+    """Service for buffering and flushing user activity timestamps."""
+
+    async def record(self, user_id: UUID) -> bool:
+        """Record user activity, throttled per user.
+
+        Returns True if activity was buffered (or throttled), False if Redis
+        is unavailable and the caller should fall back to a direct update.
+        """
+        try:
+            throttle_key = ACTIVITY_THROTTLE_KEY.format(user_id=user_id)
+            first_in_window = await redis_client.client.set(throttle_key, "1", ex=ACTIVITY_THROTTLE_SECONDS, nx=True)
+            if first_in_window:
+                now = datetime.now(timezone.utc)
+                await redis_client.client.hset(ACTIVITY_PENDING_KEY, str(user_id), now.isoformat())
+            return True
+        except Exception as e:
+            logger.warning("Failed to record user activity", user_id=str(user_id), error=str(e))
+            return False
+
+    async def flush(self, db: AsyncSession) -> int:
+        """Write buffered activity timestamps to the database.
+
+        The pending hash is read and deleted atomically, so concurrent
+        flushes never write the same entries twice.
+
+        Returns number of users updated.
+        """
+        async with redis_client.client.pipeline(transaction=True) as pipe:
+            pipe.hgetall(ACTIVITY_PENDING_KEY)
+            pipe.delete(ACTIVITY_PENDING_KEY)
+            pending, _ = await pipe.execute()
+
+        if not pending:
+            return 0
+
+        rows = [
+            {"user_id": UUID(user_id), "seen_at": datetime.fromisoformat(timestamp)}
+            for user_id, timestamp in pending.items()
+        ]
+        # Single executemany UPDATE; rows of deleted users simply match nothing
+        users = User.__table__
+        stmt = update(users).where(users.c.id == bindparam("user_id")).values(last_login_at=bindparam("seen_at"))
+        await db.execute(stmt, rows)
+        await db.commit()
+
+        return len(rows)
+
+
+# Global instance
+user_activity_service = UserActivityService()
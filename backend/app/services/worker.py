@@ -1,16 +1,17 @@
 """Worker service for external task execution."""
 
 from datetime import datetime, timezone
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import structlog
 from redis.asyncio import Redis
-from sqlalchemy import select
+from redis.commands.core import AsyncScript
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.redis import get_redis
 from app.core.security import get_password_hash, verify_password
-from app.models.cron_task import CronTask, TaskStatus
+from app.models.cron_task import CronTask, ProtocolType, TaskStatus
 from app.models.delayed_task import DelayedTask
 from app.models.execution import Execution
 from app.models.worker import Worker, WorkerStatus
@@ -28,10 +29,74 @@ logger = structlog.get_logger()
 WORKER_TASKS_KEY = "worker:{worker_id}:tasks"  # List of pending tasks for worker
 WORKER_TASK_DATA_KEY = "worker:task:{task_id}"  # Task data hash
 
+# Long-poll wait cap for GET /worker/tasks
+MAX_POLL_WAIT_SECONDS = 30
+
+# Return the payloads of the given task data keys and delete them, so a
+# popped batch is fetched in one round trip and cannot be handed out twice.
+POP_TASKS_SCRIPT = """
+local payloads = {}
+for _, task_key in ipairs(KEYS) do
+    local data = redis.call('GET', task_key)
+    if data then
+        payloads[#payloads + 1] = data
+        redis.call('DEL', task_key)
+    end
+end
+return payloads
+"""
+
+
+def _to_naive_utc(value: datetime) -> datetime:
+    """Convert a worker-reported timestamp to naive UTC as stored in the database."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _build_execution(
+    worker: Worker,
+    result: WorkerTaskResult,
+    task: CronTask | DelayedTask,
+    status: TaskStatus,
+) -> dict:
+    """Build an execution row for bulk insert from a worker result."""
+    return {
+        "id": uuid4(),
+        "workspace_id": worker.workspace_id,
+        "task_type": result.task_type,
+        "task_id": result.task_id,
+        "task_name": task.name,
+        "cron_task_id": task.id if isinstance(task, CronTask) else None,
+        "status": status,
+        "started_at": _to_naive_utc(result.started_at),
+        "finished_at": _to_naive_utc(result.finished_at),
+        "duration_ms": result.duration_ms,
+        "request_url": task.url,
+        "request_method": task.method,
+        "protocol_type": ProtocolType.HTTP,
+        "response_status_code": result.status_code,
+        "response_headers": result.response_headers,
+        "response_body": result.response_body[:10000] if result.response_body else None,
+        "response_size_bytes": len(result.response_body.encode()) if result.response_body else None,
+        "error_message": result.error,
+        "error_type": result.error_type,
+        "created_at": datetime.utcnow(),
+    }
+
 
 class WorkerService:
     """Service for managing external workers and their tasks."""
 
+    def __init__(self):
+        self._pop_script: AsyncScript | None = None
+
+    def _get_pop_script(self, redis: Redis) -> AsyncScript:
+        """Get the batch pop script registered on the given client."""
+        if self._pop_script is None or self._pop_script.registered_client is not redis:
+            self._pop_script = redis.register_script(POP_TASKS_SCRIPT)
+        return self._pop_script
+
     async def create_worker(
         self,
         db: AsyncSession,
@@ -195,33 +260,47 @@ class WorkerService:
             task_id=str(task_info.task_id),
         )
 
+    async def get_queue_depths(self) -> dict[str, int]:
+        """Get the number of tasks waiting in each worker's list, by worker id."""
+        redis: Redis = await get_redis()
+        keys = [key async for key in redis.scan_iter(match=WORKER_TASKS_KEY.format(worker_id="*"), count=500)]
+        if not keys:
+            return {}
+
+        async with redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.llen(key)
+            lengths = await pipe.execute()
+
+        # Keys are worker:{worker_id}:tasks
+        return {key.split(":")[1]: length for key, length in zip(keys, lengths)}
+
     async def poll_tasks(
         self,
         worker_id: UUID,
         max_tasks: int = 10,
+        wait_seconds: float = 0,
     ) -> list[WorkerTaskInfo]:
-        """Get pending tasks for a worker."""
+        """Get pending tasks for a worker.
+
+        With ``wait_seconds`` > 0 an empty queue is long-polled: the call
+        blocks until a task arrives or the wait expires.
+        """
         redis: Redis = await get_redis()
         queue_key = WORKER_TASKS_KEY.format(worker_id=worker_id)
 
-        tasks = []
-
-        # Pop tasks from queue
-        for _ in range(max_tasks):
-            task_id = await redis.lpop(queue_key)
-            if not task_id:
-                break
+        task_ids = await redis.lpop(queue_key, max_tasks)
+        if not task_ids and wait_seconds > 0:
+            popped = await redis.blmpop(wait_seconds, 1, queue_key, direction="LEFT", count=max_tasks)
+            if popped:
+                _, task_ids = popped
+        if not task_ids:
+            return []
 
-            # Get task data
-            task_key = WORKER_TASK_DATA_KEY.format(task_id=task_id.decode())
-            task_data = await redis.get(task_key)
+        pop_script = self._get_pop_script(redis)
+        payloads = await pop_script(keys=[WORKER_TASK_DATA_KEY.format(task_id=task_id) for task_id in task_ids])
 
-            if task_data:
-                tasks.append(WorkerTaskInfo.model_validate_json(task_data))
-                # Delete task data after retrieval
-                await redis.delete(task_key)
-
-        return tasks
+        return [WorkerTaskInfo.model_validate_json(payload) for payload in payloads]
 
     async def process_task_result(
         self,
@@ -230,76 +309,124 @@ class WorkerService:
         result: WorkerTaskResult,
     ) -> bool:
         """Process task execution result from worker."""
+        accepted, _ = await self.process_task_results(db, worker, [result])
+        return accepted == 1
+
+    async def process_task_results(
+        self,
+        db: AsyncSession,
+        worker: Worker,
+        results: list[WorkerTaskResult],
+    ) -> tuple[int, list[UUID]]:
+        """Process a batch of task execution results from a worker.
+
+        Referenced tasks are loaded with one query per task type, executions
+        are bulk-inserted and worker counters are updated once per batch.
+        Results for tasks outside the worker's workspace are rejected.
+
+        A result is identified by its task id and started_at, so a batch the
+        worker resubmits after a lost response is not recorded twice: results
+        that already have an execution are accepted without being applied
+        again. Batches of one worker are serialized by locking its row.
+
+        Returns (accepted count, rejected task ids). On a database error the
+        whole batch is rolled back and reported as rejected.
+        """
         try:
-            # Determine success/failure
-            is_success = result.error is None and result.status_code is not None
-
-            # Create execution record
-            execution = Execution(
-                workspace_id=worker.workspace_id,
-                cron_task_id=result.task_id if result.task_type == "cron" else None,
-                delayed_task_id=result.task_id if result.task_type == "delayed" else None,
-                status=TaskStatus.SUCCESS if is_success else TaskStatus.FAILED,
-                started_at=result.started_at,
-                finished_at=result.finished_at,
-                duration_ms=result.duration_ms,
-                request_url="",  # Will be set from task
-                request_method="",  # Will be set from task
-                response_status=result.status_code,
-                response_body=result.response_body[:10000] if result.response_body else None,
-                response_headers=result.response_headers,
-                error_message=result.error,
+            # A retry waits here until the attempt it repeats has committed
+            await db.execute(
+                select(Worker).where(Worker.id == worker.id).with_for_update().execution_options(populate_existing=True)
             )
 
-            # Update task based on type
-            if result.task_type == "cron":
-                task = await db.get(CronTask, result.task_id)
-                if task:
-                    execution.request_url = task.url
-                    execution.request_method = task.method.value
-                    task.last_run_at = result.finished_at
-                    task.last_status = TaskStatus.SUCCESS if is_success else TaskStatus.FAILED
+            rows = await db.execute(
+                select(Execution.task_id, Execution.started_at).where(
+                    Execution.workspace_id == worker.workspace_id,
+                    Execution.task_id.in_({r.task_id for r in results}),
+                    Execution.started_at.in_({_to_naive_utc(r.started_at) for r in results}),
+                )
+            )
+            recorded = set(rows.all())
+            new_results = []
+            for result in results:
+                key = (result.task_id, _to_naive_utc(result.started_at))
+                if key not in recorded:
+                    recorded.add(key)
+                    new_results.append(result)
+            duplicates = len(results) - len(new_results)
+
+            cron_ids = {r.task_id for r in new_results if r.task_type == "cron"}
+            delayed_ids = {r.task_id for r in new_results if r.task_type == "delayed"}
+
+            tasks: dict[tuple[str, UUID], CronTask | DelayedTask] = {}
+            if cron_ids:
+                rows = await db.execute(
+                    select(CronTask).where(CronTask.id.in_(cron_ids), CronTask.workspace_id == worker.workspace_id)
+                )
+                tasks.update((("cron", task.id), task) for task in rows.scalars())
+            if delayed_ids:
+                rows = await db.execute(
+                    select(DelayedTask).where(
+                        DelayedTask.id.in_(delayed_ids), DelayedTask.workspace_id == worker.workspace_id
+                    )
+                )
+                tasks.update((("delayed", task.id), task) for task in rows.scalars())
+
+            executions = []
+            rejected = []
+            succeeded = 0
+            # Apply in completion order so the latest result wins on the task
+            for result in sorted(new_results, key=lambda r: _to_naive_utc(r.finished_at)):
+                task = tasks.get((result.task_type, result.task_id))
+                if task is None:
+                    rejected.append(result.task_id)
+                    continue
+
+                is_success = result.error is None and result.status_code is not None
+                status = TaskStatus.SUCCESS if is_success else TaskStatus.FAILED
+                finished_at = _to_naive_utc(result.finished_at)
+                succeeded += is_success
+
+                executions.append(_build_execution(worker, result, task, status))
+
+                if isinstance(task, CronTask):
+                    task.last_run_at = finished_at
+                    task.last_status = status
                     if is_success:
                         task.consecutive_failures = 0
                     else:
                         task.consecutive_failures += 1
+                else:
+                    task.status = status
+                    task.executed_at = finished_at
 
-            elif result.task_type == "delayed":
-                task = await db.get(DelayedTask, result.task_id)
-                if task:
-                    execution.request_url = task.url
-                    execution.request_method = task.method.value
-                    task.status = TaskStatus.SUCCESS if is_success else TaskStatus.FAILED
-                    task.executed_at = result.finished_at
-
-            db.add(execution)
+            if executions:
+                await db.execute(insert(Execution), executions)
 
             # Update worker stats
-            if is_success:
-                worker.tasks_completed += 1
-            else:
-                worker.tasks_failed += 1
+            worker.tasks_completed += succeeded
+            worker.tasks_failed += len(executions) - succeeded
 
             await db.commit()
 
-            logger.info(
-                "Task result processed",
-                worker_id=str(worker.id),
-                task_id=str(result.task_id),
-                success=is_success,
-            )
-
-            return True
-
         except Exception as e:
             logger.error(
-                "Failed to process task result",
+                "Failed to process task results",
                 worker_id=str(worker.id),
-                task_id=str(result.task_id),
+                count=len(results),
                 error=str(e),
             )
             await db.rollback()
-            return False
+            return 0, [r.task_id for r in results]
+
+        logger.info(
+            "Task results processed",
+            worker_id=str(worker.id),
+            accepted=len(executions),
+            duplicates=duplicates,
+            rejected=len(rejected),
+        )
+
+        return len(executions) + duplicates, rejected
 
     async def mark_offline_workers(
         self,
@@ -0,0 +1,172 @@
+"""Cached workspace dashboard summary.
+
+The workspace dashboard shows counts across every monitor type plus recent
+execution statistics. They are computed with two aggregate queries run
+concurrently and cached in Redis for a short time. Mutations of tasks and
+monitors (and executions that change a task's status) invalidate the cache
+after they commit; plain counters such as executions today refresh with the
+TTL.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import structlog
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.redis import redis_client
+from app.db.database import async_session_factory
+from app.models.cron_task import CronTask, TaskStatus
+from app.models.delayed_task import DelayedTask
+from app.models.execution import Execution
+from app.models.heartbeat import Heartbeat, HeartbeatStatus
+from app.models.ssl_monitor import SSLMonitor, SSLMonitorStatus
+from app.models.task_chain import TaskChain
+
+logger = structlog.get_logger()
+
+# Cache key for a workspace's summary
+WORKSPACE_SUMMARY_CACHE_KEY = "cache:workspace:summary:{workspace_id}"
+WORKSPACE_SUMMARY_CACHE_TTL = 30  # Seconds
+
+
+def _count(column, *conditions):
+    count = func.count(column)
+    return count.filter(*conditions) if conditions else count
+
+
+def build_entity_counts_query(workspace_id: UUID):
+    """Build one statement returning task and monitor counts as a single row."""
+    cron_tasks = (
+        select(
+            _count(CronTask.id, CronTask.is_active.is_(True)).label("active_cron_tasks"),
+            _count(CronTask.id, CronTask.is_active.is_(True), CronTask.consecutive_failures > 0).label(
+                "attention_cron_failing"
+            ),
+        )
+        .where(CronTask.workspace_id == workspace_id)
+        .subquery()
+    )
+    delayed_tasks = (
+        select(_count(DelayedTask.id, DelayedTask.status == TaskStatus.PENDING).label("pending_delayed_tasks"))
+        .where(DelayedTask.workspace_id == workspace_id)
+        .subquery()
+    )
+    heartbeats = (
+        select(
+            _count(Heartbeat.id).label("heartbeats_total"),
+            _count(Heartbeat.id, Heartbeat.status == HeartbeatStatus.HEALTHY).label("heartbeats_healthy"),
+            _count(Heartbeat.id, Heartbeat.status.in_([HeartbeatStatus.LATE, HeartbeatStatus.DEAD])).label(
+                "heartbeats_unhealthy"
+            ),
+        )
+        .where(Heartbeat.workspace_id == workspace_id)
+        .subquery()
+    )
+    ssl_monitors = (
+        select(
+            _count(SSLMonitor.id).label("ssl_monitors_total"),
+            _count(SSLMonitor.id, SSLMonitor.status == SSLMonitorStatus.EXPIRING).label("ssl_expiring_soon"),
+            _count(
+                SSLMonitor.id,
+                SSLMonitor.status.in_([SSLMonitorStatus.EXPIRING, SSLMonitorStatus.EXPIRED, SSLMonitorStatus.ERROR]),
+            ).label("attention_ssl"),
+        )
+        .where(SSLMonitor.workspace_id == workspace_id)
+        .subquery()
+    )
+    task_chains = (
+        select(
+            _count(TaskChain.id).label("chains_total"),
+            _count(TaskChain.id, TaskChain.is_active.is_(True)).label("chains_active"),
+            _count(TaskChain.id, TaskChain.is_active.is_(True), TaskChain.consecutive_failures > 0).label(
+                "attention_chains_failing"
+            ),
+        )
+        .where(TaskChain.workspace_id == workspace_id)
+        .subquery()
+    )
+    # Every subquery returns exactly one row, so the cross join is one row too
+    return select(cron_tasks, delayed_tasks, heartbeats, ssl_monitors, task_chains)
+
+
+def build_execution_stats_query(workspace_id: UUID, now: datetime):
+    """Build one statement returning today's and the last 7 days' execution counts."""
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    week_ago = now - timedelta(days=7)
+    return select(
+        _count(Execution.id, Execution.started_at >= today_start).label("executions_today"),
+        _count(Execution.id).label("executions_7d"),
+        _count(Execution.id, Execution.status == TaskStatus.SUCCESS).label("successful_7d"),
+    ).where(
+        Execution.workspace_id == workspace_id,
+        # Today always lies within the last 7 days
+        Execution.started_at >= week_ago,
+    )
+
+
+async def compute_workspace_summary(db: AsyncSession, workspace_id: UUID) -> dict:
+    """Compute a workspace summary live.
+
+    The executions query runs in its own session so both queries are in
+    flight at the same time.
+    """
+
+    async def execution_stats():
+        async with async_session_factory() as executions_db:
+            result = await executions_db.execute(build_execution_stats_query(workspace_id, datetime.utcnow()))
+            return result.one()._mapping
+
+    counts_result, execution_row = await asyncio.gather(
+        db.execute(build_entity_counts_query(workspace_id)), execution_stats()
+    )
+
+    summary = dict(counts_result.one()._mapping)
+    summary["executions_today"] = execution_row["executions_today"]
+    total = execution_row["executions_7d"]
+    summary["success_rate_7d"] = (execution_row["successful_7d"] / total * 100) if total > 0 else 0.0
+    # Same as the late/dead heartbeats above
+    summary["attention_heartbeats"] = summary["heartbeats_unhealthy"]
+    return summary
+
+
+class WorkspaceSummaryService:
+    """Service for cached workspace dashboard summaries."""
+
+    def _key(self, workspace_id: UUID) -> str:
+        return WORKSPACE_SUMMARY_CACHE_KEY.format(workspace_id=workspace_id)
+
+    async def get(self, db: AsyncSession, workspace_id: UUID) -> dict:
+        """Get a workspace summary from cache, computing it on a miss."""
+        try:
+            cached = await redis_client.get(self._key(workspace_id))
+            if cached:
+                return json.loads(cached)
+        except Exception as e:
+            logger.warning("Failed to get workspace summary from cache", workspace_id=str(workspace_id), error=str(e))
+
+        summary = await compute_workspace_summary(db, workspace_id)
+        try:
+            await redis_client.set(self._key(workspace_id), json.dumps(summary), expire=WORKSPACE_SUMMARY_CACHE_TTL)
+        except Exception as e:
+            logger.warning("Failed to cache workspace summary", workspace_id=str(workspace_id), error=str(e))
+        return summary
+
+    async def invalidate(self, *workspace_ids: UUID) -> None:
+        """Drop cached summaries. Call this AFTER commit of the change.
+
+        Best-effort: errors are logged, the entry expires with its TTL anyway.
+        """
+        if not workspace_ids:
+            return
+        try:
+            await redis_client.delete(*(self._key(workspace_id) for workspace_id in workspace_ids))
+        except Exception as e:
+            logger.warning("Failed to invalidate workspace summary cache", error=str(e))
+
+
+# Global instance
+workspace_summary_service = WorkspaceSummaryService()
@@ -0,0 +1,70 @@
+"""Admission of overdue work, e.g. after scheduler downtime.
+
+Due rows more than settings.scheduler_backlog_threshold_seconds late are
+backlog. The scheduler claims them only after on-time rows, and starts at
+most settings.scheduler_backlog_rate of them per second, so catching up
+after an outage doesn't stampede the workers and the targets. Missed cron
+runs that are too late for their task (see CronTask.catch_up_policy) are
+skipped instead of run.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.models.cron_task import CatchUpPolicy, CronTask
+
+
+class TokenBucket:
+    """Allows `rate` operations per second, in bursts of up to `burst`.
+
+    The burst defaults to one second of operations and is at least 1.
+    A rate of 0 allows everything.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None):
+        self.rate = rate
+        self.burst = max(burst if burst is not None else rate, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def has_token(self) -> bool:
+        """Whether an operation is allowed right now."""
+        if self.rate <= 0:
+            return True
+        self._refill()
+        return self._tokens >= 1
+
+    def take(self) -> None:
+        """Account for an operation."""
+        if self.rate <= 0:
+            return
+        self._refill()
+        self._tokens -= 1
+
+
+def backlog_cutoff(now: datetime) -> datetime:
+    """Get the due time before which work counts as backlog."""
+    return now - timedelta(seconds=settings.scheduler_backlog_threshold_seconds)
+
+
+def staleness_limit(task: CronTask) -> int | None:
+    """Get how late a missed run of the task may start, in seconds (None = any)."""
+    if task.catch_up_policy == CatchUpPolicy.SKIP_MISSED:
+        return settings.scheduler_backlog_threshold_seconds
+    if task.max_staleness_seconds is not None:
+        return task.max_staleness_seconds
+    return settings.scheduler_max_staleness_seconds or None
+
+
+def is_missed_run_stale(task: CronTask, due_at: datetime | None, now: datetime) -> bool:
+    """Whether the run of the task due at `due_at` is too late to start at `now`."""
+    limit = staleness_limit(task)
+    if limit is None or due_at is None:
+        return False
+    return (now - due_at).total_seconds() > limit
@@ -0,0 +1,121 @@
+"""Adaptive concurrency of the arq queue workers.
+
+Jobs are mostly waiting on the network, so a worker process can run far
+more of them than a fixed ``max_jobs`` allows, until the event loop, the
+CPU or the DB pool saturates. With settings.worker_adaptive_concurrency
+each queue worker starts at its configured max jobs; every sample the
+limit grows while jobs fill it and the process is healthy, and drops by
+a quarter as soon as event-loop lag, CPU or DB pool usage crosses its
+threshold.
+
+arq sizes a worker's job semaphore at construction and checks
+``Worker.max_jobs`` before taking each job, so workers are built with
+the upper bound and the controller moves ``max_jobs`` below it.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+
+import structlog
+from arq.worker import Worker
+
+from app.config import settings
+from app.workers.metrics import WORKER_CONCURRENCY_LIMIT, WORKER_DB_POOL_USAGE, WORKER_LOOP_LAG
+
+logger = structlog.get_logger()
+
+SAMPLE_INTERVAL = 1.0  # Seconds between load samples
+BACKOFF_FACTOR = 0.75  # Limit kept when the process is overloaded
+
+
+@dataclass
+class LoadSample:
+    """Load of the worker process over one sample interval."""
+
+    loop_lag_ms: float
+    cpu_percent: float  # Of one core
+    db_pool_usage: float  # Checked-out share of the DB connections
+
+    @property
+    def overloaded(self) -> bool:
+        """Whether any signal is over its threshold."""
+        return (
+            self.loop_lag_ms > settings.worker_max_loop_lag_ms
+            or self.cpu_percent > settings.worker_max_cpu_percent
+            or self.db_pool_usage > settings.worker_max_db_pool_usage
+        )
+
+
+def db_pool_usage() -> float:
+    """Get the share of the process's DB connections checked out."""
+    from app.db.database import engine
+
+    capacity = settings.database_pool_size + settings.database_max_overflow
+    return engine.pool.checkedout() / capacity if capacity else 0.0
+
+
+async def sample_load(interval: float = SAMPLE_INTERVAL) -> LoadSample:
+    """Sleep for an interval and measure the load of the process meanwhile."""
+    started, cpu_started = time.monotonic(), time.process_time()
+    await asyncio.sleep(interval)
+    elapsed = time.monotonic() - started
+
+    # A busy loop resumes the sleep late
+    return LoadSample(
+        loop_lag_ms=max(elapsed - interval, 0.0) * 1000,
+        cpu_percent=(time.process_time() - cpu_started) / elapsed * 100,
+        db_pool_usage=db_pool_usage(),
+    )
+
+
+class ConcurrencyController:
+    """Moves the max jobs of one queue worker between 1 and its upper bound."""
+
+    def __init__(self, worker: Worker, queue: str, initial: int, maximum: int):
+        self.worker = worker
+        self.queue = queue
+        self.maximum = maximum
+        self._set_limit(min(initial, maximum))
+
+    @property
+    def limit(self) -> int:
+        return self.worker.max_jobs
+
+    def _set_limit(self, limit: int) -> None:
+        self.worker.max_jobs = limit
+        WORKER_CONCURRENCY_LIMIT.labels(queue=self.queue).set(limit)
+
+    def adjust(self, sample: LoadSample) -> None:
+        """Raise or lower the limit after a load sample."""
+        limit = self.limit
+        if sample.overloaded:
+            limit = max(1, int(limit * BACKOFF_FACTOR))
+        elif self.worker.job_counter >= limit:
+            # Only probe higher while the limit is what holds jobs back
+            limit = min(self.maximum, limit + max(1, limit // 10))
+
+        if limit != self.limit:
+            logger.debug(
+                "Worker concurrency changed",
+                queue=self.queue,
+                limit=limit,
+                loop_lag_ms=round(sample.loop_lag_ms, 1),
+                cpu_percent=round(sample.cpu_percent, 1),
+                db_pool_usage=round(sample.db_pool_usage, 2),
+            )
+            self._set_limit(limit)
+
+
+async def run_adaptive_concurrency(controllers: list[ConcurrencyController]) -> None:
+    """Adjust the limits of the queue workers of this process until cancelled."""
+    while True:
+        try:
+            sample = await sample_load()
+            WORKER_LOOP_LAG.set(sample.loop_lag_ms / 1000)
+            WORKER_DB_POOL_USAGE.set(sample.db_pool_usage)
+            for controller in controllers:
+                controller.adjust(sample)
+        except Exception as e:
+            logger.error("Error adjusting worker concurrency", error=str(e))
+            await asyncio.sleep(SAMPLE_INTERVAL)
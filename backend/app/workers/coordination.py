@@ -0,0 +1,190 @@
+"""Coordination of scheduler replicas through Redis leases.
+
+Scheduler replicas register in Redis and split N hash partitions of task
+ids between them; each replica only claims the due rows of the partitions
+it holds a lease on. Loops that must run once per deployment (billing,
+retention, monitor checks, ...) run on the replica holding the leader
+lease. Each run of such a loop is recorded in Redis for the loop's
+interval, so a replica taking over the leadership waits out the interval
+the previous leader started instead of running every loop again.
+
+Every heartbeat renews the registration and the leases in one script.
+Partitions are assigned round-robin over the sorted live replicas; a
+replica gives up partitions assigned to someone else and takes free ones
+assigned to it, so joins and leaves are rebalanced within a few
+heartbeats. A crashed replica's leases expire after the lease TTL.
+
+Row claims keep using SELECT FOR UPDATE SKIP LOCKED, so a partition
+briefly processed by two replicas during a handover is still safe.
+"""
+
+import os
+import socket
+import time
+from uuid import uuid4
+
+import structlog
+from redis.commands.core import AsyncScript
+from sqlalchemy import String, cast, func
+
+from app.core.redis import redis_client
+
+logger = structlog.get_logger()
+
+# Redis keys
+SCHEDULER_REPLICAS_KEY = "scheduler:replicas"  # Sorted set of replica id -> registration expiry (ms)
+SCHEDULER_LEADER_KEY = "scheduler:leader"  # Replica id of the leader
+SCHEDULER_PARTITION_KEY = "scheduler:partition:{partition}"  # Replica id of the partition owner
+SCHEDULER_LOOP_KEY = "scheduler:loop:{loop}"  # Replica id of a leader loop's last run, expires after its interval
+
+# Register replica ARGV[1] for ARGV[2] ms, renew or take the leader lease
+# (KEYS[2]) and the partition leases (KEYS[3..]) assigned to it, and give
+# up partitions assigned to another live replica.
+# Returns {is leader, owned partition numbers...}.
+HEARTBEAT_SCRIPT = """
+local me = ARGV[1]
+local ttl = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+redis.call('ZADD', KEYS[1], now + ttl, me)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+redis.call('PEXPIRE', KEYS[1], ttl)
+
+local replicas = redis.call('ZRANGE', KEYS[1], 0, -1)
+table.sort(replicas)
+local index = 0
+for i, replica in ipairs(replicas) do
+    if replica == me then
+        index = i - 1
+    end
+end
+
+local result = {0}
+local leader = redis.call('GET', KEYS[2])
+if not leader or leader == me then
+    redis.call('SET', KEYS[2], me, 'PX', ttl)
+    result[1] = 1
+end
+
+for i = 3, #KEYS do
+    local partition = i - 3
+    local owner = redis.call('GET', KEYS[i])
+    if partition % #replicas == index then
+        if not owner or owner == me then
+            redis.call('SET', KEYS[i], me, 'PX', ttl)
+            result[#result + 1] = partition
+        end
+    elseif owner == me then
+        redis.call('DEL', KEYS[i])
+    end
+end
+return result
+"""
+
+# Drop replica ARGV[1] and every lease it holds
+LEAVE_SCRIPT = """
+redis.call('ZREM', KEYS[1], ARGV[1])
+for i = 2, #KEYS do
+    if redis.call('GET', KEYS[i]) == ARGV[1] then
+        redis.call('DEL', KEYS[i])
+    end
+end
+return 1
+"""
+
+
+# Claim the next run of a leader loop: set KEYS[1] to replica ARGV[1] for
+# ARGV[2] ms unless it exists. Returns 0 if claimed, else the ms left.
+CLAIM_LOOP_SCRIPT = """
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+    return 0
+end
+return math.max(redis.call('PTTL', KEYS[1]), 1)
+"""
+
+
+def partition_clause(id_column, partitions: int, owned: list[int]):
+    """Build a filter for rows whose id falls into one of the owned partitions."""
+    # hashtext is stable across connections; mask the sign bit for a valid modulo
+    partition = func.hashtext(cast(id_column, String)).op("&")(0x7FFFFFFF) % partitions
+    return partition.in_(owned)
+
+
+class SchedulerCoordinator:
+    """Partition and leader leases of one scheduler replica."""
+
+    def __init__(self, partitions: int, lease_ttl_seconds: int):
+        self.partitions = partitions
+        self.lease_ttl_seconds = lease_ttl_seconds
+        self.replica_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._owned: list[int] = []
+        self._leader = False
+        self._valid_until = 0.0  # Monotonic time the leases expire at
+        self._script: AsyncScript | None = None
+        self._leave_script: AsyncScript | None = None
+        self._claim_script: AsyncScript | None = None
+
+    @property
+    def heartbeat_interval(self) -> float:
+        """Seconds between heartbeats, a third of the lease TTL."""
+        return self.lease_ttl_seconds / 3
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this replica holds an unexpired leader lease."""
+        return self._leader and time.monotonic() < self._valid_until
+
+    @property
+    def owned_partitions(self) -> list[int]:
+        """Partitions this replica holds unexpired leases on."""
+        return self._owned if time.monotonic() < self._valid_until else []
+
+    def _keys(self) -> list[str]:
+        return [
+            SCHEDULER_REPLICAS_KEY,
+            SCHEDULER_LEADER_KEY,
+            *(SCHEDULER_PARTITION_KEY.format(partition=partition) for partition in range(self.partitions)),
+        ]
+
+    def _get_script(self, source: str, cached: AsyncScript | None) -> AsyncScript:
+        client = redis_client.client
+        if cached is None or cached.registered_client is not client:
+            cached = client.register_script(source)
+        return cached
+
+    async def heartbeat(self) -> None:
+        """Renew the registration and leases and rebalance partitions."""
+        # Leases are only trusted until they could have expired in Redis
+        started = time.monotonic()
+        self._script = self._get_script(HEARTBEAT_SCRIPT, self._script)
+        result = await self._script(keys=self._keys(), args=[self.replica_id, self.lease_ttl_seconds * 1000])
+
+        leader, owned = bool(result[0]), [int(partition) for partition in result[1:]]
+        if leader != self._leader or owned != self._owned:
+            logger.info(
+                "Scheduler leases changed",
+                replica_id=self.replica_id,
+                leader=leader,
+                partitions=owned,
+            )
+        self._leader, self._owned = leader, owned
+        self._valid_until = started + self.lease_ttl_seconds
+
+    async def claim_loop_run(self, loop: str, interval: float) -> float:
+        """Claim the next run of a leader loop.
+
+        Returns 0 if the caller should run the loop now, otherwise the
+        seconds until the interval since its last run (by any replica) ends.
+        """
+        self._claim_script = self._get_script(CLAIM_LOOP_SCRIPT, self._claim_script)
+        remaining_ms = await self._claim_script(
+            keys=[SCHEDULER_LOOP_KEY.format(loop=loop)], args=[self.replica_id, int(interval * 1000)]
+        )
+        return remaining_ms / 1000
+
+    async def leave(self) -> None:
+        """Give up all leases so other replicas take over right away."""
+        self._leader, self._owned, self._valid_until = False, [], 0.0
+        self._leave_script = self._get_script(LEAVE_SCRIPT, self._leave_script)
+        await self._leave_script(keys=self._keys(), args=[self.replica_id])
@@ -0,0 +1,221 @@
+"""Prometheus metrics for the scheduler and arq worker processes.
+
+Metrics live in a dedicated registry, separate from the API's /metrics
+endpoint. Each process exposes it on its own port
+(settings.scheduler_metrics_port and settings.worker_metrics_port).
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, start_http_server
+
+from app.services.http_timing import HttpTimings
+
+registry = CollectorRegistry()
+
+# Seconds a task started (or was dispatched) after falling due
+LAG_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 10, 30, 60, 120, 300, 900)
+
+DISPATCH_LAG = Histogram(
+    "cronbox_scheduler_dispatch_lag_seconds",
+    "Delay between a task falling due and the scheduler enqueueing it",
+    ["kind"],  # cron, delayed, chain
+    buckets=LAG_BUCKETS,
+    registry=registry,
+)
+
+CLAIM_BATCH_SIZE = Histogram(
+    "cronbox_scheduler_claim_batch_size",
+    "Due rows claimed per poll cycle",
+    ["kind"],  # cron, delayed, chain
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100),
+    registry=registry,
+)
+
+MISSED_RUNS_SKIPPED = Counter(
+    "cronbox_scheduler_missed_runs_skipped_total",
+    "Missed runs skipped for being too late",
+    ["kind"],  # cron
+    registry=registry,
+)
+
+LOOP_DURATION = Histogram(
+    "cronbox_scheduler_loop_duration_seconds",
+    "Duration of one cycle of a scheduler loop",
+    ["loop"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+    registry=registry,
+)
+
+LOOP_ERRORS = Counter(
+    "cronbox_scheduler_loop_errors_total",
+    "Scheduler loop cycles that failed",
+    ["loop"],
+    registry=registry,
+)
+
+QUEUE_DEPTH = Gauge(
+    "cronbox_queue_depth",
+    "Jobs ready to run in the arq queue",
+    ["queue"],
+    registry=registry,
+)
+
+WORKER_QUEUE_DEPTH = Gauge(
+    "cronbox_external_worker_queue_depth",
+    "Tasks waiting in an external worker's list",
+    ["worker_id"],
+    registry=registry,
+)
+
+START_LAG = Histogram(
+    "cronbox_worker_schedule_to_start_seconds",
+    "Delay between a task falling due and the worker starting it",
+    ["kind"],  # cron
+    buckets=LAG_BUCKETS,
+    registry=registry,
+)
+
+DUE_TASKS_PER_SECOND = Histogram(
+    "cronbox_scheduler_due_tasks_per_second",
+    "Cron tasks falling due in each wall-clock second",
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+    registry=registry,
+)
+
+HTTP_PHASE_DURATION = Histogram(
+    "cronbox_worker_http_phase_seconds",
+    "Duration of the phases of task HTTP requests",
+    ["phase"],  # dns, connect, tls, ttfb, transfer
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+    registry=registry,
+)
+
+HTTP_REQUESTS = Counter(
+    "cronbox_worker_http_requests_total",
+    "Task HTTP requests by the connection they were sent on",
+    ["connection"],  # new, reused
+    registry=registry,
+)
+
+
+WORKER_CONCURRENCY_LIMIT = Gauge(
+    "cronbox_worker_concurrency_limit",
+    "Jobs a queue worker may run at a time",
+    ["queue"],
+    registry=registry,
+)
+
+WORKER_LOOP_LAG = Gauge(
+    "cronbox_worker_event_loop_lag_seconds",
+    "Event-loop lag of the worker process in the last sample",
+    registry=registry,
+)
+
+WORKER_DB_POOL_USAGE = Gauge(
+    "cronbox_worker_db_pool_usage_ratio",
+    "Share of the worker process's DB connections checked out in the last sample",
+    registry=registry,
+)
+
+
+class DueTaskCounter:
+    """Counts due tasks by the second they fell due.
+
+    Seconds are observed into the histogram once they are `settle_seconds`
+    old, including seconds in which nothing fell due, so both the
+    top-of-minute spikes and the idle time between them show up.
+    """
+
+    # Upper bound on seconds observed per flush (after long idle periods)
+    MAX_FLUSH_SECONDS = 3600
+
+    def __init__(self, histogram: Histogram, settle_seconds: int = 10):
+        self.histogram = histogram
+        self.settle_seconds = settle_seconds
+        self._counts: dict[int, int] = {}
+        self._flushed_until: int | None = None
+
+    @staticmethod
+    def _second(moment: datetime) -> int:
+        """Unix second of a naive UTC (or aware) datetime."""
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return int(moment.timestamp())
+
+    def record(self, due_at: datetime | None) -> None:
+        """Count a task that fell due at `due_at`."""
+        if due_at is None:
+            return
+        second = self._second(due_at)
+        if self._flushed_until is not None:
+            # Late tasks from an already observed second count towards the next one
+            second = max(second, self._flushed_until)
+        self._counts[second] = self._counts.get(second, 0) + 1
+
+    def flush(self, now: datetime) -> None:
+        """Observe every settled second not observed yet."""
+        until = self._second(now) - self.settle_seconds
+        start = self._flushed_until
+        if start is None:
+            start = min(self._counts, default=until)
+        start = max(start, until - self.MAX_FLUSH_SECONDS)
+
+        for second in range(start, until):
+            self.histogram.observe(self._counts.pop(second, 0))
+        for second in [s for s in self._counts if s < until]:
+            del self._counts[second]
+        self._flushed_until = max(until, start)
+
+
+DUE_TASKS = DueTaskCounter(DUE_TASKS_PER_SECOND)
+
+
+def _lag_seconds(due_at: datetime) -> float:
+    """Seconds from a naive UTC (or aware) moment until now, never negative."""
+    if due_at.tzinfo is not None:
+        due_at = due_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return max((datetime.utcnow() - due_at).total_seconds(), 0.0)
+
+
+def observe_dispatch_lag(kind: str, due_at: datetime | None) -> None:
+    """Record how late a task of the given kind was enqueued."""
+    if due_at is not None:
+        DISPATCH_LAG.labels(kind=kind).observe(_lag_seconds(due_at))
+
+
+def observe_start_lag(kind: str, due_at: datetime | None) -> None:
+    """Record how late a task of the given kind started executing."""
+    if due_at is not None:
+        START_LAG.labels(kind=kind).observe(_lag_seconds(due_at))
+
+
+def observe_http_timings(timings: HttpTimings) -> None:
+    """Record the phase durations of a task HTTP request."""
+    for phase in ("dns", "connect", "tls", "ttfb", "transfer"):
+        duration_ms = getattr(timings, f"{phase}_ms")
+        if duration_ms is not None:
+            HTTP_PHASE_DURATION.labels(phase=phase).observe(duration_ms / 1000)
+    if timings.connection_reused is not None:
+        HTTP_REQUESTS.labels(connection="reused" if timings.connection_reused else "new").inc()
+
+
+@contextmanager
+def observe_loop(loop: str) -> Iterator[None]:
+    """Time one cycle of a scheduler loop and count it if it fails."""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        LOOP_ERRORS.labels(loop=loop).inc()
+        raise
+    finally:
+        LOOP_DURATION.labels(loop=loop).observe(time.perf_counter() - started)
+
+
+def start_metrics_server(port: int) -> None:
+    """Expose metrics over HTTP on the given port."""
+    start_http_server(port, registry=registry)
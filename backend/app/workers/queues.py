@@ -0,0 +1,46 @@
+"""Named arq queues and the routing of jobs to them.
+
+Jobs are split by class so slow work cannot hold the slots of
+latency-sensitive cron runs: HTTP executions, chains (many sequential
+requests per job) and notifications (SMTP, messengers) each have their
+own queue, served by a worker pool with its own concurrency. Every
+``enqueue_job`` call routes explicitly with
+``_queue_name=queue_for(<function>)``.
+"""
+
+from app.config import settings
+
+EXECUTIONS = "executions"
+CHAINS = "chains"
+NOTIFICATIONS = "notifications"
+
+QUEUE_NAMES = [EXECUTIONS, CHAINS, NOTIFICATIONS]
+
+# Job function -> queue name
+JOB_QUEUES = {
+    "execute_http_task": EXECUTIONS,
+    "execute_cron_task": EXECUTIONS,
+    "execute_delayed_task": EXECUTIONS,
+    "execute_chain": CHAINS,
+    "send_task_notification": NOTIFICATIONS,
+    "send_chain_notification": NOTIFICATIONS,
+}
+
+
+def queue_key(name: str) -> str:
+    """Get the Redis key of a named queue."""
+    return f"arq:queue:{name}"
+
+
+def queue_for(function: str) -> str:
+    """Get the Redis key of the queue a job function is routed to."""
+    return queue_key(JOB_QUEUES[function])
+
+
+def queue_max_jobs(name: str) -> int:
+    """Get the concurrent jobs of one worker of a queue."""
+    return {
+        EXECUTIONS: settings.worker_executions_max_jobs,
+        CHAINS: settings.worker_chains_max_jobs,
+        NOTIFICATIONS: settings.worker_notifications_max_jobs,
+    }[name]
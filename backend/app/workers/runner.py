@@ -0,0 +1,115 @@
+"""Run arq workers for a set of named queues in one process.
+
+Each queue gets its own arq Worker, and so its own job slots, while the
+process shares one database engine, HTTP client and Redis client between
+them. Signals stop every worker; arq re-queues jobs cancelled on shutdown.
+Jobs left in the arq default queue from before named queues (including
+deferred retries) are run by a burst worker that exits once it is empty.
+With settings.worker_adaptive_concurrency the workers' max jobs follow
+the load of the process (see app.workers.concurrency).
+"""
+
+import asyncio
+import signal
+from functools import partial
+
+import structlog
+from arq.worker import Worker, create_worker
+
+from app.config import settings
+from app.workers.concurrency import ConcurrencyController, run_adaptive_concurrency
+from app.workers.settings import (
+    WorkerSettings,
+    close_worker_context,
+    init_worker_context,
+    queue_worker_options,
+)
+
+logger = structlog.get_logger()
+
+
+def _stop(workers: list[Worker], signum: signal.Signals) -> None:
+    for worker in workers:
+        worker.handle_sig(signum)
+
+
+async def _drain_default_queue(worker: Worker) -> None:
+    """Run the jobs left in the arq default queue, then close the worker."""
+    try:
+        await worker.async_run()
+    except Exception as e:
+        logger.warning("Failed to drain the default queue", error=str(e))
+    else:
+        logger.info("Default queue drained")
+    await worker.close()
+
+
+async def serve_queues(names: list[str]) -> None:
+    """Consume the named queues until a signal arrives or a worker fails."""
+    ctx: dict = {}
+    await init_worker_context(ctx)
+
+    options = {name: queue_worker_options(name) for name in names}
+    if settings.worker_adaptive_concurrency:
+        # The job semaphore is sized for the upper bound, the controller sets max_jobs
+        maximum = {name: max(settings.worker_adaptive_max_jobs, options[name]["max_jobs"]) for name in names}
+    else:
+        maximum = {name: options[name]["max_jobs"] for name in names}
+
+    # Each worker sets ctx["redis"] to its own pool on start
+    workers = [
+        create_worker(
+            WorkerSettings,
+            ctx=dict(ctx),
+            on_startup=None,
+            on_shutdown=None,
+            handle_signals=False,
+            **{**options[name], "max_jobs": maximum[name]},
+        )
+        for name in names
+    ]
+    # Registers every function; burst mode exits once the queue, deferred jobs included, is empty
+    drain = create_worker(
+        WorkerSettings,
+        ctx=dict(ctx),
+        on_startup=None,
+        on_shutdown=None,
+        handle_signals=False,
+        burst=True,
+    )
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, partial(_stop, [*workers, drain], signum))
+
+    adaptive = None
+    if settings.worker_adaptive_concurrency:
+        controllers = [
+            ConcurrencyController(worker, name, options[name]["max_jobs"], maximum[name])
+            for name, worker in zip(names, workers, strict=True)
+        ]
+        adaptive = asyncio.create_task(run_adaptive_concurrency(controllers))
+
+    logger.info("Worker started", queues=names, adaptive_concurrency=settings.worker_adaptive_concurrency)
+    runs = [asyncio.create_task(worker.async_run()) for worker in workers]
+    draining = asyncio.create_task(_drain_default_queue(drain))
+    try:
+        # A worker only returns on shutdown or failure, so stop the others too
+        await asyncio.wait(runs, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        if adaptive:
+            adaptive.cancel()
+        await asyncio.gather(*(worker.close() for worker in [*workers, drain]))
+        await asyncio.gather(*runs, draining, return_exceptions=True)
+        await close_worker_context(ctx)
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(signum)
+        logger.info("Worker stopped", queues=names)
+
+    for run in runs:
+        if not run.cancelled() and run.exception():
+            raise run.exception()
+
+
+def run_queue_workers(names: list[str]) -> None:
+    """Run workers for the named queues until stopped."""
+    asyncio.run(serve_queues(names))
@@ -6,30 +6,62 @@ due cron and delayed tasks, enqueueing them to the arq worker queue.
 Tasks can be executed by:
 1. Cloud workers (arq) - default, if no worker_id is set
 2. External workers - if task has worker_id, enqueue to worker's polling queue
+
+With SCHEDULER_PARTITIONS set, several replicas can run side by side: each
+claims only the due rows of its partitions and the other loops run on the
+leader only (see coordination).
 """
 
 import asyncio
 import signal
+import time
 from datetime import datetime
 
-import pytz
 import structlog
 from arq import create_pool
-from croniter import croniter
+from arq.constants import default_queue_name
+from sqlalchemy import select
 
+from app.config import settings
+from app.core.redis import redis_client
 from app.db.database import async_session_factory
 from app.db.repositories.cron_tasks import CronTaskRepository
 from app.db.repositories.delayed_tasks import DelayedTaskRepository
 from app.db.repositories.task_chains import TaskChainRepository
+from app.db.repositories.workspaces import WorkspaceRepository
 from app.models.cron_task import CronTask, OverlapPolicy, TaskStatus
+from app.models.delayed_task import DelayedTask
 from app.models.task_chain import TaskChain, TriggerType
+from app.models.task_queue import TaskQueue
 from app.schemas.worker import WorkerTaskInfo
 from app.services.overlap import OverlapAction, overlap_service
+from app.services.overlap_leases import overlap_lease_store
+from app.services.schedule import calculate_next_run, calculate_next_runs, get_task_jitter_offset
 from app.services.worker import worker_service
+from app.workers.admission import TokenBucket, backlog_cutoff, is_missed_run_stale
+from app.workers.coordination import SchedulerCoordinator, partition_clause
+from app.workers.metrics import (
+    CLAIM_BATCH_SIZE,
+    DUE_TASKS,
+    MISSED_RUNS_SKIPPED,
+    QUEUE_DEPTH,
+    WORKER_QUEUE_DEPTH,
+    observe_dispatch_lag,
+    observe_loop,
+    start_metrics_server,
+)
+from app.workers.queues import QUEUE_NAMES, queue_for, queue_key
 from app.workers.settings import get_redis_settings
 
 logger = structlog.get_logger()
 
+# Seconds between claims of due cron and delayed tasks
+CRON_POLL_INTERVAL = 2
+DELAYED_POLL_INTERVAL = 1
+
+# How often replicas that aren't the leader check whether they took over
+FOLLOWER_CHECK_INTERVAL = 5  # Seconds
+
 
 class TaskScheduler:
     """Scheduler that polls for due tasks and enqueues them."""
@@ -37,16 +69,66 @@ class TaskScheduler:
     def __init__(self):
         self.redis_pool = None
         self.running = False
+        self.coordinator = (
+            SchedulerCoordinator(settings.scheduler_partitions, settings.scheduler_lease_ttl_seconds)
+            if settings.scheduler_partitions
+            else None
+        )
+        # Starts of overdue work (see admission); a poll cycle may use the
+        # tokens of the whole interval before it, or the rate is never reached
+        rate = settings.scheduler_backlog_rate
+        self.cron_backlog = TokenBucket(rate, burst=rate * CRON_POLL_INTERVAL)
+        self.delayed_backlog = TokenBucket(rate, burst=rate * DELAYED_POLL_INTERVAL)
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this replica runs the loops that must run once per deployment."""
+        return self.coordinator is None or self.coordinator.is_leader
+
+    async def _leader_turn(self, loop: str, interval: float) -> bool:
+        """Whether a leader-only loop should run now; sleeps briefly if not.
+
+        With sharding, a new leader waits out the interval of the previous
+        leader's last run first (see SchedulerCoordinator.claim_loop_run).
+        """
+        if not self.is_leader:
+            await asyncio.sleep(FOLLOWER_CHECK_INTERVAL)
+            return False
+        if self.coordinator is None:
+            return True
+
+        try:
+            remaining = await self.coordinator.claim_loop_run(loop, interval)
+        except Exception as e:
+            logger.warning("Failed to claim scheduler loop run", loop=loop, error=str(e))
+            return True
+        if remaining:
+            # Re-check the leadership while waiting
+            await asyncio.sleep(min(remaining, FOLLOWER_CHECK_INTERVAL))
+            return False
+        return True
+
+    def _partition_filter(self, id_column):
+        """Get the filter for rows of this replica's partitions (None without sharding)."""
+        if self.coordinator is None:
+            return None
+        return partition_clause(id_column, self.coordinator.partitions, self.coordinator.owned_partitions)
 
     async def start(self):
         """Start the scheduler."""
         self.running = True
         self.redis_pool = await create_pool(get_redis_settings())
+        # Shared app Redis client (external worker queues, caches, activity buffer)
+        await redis_client.initialize()
+
+        if settings.scheduler_metrics_port:
+            start_metrics_server(settings.scheduler_metrics_port)
 
         logger.info("Scheduler started")
 
         # Run all polling loops concurrently
         await asyncio.gather(
+            self._coordinate(),
             self._poll_cron_tasks(),
             self._poll_delayed_tasks(),
             self._poll_task_chains(),
@@ -59,40 +141,64 @@ class TaskScheduler:
             self._cleanup_stale_instances(),
             self._cleanup_old_executions(),
             self._process_task_queue(),
+            self._flush_user_activity(),
+            self._poll_queue_depths(),
         )
 
     async def stop(self):
         """Stop the scheduler."""
         self.running = False
+        if self.coordinator:
+            try:
+                await self.coordinator.leave()
+            except Exception as e:
+                logger.error("Error releasing scheduler leases", error=str(e))
         if self.redis_pool:
             await self.redis_pool.close()
+        await redis_client.close()
         logger.info("Scheduler stopped")
 
+    async def _coordinate(self):
+        """Renew this replica's scheduler leases every third of their TTL."""
+        if self.coordinator is None:
+            return
+
+        while self.running:
+            try:
+                await self.coordinator.heartbeat()
+            except Exception as e:
+                logger.error("Error renewing scheduler leases", error=str(e))
+
+            await asyncio.sleep(self.coordinator.heartbeat_interval)
+
     async def _poll_cron_tasks(self):
         """Poll for due cron tasks every 2 seconds for improved accuracy."""
         while self.running:
             try:
-                await self._process_due_cron_tasks()
+                with observe_loop("cron_tasks"):
+                    await self._process_due_cron_tasks()
             except Exception as e:
                 logger.error("Error processing cron tasks", error=str(e))
 
-            await asyncio.sleep(2)
+            await asyncio.sleep(CRON_POLL_INTERVAL)
 
     async def _poll_delayed_tasks(self):
         """Poll for due delayed tasks every 1 second for improved accuracy."""
         while self.running:
             try:
-                await self._process_due_delayed_tasks()
+                with observe_loop("delayed_tasks"):
+                    await self._process_due_delayed_tasks()
             except Exception as e:
                 logger.error("Error processing delayed tasks", error=str(e))
 
-            await asyncio.sleep(1)
+            await asyncio.sleep(DELAYED_POLL_INTERVAL)
 
     async def _poll_task_chains(self):
         """Poll for due task chains every 5 seconds."""
         while self.running:
             try:
-                await self._process_due_chains()
+                with observe_loop("task_chains"):
+                    await self._process_due_chains()
             except Exception as e:
                 logger.error("Error processing task chains", error=str(e))
 
@@ -101,8 +207,12 @@ class TaskScheduler:
     async def _poll_heartbeats(self):
         """Poll for overdue heartbeat monitors every 30 seconds."""
         while self.running:
+            if not await self._leader_turn("heartbeats", 30):
+                continue
+
             try:
-                await self._process_heartbeat_checks()
+                with observe_loop("heartbeats"):
+                    await self._process_heartbeat_checks()
             except Exception as e:
                 logger.error("Error processing heartbeat checks", error=str(e))
 
@@ -126,8 +236,12 @@ class TaskScheduler:
     async def _poll_process_monitors(self):
         """Poll for process monitors with missed starts/ends every 30 seconds."""
         while self.running:
+            if not await self._leader_turn("process_monitors", 30):
+                continue
+
             try:
-                await self._process_process_monitor_checks()
+                with observe_loop("process_monitors"):
+                    await self._process_process_monitor_checks()
             except Exception as e:
                 logger.error("Error processing process monitor checks", error=str(e))
 
@@ -151,8 +265,12 @@ class TaskScheduler:
     async def _poll_ssl_monitors(self):
         """Poll for SSL monitors due for check every 5 minutes."""
         while self.running:
+            if not await self._leader_turn("ssl_monitors", 300):
+                continue
+
             try:
-                await self._process_ssl_monitor_checks()
+                with observe_loop("ssl_monitors"):
+                    await self._process_ssl_monitor_checks()
             except Exception as e:
                 logger.error("Error processing SSL monitor checks", error=str(e))
 
@@ -176,8 +294,12 @@ class TaskScheduler:
     async def _update_next_run_times(self):
         """Update next_run_at for tasks that need it, every minute."""
         while self.running:
+            if not await self._leader_turn("next_run_times", 60):
+                continue
+
             try:
-                await self._calculate_next_run_times()
+                with observe_loop("next_run_times"):
+                    await self._calculate_next_run_times()
             except Exception as e:
                 logger.error("Error updating next run times", error=str(e))
 
@@ -186,8 +308,12 @@ class TaskScheduler:
     async def _check_subscriptions(self):
         """Check for expired and expiring subscriptions every hour."""
         while self.running:
+            if not await self._leader_turn("subscriptions", 3600):
+                continue
+
             try:
-                await self._process_subscription_checks()
+                with observe_loop("subscriptions"):
+                    await self._process_subscription_checks()
             except Exception as e:
                 logger.error("Error checking subscriptions", error=str(e))
 
@@ -197,19 +323,42 @@ class TaskScheduler:
     async def _check_pending_payments(self):
         """Check and update old pending payments every 5 minutes."""
         while self.running:
+            if not await self._leader_turn("pending_payments", 300):
+                continue
+
             try:
-                from app.services.billing import billing_service
+                with observe_loop("pending_payments"):
+                    from app.services.billing import billing_service
 
-                async with async_session_factory() as db:
-                    updated = await billing_service.check_pending_payments(db)
-                    if updated:
-                        logger.info("Checked pending payments", updated=updated)
+                    async with async_session_factory() as db:
+                        updated = await billing_service.check_pending_payments(db)
+                        if updated:
+                            logger.info("Checked pending payments", updated=updated)
             except Exception as e:
                 logger.error("Error checking pending payments", error=str(e))
 
             # Check every 5 minutes
             await asyncio.sleep(300)
 
+    async def _flush_user_activity(self):
+        """Flush buffered user activity (last_login_at) to the database every minute."""
+        from app.services.user_activity import user_activity_service
+
+        while self.running:
+            if not await self._leader_turn("user_activity", 60):
+                continue
+
+            try:
+                with observe_loop("user_activity"):
+                    async with async_session_factory() as db:
+                        flushed = await user_activity_service.flush(db)
+                        if flushed:
+                            logger.debug("Flushed user activity", count=flushed)
+            except Exception as e:
+                logger.error("Error flushing user activity", error=str(e))
+
+            await asyncio.sleep(60)
+
     async def _process_subscription_checks(self):
         """Process subscription expiration checks, auto-renewals, and notifications."""
         from app.services.billing import billing_service
@@ -298,8 +447,10 @@ class TaskScheduler:
 
         Each task is processed in a separate transaction to ensure
         FOR UPDATE lock is held until commit for that specific task.
+        On-time tasks are claimed first; overdue ones at the backlog rate.
         """
         now = datetime.utcnow()
+        cutoff = backlog_cutoff(now)
         processed = 0
         max_tasks_per_cycle = 100
 
@@ -307,26 +458,49 @@ class TaskScheduler:
             async with async_session_factory() as db:
                 cron_repo = CronTaskRepository(db)
                 # Fetch ONE task at a time with row lock
-                due_tasks = await cron_repo.get_due_tasks(now, limit=1)
+                due_tasks = await cron_repo.get_due_tasks(
+                    now,
+                    limit=1,
+                    partition_filter=self._partition_filter(CronTask.id),
+                    backlog_before=cutoff,
+                    include_backlog=self.cron_backlog.has_token(),
+                )
 
                 if not due_tasks:
                     break  # No more due tasks
 
                 task = due_tasks[0]
+                lease_id = None  # Overlap slot lease (redis backend)
                 try:
                     # Calculate next run time immediately to prevent re-enqueueing
-                    tz = pytz.timezone(task.timezone)
-                    now_tz = datetime.now(tz)
-                    cron = croniter(task.schedule, now_tz)
-                    next_run = cron.get_next(datetime)
-                    next_run_utc = next_run.astimezone(pytz.UTC).replace(tzinfo=None)
+                    due_at = task.next_run_at
+                    DUE_TASKS.record(due_at)
+                    offset = get_task_jitter_offset(
+                        task.id, task.schedule_jitter_seconds, task.workspace.schedule_jitter_seconds
+                    )
+                    next_run_utc = calculate_next_run(task.schedule, task.timezone, offset_seconds=offset)
 
                     # Update next_run_at in memory (row is still locked by FOR UPDATE)
                     task.next_run_at = next_run_utc
 
+                    if is_missed_run_stale(task, due_at, now):
+                        await WorkspaceRepository(db).increment_executions_skipped(task.workspace_id)
+                        MISSED_RUNS_SKIPPED.labels(kind="cron").inc()
+                        logger.info(
+                            "Cron task missed run skipped",
+                            task_id=str(task.id),
+                            task_name=task.name,
+                            due_at=due_at.isoformat(),
+                            next_run_at=next_run_utc.isoformat(),
+                        )
+                        await db.commit()
+                        processed += 1
+                        continue
+
                     # Check overlap prevention policy
                     if task.overlap_policy != OverlapPolicy.ALLOW:
                         overlap_result = await overlap_service.check_cron_task_overlap(db, task)
+                        lease_id = overlap_result.lease_id
                         if not overlap_result.should_execute:
                             if overlap_result.action == OverlapAction.QUEUE:
                                 logger.info(
@@ -378,6 +552,9 @@ class TaskScheduler:
                             "execute_cron_task",
                             task_id=str(task.id),
                             retry_attempt=0,
+                            lease_id=lease_id,
+                            scheduled_at=due_at.isoformat() if due_at else None,
+                            _queue_name=queue_for("execute_cron_task"),
                         )
 
                         logger.info(
@@ -389,10 +566,15 @@ class TaskScheduler:
 
                     # Commit releases the row lock after successful enqueue
                     await db.commit()
+                    observe_dispatch_lag("cron", due_at)
+                    if due_at and due_at < cutoff:
+                        self.cron_backlog.take()
                     processed += 1
 
                 except Exception as e:
                     await db.rollback()
+                    if lease_id:
+                        await overlap_service.release_lease("cron", task.id, lease_id)
                     logger.error(
                         "Error processing cron task",
                         task_id=str(task.id),
@@ -400,6 +582,9 @@ class TaskScheduler:
                     )
                     # Continue to next task on error
 
+        DUE_TASKS.flush(datetime.utcnow())
+        CLAIM_BATCH_SIZE.labels(kind="cron").observe(processed)
+
         if processed > 0:
             logger.info(f"Processed {processed} cron tasks")
 
@@ -408,8 +593,10 @@ class TaskScheduler:
 
         Each task is processed in a separate transaction to ensure
         FOR UPDATE lock is held until commit for that specific task.
+        On-time tasks are claimed first; overdue ones at the backlog rate.
         """
         now = datetime.utcnow()
+        cutoff = backlog_cutoff(now)
         processed = 0
         max_tasks_per_cycle = 100
 
@@ -417,7 +604,13 @@ class TaskScheduler:
             async with async_session_factory() as db:
                 delayed_repo = DelayedTaskRepository(db)
                 # Fetch ONE task at a time with row lock
-                due_tasks = await delayed_repo.get_due_tasks(now, limit=1)
+                due_tasks = await delayed_repo.get_due_tasks(
+                    now,
+                    limit=1,
+                    partition_filter=self._partition_filter(DelayedTask.id),
+                    backlog_before=cutoff,
+                    include_backlog=self.delayed_backlog.has_token(),
+                )
 
                 if not due_tasks:
                     break  # No more due tasks
@@ -458,6 +651,7 @@ class TaskScheduler:
                             "execute_delayed_task",
                             task_id=str(task.id),
                             retry_attempt=0,
+                            _queue_name=queue_for("execute_delayed_task"),
                         )
 
                         logger.info(
@@ -468,6 +662,9 @@ class TaskScheduler:
 
                     # Commit releases the row lock after successful enqueue
                     await db.commit()
+                    observe_dispatch_lag("delayed", task.execute_at)
+                    if task.execute_at < cutoff:
+                        self.delayed_backlog.take()
                     processed += 1
 
                 except Exception as e:
@@ -479,6 +676,7 @@ class TaskScheduler:
                     )
                     # Continue to next task on error
 
+        CLAIM_BATCH_SIZE.labels(kind="delayed").observe(processed)
         if processed > 0:
             logger.info(f"Processed {processed} delayed tasks")
 
@@ -488,54 +686,55 @@ class TaskScheduler:
             # Update cron tasks
             cron_repo = CronTaskRepository(db)
             tasks = await cron_repo.get_tasks_needing_next_run_update(limit=100)
+            next_runs = calculate_next_runs(
+                (
+                    task.schedule,
+                    task.timezone,
+                    get_task_jitter_offset(
+                        task.id, task.schedule_jitter_seconds, task.workspace.schedule_jitter_seconds
+                    ),
+                )
+                for task in tasks
+            )
 
-            for task in tasks:
-                try:
-                    tz = pytz.timezone(task.timezone)
-                    now_tz = datetime.now(tz)
-                    cron = croniter(task.schedule, now_tz)
-                    next_run = cron.get_next(datetime)
-                    next_run_utc = next_run.astimezone(pytz.UTC).replace(tzinfo=None)
-
-                    task.next_run_at = next_run_utc
-
-                    logger.debug(
-                        "Updated next_run_at for cron task",
-                        task_id=str(task.id),
-                        next_run_at=next_run_utc.isoformat(),
-                    )
-                except Exception as e:
+            for task, next_run_utc in zip(tasks, next_runs):
+                if next_run_utc is None:
                     logger.error(
                         "Error calculating next run time for cron task",
                         task_id=str(task.id),
-                        error=str(e),
+                        error="Invalid schedule or timezone",
                     )
+                    continue
+
+                task.next_run_at = next_run_utc
+
+                logger.debug(
+                    "Updated next_run_at for cron task",
+                    task_id=str(task.id),
+                    next_run_at=next_run_utc.isoformat(),
+                )
 
             # Update task chains
             chain_repo = TaskChainRepository(db)
             chains = await chain_repo.get_chains_needing_next_run_update(limit=100)
+            next_runs = calculate_next_runs((chain.schedule, chain.timezone, 0) for chain in chains)
 
-            for chain in chains:
-                try:
-                    tz = pytz.timezone(chain.timezone)
-                    now_tz = datetime.now(tz)
-                    cron = croniter(chain.schedule, now_tz)
-                    next_run = cron.get_next(datetime)
-                    next_run_utc = next_run.astimezone(pytz.UTC).replace(tzinfo=None)
-
-                    chain.next_run_at = next_run_utc
-
-                    logger.debug(
-                        "Updated next_run_at for chain",
-                        chain_id=str(chain.id),
-                        next_run_at=next_run_utc.isoformat(),
-                    )
-                except Exception as e:
+            for chain, next_run_utc in zip(chains, next_runs):
+                if next_run_utc is None:
                     logger.error(
                         "Error calculating next run time for chain",
                         chain_id=str(chain.id),
-                        error=str(e),
+                        error="Invalid schedule or timezone",
                     )
+                    continue
+
+                chain.next_run_at = next_run_utc
+
+                logger.debug(
+                    "Updated next_run_at for chain",
+                    chain_id=str(chain.id),
+                    next_run_at=next_run_utc.isoformat(),
+                )
 
             await db.commit()
 
@@ -553,21 +752,21 @@ class TaskScheduler:
             async with async_session_factory() as db:
                 chain_repo = TaskChainRepository(db)
                 # Fetch ONE chain at a time with row lock
-                due_chains = await chain_repo.get_due_chains(now, limit=1)
+                due_chains = await chain_repo.get_due_chains(
+                    now, limit=1, partition_filter=self._partition_filter(TaskChain.id)
+                )
 
                 if not due_chains:
                     break  # No more due chains
 
                 chain = due_chains[0]
+                lease_id = None  # Overlap slot lease (redis backend)
                 try:
                     # Calculate next run time for cron chains
+                    due_at = chain.next_run_at
                     next_run_utc = None
                     if chain.trigger_type == TriggerType.CRON and chain.schedule:
-                        tz = pytz.timezone(chain.timezone)
-                        now_tz = datetime.now(tz)
-                        cron = croniter(chain.schedule, now_tz)
-                        next_run = cron.get_next(datetime)
-                        next_run_utc = next_run.astimezone(pytz.UTC).replace(tzinfo=None)
+                        next_run_utc = calculate_next_run(chain.schedule, chain.timezone)
                         chain.next_run_at = next_run_utc
                     elif chain.trigger_type == TriggerType.DELAYED:
                         # Delayed chains run once and deactivate
@@ -576,6 +775,7 @@ class TaskScheduler:
                     # Check overlap prevention policy
                     if chain.overlap_policy != OverlapPolicy.ALLOW:
                         overlap_result = await overlap_service.check_chain_overlap(db, chain)
+                        lease_id = overlap_result.lease_id
                         if not overlap_result.should_execute:
                             if overlap_result.action == OverlapAction.QUEUE:
                                 logger.info(
@@ -601,6 +801,8 @@ class TaskScheduler:
                         "execute_chain",
                         chain_id=str(chain.id),
                         initial_variables={},
+                        lease_id=lease_id,
+                        _queue_name=queue_for("execute_chain"),
                     )
 
                     logger.info(
@@ -613,10 +815,13 @@ class TaskScheduler:
 
                     # Commit releases the row lock after successful enqueue
                     await db.commit()
+                    observe_dispatch_lag("chain", due_at)
                     processed += 1
 
                 except Exception as e:
                     await db.rollback()
+                    if lease_id:
+                        await overlap_service.release_lease("chain", chain.id, lease_id)
                     logger.error(
                         "Error processing task chain",
                         chain_id=str(chain.id),
@@ -624,18 +829,52 @@ class TaskScheduler:
                     )
                     # Continue to next chain on error
 
+        CLAIM_BATCH_SIZE.labels(kind="chain").observe(processed)
         if processed > 0:
             logger.info(f"Processed {processed} task chains")
 
+    async def _poll_queue_depths(self):
+        """Record the depth of the arq queue and external worker lists every 15 seconds."""
+        while self.running:
+            if not await self._leader_turn("queue_depths", 15):
+                continue
+
+            try:
+                with observe_loop("queue_depths"):
+                    await self._record_queue_depths()
+            except Exception as e:
+                logger.error("Error recording queue depths", error=str(e))
+
+            await asyncio.sleep(15)
+
+    async def _record_queue_depths(self):
+        """Set the queue depth gauges from Redis."""
+        # Deferred jobs (retries, ...) are scored by their run time
+        now_ms = int(time.time() * 1000)
+        # The default queue only holds jobs enqueued before named queues
+        for queue in [default_queue_name, *(queue_key(name) for name in QUEUE_NAMES)]:
+            ready = await self.redis_pool.zcount(queue, "-inf", now_ms)
+            QUEUE_DEPTH.labels(queue=queue).set(ready)
+
+        depths = await worker_service.get_queue_depths()
+        # Drop workers whose list is gone
+        WORKER_QUEUE_DEPTH.clear()
+        for worker_id, depth in depths.items():
+            WORKER_QUEUE_DEPTH.labels(worker_id=worker_id).set(depth)
+
     async def _cleanup_stale_instances(self):
         """Cleanup stale running instances every 5 minutes."""
         while self.running:
+            if not await self._leader_turn("stale_instances", 300):
+                continue
+
             try:
-                async with async_session_factory() as db:
-                    cleaned = await overlap_service.cleanup_stale_instances(db)
-                    if cleaned:
-                        await db.commit()
-                        logger.info("Cleaned up stale running instances", count=cleaned)
+                with observe_loop("stale_instances"):
+                    async with async_session_factory() as db:
+                        cleaned = await overlap_service.cleanup_stale_instances(db)
+                        if cleaned:
+                            await db.commit()
+                            logger.info("Cleaned up stale running instances", count=cleaned)
             except Exception as e:
                 logger.error("Error cleaning up stale instances", error=str(e))
 
@@ -651,53 +890,61 @@ class TaskScheduler:
         from app.services.billing import billing_service
 
         while self.running:
+            if not await self._leader_turn("execution_retention", 3600):
+                continue
+
             try:
-                async with async_session_factory() as db:
-                    workspace_repo = WorkspaceRepository(db)
-                    execution_repo = ExecutionRepository(db)
-                    chain_execution_repo = ChainExecutionRepository(db)
+                with observe_loop("execution_retention"):
+                    async with async_session_factory() as db:
+                        workspace_repo = WorkspaceRepository(db)
+                        execution_repo = ExecutionRepository(db)
+                        chain_execution_repo = ChainExecutionRepository(db)
+
+                        # Get all workspaces grouped by owner
+                        owner_workspaces = await workspace_repo.get_all_workspace_ids_grouped_by_owner()
+
+                        # Resolve all owners' plans in one query
+                        owner_plans = await billing_service.get_user_plans(
+                            db, [owner_id for owner_id, _ in owner_workspaces]
+                        )
 
-                    # Get all workspaces grouped by owner
-                    owner_workspaces = await workspace_repo.get_all_workspace_ids_grouped_by_owner()
+                        total_deleted = 0
+                        total_chain_deleted = 0
 
-                    total_deleted = 0
-                    total_chain_deleted = 0
+                        for owner_id, workspace_ids in owner_workspaces:
+                            try:
+                                plan = owner_plans[owner_id]
+                                retention_days = plan.max_execution_history_days
 
-                    for owner_id, workspace_ids in owner_workspaces:
-                        try:
-                            # Get owner's plan
-                            plan = await billing_service.get_user_plan(db, owner_id)
-                            retention_days = plan.max_execution_history_days
+                                # Calculate cutoff date
+                                cutoff = datetime.utcnow() - timedelta(days=retention_days)
 
-                            # Calculate cutoff date
-                            cutoff = datetime.utcnow() - timedelta(days=retention_days)
+                                # Delete old executions for each workspace
+                                for workspace_id in workspace_ids:
+                                    deleted = await execution_repo.cleanup_old_executions(workspace_id, cutoff)
+                                    total_deleted += deleted
 
-                            # Delete old executions for each workspace
-                            for workspace_id in workspace_ids:
-                                deleted = await execution_repo.cleanup_old_executions(workspace_id, cutoff)
-                                total_deleted += deleted
+                                    chain_deleted = await chain_execution_repo.delete_old_executions(
+                                        workspace_id, retention_days
+                                    )
+                                    total_chain_deleted += chain_deleted
 
-                                chain_deleted = await chain_execution_repo.delete_old_executions(
-                                    workspace_id, retention_days
+                            except Exception as e:
+                                logger.error(
+                                    "Error cleaning up executions for owner",
+                                    owner_id=str(owner_id),
+                                    error=str(e),
                                 )
-                                total_chain_deleted += chain_deleted
-
-                        except Exception as e:
-                            logger.error(
-                                "Error cleaning up executions for owner",
-                                owner_id=str(owner_id),
-                                error=str(e),
-                            )
-                            continue
+                                continue
 
-                    await db.commit()
+                        await db.commit()
 
-                    if total_deleted > 0 or total_chain_deleted > 0:
-                        logger.info(
-                            "Cleaned up old executions",
-                            executions_deleted=total_deleted,
-                            chain_executions_deleted=total_chain_deleted,
-                        )
+                        if total_deleted > 0 or total_chain_deleted > 0:
+                            logger.info(
+                                "Cleaned up old executions",
+                                executions_deleted=total_deleted,
+                                chain_executions_deleted=total_chain_deleted,
+                            )
 
             except Exception as e:
                 logger.error("Error in execution cleanup job", error=str(e))
@@ -706,28 +953,35 @@ class TaskScheduler:
             await asyncio.sleep(3600)
 
     async def _process_task_queue(self):
-        """Process queued tasks when slots become available every 10 seconds."""
+        """Start queued tasks whose slots are free every 30 seconds.
+
+        Finishing executions hand their slot to the next queued one, so
+        this is only a safety net (e.g. for slots freed by stale instance
+        cleanup or expired leases).
+        """
         while self.running:
+            if not await self._leader_turn("task_queue", 30):
+                continue
+
             try:
-                await self._check_and_execute_queued_tasks()
+                with observe_loop("task_queue"):
+                    await self._check_and_execute_queued_tasks()
             except Exception as e:
                 logger.error("Error processing task queue", error=str(e))
 
-            await asyncio.sleep(10)
+            await asyncio.sleep(30)
 
     async def _check_and_execute_queued_tasks(self):
-        """Check for queued tasks that can now be executed."""
+        """Check tasks with queued executions for free slots."""
+        if overlap_service.uses_leases:
+            await self._execute_queued_with_leases()
+            return
 
         async with async_session_factory() as db:
-            # Get cron tasks with queue policy and available slots
-            CronTaskRepository(db)
-            TaskChainRepository(db)
-
-            # Find cron tasks with available slots
-            from sqlalchemy import select
-
+            # Find cron tasks with queued executions and available slots
             result = await db.execute(
                 select(CronTask).where(
+                    CronTask.id.in_(select(TaskQueue.task_id).where(TaskQueue.task_type == "cron")),
                     CronTask.overlap_policy == OverlapPolicy.QUEUE,
                     CronTask.is_active == True,  # noqa: E712
                     CronTask.is_paused == False,  # noqa: E712
@@ -737,44 +991,16 @@ class TaskScheduler:
             available_cron_tasks = result.scalars().all()
 
             for task in available_cron_tasks:
-                # Check if there are queued executions
                 queued = await overlap_service._pop_from_queue(db, "cron", task.id)
                 if queued:
                     # Increment running instances
                     await overlap_service._increment_running_instances(db, "cron", task.id)
+                    await overlap_service.dispatch_queued(self.redis_pool, "cron", task, queued)
 
-                    # Enqueue the task
-                    if task.worker_id:
-                        task_info = WorkerTaskInfo(
-                            task_id=task.id,
-                            task_type="cron",
-                            url=task.url,
-                            method=task.method.value,
-                            headers=task.headers or {},
-                            body=task.body,
-                            timeout_seconds=task.timeout_seconds,
-                            retry_count=task.retry_count,
-                            retry_delay_seconds=task.retry_delay_seconds,
-                            workspace_id=task.workspace_id,
-                            task_name=task.name,
-                        )
-                        await worker_service.enqueue_task_for_worker(task.worker_id, task_info)
-                    else:
-                        await self.redis_pool.enqueue_job(
-                            "execute_cron_task",
-                            task_id=str(task.id),
-                            retry_attempt=queued.retry_attempt,
-                        )
-
-                    logger.info(
-                        "Executed queued cron task",
-                        task_id=str(task.id),
-                        task_name=task.name,
-                    )
-
-            # Find chains with available slots
+            # Find chains with queued executions and available slots
             chain_result = await db.execute(
                 select(TaskChain).where(
+                    TaskChain.id.in_(select(TaskQueue.task_id).where(TaskQueue.task_type == "chain")),
                     TaskChain.overlap_policy == OverlapPolicy.QUEUE,
                     TaskChain.is_active == True,  # noqa: E712
                     TaskChain.is_paused == False,  # noqa: E712
@@ -788,21 +1014,43 @@ class TaskScheduler:
                 if queued:
                     # Increment running instances
                     await overlap_service._increment_running_instances(db, "chain", chain.id)
+                    await overlap_service.dispatch_queued(self.redis_pool, "chain", chain, queued)
 
-                    # Enqueue the chain
-                    await self.redis_pool.enqueue_job(
-                        "execute_chain",
-                        chain_id=str(chain.id),
-                        initial_variables=queued.initial_variables or {},
-                    )
+            await db.commit()
 
-                    logger.info(
-                        "Executed queued chain",
-                        chain_id=str(chain.id),
-                        chain_name=chain.name,
-                    )
+    async def _execute_queued_with_leases(self):
+        """Start queued executions of tasks that can take a lease slot."""
+        queued_tasks = await overlap_lease_store.queued_tasks()
+        if not queued_tasks:
+            return
 
-            await db.commit()
+        async with async_session_factory() as db:
+            for task_type, task_id in queued_tasks:
+                task = await db.get(CronTask if task_type == "cron" else TaskChain, task_id)
+                if task is None:
+                    # Deleted task, drop its queue
+                    await overlap_lease_store.clear_task(task_type, task_id)
+                    continue
+                if task.overlap_policy != OverlapPolicy.QUEUE or not task.is_active or task.is_paused:
+                    continue
+
+                lease_id = await overlap_lease_store.acquire(
+                    task_type, task.id, task.max_instances, overlap_service.lease_ttl(task)
+                )
+                if not lease_id:
+                    continue
+
+                queued = await overlap_lease_store.pop(task_type, task.id)
+                if not queued:
+                    await overlap_service.release_lease(task_type, task.id, lease_id)
+                    continue
+
+                try:
+                    await overlap_service.dispatch_queued(self.redis_pool, task_type, task, queued, lease_id)
+                except Exception:
+                    await overlap_lease_store.push_front(queued)
+                    await overlap_service.release_lease(task_type, task.id, lease_id)
+                    raise
 
 
 async def run_scheduler():
@@ -3,7 +3,10 @@
 from arq.connections import RedisSettings
 
 from app.config import settings
+from app.core.redis import redis_client
+from app.workers.queues import JOB_QUEUES, queue_key, queue_max_jobs
 from app.workers.tasks import (
+    create_http_client,
     execute_chain,
     execute_cron_task,
     execute_delayed_task,
@@ -26,8 +29,39 @@ def get_redis_settings() -> RedisSettings:
     )
 
 
+async def init_worker_context(ctx: dict) -> None:
+    """Set up the resources shared by the jobs of a worker process."""
+    from app.db.database import async_session_factory
+
+    # Initialize database session factory
+    ctx["db_factory"] = async_session_factory
+
+    # Shared app Redis client (cache invalidation)
+    await redis_client.initialize()
+
+    # Shared client for task HTTP requests
+    ctx["http_client"] = create_http_client()
+
+    if settings.worker_metrics_port:
+        from app.workers.metrics import start_metrics_server
+
+        start_metrics_server(settings.worker_metrics_port)
+
+
+async def close_worker_context(ctx: dict) -> None:
+    """Release the resources set up by init_worker_context."""
+    if "http_client" in ctx:
+        await ctx["http_client"].aclose()
+    await redis_client.close()
+
+
 class WorkerSettings:
-    """arq worker settings."""
+    """arq worker settings.
+
+    Used as is, the worker consumes the arq default queue, which only holds
+    jobs enqueued before named queues (cronbox-worker drains it on start);
+    ``queue_worker_options`` adapts it to a named queue.
+    """
 
     # Redis connection
     redis_settings = get_redis_settings()
@@ -58,14 +92,11 @@ class WorkerSettings:
         """Called on worker startup."""
         from arq import create_pool
 
-        from app.db.database import async_session_factory
-
-        # Initialize database session factory
-        ctx["db_factory"] = async_session_factory
-
         # Initialize shared Redis pool for enqueuing jobs
         ctx["redis"] = await create_pool(get_redis_settings())
 
+        await init_worker_context(ctx)
+
         print("Worker started successfully")
 
     @staticmethod
@@ -74,6 +105,7 @@ class WorkerSettings:
         # Close shared Redis pool
         if "redis" in ctx:
             await ctx["redis"].close(close_connection_pool=True)
+        await close_worker_context(ctx)
 
         print("Worker shutting down...")
 
@@ -86,3 +118,13 @@ class WorkerSettings:
     async def on_job_end(ctx: dict) -> None:
         """Called when a job ends."""
         pass
+
+
+def queue_worker_options(name: str) -> dict:
+    """Get the arq Worker options overriding WorkerSettings for a named queue."""
+    return {
+        "queue_name": queue_key(name),
+        "functions": [function for function in WorkerSettings.functions if JOB_QUEUES[function.__name__] == name],
+        "max_jobs": queue_max_jobs(name),
+        "health_check_key": f"{WorkerSettings.health_check_key}:{name}",
+    }
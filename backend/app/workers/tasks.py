@@ -1,15 +1,18 @@
 """Worker tasks for executing HTTP, ICMP, and TCP requests."""
 
 import asyncio
+import math
+import time
+from contextlib import nullcontext
 from datetime import datetime
+from http.cookiejar import CookieJar, DefaultCookiePolicy
 from typing import Any
 from uuid import UUID
 
 import httpx
-import pytz
 import structlog
-from croniter import croniter
 
+from app.config import settings
 from app.core.url_validator import (
     SSRFError,
     sanitize_url_for_logging,
@@ -19,22 +22,21 @@ from app.db.repositories.cron_tasks import CronTaskRepository
 from app.db.repositories.delayed_tasks import DelayedTaskRepository
 from app.db.repositories.executions import ExecutionRepository
 from app.models.cron_task import OverlapPolicy, ProtocolType, TaskStatus
+from app.services.http_timing import HttpTimingTrace
 from app.services.icmp import execute_icmp_ping
 from app.services.notifications import notification_service
 from app.services.overlap import overlap_service
+from app.services.schedule import calculate_next_run, get_jitter_offset
 from app.services.tcp import execute_tcp_check
+from app.services.workspace_summary import workspace_summary_service
+from app.workers.metrics import observe_http_timings, observe_start_lag
+from app.workers.queues import queue_for
 
 logger = structlog.get_logger()
 
-
-def calculate_next_run(schedule: str, tz_name: str) -> datetime:
-    """Calculate next run time based on cron schedule and timezone."""
-    tz = pytz.timezone(tz_name)
-    now = datetime.now(tz)
-    cron = croniter(schedule, now)
-    next_run = cron.get_next(datetime)
-    # Convert to UTC for storage (naive datetime)
-    return next_run.astimezone(pytz.UTC).replace(tzinfo=None)
+# Chain step retries due within this many seconds are awaited in the running
+# job; longer waits checkpoint the run and resume it in a deferred job
+CHAIN_RETRY_INLINE_SECONDS = 1.0
 
 
 async def send_task_notification(
@@ -99,6 +101,18 @@ async def send_task_notification(
             return {"success": False, "error": str(e)}
 
 
+def create_http_client() -> httpx.AsyncClient:
+    """Create the worker-wide client for task HTTP requests.
+
+    Sharing it keeps connections to the same targets alive between runs.
+    Cookies are never stored, so responses can't leak into other tasks.
+    """
+    return httpx.AsyncClient(
+        cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+        limits=httpx.Limits(max_connections=None, max_keepalive_connections=100),
+    )
+
+
 async def execute_http_task(
     ctx: dict,
     *,
@@ -111,11 +125,16 @@ async def execute_http_task(
     """Execute an HTTP request and return the result.
 
     This is the core HTTP execution function used by both cron and delayed tasks.
+    Requests go through the worker's shared client (ctx["http_client"]) when
+    there is one. Phase timings are returned under "timings".
 
     Security: URLs are validated against SSRF attacks before execution.
     """
     headers = headers or {}
-    start_time = datetime.utcnow()
+    started = time.perf_counter()
+
+    def elapsed_ms() -> int:
+        return int((time.perf_counter() - started) * 1000)
 
     # SSRF Protection: Validate URL before making request
     try:
@@ -136,23 +155,28 @@ async def execute_http_task(
             "error": f"URL validation failed: {e.message}",
             "error_type": "ssrf_blocked",
         }
+    # Validation resolves the hostname
+    dns_ms = round((time.perf_counter() - started) * 1000, 3)
 
+    trace = HttpTimingTrace()
+    shared_client = ctx.get("http_client")
     try:
-        async with httpx.AsyncClient(timeout=timeout_seconds) as client:
+        async with nullcontext(shared_client) if shared_client else httpx.AsyncClient() as client:
             response = await client.request(
                 method=method,
                 url=url,
                 headers=headers,
                 content=body.encode() if body else None,
+                timeout=timeout_seconds,
+                extensions={"trace": trace},
             )
 
-        end_time = datetime.utcnow()
-        duration_ms = int((end_time - start_time).total_seconds() * 1000)
+        duration_ms = elapsed_ms()
 
         # Limit response body size (max 64KB)
         response_body = response.text[:65536] if response.text else None
 
-        return {
+        result = {
             "success": 200 <= response.status_code < 400,
             "status_code": response.status_code,
             "headers": dict(response.headers),
@@ -163,39 +187,44 @@ async def execute_http_task(
         }
 
     except httpx.TimeoutException as e:
-        return {
+        result = {
             "success": False,
             "status_code": None,
             "headers": None,
             "body": None,
             "size_bytes": None,
-            "duration_ms": int((datetime.utcnow() - start_time).total_seconds() * 1000),
+            "duration_ms": elapsed_ms(),
             "error": str(e),
             "error_type": "timeout",
         }
     except httpx.RequestError as e:
-        return {
+        result = {
             "success": False,
             "status_code": None,
             "headers": None,
             "body": None,
             "size_bytes": None,
-            "duration_ms": int((datetime.utcnow() - start_time).total_seconds() * 1000),
+            "duration_ms": elapsed_ms(),
             "error": str(e),
             "error_type": "request_error",
         }
     except Exception as e:
-        return {
+        result = {
             "success": False,
             "status_code": None,
             "headers": None,
             "body": None,
             "size_bytes": None,
-            "duration_ms": int((datetime.utcnow() - start_time).total_seconds() * 1000),
+            "duration_ms": elapsed_ms(),
             "error": str(e),
             "error_type": "unknown",
         }
 
+    timings = trace.timings(dns_ms=dns_ms)
+    observe_http_timings(timings)
+    result["timings"] = timings.as_dict()
+    return result
+
 
 async def execute_icmp_task(
     ctx: dict,
@@ -266,6 +295,8 @@ async def execute_cron_task(
     task_id: str,
     retry_attempt: int = 0,
     manual_run: bool = False,
+    lease_id: str | None = None,
+    scheduled_at: str | None = None,
 ) -> dict:
     """Execute a cron task by ID.
 
@@ -276,7 +307,26 @@ async def execute_cron_task(
         task_id: The ID of the task to execute
         retry_attempt: Current retry attempt number
         manual_run: If True, allows execution of paused tasks (for manual trigger)
+        lease_id: Overlap slot lease held while the task runs (redis backend)
+        scheduled_at: When the scheduled run fell due (ISO, naive UTC)
     """
+    if scheduled_at:
+        observe_start_lag("cron", datetime.fromisoformat(scheduled_at))
+
+    async with overlap_service.hold_lease("cron", task_id, lease_id):
+        return await _execute_cron_task(
+            ctx, task_id=task_id, retry_attempt=retry_attempt, manual_run=manual_run, lease_id=lease_id
+        )
+
+
+async def _execute_cron_task(
+    ctx: dict,
+    *,
+    task_id: str,
+    retry_attempt: int,
+    manual_run: bool,
+    lease_id: str | None,
+) -> dict:
     db_factory = ctx["db_factory"]
 
     async with db_factory() as db:
@@ -328,7 +378,8 @@ async def execute_cron_task(
                 error=validation_error,
             )
             # Update task status to failed without creating execution
-            next_run_at = calculate_next_run(task.schedule, task.timezone)
+            offset = get_jitter_offset(task.id, await cron_repo.get_schedule_jitter_seconds(task))
+            next_run_at = calculate_next_run(task.schedule, task.timezone, offset_seconds=offset)
             await cron_repo.update_last_run(
                 task=task,
                 status=TaskStatus.FAILED,
@@ -336,6 +387,8 @@ async def execute_cron_task(
                 next_run_at=next_run_at,
             )
             await db.commit()
+            if previous_status != TaskStatus.FAILED:
+                await workspace_summary_service.invalidate(task.workspace_id)
             return {"success": False, "error": validation_error}
 
         # Create execution record based on protocol type
@@ -424,6 +477,7 @@ async def execute_cron_task(
                 response_size_bytes=result.get("size_bytes"),
                 error_message=result.get("error"),
                 error_type=result.get("error_type"),
+                http_timings=result.get("timings"),
             )
         elif protocol_type == ProtocolType.ICMP:
             await exec_repo.complete_icmp_execution(
@@ -448,11 +502,8 @@ async def execute_cron_task(
             )
 
         # Calculate next run time
-        tz = pytz.timezone(task.timezone)
-        now = datetime.now(tz)
-        cron = croniter(task.schedule, now)
-        next_run = cron.get_next(datetime)
-        next_run_utc = next_run.astimezone(pytz.UTC).replace(tzinfo=None)
+        offset = get_jitter_offset(task.id, await cron_repo.get_schedule_jitter_seconds(task))
+        next_run_utc = calculate_next_run(task.schedule, task.timezone, offset_seconds=offset)
 
         # Update task status
         await cron_repo.update_last_run(
@@ -464,10 +515,14 @@ async def execute_cron_task(
 
         # Release running instance slot for overlap prevention
         if task.overlap_policy != OverlapPolicy.ALLOW:
-            await overlap_service.release_cron_task(db, task)
+            await overlap_service.release_cron_task(db, task, ctx["redis"], lease_id=lease_id)
 
         await db.commit()
 
+        # Failing task counts only change when the status flips
+        if status != previous_status:
+            await workspace_summary_service.invalidate(task.workspace_id)
+
         logger.info(
             "Cron task execution completed",
             task_id=task_id,
@@ -489,6 +544,7 @@ async def execute_cron_task(
                         task_name=task.name,
                         task_type="cron",
                         notification_event="recovery",
+                        _queue_name=queue_for("send_task_notification"),
                     )
                 # Send success notification
                 await redis.enqueue_job(
@@ -498,6 +554,7 @@ async def execute_cron_task(
                     task_type="cron",
                     notification_event="success",
                     duration_ms=result.get("duration_ms"),
+                    _queue_name=queue_for("send_task_notification"),
                 )
             else:
                 # Only send failure notification on final attempt (no more retries)
@@ -519,6 +576,7 @@ async def execute_cron_task(
                         notification_event="failure",
                         error_message=result.get("error"),
                         task_url=task_target,
+                        _queue_name=queue_for("send_task_notification"),
                     )
         except Exception as e:
             logger.error("Failed to enqueue notification", error=str(e), task_id=task_id)
@@ -530,6 +588,7 @@ async def execute_cron_task(
                 task_id=task_id,
                 retry_attempt=retry_attempt + 1,
                 _defer_by=task.retry_delay_seconds,
+                _queue_name=queue_for("execute_cron_task"),
             )
 
             logger.info(
@@ -605,6 +664,7 @@ async def execute_delayed_task(
             )
             await delayed_repo.mark_failed(task, error=validation_error)
             await db.commit()
+            await workspace_summary_service.invalidate(task.workspace_id)
             return {"success": False, "error": validation_error}
 
         # Create execution record based on protocol type
@@ -692,6 +752,7 @@ async def execute_delayed_task(
                 response_size_bytes=result.get("size_bytes"),
                 error_message=result.get("error"),
                 error_type=result.get("error_type"),
+                http_timings=result.get("timings"),
             )
         elif protocol_type == ProtocolType.ICMP:
             await exec_repo.complete_icmp_execution(
@@ -726,6 +787,8 @@ async def execute_delayed_task(
                 await delayed_repo.mark_completed(task, TaskStatus.FAILED, datetime.utcnow())
 
         await db.commit()
+        # One-shot task left the pending state
+        await workspace_summary_service.invalidate(task.workspace_id)
 
         logger.info(
             "Delayed task execution completed",
@@ -746,6 +809,7 @@ async def execute_delayed_task(
                     task_type="delayed",
                     notification_event="success",
                     duration_ms=result.get("duration_ms"),
+                    _queue_name=queue_for("send_task_notification"),
                 )
             else:
                 # Only send failure notification on final attempt (no more retries)
@@ -767,6 +831,7 @@ async def execute_delayed_task(
                         notification_event="failure",
                         error_message=result.get("error"),
                         task_url=task_target,
+                        _queue_name=queue_for("send_task_notification"),
                     )
         except Exception as e:
             logger.error("Failed to enqueue notification", error=str(e), task_id=task_id)
@@ -778,6 +843,7 @@ async def execute_delayed_task(
                 task_id=task_id,
                 retry_attempt=retry_attempt + 1,
                 _defer_by=task.retry_delay_seconds,
+                _queue_name=queue_for("execute_delayed_task"),
             )
 
             logger.info(
@@ -806,17 +872,49 @@ async def execute_chain(
     chain_id: str,
     initial_variables: dict | None = None,
     manual_run: bool = False,
+    chain_execution_id: str | None = None,
+    lease_id: str | None = None,
 ) -> dict:
     """Execute a task chain by ID.
 
     Creates chain and step execution records, performs HTTP requests
     for each step with variable substitution, and handles conditions.
 
+    A step retry that is not due soon does not block the job: the run is
+    checkpointed to its ChainExecution and re-enqueued with _defer_by,
+    then resumes from the checkpoint at the retried step.
+
     Args:
         chain_id: The ID of the chain to execute
         initial_variables: Optional variables to pass to the chain
         manual_run: If True, allows execution of paused chains (for manual trigger)
+        chain_execution_id: Execution to resume from its checkpoint
+        lease_id: Overlap slot lease held while the chain runs (redis backend)
     """
+    async with overlap_service.hold_lease("chain", chain_id, lease_id) as lease:
+        result = await _execute_chain(
+            ctx,
+            chain_id=chain_id,
+            initial_variables=initial_variables,
+            manual_run=manual_run,
+            chain_execution_id=chain_execution_id,
+            lease_id=lease_id,
+        )
+        if lease and result.get("deferred"):
+            # The resumed job holds the slot until the chain completes
+            lease.hand_off(result["retry_in_seconds"] + settings.overlap_pending_lease_ttl_seconds)
+        return result
+
+
+async def _execute_chain(
+    ctx: dict,
+    *,
+    chain_id: str,
+    initial_variables: dict | None,
+    manual_run: bool,
+    chain_execution_id: str | None,
+    lease_id: str | None,
+) -> dict:
     from uuid import UUID
 
     from app.db.repositories.chain_executions import (
@@ -828,14 +926,16 @@ async def execute_chain(
     from app.models.task_chain import ChainStatus, TriggerType
     from app.services.chain_executor import (
         ChainExecutionContext,
+        ResponseDocument,
+        StepScheduler,
         VariableSubstitutionError,
         evaluate_condition,
         extract_variables_from_response,
         log_chain_execution_complete,
         log_chain_execution_start,
         log_step_execution,
-        prepare_step_request,
     )
+    from app.services.chain_plan import get_chain_plan
 
     db_factory = ctx["db_factory"]
     initial_variables = initial_variables or {}
@@ -851,206 +951,352 @@ async def execute_chain(
             logger.warning("Chain not found", chain_id=chain_id)
             return {"success": False, "error": "Chain not found"}
 
-        # For manual runs, allow paused chains but still require active
-        # For scheduled runs, reject both inactive and paused chains
-        if not chain.is_active:
-            logger.info("Chain is not active", chain_id=chain_id)
-            return {"success": False, "error": "Chain not active"}
+        chain_execution = None
+        checkpoint = None
+        if chain_execution_id:
+            # Resuming after a deferred retry: the run already passed the
+            # checks below, so finish it even if the chain was paused since
+            chain_execution = await exec_repo.get_by_id(UUID(chain_execution_id))
+            checkpoint = chain_execution.checkpoint if chain_execution else None
+            if checkpoint is None:
+                logger.warning("Chain execution has nothing to resume", chain_execution_id=chain_execution_id)
+                return {"success": False, "error": "Chain execution not resumable"}
+        else:
+            # For manual runs, allow paused chains but still require active
+            # For scheduled runs, reject both inactive and paused chains
+            if not chain.is_active:
+                logger.info("Chain is not active", chain_id=chain_id)
+                return {"success": False, "error": "Chain not active"}
 
-        if chain.is_paused and not manual_run:
-            logger.info("Chain is paused (scheduled run)", chain_id=chain_id)
-            return {"success": False, "error": "Chain is paused"}
+            if chain.is_paused and not manual_run:
+                logger.info("Chain is paused (scheduled run)", chain_id=chain_id)
+                return {"success": False, "error": "Chain is paused"}
 
         if not chain.steps:
             logger.info("Chain has no steps", chain_id=chain_id)
             return {"success": False, "error": "Chain has no steps"}
 
-        # Create execution context
-        exec_context = ChainExecutionContext(chain, initial_variables)
-        log_chain_execution_start(chain, exec_context.variables)
-
-        # Create chain execution record
-        chain_execution = await exec_repo.create_execution(
-            workspace_id=chain.workspace_id,
-            chain_id=chain.id,
-            total_steps=len(chain.steps),
-            initial_variables=initial_variables,
-        )
-        await db.commit()
+        # Run steps as their dependencies finish. Only the HTTP requests run
+        # concurrently; all database writes stay in this coroutine because
+        # the session must not be used from several tasks at once.
+        plan = get_chain_plan(chain)
+        scheduler = StepScheduler(chain.steps, chain.max_parallel_steps, plan.dependencies)
+        # Parsed responses of this job's steps, shared by extractors and conditions
+        documents: dict[int, ResponseDocument] = {}
+        in_flight: dict[asyncio.Task, tuple[Any, Any, str, dict[str, Any]]] = {}
+        # Failed steps waiting for a retry, keyed by step_order
+        retries: dict[int, dict[str, Any]] = {}
+        retry_step_executions: dict[int, Any] = {}
+
+        if checkpoint is not None:
+            exec_context = ChainExecutionContext.from_checkpoint(chain, checkpoint)
+            retries = {int(order): retry for order, retry in checkpoint.get("retries", {}).items()}
+            scheduler.restore(set(checkpoint.get("finished", [])), set(retries))
+            if checkpoint.get("stopped"):
+                scheduler.stop()
+            logger.info("Resuming chain execution", chain_id=chain_id, chain_execution_id=chain_execution_id)
+        else:
+            exec_context = ChainExecutionContext(chain, initial_variables)
+            log_chain_execution_start(chain, exec_context.variables)
+
+            # Create chain execution record
+            chain_execution = await exec_repo.create_execution(
+                workspace_id=chain.workspace_id,
+                chain_id=chain.id,
+                total_steps=len(chain.steps),
+                initial_variables=initial_variables,
+            )
+            await db.commit()
 
-        # Execute each step
-        for step in chain.steps:
-            step_status = StepStatus.PENDING
-            status_code = None
-            response_body = None
-            extracted_vars = {}
-            error_message = None
-            error_type = None
+        steps_by_order = {step.step_order: step for step in chain.steps}
+        for order in [order for order in retries if order not in steps_by_order]:
+            # The step was deleted while the run was waiting for its retry
+            del retries[order]
+            exec_context.update_from_step_result(StepStatus.FAILED, step_order=order)
+
+        def launch_request(step, step_execution, request: dict[str, Any]) -> None:
+            """Start a step's HTTP request in the background."""
+            task = asyncio.create_task(
+                execute_http_task(
+                    ctx,
+                    url=request["url"],
+                    method=step.method.value,
+                    headers=request["headers"],
+                    body=request["body"],
+                    timeout_seconds=step.timeout_seconds,
+                )
+            )
+            in_flight[task] = (step, step_execution, request)
+
+        async def skip_step(step, condition_details: str) -> None:
+            await step_exec_repo.mark_as_skipped(
+                chain_execution_id=chain_execution.id,
+                step_id=step.id,
+                step_order=step.step_order,
+                step_name=step.name,
+                request_url=step.url,
+                request_method=step.method.value,
+                condition_details=condition_details,
+            )
+            exec_context.update_from_step_result(StepStatus.SKIPPED, step_order=step.step_order)
+            log_step_execution(chain, step, step.step_order, step.url, StepStatus.SKIPPED)
+
+        async def start_step(step) -> bool:
+            """Start a step. Returns False if it finished without a request."""
+            # Skip disabled steps
+            if not step.is_enabled:
+                await skip_step(step, "Step is disabled")
+                return False
+
+            # Check condition against the previous step's response
+            compiled = plan.steps[step.step_order]
+            if compiled.condition:
+                previous_order = scheduler.previous_step_order(step)
+                previous_status_code, previous_response_body = exec_context.get_step_response(previous_order)
+                condition_met, condition_details = evaluate_condition(
+                    compiled.condition,
+                    previous_status_code,
+                    documents.get(previous_order) or previous_response_body,
+                )
+                if not condition_met:
+                    await skip_step(step, condition_details)
+                    return False
 
+            # Prepare request with variable substitution
             try:
-                # Skip disabled steps
-                if not step.is_enabled:
-                    await step_exec_repo.mark_as_skipped(
-                        chain_execution_id=chain_execution.id,
-                        step_id=step.id,
-                        step_order=step.step_order,
-                        step_name=step.name,
-                        request_url=step.url,
-                        request_method=step.method.value,
-                        condition_details="Step is disabled",
-                    )
-                    exec_context.update_from_step_result(StepStatus.SKIPPED)
-                    log_step_execution(chain, step, step.step_order, step.url, StepStatus.SKIPPED)
-                    continue
-
-                # Check condition if present
-                if step.condition:
-                    condition_met, condition_details = evaluate_condition(
-                        step.condition,
-                        exec_context.previous_status_code,
-                        exec_context.previous_response_body,
-                    )
-                    if not condition_met:
-                        # Skip this step
-                        await step_exec_repo.mark_as_skipped(
-                            chain_execution_id=chain_execution.id,
-                            step_id=step.id,
-                            step_order=step.step_order,
-                            step_name=step.name,
-                            request_url=step.url,
-                            request_method=step.method.value,
-                            condition_details=condition_details,
-                        )
-                        exec_context.update_from_step_result(StepStatus.SKIPPED)
-                        log_step_execution(chain, step, step.step_order, step.url, StepStatus.SKIPPED)
-                        continue
+                url, headers, body = compiled.prepare_request(exec_context.get_variables_for_step(step.step_order))
+            except VariableSubstitutionError as e:
+                error_message = str(e)
 
-                # Prepare request with variable substitution
-                try:
-                    url, headers, body = prepare_step_request(step, exec_context.variables)
-                except VariableSubstitutionError as e:
-                    step_status = StepStatus.FAILED
-                    error_message = str(e)
-                    error_type = "variable_substitution"
-
-                    # Create step execution record for the failure
-                    step_execution = await step_exec_repo.create_step_execution(
-                        chain_execution_id=chain_execution.id,
-                        step_id=step.id,
-                        step_order=step.step_order,
-                        step_name=step.name,
-                        request_url=step.url,
-                        request_method=step.method.value,
-                        request_headers=step.headers,
-                        request_body=step.body,
-                    )
-                    await step_exec_repo.complete_step_execution(
-                        step_execution,
-                        status=StepStatus.FAILED,
-                        error_message=error_message,
-                        error_type=error_type,
-                    )
-                    exec_context.update_from_step_result(StepStatus.FAILED)
-                    log_step_execution(chain, step, step.step_order, step.url, StepStatus.FAILED, error=error_message)
-
-                    if not exec_context.should_continue(step, StepStatus.FAILED):
-                        break
-                    continue
-
-                # Create step execution record
+                # Create step execution record for the failure
                 step_execution = await step_exec_repo.create_step_execution(
                     chain_execution_id=chain_execution.id,
                     step_id=step.id,
                     step_order=step.step_order,
                     step_name=step.name,
-                    request_url=url,
+                    request_url=step.url,
                     request_method=step.method.value,
-                    request_headers=headers,
-                    request_body=body,
+                    request_headers=step.headers,
+                    request_body=step.body,
                 )
-
-                # Execute HTTP request with retry
-                result: dict[str, Any] | None = None
-                for attempt in range(step.retry_count + 1):
-                    result = await execute_http_task(
-                        ctx,
-                        url=url,
-                        method=step.method.value,
-                        headers=headers,
-                        body=body,
-                        timeout_seconds=step.timeout_seconds,
-                    )
-                    if result["success"]:
-                        break
-                    if attempt < step.retry_count:
-                        await asyncio.sleep(step.retry_delay_seconds)
-
-                # result is always set because retry_count >= 0, so loop runs at least once
-                assert result is not None
-
-                status_code = result.get("status_code")
-                response_body = result.get("body")
-
-                if result["success"]:
-                    step_status = StepStatus.SUCCESS
-                    # Extract variables from response
-                    if step.extract_variables:
-                        extracted_vars = extract_variables_from_response(response_body, step.extract_variables)
-                else:
-                    step_status = StepStatus.FAILED
-                    error_message = result.get("error")
-                    error_type = result.get("error_type")
-
-                # Complete step execution
                 await step_exec_repo.complete_step_execution(
                     step_execution,
-                    status=step_status,
-                    response_status_code=status_code,
-                    response_headers=result.get("headers"),
-                    response_body=response_body,
-                    response_size_bytes=result.get("size_bytes"),
-                    extracted_variables=extracted_vars,
-                    condition_met=True if step.condition else None,
+                    status=StepStatus.FAILED,
                     error_message=error_message,
-                    error_type=error_type,
-                    retry_attempt=result.get("retry_attempt", 0),
+                    error_type="variable_substitution",
                 )
+                exec_context.update_from_step_result(StepStatus.FAILED, step_order=step.step_order)
+                log_step_execution(chain, step, step.step_order, step.url, StepStatus.FAILED, error=error_message)
 
-                # Update context
-                exec_context.update_from_step_result(
-                    step_status,
-                    status_code=status_code,
-                    response_body=response_body,
-                    extracted_variables=extracted_vars,
-                )
+                if not exec_context.should_continue(step, StepStatus.FAILED):
+                    scheduler.stop()
+                return False
+
+            # Create step execution record
+            step_execution = await step_exec_repo.create_step_execution(
+                chain_execution_id=chain_execution.id,
+                step_id=step.id,
+                step_order=step.step_order,
+                step_name=step.name,
+                request_url=url,
+                request_method=step.method.value,
+                request_headers=headers,
+                request_body=body,
+            )
 
-                log_step_execution(
-                    chain,
-                    step,
-                    step.step_order,
-                    url,
-                    step_status,
-                    duration_ms=result.get("duration_ms"),
-                    error=error_message,
+            launch_request(step, step_execution, {"url": url, "headers": headers, "body": body, "attempt": 0})
+            return True
+
+        async def start_retry(step) -> None:
+            retry = retries.pop(step.step_order)
+            step_execution = retry_step_executions.pop(step.step_order, None)
+            if step_execution is None:
+                # Resumed run: the record was created by an earlier job
+                step_execution = await step_exec_repo.get_by_id(UUID(retry["step_execution_id"]))
+            launch_request(step, step_execution, retry)
+
+        async def finish_step(step, step_execution, request: dict[str, Any], result: dict[str, Any]) -> bool:
+            """Record a finished request. Returns False if the step will be retried."""
+            url = request["url"]
+            if not result["success"] and request["attempt"] < step.retry_count:
+                # Wait for the retry without holding this job: other steps
+                # keep running, and if nothing else is left the run is deferred
+                retries[step.step_order] = {
+                    **request,
+                    "attempt": request["attempt"] + 1,
+                    "retry_at": time.time() + step.retry_delay_seconds,
+                    "step_execution_id": str(step_execution.id),
+                }
+                retry_step_executions[step.step_order] = step_execution
+                logger.info(
+                    "Chain step retry scheduled",
+                    chain_id=chain_id,
+                    step_order=step.step_order,
+                    retry_attempt=request["attempt"] + 1,
+                    retry_delay_seconds=step.retry_delay_seconds,
                 )
+                return False
 
-                # Check if we should continue
-                if step_status == StepStatus.FAILED:
-                    if not exec_context.should_continue(step, step_status):
-                        exec_context.error_message = f"Chain stopped at step {step.step_order}: {error_message}"
-                        break
+            status_code = result.get("status_code")
+            response_body = result.get("body")
+            extracted_vars = {}
+            error_message = None
+            error_type = None
 
-            except Exception as e:
-                logger.error(
-                    "Unexpected error executing step",
-                    chain_id=chain_id,
-                    step_id=str(step.id),
-                    error=str(e),
-                )
-                exec_context.update_from_step_result(StepStatus.FAILED)
-                exec_context.error_message = f"Unexpected error at step {step.step_order}: {str(e)}"
-                if not exec_context.should_continue(step, StepStatus.FAILED):
-                    break
+            document = documents[step.step_order] = ResponseDocument(response_body)
+            if result["success"]:
+                step_status = StepStatus.SUCCESS
+                # Extract variables from response
+                if step.extract_variables:
+                    extracted_vars = extract_variables_from_response(document, plan.steps[step.step_order].extractors)
+            else:
+                step_status = StepStatus.FAILED
+                error_message = result.get("error")
+                error_type = result.get("error_type")
+
+            # Complete step execution
+            await step_exec_repo.complete_step_execution(
+                step_execution,
+                status=step_status,
+                response_status_code=status_code,
+                response_headers=result.get("headers"),
+                response_body=response_body,
+                response_size_bytes=result.get("size_bytes"),
+                extracted_variables=extracted_vars,
+                condition_met=True if step.condition else None,
+                error_message=error_message,
+                error_type=error_type,
+                retry_attempt=request["attempt"],
+            )
+
+            # Update context
+            exec_context.update_from_step_result(
+                step_status,
+                status_code=status_code,
+                response_body=response_body,
+                extracted_variables=extracted_vars,
+                step_order=step.step_order,
+            )
+
+            log_step_execution(
+                chain,
+                step,
+                step.step_order,
+                url,
+                step_status,
+                duration_ms=result.get("duration_ms"),
+                error=error_message,
+            )
+
+            # Check if we should continue
+            if step_status == StepStatus.FAILED and not exec_context.should_continue(step, step_status):
+                exec_context.error_message = f"Chain stopped at step {step.step_order}: {error_message}"
+                scheduler.stop()
+            return True
+
+        def fail_unexpectedly(step, error: Exception) -> None:
+            logger.error(
+                "Unexpected error executing step",
+                chain_id=chain_id,
+                step_id=str(step.id),
+                error=str(error),
+            )
+            exec_context.update_from_step_result(StepStatus.FAILED, step_order=step.step_order)
+            exec_context.error_message = f"Unexpected error at step {step.step_order}: {str(error)}"
+            if not exec_context.should_continue(step, StepStatus.FAILED):
+                scheduler.stop()
+
+        async def defer_execution(delay: float) -> dict:
+            """Checkpoint the run and continue it in a new job once the retry is due."""
+            checkpoint = exec_context.to_checkpoint()
+            checkpoint["finished"] = sorted(scheduler.finished)
+            checkpoint["retries"] = {str(order): retry for order, retry in retries.items()}
+            checkpoint["stopped"] = scheduler.stopped
+
+            await exec_repo.update_step_counts(
+                chain_execution,
+                completed=exec_context.completed_steps,
+                failed=exec_context.failed_steps,
+                skipped=exec_context.skipped_steps,
+            )
+            await exec_repo.update_variables(chain_execution, exec_context.variables)
+            await exec_repo.save_checkpoint(chain_execution, checkpoint)
+            await db.commit()
+
+            # The overlap slot stays taken until the resumed run completes
+            defer_by = math.ceil(delay)
+            await ctx["redis"].enqueue_job(
+                "execute_chain",
+                chain_id=chain_id,
+                chain_execution_id=str(chain_execution.id),
+                manual_run=manual_run,
+                lease_id=lease_id,
+                _defer_by=defer_by,
+                _queue_name=queue_for("execute_chain"),
+            )
+            logger.info(
+                "Chain execution deferred until step retry",
+                chain_id=chain_id,
+                chain_execution_id=str(chain_execution.id),
+                defer_by=defer_by,
+            )
+            return {
+                "success": False,
+                "status": ChainStatus.RUNNING.value,
+                "deferred": True,
+                "retry_in_seconds": defer_by,
+                "completed_steps": exec_context.completed_steps,
+                "failed_steps": exec_context.failed_steps,
+                "skipped_steps": exec_context.skipped_steps,
+            }
+
+        while True:
+            # Start everything that is ready; steps finishing without a
+            # request may unblock further steps, so repeat until none are left
+            while ready := scheduler.next_ready():
+                for step in ready:
+                    if scheduler.stopped:
+                        break
+                    try:
+                        if await start_step(step):
+                            continue
+                    except Exception as e:
+                        fail_unexpectedly(step, e)
+                    scheduler.finish(step)
+
+            # Start retries that are due
+            now = time.time()
+            for order in sorted(order for order, retry in retries.items() if retry["retry_at"] <= now):
+                step = steps_by_order[order]
+                try:
+                    await start_retry(step)
+                except Exception as e:
+                    fail_unexpectedly(step, e)
+                    scheduler.finish(step)
+
+            if not in_flight and not retries:
+                break
+
+            next_retry_in = min(retry["retry_at"] for retry in retries.values()) - time.time() if retries else None
+
+            if not in_flight:
+                # Only retries are left: short waits happen inline, longer
+                # ones free the worker slot until the retry is due
+                if next_retry_in > CHAIN_RETRY_INLINE_SECONDS:
+                    return await defer_execution(next_retry_in)
+                await asyncio.sleep(max(0.0, next_retry_in))
+                continue
+
+            timeout = max(0.0, next_retry_in) if next_retry_in is not None else None
+            done, _ = await asyncio.wait(in_flight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for request in sorted(done, key=lambda t: in_flight[t][0].step_order):
+                step, step_execution, step_request = in_flight.pop(request)
+                try:
+                    if not await finish_step(step, step_execution, step_request, request.result()):
+                        continue
+                except Exception as e:
+                    fail_unexpectedly(step, e)
+                scheduler.finish(step)
 
         # Update chain execution with final status
         final_status = exec_context.get_final_status(len(chain.steps))
@@ -1070,13 +1316,10 @@ async def execute_chain(
         # Calculate next run time for cron chains
         next_run_at = None
         if chain.trigger_type == TriggerType.CRON and chain.schedule:
-            tz = pytz.timezone(chain.timezone)
-            now = datetime.now(tz)
-            cron = croniter(chain.schedule, now)
-            next_run = cron.get_next(datetime)
-            next_run_at = next_run.astimezone(pytz.UTC).replace(tzinfo=None)
+            next_run_at = calculate_next_run(chain.schedule, chain.timezone)
 
         # Update chain status
+        previous_status = chain.last_status
         await chain_repo.update_last_run(
             chain=chain,
             status=final_status,
@@ -1088,10 +1331,14 @@ async def execute_chain(
         from app.models.cron_task import OverlapPolicy
 
         if chain.overlap_policy != OverlapPolicy.ALLOW:
-            await overlap_service.release_chain(db, chain)
+            await overlap_service.release_chain(db, chain, ctx["redis"], lease_id=lease_id)
 
         await db.commit()
 
+        # Failing counts change when the status flips; delayed chains are deactivated
+        if final_status != previous_status or chain.trigger_type == TriggerType.DELAYED:
+            await workspace_summary_service.invalidate(chain.workspace_id)
+
         # Log completion
         duration_ms = int((datetime.utcnow() - exec_context.started_at).total_seconds() * 1000)
         log_chain_execution_complete(
@@ -1116,6 +1363,7 @@ async def execute_chain(
                     completed_steps=exec_context.completed_steps,
                     total_steps=len(chain.steps),
                     task_level_override=True,
+                    _queue_name=queue_for("send_chain_notification"),
                 )
             elif final_status == ChainStatus.FAILED and chain.notify_on_failure:
                 await redis.enqueue_job(
@@ -1126,6 +1374,7 @@ async def execute_chain(
                     error_message=exec_context.error_message,
                     completed_steps=exec_context.completed_steps,
                     total_steps=len(chain.steps),
+                    _queue_name=queue_for("send_chain_notification"),
                 )
             elif final_status == ChainStatus.PARTIAL and chain.notify_on_partial:
                 await redis.enqueue_job(
@@ -1136,6 +1385,7 @@ async def execute_chain(
                     completed_steps=exec_context.completed_steps,
                     failed_steps=exec_context.failed_steps,
                     total_steps=len(chain.steps),
+                    _queue_name=queue_for("send_chain_notification"),
                 )
         except Exception as e:
             logger.error("Failed to enqueue chain notification", error=str(e), chain_id=chain_id)
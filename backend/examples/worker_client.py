@@ -15,6 +15,11 @@ Usage:
 
 Requirements:
     pip install httpx
+
+This is a minimal single-file example. For production use run the
+supported runtime instead, which adds a bounded execution pool, batched
+result submission, graceful drain on SIGTERM and Prometheus metrics:
+    cronbox-external-worker --api-url $CRONBOX_API_URL --key $CRONBOX_WORKER_KEY
 """
 
 import asyncio
@@ -30,6 +35,8 @@ import httpx
 API_URL = os.environ.get("CRONBOX_API_URL", "http://localhost:8000/v1")
 WORKER_KEY = os.environ.get("CRONBOX_WORKER_KEY", "")
 POLL_INTERVAL = int(os.environ.get("CRONBOX_POLL_INTERVAL", "5"))
+# Long-poll wait in seconds (0 disables long-polling and polls every POLL_INTERVAL)
+POLL_WAIT = int(os.environ.get("CRONBOX_POLL_WAIT", "20"))
 MAX_CONCURRENT_TASKS = int(os.environ.get("CRONBOX_MAX_CONCURRENT", "5"))
 HEARTBEAT_INTERVAL = 30
 
@@ -54,7 +61,10 @@ class CronBoxWorker:
         self.running = True
         print("[Worker] Starting CronBox worker...")
         print(f"[Worker] API URL: {self.api_url}")
-        print(f"[Worker] Poll interval: {POLL_INTERVAL}s")
+        if POLL_WAIT:
+            print(f"[Worker] Long-poll wait: {POLL_WAIT}s")
+        else:
+            print(f"[Worker] Poll interval: {POLL_INTERVAL}s")
         print(f"[Worker] Max concurrent tasks: {MAX_CONCURRENT_TASKS}")
 
         # Verify connection
@@ -97,19 +107,24 @@ class CronBoxWorker:
         except Exception as e:
             print(f"[Worker] Heartbeat failed: {e}")
 
-    async def poll_tasks(self) -> list[dict]:
-        """Poll for pending tasks."""
+    async def poll_tasks(self) -> tuple[list[dict], int]:
+        """Poll for pending tasks.
+
+        Returns the tasks and the suggested delay before the next poll.
+        """
         try:
             response = await self.client.get(
                 f"{self.api_url}/worker/tasks",
-                params={"max_tasks": MAX_CONCURRENT_TASKS - self.current_tasks},
+                params={"max_tasks": MAX_CONCURRENT_TASKS - self.current_tasks, "wait": POLL_WAIT},
+                # The server holds long-poll requests open for up to POLL_WAIT seconds
+                timeout=httpx.Timeout(POLL_WAIT + 30.0, connect=10.0),
             )
             response.raise_for_status()
             data = response.json()
-            return data.get("tasks", [])
+            return data.get("tasks", []), data.get("poll_interval_seconds", POLL_INTERVAL)
         except Exception as e:
             print(f"[Worker] Poll failed: {e}")
-            return []
+            return [], POLL_INTERVAL
 
     async def submit_result(self, result: dict):
         """Submit task execution result."""
@@ -212,19 +227,24 @@ class CronBoxWorker:
     async def _poll_loop(self):
         """Main polling loop."""
         while self.running:
+            delay = POLL_INTERVAL
             try:
                 # Only poll if we have capacity
                 if self.current_tasks < MAX_CONCURRENT_TASKS:
-                    tasks = await self.poll_tasks()
+                    tasks, delay = await self.poll_tasks()
 
                     for task in tasks:
                         # Execute tasks concurrently
                         asyncio.create_task(self.execute_task(task))
+                else:
+                    # Wait briefly for a running task to finish
+                    delay = 1
 
             except Exception as e:
                 print(f"[Worker] Poll loop error: {e}")
 
-            await asyncio.sleep(POLL_INTERVAL)
+            if delay:
+                await asyncio.sleep(delay)
 
     async def _heartbeat_loop(self):
         """Heartbeat loop."""
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Microbenchmark: chain step processing with and without compiled plans.
+
+Simulates the per-step CPU work of execute_chain (request templating,
+condition evaluation and variable extraction) for a long chain with heavy
+extraction. No network or database is involved.
+
+Usage:
+    python scripts/benchmark_chain_plan.py [--steps 50] [--extract 10] [--runs 20]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from uuid import uuid4
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import structlog
+
+from app.services.chain_executor import (
+    ResponseDocument,
+    evaluate_condition,
+    extract_variables_from_response,
+    prepare_step_request,
+)
+from app.services.chain_plan import clear_chain_plan_cache, get_chain_plan
+
+
+def build_chain(steps: int, extract: int) -> SimpleNamespace:
+    """Build an in-memory chain where every step extracts and uses variables."""
+    chain_steps = []
+    for order in range(steps):
+        chain_steps.append(
+            SimpleNamespace(
+                id=uuid4(),
+                step_order=order,
+                updated_at=None,
+                url="https://api.example.com/orders/{{order_id}}/items/{{item_0}}?page={{page}}",
+                headers={"Authorization": "Bearer {{token}}", "X-Request": "{{request_id}}"},
+                body='{"order": "{{order_id}}", "note": "{{item_1}}"}',
+                condition={"operator": "regex", "field": "$.data.status", "value": "^(ok|done)$"},
+                extract_variables={f"item_{i}": f"$.data.items[{i}].id" for i in range(extract)}
+                | {"order_id": "$.data.order.id", "token": "$.meta.token"},
+                depends_on=None,
+            )
+        )
+    return SimpleNamespace(id=uuid4(), updated_at=None, steps=chain_steps)
+
+
+def build_response(extract: int) -> str:
+    """Build a realistic JSON response body."""
+    return json.dumps(
+        {
+            "data": {
+                "status": "ok",
+                "order": {"id": 42, "lines": [{"sku": f"SKU-{n}", "qty": n} for n in range(50)]},
+                "items": [{"id": i, "name": f"item {i}", "tags": ["a", "b", "c"]} for i in range(max(extract, 1) * 2)],
+            },
+            "meta": {"token": "t0k3n", "page": 1},
+        }
+    )
+
+
+def run_uncompiled(chain: SimpleNamespace, body: str) -> None:
+    variables = {"page": 1, "request_id": "r", "token": "t", "order_id": 1, "item_0": 0, "item_1": 1}
+    for step in chain.steps:
+        evaluate_condition(step.condition, 200, body)
+        prepare_step_request(step, variables)
+        variables.update(extract_variables_from_response(body, step.extract_variables))
+
+
+def run_compiled(chain: SimpleNamespace, body: str) -> None:
+    plan = get_chain_plan(chain)
+    variables = {"page": 1, "request_id": "r", "token": "t", "order_id": 1, "item_0": 0, "item_1": 1}
+    for step in chain.steps:
+        compiled = plan.steps[step.step_order]
+        # Each step's response is parsed once and shared with the next step's condition
+        document = ResponseDocument(body)
+        evaluate_condition(compiled.condition, 200, document)
+        compiled.prepare_request(variables)
+        variables.update(extract_variables_from_response(document, compiled.extractors))
+
+
+def timed(fn, runs: int) -> float:
+    """Best-of-N wall time in seconds."""
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=50, help="Steps per chain")
+    parser.add_argument("--extract", type=int, default=10, help="Extracted variables per step")
+    parser.add_argument("--runs", type=int, default=20, help="Repetitions (best is reported)")
+    args = parser.parse_args()
+
+    # Silence per-extraction debug logging so it doesn't dominate timings
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(40))
+
+    chain = build_chain(args.steps, args.extract)
+    body = build_response(args.extract)
+
+    uncompiled = timed(lambda: run_uncompiled(chain, body), args.runs)
+
+    clear_chain_plan_cache()
+    started = time.perf_counter()
+    get_chain_plan(chain)
+    compile_time = time.perf_counter() - started
+    compiled = timed(lambda: run_compiled(chain, body), args.runs)
+
+    print(f"chain: {args.steps} steps, {args.extract + 2} extractions/step, body {len(body)} bytes")
+    print(f"uncompiled:     {uncompiled * 1000:8.2f} ms/run")
+    print(f"compiled (hot): {compiled * 1000:8.2f} ms/run")
+    print(f"plan compile:   {compile_time * 1000:8.2f} ms (once per chain version)")
+    print(f"speedup:        {uncompiled / compiled:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
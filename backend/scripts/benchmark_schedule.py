@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Microbenchmark: next-run computation with and without compiled schedules.
+
+Compares the previous inline croniter computation (parse the expression and
+resolve the timezone on every call) with the schedule engine, per call and
+for a bulk batch of tasks sharing a realistic mix of schedules.
+
+Usage:
+    python scripts/benchmark_schedule.py [--calls 20000] [--batch 1000] [--runs 5]
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytz
+from croniter import croniter
+
+from app.services.schedule import calculate_next_run, calculate_next_runs, get_schedule
+
+SCHEDULES = [
+    ("*/5 * * * *", "UTC"),
+    ("0 * * * *", "Europe/Moscow"),
+    ("*/15 9-18 * * 1-5", "Europe/Berlin"),
+    ("30 2 * * *", "America/New_York"),
+    ("0 0 1 * *", "Asia/Tokyo"),
+]
+
+
+def inline_next_run(schedule: str, tz_name: str) -> datetime:
+    """The computation previously duplicated across the codebase."""
+    tz = pytz.timezone(tz_name)
+    now = datetime.now(tz)
+    cron = croniter(schedule, now)
+    next_run = cron.get_next(datetime)
+    return next_run.astimezone(pytz.UTC).replace(tzinfo=None)
+
+
+def timed(fn, runs: int) -> float:
+    """Best-of-N wall time in seconds."""
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000, help="Single calls per run")
+    parser.add_argument("--batch", type=int, default=1000, help="Tasks per bulk batch")
+    parser.add_argument("--runs", type=int, default=5, help="Repetitions (best is reported)")
+    args = parser.parse_args()
+
+    calls = [SCHEDULES[i % len(SCHEDULES)] for i in range(args.calls)]
+    batch = [SCHEDULES[i % len(SCHEDULES)] for i in range(args.batch)]
+
+    get_schedule.cache_clear()
+    inline = timed(lambda: [inline_next_run(s, tz) for s, tz in calls], args.runs)
+    cached = timed(lambda: [calculate_next_run(s, tz) for s, tz in calls], args.runs)
+    inline_batch = timed(lambda: [inline_next_run(s, tz) for s, tz in batch], args.runs)
+    bulk = timed(lambda: calculate_next_runs(batch), args.runs)
+
+    print(f"schedules: {len(SCHEDULES)} distinct, {args.calls} calls, batch of {args.batch}")
+    print(f"inline croniter:  {inline / args.calls * 1e6:8.2f} us/call")
+    print(f"compiled (hot):   {cached / args.calls * 1e6:8.2f} us/call")
+    print(f"speedup:          {inline / cached:8.2f}x")
+    print(f"batch inline:     {inline_batch * 1000:8.2f} ms")
+    print(f"batch bulk API:   {bulk * 1000:8.2f} ms")
+    print(f"bulk speedup:     {inline_batch / bulk:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
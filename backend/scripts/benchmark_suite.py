@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""Microbenchmark suite: hot paths of the scheduler and workers.
+
+Times the functions that run for every execution (HTTP execution against
+a local stub server, next-run computation, chain templating, conditions
+and extraction, notification rendering, SSRF validation, ping parsing,
+external worker task payloads). Runs offline, without database or Redis.
+
+Each benchmark is calibrated to run for at least --min-time per round; the
+median and best time per call over the rounds are reported. Results can
+be saved as a JSON baseline and compared against later runs, failing when
+a benchmark got slower than the threshold.
+
+Usage:
+    python scripts/benchmark_suite.py run [--filter ssrf] [--rounds 7] [--output .benchmarks/baseline.json]
+    python scripts/benchmark_suite.py run --compare .benchmarks/baseline.json [--threshold 10]
+    python scripts/benchmark_suite.py compare .benchmarks/baseline.json .benchmarks/current.json [--threshold 10]
+
+Baselines are machine-specific; compare runs from the same machine.
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import uuid4
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import structlog
+
+from app.core.url_validator import validate_url_for_ssrf
+from app.schemas.worker import WorkerTaskInfo
+from app.services.chain_executor import evaluate_condition, extract_variables_from_response, substitute_variables
+from app.services.icmp import _parse_ping_output
+from app.services.schedule import calculate_next_run, calculate_next_runs
+from app.services.template_service import TemplateService
+from app.workers.tasks import create_http_client, execute_http_task
+
+BENCHMARKS: dict[str, Callable] = {}
+
+RESPONSE_BODY = json.dumps(
+    {
+        "data": {
+            "status": "ok",
+            "order": {"id": 42, "total": 99.5, "lines": [{"sku": f"SKU-{n}", "qty": n} for n in range(20)]},
+            "items": [{"id": i, "name": f"item {i}"} for i in range(10)],
+        },
+        "meta": {"token": "t0k3n", "page": 1},
+    }
+)
+
+PING_OUTPUT = """PING example.com (93.184.216.34) 56(84) bytes of data.
+64 bytes from 93.184.216.34: icmp_seq=1 ttl=56 time=10.3 ms
+64 bytes from 93.184.216.34: icmp_seq=2 ttl=56 time=9.50 ms
+64 bytes from 93.184.216.34: icmp_seq=3 ttl=56 time=9.83 ms
+
+--- example.com ping statistics ---
+3 packets transmitted, 3 received, 0% packet loss, time 2003ms
+rtt min/avg/max/mdev = 9.502/9.878/10.339/0.346 ms"""
+
+SCHEDULES = [
+    ("*/5 * * * *", "UTC", 0),
+    ("0 * * * *", "Europe/Moscow", 17),
+    ("*/15 9-18 * * 1-5", "Europe/Berlin", 0),
+    ("30 2 * * *", "America/New_York", 42),
+    ("0 0 1 * *", "Asia/Tokyo", 0),
+]
+
+
+def benchmark(name: str):
+    """Register a benchmark: a (async) context manager yielding the callable to time."""
+
+    def register(factory):
+        BENCHMARKS[name] = factory
+        return factory
+
+    return register
+
+
+# === Benchmarks ===
+
+
+async def _stub_handler(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answer every request on a keep-alive connection with a small JSON body."""
+    body = b'{"status":"ok"}'
+    response = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+    try:
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(response)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+@benchmark("execute_http_task")
+@asynccontextmanager
+async def bench_execute_http_task():
+    server = await asyncio.start_server(_stub_handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    ctx = {"http_client": create_http_client()}
+    call = partial(
+        execute_http_task,
+        ctx,
+        url=f"http://127.0.0.1:{port}/hook?id=1",
+        method="POST",
+        headers={"Content-Type": "application/json"},
+        body='{"event": "tick"}',
+    )
+    # The stub is on loopback, which SSRF validation rejects; it is timed on its own
+    with patch("app.workers.tasks.validate_url_for_ssrf"):
+        result = await call()
+        if not result["success"]:
+            raise RuntimeError(f"Stub request failed: {result['error']}")
+        yield call
+    await ctx["http_client"].aclose()
+    server.close()
+    await server.wait_closed()
+
+
+@benchmark("calculate_next_run")
+@contextmanager
+def bench_calculate_next_run():
+    yield partial(calculate_next_run, "*/15 9-18 * * 1-5", "Europe/Berlin", offset_seconds=17)
+
+
+@benchmark("calculate_next_runs_1000")
+@contextmanager
+def bench_calculate_next_runs():
+    batch = [SCHEDULES[i % len(SCHEDULES)] for i in range(1000)]
+    yield partial(calculate_next_runs, batch)
+
+
+@benchmark("substitute_variables")
+@contextmanager
+def bench_substitute_variables():
+    template = '{"order": "{{order_id}}", "token": "{{token}}", "page": {{page}}, "items": "{{item_0}},{{item_1}}"}'
+    variables = {"order_id": 42, "token": "t0k3n", "page": 3, "item_0": "a", "item_1": "b"}
+    yield partial(substitute_variables, template, variables)
+
+
+@benchmark("evaluate_condition")
+@contextmanager
+def bench_evaluate_condition():
+    condition = {"operator": "equals", "field": "$.data.status", "value": "ok"}
+    yield partial(evaluate_condition, condition, 200, RESPONSE_BODY)
+
+
+@benchmark("extract_variables_from_response")
+@contextmanager
+def bench_extract_variables_from_response():
+    extract = {
+        "order_id": "$.data.order.id",
+        "total": "$.data.order.total",
+        "token": "$.meta.token",
+        "first_item": "$.data.items[0].id",
+        "last_sku": "$.data.order.lines[19].sku",
+    }
+    yield partial(extract_variables_from_response, RESPONSE_BODY, extract)
+
+
+@benchmark("template_render")
+@contextmanager
+def bench_template_render():
+    template = SimpleNamespace(
+        code="task_failure",
+        subject="Task {task_name} failed",
+        body=(
+            "<b>Task failed</b>\nTask: {task_name}\nWorkspace: {workspace_name}\n"
+            "Error: {error_message}\nDuration: {duration_ms} ms\n<a href='{url}'>Open</a>"
+        ),
+    )
+    variables = {
+        "task_name": "Nightly <export>",
+        "workspace_name": "Acme & Co",
+        "error_message": "Connection timed out after 30s",
+        "duration_ms": 30012,
+        "url": "https://cp.cronbox.ru/tasks/1",
+    }
+    yield partial(TemplateService().render, template, variables)
+
+
+@benchmark("validate_url_for_ssrf")
+@contextmanager
+def bench_validate_url_for_ssrf():
+    # An IP literal: hostnames would time the resolver instead
+    yield partial(validate_url_for_ssrf, "https://93.184.216.34:8443/api/v1/hook?token=abc")
+
+
+@benchmark("parse_ping_output")
+@contextmanager
+def bench_parse_ping_output():
+    yield partial(_parse_ping_output, PING_OUTPUT, 3, 2100.0)
+
+
+@benchmark("worker_task_info_roundtrip")
+@contextmanager
+def bench_worker_task_info_roundtrip():
+    info = WorkerTaskInfo(
+        task_id=uuid4(),
+        task_type="cron",
+        url="https://api.example.com/hook",
+        method="POST",
+        headers={"Authorization": "Bearer t0k3n", "Content-Type": "application/json"},
+        body='{"event": "tick"}',
+        workspace_id=uuid4(),
+        task_name="Nightly export",
+    )
+    # As stored in Redis by the scheduler and read back by poll_tasks
+    yield lambda: WorkerTaskInfo.model_validate_json(info.model_dump_json())
+
+
+# === Runner ===
+
+
+def _measure(call: Callable, rounds: int, min_time: float) -> dict:
+    """Time a sync callable: calibrate iterations, then time the rounds."""
+    iterations = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            call()
+        if time.perf_counter() - started >= min_time:
+            break
+        iterations *= 2
+
+    per_call = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            call()
+        per_call.append((time.perf_counter() - started) / iterations)
+    return _summary(per_call, iterations)
+
+
+async def _measure_async(call: Callable, rounds: int, min_time: float) -> dict:
+    """Time a coroutine function like _measure."""
+    iterations = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await call()
+        if time.perf_counter() - started >= min_time:
+            break
+        iterations *= 2
+
+    per_call = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await call()
+        per_call.append((time.perf_counter() - started) / iterations)
+    return _summary(per_call, iterations)
+
+
+def _summary(per_call: list[float], iterations: int) -> dict:
+    return {
+        "median_us": round(statistics.median(per_call) * 1e6, 3),
+        "min_us": round(min(per_call) * 1e6, 3),
+        "rounds": len(per_call),
+        "iterations": iterations,
+    }
+
+
+async def _run_async(factory: Callable, rounds: int, min_time: float) -> dict:
+    async with factory() as call:
+        return await _measure_async(call, rounds, min_time)
+
+
+def run_benchmark(name: str, rounds: int, min_time: float) -> dict:
+    """Run one registered benchmark."""
+    factory = BENCHMARKS[name]
+    if inspect.isasyncgenfunction(inspect.unwrap(factory)):
+        return asyncio.run(_run_async(factory, rounds, min_time))
+    with factory() as call:
+        return _measure(call, rounds, min_time)
+
+
+def run_suite(name_filter: str | None, rounds: int, min_time: float) -> dict:
+    """Run the benchmarks matching the filter and collect the results."""
+    results = {}
+    for name in BENCHMARKS:
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = run_benchmark(name, rounds, min_time)
+        print(f"{name:34} {results[name]['median_us']:12.2f} us  (min {results[name]['min_us']:.2f})")
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "benchmarks": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Print the change of every benchmark; return those slower than the threshold (%)."""
+    if baseline.get("platform") != current.get("platform"):
+        print(f"warning: comparing {baseline.get('platform')} with {current.get('platform')}")
+
+    regressions = []
+    print(f"{'benchmark':34} {'baseline us':>12} {'current us':>12} {'change':>8}")
+    for name, result in current["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if base is None:
+            print(f"{name:34} {'-':>12} {result['median_us']:12.2f} {'new':>8}")
+            continue
+        change = (result["median_us"] - base["median_us"]) / base["median_us"] * 100
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:34} {base['median_us']:12.2f} {result['median_us']:12.2f} {change:+7.1f}%{flag}")
+    for name in sorted(baseline["benchmarks"].keys() - current["benchmarks"].keys()):
+        print(f"{name:34} missing from the current run")
+    return regressions
+
+
+def _load(path: str) -> dict:
+    return json.loads(Path(path).read_text())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--filter", help="Only run benchmarks whose name contains this")
+    run_parser.add_argument("--rounds", type=int, default=7, help="Timed rounds per benchmark (median is reported)")
+    run_parser.add_argument("--min-time", type=float, default=0.05, help="Minimum seconds per round")
+    run_parser.add_argument("--output", help="Save the results to this JSON file")
+    run_parser.add_argument("--compare", metavar="BASELINE", help="Compare the results with a JSON baseline")
+    run_parser.add_argument("--threshold", type=float, default=10, help="Slowdown in %% that is a regression")
+
+    compare_parser = commands.add_parser("compare", help="Compare two JSON results")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=10, help="Slowdown in %% that is a regression")
+    args = parser.parse_args()
+
+    # Silence per-call logging so it doesn't dominate timings
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(40))
+
+    if args.command == "run":
+        current = run_suite(args.filter, args.rounds, args.min_time)
+        if args.output:
+            Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+            Path(args.output).write_text(json.dumps(current, indent=2) + "\n")
+            print(f"saved to {args.output}")
+        baseline = _load(args.compare) if args.compare else None
+    else:
+        baseline, current = _load(args.baseline), _load(args.current)
+
+    if baseline is not None:
+        print()
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold}%: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
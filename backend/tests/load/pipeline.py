@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""End-to-end throughput harness: scheduler -> arq worker -> HTTP sink.
+
+Seeds cron and delayed tasks that fall due over a time window, each
+calling a local HTTP sink server with configurable latency and error
+rate. It then runs the real TaskScheduler and queue worker(s) as child
+processes against the local Postgres and Redis (make infra), and reports
+throughput, schedule-to-execution lag percentiles and DB/Redis operation
+counts. Seeded data (a throwaway user and workspace) is deleted at the end.
+
+Lag is measured at the sink: the time a task's first request arrives minus
+the time it fell due. Redis counts include everything hitting the Redis
+database during the run; Postgres counts cover the whole database.
+
+Usage (from backend/, with migrations applied):
+    python tests/load/pipeline.py --cron 500 --delayed 500 --spread 30
+    python tests/load/pipeline.py --cron 2000 --latency-ms 200 --jitter-ms 100 --error-rate 0.05 --worker-processes 2
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import signal
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from urllib.parse import urlparse
+from uuid import UUID, uuid4
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import redis.asyncio as redis
+from sqlalchemy import delete, text
+
+from app.config import settings
+from app.db.database import async_session_factory, engine
+from app.models.cron_task import CronTask
+from app.models.delayed_task import DelayedTask
+from app.models.user import User
+from app.models.workspace import Workspace
+
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "postgres", "redis"}
+
+PG_COUNTERS = ["xact_commit", "xact_rollback", "tup_returned", "tup_fetched", "tup_inserted", "tup_updated"]
+
+
+# === Sink ===
+
+
+class Sink:
+    """HTTP server recording the first request of every seeded task."""
+
+    def __init__(self, latency_ms: float, jitter_ms: float, error_rate: float):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self.first_hit: dict[str, float] = {}  # Task id -> wall-clock arrival
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                arrived = time.time()
+                lines = head.decode("latin-1").split("\r\n")
+                path = lines[0].split(" ")[1]
+                length = next(
+                    (int(line.split(":", 1)[1]) for line in lines if line.lower().startswith("content-length:")), 0
+                )
+                if length:
+                    await reader.readexactly(length)
+
+                # Paths are /<kind>/<task id>
+                self.requests += 1
+                self.first_hit.setdefault(path.rsplit("/", 1)[-1], arrived)
+
+                await asyncio.sleep((self.latency_ms + random.uniform(0, self.jitter_ms)) / 1000)
+                failed = random.random() < self.error_rate
+                self.errors += failed
+                status = b"500 Internal Server Error" if failed else b"200 OK"
+                writer.write(b"HTTP/1.1 %s\r\nContent-Type: application/json\r\nContent-Length: 2\r\n\r\n{}" % status)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+# === Child processes ===
+
+
+def _run_scheduler() -> None:
+    from app.workers.scheduler import run_scheduler
+
+    asyncio.run(run_scheduler())
+
+
+def _run_worker() -> None:
+    from unittest.mock import patch
+
+    from app.workers.queues import QUEUE_NAMES
+    from app.workers.runner import run_queue_workers
+
+    # The sink is on loopback, which SSRF validation rejects
+    with patch("app.workers.tasks.validate_url_for_ssrf"):
+        run_queue_workers(QUEUE_NAMES)
+
+
+def _stop(processes: list[multiprocessing.process.BaseProcess]) -> None:
+    for process in processes:
+        if process.is_alive():
+            os.kill(process.pid, signal.SIGTERM)
+    for process in processes:
+        process.join(30)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+
+# === Seeding and stats ===
+
+
+async def seed(sink_url: str, cron: int, delayed: int, start: datetime, spread: float) -> tuple[UUID, dict[str, float]]:
+    """Create a user and workspace with tasks falling due over [start, start + spread].
+
+    Returns the user id and the due time (epoch) of every task by id.
+    """
+    due: dict[str, float] = {}
+    suffix = uuid4().hex[:8]
+    async with async_session_factory() as db:
+        user = User(email=f"pipeline-{suffix}@loadtest.invalid", password_hash="!", name="Pipeline harness")
+        db.add(user)
+        await db.flush()
+        workspace = Workspace(
+            name="Pipeline harness", slug=f"pipeline-{suffix}", owner_id=user.id, webhook_secret=suffix
+        )
+        db.add(workspace)
+        await db.flush()
+
+        kinds = ["cron"] * cron + ["delayed"] * delayed
+        random.Random(0).shuffle(kinds)
+        for index, kind in enumerate(kinds):
+            at = start + timedelta(seconds=spread * index / max(len(kinds) - 1, 1))
+            task_id = uuid4()
+            common = {
+                "id": task_id,
+                "workspace_id": workspace.id,
+                "name": f"pipeline {index}",
+                "url": f"{sink_url}/{kind}/{task_id}",
+                "timeout_seconds": 30,
+                "retry_count": 0,
+            }
+            if kind == "cron":
+                db.add(
+                    CronTask(
+                        **common,
+                        schedule="* * * * *",
+                        timezone="UTC",
+                        next_run_at=at,
+                        notify_on_failure=False,
+                        notify_on_recovery=False,
+                    )
+                )
+            else:
+                db.add(DelayedTask(**common, execute_at=at))
+            due[str(task_id)] = (at - datetime(1970, 1, 1)).total_seconds()
+        await db.commit()
+        return user.id, due
+
+
+async def cleanup(user_id: UUID) -> None:
+    """Delete the seeded user; the workspace, tasks and executions cascade."""
+    async with async_session_factory() as db:
+        await db.execute(delete(User).where(User.id == user_id))
+        await db.commit()
+
+
+async def execution_counts(user_id: UUID) -> dict[str, int]:
+    async with async_session_factory() as db:
+        result = await db.execute(
+            text(
+                "SELECT e.status, count(*) FROM executions e JOIN workspaces w ON w.id = e.workspace_id "
+                "WHERE w.owner_id = :user_id GROUP BY e.status"
+            ),
+            {"user_id": user_id},
+        )
+        return {str(status): count for status, count in result.all()}
+
+
+async def pg_stats() -> dict[str, int]:
+    # Backends report their counters on exit at the latest, so take this after stopping the children
+    async with engine.connect() as conn:
+        row = (
+            await conn.execute(
+                text(f"SELECT {', '.join(PG_COUNTERS)} FROM pg_stat_database WHERE datname = current_database()")
+            )
+        ).one()
+        return dict(zip(PG_COUNTERS, row, strict=True))
+
+
+async def redis_stats(client: redis.Redis) -> dict[str, int]:
+    stats = await client.info("commandstats")
+    return {name.removeprefix("cmdstat_"): values["calls"] for name, values in stats.items()}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def check_local() -> None:
+    for name, url in (("DATABASE_URL", settings.database_url), ("REDIS_URL", settings.redis_url)):
+        host = urlparse(url).hostname
+        if host not in LOCAL_HOSTS:
+            sys.exit(f"{name} points to {host}; the harness only runs against local services")
+
+
+# === Main ===
+
+
+async def run(args: argparse.Namespace) -> None:
+    check_local()
+    sink = Sink(args.latency_ms, args.jitter_ms, args.error_rate)
+    server = await asyncio.start_server(sink.handle, "127.0.0.1", args.sink_port)
+    sink_url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+    redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+
+    start = datetime.utcnow() + timedelta(seconds=args.warmup)
+    user_id, due = await seed(sink_url, args.cron, args.delayed, start, args.spread)
+    print(f"Seeded {args.cron} cron and {args.delayed} delayed tasks due over {args.spread}s from {start:%H:%M:%S}")
+
+    pg_before, redis_before = await pg_stats(), await redis_stats(redis_client)
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_run_scheduler, name="scheduler")]
+    processes += [context.Process(target=_run_worker, name=f"worker-{i}") for i in range(args.worker_processes)]
+    for process in processes:
+        process.start()
+
+    deadline = time.time() + args.warmup + args.spread + args.timeout
+    try:
+        while len(sink.first_hit) < len(due) and time.time() < deadline:
+            await asyncio.sleep(5)
+            print(f"  {len(sink.first_hit)}/{len(due)} tasks executed, {sink.requests} requests")
+    finally:
+        _stop(processes)
+
+    pg_after, redis_after = await pg_stats(), await redis_stats(redis_client)
+    executions = await execution_counts(user_id)
+    if not args.keep:
+        await cleanup(user_id)
+    server.close()
+    await redis_client.aclose()
+    await engine.dispose()
+
+    # === Report ===
+    hits = {task_id: at for task_id, at in sink.first_hit.items() if task_id in due}
+    lags = [at - due[task_id] for task_id, at in hits.items()]
+    print(f"\nexecuted:    {len(hits)}/{len(due)} tasks ({sink.requests} requests, {sink.errors} answered 500)")
+    print(f"executions:  {', '.join(f'{status} {count}' for status, count in sorted(executions.items())) or 'none'}")
+    window = max(hits.values()) - min(hits.values()) if hits else 0
+    if window:
+        print(f"throughput:  {(len(hits) - 1) / window:.1f} executions/s over {window:.1f}s")
+    if lags:
+        print(
+            "lag (s):     "
+            f"p50 {percentile(lags, 50):.3f}  p90 {percentile(lags, 90):.3f}  p99 {percentile(lags, 99):.3f}  "
+            f"max {max(lags):.3f}  mean {statistics.fmean(lags):.3f}"
+        )
+
+    per_task = max(len(hits), 1)
+    print("\npostgres (whole database):")
+    for counter in PG_COUNTERS:
+        delta = pg_after[counter] - pg_before[counter]
+        print(f"  {counter:14} {delta:10}  ({delta / per_task:.1f}/task)")
+
+    redis_delta = {name: calls - redis_before.get(name, 0) for name, calls in redis_after.items()}
+    total = sum(redis_delta.values())
+    print(f"\nredis: {total} commands ({total / per_task:.1f}/task)")
+    for name, calls in sorted(redis_delta.items(), key=lambda item: -item[1])[:12]:
+        if calls:
+            print(f"  {name:20} {calls:10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cron", type=int, default=500, help="Cron tasks to seed")
+    parser.add_argument("--delayed", type=int, default=500, help="Delayed tasks to seed")
+    parser.add_argument("--spread", type=float, default=30, help="Seconds over which the tasks fall due (0 = burst)")
+    parser.add_argument("--warmup", type=float, default=10, help="Seconds before the first task falls due")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds to wait for stragglers after the window")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Sink response latency")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random extra sink latency, up to this")
+    parser.add_argument("--error-rate", type=float, default=0, help="Share of sink responses that are 500s")
+    parser.add_argument("--worker-processes", type=int, default=1, help="Queue worker processes")
+    parser.add_argument("--sink-port", type=int, default=0, help="Sink port (0 = any free port)")
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded user, tasks and executions")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from app.services.billing import PLANS_CACHE_KEY, BillingService
+from app.services.billing import PLANS_BY_ID_CACHE_KEY, PLANS_CACHE_KEY, BillingService
 
 
 class TestRedisCacheInvalidation:
@@ -22,7 +22,7 @@ class TestRedisCacheInvalidation:
             result = await billing.invalidate_plans_cache()
 
             assert result is True
-            mock_redis.delete.assert_called_once_with(PLANS_CACHE_KEY)
+            mock_redis.delete.assert_called_once_with(PLANS_CACHE_KEY, PLANS_BY_ID_CACHE_KEY)
 
     @pytest.mark.asyncio
     async def test_invalidate_plans_cache_key_not_exists(self):
@@ -36,7 +36,7 @@ class TestRedisCacheInvalidation:
             result = await billing.invalidate_plans_cache()
 
             assert result is True
-            mock_redis.delete.assert_called_once_with(PLANS_CACHE_KEY)
+            mock_redis.delete.assert_called_once_with(PLANS_CACHE_KEY, PLANS_BY_ID_CACHE_KEY)
 
     @pytest.mark.asyncio
     async def test_invalidate_plans_cache_redis_error(self):
@@ -51,7 +51,7 @@ class TestRedisCacheInvalidation:
 
             # Should return False but not raise exception (best-effort)
             assert result is False
-            mock_redis.delete.assert_called_once_with(PLANS_CACHE_KEY)
+            mock_redis.delete.assert_called_once_with(PLANS_CACHE_KEY, PLANS_BY_ID_CACHE_KEY)
 
     @pytest.mark.asyncio
     async def test_redis_delete_returns_count(self):
@@ -64,59 +64,72 @@ class TestRequireAdmin:
 class TestGetAdminStats:
     """Tests for get_admin_stats endpoint."""
 
+    def _stats(self, **overrides):
+        stats = {
+            "total_users": 100,
+            "active_users": 90,
+            "verified_users": 80,
+            "total_workspaces": 50,
+            "total_cron_tasks": 40,
+            "active_cron_tasks": 30,
+            "total_delayed_tasks": 20,
+            "pending_delayed_tasks": 10,
+            "total_task_chains": 5,
+            "active_task_chains": 4,
+            "total_heartbeats": 3,
+            "active_heartbeats": 2,
+            "total_ssl_monitors": 1,
+            "active_ssl_monitors": 1,
+            "total_executions": 1000,
+            "executions_today": 10,
+            "executions_this_week": 70,
+            "success_rate": 95.5,
+            "active_subscriptions": 5,
+            "paid_subscriptions": 2,
+            "revenue_this_month": 999.0,
+            "computed_at": "2026-01-01T12:00:00",
+        }
+        stats.update(overrides)
+        return stats
+
     @pytest.mark.asyncio
     async def test_get_stats_success(self):
-        """Test getting admin stats."""
+        """Test stats are served from the snapshot."""
         from app.api.v1.admin import get_admin_stats
 
         mock_admin = create_mock_admin()
         mock_db = MagicMock()
 
-        # Mock all scalar calls with MagicMock that returns coroutine
-        async def mock_scalar(query):
-            # Return appropriate values for different queries
-            return 100
-
-        mock_db.scalar = mock_scalar
+        with patch("app.api.v1.admin.admin_stats_service") as mock_service:
+            mock_service.get = AsyncMock(return_value=self._stats())
+            mock_service.refresh = AsyncMock()
 
-        result = await get_admin_stats(admin=mock_admin, db=mock_db)
+            result = await get_admin_stats(admin=mock_admin, db=mock_db)
 
         assert result.total_users == 100
+        assert result.paid_subscriptions == 2
+        assert result.revenue_this_month == 999.0
+        assert result.computed_at == datetime(2026, 1, 1, 12, 0)
+        mock_service.get.assert_called_once_with(mock_db)
+        mock_service.refresh.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_get_stats_paid_subscriptions(self):
-        """Test paid_subscriptions counts only users with real payments."""
+    async def test_get_stats_refresh(self):
+        """Test refresh=true recomputes the snapshot."""
         from app.api.v1.admin import get_admin_stats
 
         mock_admin = create_mock_admin()
         mock_db = MagicMock()
 
-        call_count = 0
+        with patch("app.api.v1.admin.admin_stats_service") as mock_service:
+            mock_service.get = AsyncMock()
+            mock_service.refresh = AsyncMock(return_value=self._stats(total_users=101))
 
-        async def mock_scalar(query):
-            nonlocal call_count
-            call_count += 1
-            # Different values for different queries to distinguish them
-            # Queries order: users (3), workspaces (1), tasks (6), chains (2), heartbeats (2),
-            # ssl_monitors (2), executions (3), success_rate (2), active_subs, paid_subs, revenue
-            # Total basic stats: 3 + 1 + 6 + 2 + 2 + 3 + 2 = 19
-            if call_count <= 19:  # Basic stats
-                return 10
-            if call_count == 20:  # active_subscriptions
-                return 5
-            if call_count == 21:  # paid_subscriptions
-                return 2  # Only 2 out of 5 have real payments
-            if call_count == 22:  # revenue
-                return 99900  # 999.00 rubles in kopeks
-            return 0
+            result = await get_admin_stats(admin=mock_admin, db=mock_db, refresh=True)
 
-        mock_db.scalar = mock_scalar
-
-        result = await get_admin_stats(admin=mock_admin, db=mock_db)
-
-        assert result.active_subscriptions == 5
-        assert result.paid_subscriptions == 2
-        assert result.revenue_this_month == 999.0
+        assert result.total_users == 101
+        mock_service.refresh.assert_called_once_with(mock_db)
+        mock_service.get.assert_not_called()
 
 
 class TestGetUser:
@@ -325,44 +338,68 @@ class TestDeleteUser:
         assert "Cannot delete your own account" in exc_info.value.detail
 
 
+def mock_result(scalars=None, rows=None):
+    """Create a mock query result."""
+    result = MagicMock()
+    result.scalars = MagicMock(return_value=MagicMock(all=MagicMock(return_value=scalars or [])))
+    result.__iter__ = MagicMock(return_value=iter(rows or []))
+    return result
+
+
 class TestListUsers:
     """Tests for list_users endpoint."""
 
+    def _row(self, user, **kwargs):
+        row = MagicMock()
+        row.id = user.id
+        row.plan_name = kwargs.get("plan_name", "pro")
+        row.current_period_end = kwargs.get("current_period_end")
+        for name in (
+            "workspaces_count",
+            "cron_tasks_count",
+            "delayed_tasks_count",
+            "task_chains_count",
+            "heartbeats_count",
+            "ssl_monitors_count",
+            "executions_count",
+        ):
+            setattr(row, name, kwargs.get("count", 5))
+        return row
+
     @pytest.mark.asyncio
     async def test_list_users_success(self):
-        """Test listing users."""
+        """Test listing users loads all page counts in one query."""
         from app.api.v1.admin import list_users
 
         mock_admin = create_mock_admin()
         mock_db = MagicMock()
         mock_users = [create_mock_user(), create_mock_user()]
-        mock_sub = create_mock_subscription()
-
-        call_count = 0
-
-        async def mock_scalar(query):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                return 2  # total count
-            # For each user: 1-workspace, 2-cron, 3-delayed, 4-chains, 5-heartbeats, 6-ssl_monitors, 7-executions, 8-subscription
-            # Subscription calls are at 9, 17 (for 2 users: 1 + 8 = 9, 1 + 16 = 17)
-            if (call_count - 1) % 8 == 0 and call_count > 1:
-                return mock_sub
-            return 5
-
-        async def mock_execute(query):
-            result = MagicMock()
-            result.scalars = MagicMock(return_value=MagicMock(all=MagicMock(return_value=mock_users)))
-            return result
-
-        mock_db.scalar = mock_scalar
-        mock_db.execute = mock_execute
+        ends_at = datetime(2026, 2, 1)
+
+        mock_db.scalar = AsyncMock(return_value=2)
+        mock_db.execute = AsyncMock(
+            side_effect=[
+                mock_result(scalars=mock_users),
+                mock_result(
+                    rows=[
+                        self._row(mock_users[0], current_period_end=ends_at),
+                        self._row(mock_users[1], plan_name=None, count=0),
+                    ]
+                ),
+            ]
+        )
 
         result = await list_users(admin=mock_admin, db=mock_db, page=1, page_size=20, search=None)
 
         assert result.total == 2
         assert len(result.users) == 2
+        assert result.users[0].plan_name == "pro"
+        assert result.users[0].executions_count == 5
+        assert result.users[0].subscription_ends_at == ends_at
+        assert result.users[1].plan_name == "free"
+        assert result.users[1].workspaces_count == 0
+        assert mock_db.scalar.await_count == 1
+        assert mock_db.execute.await_count == 2
 
     @pytest.mark.asyncio
     async def test_list_users_with_search(self):
@@ -372,31 +409,32 @@ class TestListUsers:
         mock_admin = create_mock_admin()
         mock_db = MagicMock()
         mock_users = [create_mock_user(email="search@example.com")]
-        mock_sub = create_mock_subscription()
 
-        call_count = 0
+        mock_db.scalar = AsyncMock(return_value=1)
+        mock_db.execute = AsyncMock(
+            side_effect=[mock_result(scalars=mock_users), mock_result(rows=[self._row(mock_users[0], count=3)])]
+        )
 
-        async def mock_scalar(query):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                return 1  # total count
-            # For 1 user: subscription is at call 9 (1 + 8)
-            if call_count == 9:
-                return mock_sub
-            return 3
+        result = await list_users(admin=mock_admin, db=mock_db, page=1, page_size=20, search="search")
 
-        async def mock_execute(query):
-            result = MagicMock()
-            result.scalars = MagicMock(return_value=MagicMock(all=MagicMock(return_value=mock_users)))
-            return result
+        assert result.total == 1
+        assert result.users[0].cron_tasks_count == 3
 
-        mock_db.scalar = mock_scalar
-        mock_db.execute = mock_execute
+    @pytest.mark.asyncio
+    async def test_list_users_empty_page(self):
+        """Test an empty page skips the counts query."""
+        from app.api.v1.admin import list_users
 
-        result = await list_users(admin=mock_admin, db=mock_db, page=1, page_size=20, search="search")
+        mock_admin = create_mock_admin()
+        mock_db = MagicMock()
 
-        assert result.total == 1
+        mock_db.scalar = AsyncMock(return_value=0)
+        mock_db.execute = AsyncMock(return_value=mock_result())
+
+        result = await list_users(admin=mock_admin, db=mock_db, page=3, page_size=20, search=None)
+
+        assert result.users == []
+        assert mock_db.execute.await_count == 1
 
 
 def create_mock_workspace(**kwargs):
@@ -428,40 +466,41 @@ def create_mock_subscription(**kwargs):
 class TestListWorkspaces:
     """Tests for list_workspaces endpoint."""
 
+    def _row(self, workspace, count=5, plan_name="pro"):
+        row = MagicMock()
+        row.id = workspace.id
+        row.plan_name = plan_name
+        row.cron_tasks_count = count
+        row.delayed_tasks_count = count
+        row.task_chains_count = count
+        row.heartbeats_count = count
+        row.executions_count = count
+        return row
+
     @pytest.mark.asyncio
     async def test_list_workspaces_success(self):
-        """Test listing workspaces."""
+        """Test listing workspaces loads all page counts in one query."""
         from app.api.v1.admin import list_workspaces
 
         mock_admin = create_mock_admin()
         mock_db = MagicMock()
         mock_workspaces = [create_mock_workspace(), create_mock_workspace()]
-        mock_sub = create_mock_subscription()
-
-        call_count = 0
-
-        async def mock_scalar(query):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                return 2  # total count
-            # For each workspace: cron, delayed, chains, heartbeats, exec, subscription (6 calls)
-            # So subscription is at 7, 13 (for 2 workspaces: 1 + 6 = 7, 1 + 12 = 13)
-            if call_count in [7, 13]:
-                return mock_sub
-            return 5  # counts for cron/delayed/chains/heartbeats/executions
 
-        async def mock_execute(query):
-            result = MagicMock()
-            result.scalars = MagicMock(return_value=MagicMock(all=MagicMock(return_value=mock_workspaces)))
-            return result
-
-        mock_db.scalar = mock_scalar
-        mock_db.execute = mock_execute
+        mock_db.scalar = AsyncMock(return_value=2)
+        mock_db.execute = AsyncMock(
+            side_effect=[
+                mock_result(scalars=mock_workspaces),
+                mock_result(rows=[self._row(mock_workspaces[0]), self._row(mock_workspaces[1], plan_name=None)]),
+            ]
+        )
 
         result = await list_workspaces(admin=mock_admin, db=mock_db, page=1, page_size=20, search=None)
 
         assert result.total == 2
+        assert result.workspaces[0].plan_name == "pro"
+        assert result.workspaces[0].cron_tasks_count == 5
+        assert result.workspaces[1].plan_name == "free"
+        assert mock_db.execute.await_count == 2
 
     @pytest.mark.asyncio
     async def test_list_workspaces_with_search(self):
@@ -471,31 +510,16 @@ class TestListWorkspaces:
         mock_admin = create_mock_admin()
         mock_db = MagicMock()
         mock_workspaces = [create_mock_workspace(name="SearchWorkspace")]
-        mock_sub = create_mock_subscription()
 
-        call_count = 0
-
-        async def mock_scalar(query):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                return 1  # total count
-            # For 1 workspace: subscription is at call 7 (1 + 6)
-            if call_count == 7:
-                return mock_sub
-            return 3  # counts for cron/delayed/chains/heartbeats/executions
-
-        async def mock_execute(query):
-            result = MagicMock()
-            result.scalars = MagicMock(return_value=MagicMock(all=MagicMock(return_value=mock_workspaces)))
-            return result
-
-        mock_db.scalar = mock_scalar
-        mock_db.execute = mock_execute
+        mock_db.scalar = AsyncMock(return_value=1)
+        mock_db.execute = AsyncMock(
+            side_effect=[mock_result(scalars=mock_workspaces), mock_result(rows=[self._row(mock_workspaces[0], 3)])]
+        )
 
         result = await list_workspaces(admin=mock_admin, db=mock_db, page=1, page_size=20, search="search")
 
         assert result.total == 1
+        assert result.workspaces[0].executions_count == 3
 
 
 class TestGetWorkspace:
@@ -0,0 +1,116 @@
+"""Tests for the admin dashboard statistics snapshot."""
+
+import json
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.config import settings
+from app.services.admin_stats import (
+    ADMIN_STATS_CACHE_KEY,
+    AdminStatsService,
+    build_admin_stats_query,
+    compute_admin_stats,
+)
+
+
+def mock_db_with_row(**values) -> MagicMock:
+    """Create a mock session whose query returns one row of totals."""
+    row = {column.name: 0 for column in build_admin_stats_query(datetime.utcnow()).selected_columns}
+    row.update(values)
+    result = MagicMock()
+    result.one.return_value = MagicMock(_mapping=row)
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=result)
+    return db
+
+
+class TestComputeAdminStats:
+    """Tests for compute_admin_stats."""
+
+    def test_single_statement(self):
+        """Test every total comes from one statement without a GROUP BY."""
+        sql = str(build_admin_stats_query(datetime(2026, 1, 15)).compile(dialect=postgresql.dialect()))
+
+        assert "GROUP BY" not in sql
+        assert "FILTER (WHERE" in sql
+
+    @pytest.mark.asyncio
+    async def test_derived_values(self):
+        """Test success rate and revenue are derived from the raw totals."""
+        db = mock_db_with_row(
+            total_users=10,
+            successful_this_week=45,
+            finished_this_week=50,
+            revenue_kopeks=99900,
+            paid_subscriptions=None,
+        )
+
+        stats = await compute_admin_stats(db)
+
+        db.execute.assert_awaited_once()
+        assert stats["total_users"] == 10
+        assert stats["success_rate"] == 90.0
+        assert stats["revenue_this_month"] == 999.0
+        assert stats["paid_subscriptions"] == 0
+        assert "successful_this_week" not in stats
+        assert "revenue_kopeks" not in stats
+        assert datetime.fromisoformat(stats["computed_at"])
+
+    @pytest.mark.asyncio
+    async def test_no_finished_executions(self):
+        """Test the success rate is 0 without finished executions."""
+        stats = await compute_admin_stats(mock_db_with_row())
+
+        assert stats["success_rate"] == 0
+
+
+class TestAdminStatsService:
+    """Tests for AdminStatsService."""
+
+    @pytest.mark.asyncio
+    async def test_get_cached(self):
+        """Test a cached snapshot is returned without querying."""
+        service = AdminStatsService()
+        db = mock_db_with_row()
+
+        with patch("app.services.admin_stats.redis_client") as mock_redis:
+            mock_redis.get = AsyncMock(return_value=json.dumps({"total_users": 7}))
+
+            assert await service.get(db) == {"total_users": 7}
+
+        db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_missing_computes_and_stores(self):
+        """Test a missing snapshot is computed and cached."""
+        service = AdminStatsService()
+        db = mock_db_with_row(total_users=3)
+
+        with patch("app.services.admin_stats.redis_client") as mock_redis:
+            mock_redis.get = AsyncMock(return_value=None)
+            mock_redis.set = AsyncMock()
+
+            stats = await service.get(db)
+
+        assert stats["total_users"] == 3
+        key, value = mock_redis.set.call_args.args
+        assert key == ADMIN_STATS_CACHE_KEY
+        assert json.loads(value) == stats
+        assert mock_redis.set.call_args.kwargs == {"expire": settings.admin_stats_cache_ttl_seconds}
+
+    @pytest.mark.asyncio
+    async def test_redis_unavailable(self):
+        """Test stats are still computed when Redis fails."""
+        service = AdminStatsService()
+        db = mock_db_with_row(total_users=3)
+
+        with patch("app.services.admin_stats.redis_client") as mock_redis:
+            mock_redis.get = AsyncMock(side_effect=Exception("Redis down"))
+            mock_redis.set = AsyncMock(side_effect=Exception("Redis down"))
+
+            stats = await service.get(db)
+
+        assert stats["total_users"] == 3
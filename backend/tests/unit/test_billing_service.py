@@ -1,5 +1,6 @@
 """Unit tests for billing service."""
 
+import json
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
@@ -7,8 +8,19 @@ from uuid import uuid4
 import pytest
 
 from app.models.payment import PaymentStatus
+from app.models.plan import Plan
 from app.models.subscription import SubscriptionStatus
-from app.services.billing import BillingService
+from app.services.billing import USER_PLAN_CACHE_TTL, BillingService, _plan_to_cache_dict
+
+
+def _mock_pipeline(mock_redis, results: list) -> MagicMock:
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=results)
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=pipe)
+    context.__aexit__ = AsyncMock(return_value=False)
+    mock_redis.client.pipeline.return_value = context
+    return pipe
 
 
 class TestBillingServiceInit:
@@ -168,61 +180,152 @@ class TestBillingServiceSubscription:
         assert result == mock_subscription
 
     @pytest.mark.asyncio
-    async def test_get_user_plan_with_active_subscription(self):
-        """Test getting user plan when they have an active subscription."""
+    async def test_get_user_plan_cache_hit(self):
+        """Test cached effective plan is returned without querying the database."""
         mock_db = AsyncMock()
         user_id = uuid4()
-        plan_id = uuid4()
+        plan = Plan(id=uuid4(), name="pro", display_name="Pro", max_execution_history_days=30)
 
-        mock_subscription = MagicMock()
-        mock_subscription.status = SubscriptionStatus.ACTIVE
-        mock_subscription.plan_id = plan_id
+        service = BillingService()
+        service.get_user_plans = AsyncMock()
 
-        mock_plan = MagicMock()
-        mock_plan.id = plan_id
-        mock_plan.name = "pro"
+        with patch("app.services.billing.redis_client") as mock_redis:
+            script = mock_redis.client.register_script.return_value = AsyncMock(
+                return_value=json.dumps(_plan_to_cache_dict(plan))
+            )
+
+            result = await service.get_user_plan(mock_db, user_id)
+
+        assert result.id == plan.id
+        assert result.name == "pro"
+        assert result.max_execution_history_days == 30
+        # Only this user's plan is fetched from the plans hash
+        script.assert_called_once_with(keys=[f"cache:plan:user:{user_id}", "cache:plans:by_id"])
+        service.get_user_plans.assert_not_called()
+        mock_db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_user_plan_cache_miss_resolves_and_caches(self):
+        """Test cache miss resolves the plan in one query and caches it."""
+        mock_db = AsyncMock()
+        user_id = uuid4()
+        plan = Plan(id=uuid4(), name="pro", display_name="Pro")
 
         service = BillingService()
-        service.get_user_subscription = AsyncMock(return_value=mock_subscription)
-        service.get_plan_by_id = AsyncMock(return_value=mock_plan)
+        service.get_user_plans = AsyncMock(return_value={user_id: plan})
+
+        with patch("app.services.billing.redis_client") as mock_redis:
+            mock_redis.client.register_script.return_value = AsyncMock(return_value=None)
+            pipe = _mock_pipeline(mock_redis, [])
 
-        result = await service.get_user_plan(mock_db, user_id)
+            result = await service.get_user_plan(mock_db, user_id)
 
-        assert result == mock_plan
+        assert result is plan
+        service.get_user_plans.assert_called_once_with(mock_db, [user_id])
+        pipe.set.assert_called_once_with(f"cache:plan:user:{user_id}", str(plan.id), ex=USER_PLAN_CACHE_TTL)
+        pipe.hset.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_user_plan_redis_error_falls_back_to_db(self):
+        """Test Redis errors fall back to resolving the plan from the database."""
+        mock_db = AsyncMock()
+        user_id = uuid4()
+        plan = MagicMock()
+
+        service = BillingService()
+        service.get_user_plans = AsyncMock(return_value={user_id: plan})
+
+        with patch("app.services.billing.redis_client") as mock_redis:
+            mock_redis.client.register_script.return_value = AsyncMock(side_effect=Exception("Redis down"))
+            mock_redis.client.pipeline.side_effect = Exception("Redis down")
+
+            result = await service.get_user_plan(mock_db, user_id)
+
+        assert result is plan
+
+    @pytest.mark.asyncio
+    async def test_get_user_plans_single_query(self):
+        """Test batch resolution uses a single query for all users."""
+        mock_db = AsyncMock()
+        first, second = uuid4(), uuid4()
+        free_plan = MagicMock()
+        free_plan.name = "free"
+        pro_plan = MagicMock()
+        pro_plan.name = "pro"
+
+        mock_result = MagicMock()
+        mock_result.all.return_value = [(first, pro_plan), (second, free_plan)]
+        mock_db.execute.return_value = mock_result
+
+        service = BillingService()
+        result = await service.get_user_plans(mock_db, [first, second])
+
+        assert result == {first: pro_plan, second: free_plan}
+        mock_db.execute.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_get_user_plan_fallback_to_free(self):
-        """Test getting user plan fallback to free when no subscription."""
+    async def test_get_user_plans_fallback_to_free(self):
+        """Test users missing from the join result get the free plan."""
         mock_db = AsyncMock()
         user_id = uuid4()
 
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        mock_db.execute.return_value = mock_result
+
         mock_free_plan = MagicMock()
         mock_free_plan.name = "free"
 
         service = BillingService()
-        service.get_user_subscription = AsyncMock(return_value=None)
         service.get_plan_by_name = AsyncMock(return_value=mock_free_plan)
 
-        result = await service.get_user_plan(mock_db, user_id)
+        result = await service.get_user_plans(mock_db, [user_id])
 
-        assert result == mock_free_plan
+        assert result == {user_id: mock_free_plan}
         service.get_plan_by_name.assert_called_with(mock_db, "free")
 
     @pytest.mark.asyncio
-    async def test_get_user_plan_no_free_plan_raises(self):
-        """Test getting user plan raises when free plan doesn't exist."""
+    async def test_get_user_plans_no_free_plan_raises(self):
+        """Test batch resolution raises when free plan doesn't exist."""
         mock_db = AsyncMock()
-        user_id = uuid4()
+
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        mock_db.execute.return_value = mock_result
 
         service = BillingService()
-        service.get_user_subscription = AsyncMock(return_value=None)
         service.get_plan_by_name = AsyncMock(return_value=None)
 
         with pytest.raises(RuntimeError) as exc_info:
-            await service.get_user_plan(mock_db, user_id)
+            await service.get_user_plans(mock_db, [uuid4()])
 
         assert "Free plan not found" in str(exc_info.value)
 
+    @pytest.mark.asyncio
+    async def test_get_user_plans_empty(self):
+        """Test empty input doesn't query the database."""
+        mock_db = AsyncMock()
+
+        assert await BillingService().get_user_plans(mock_db, []) == {}
+        mock_db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_user_caches(self):
+        """Test invalidation drops both principal and effective plan entries."""
+        user_id = uuid4()
+
+        with (
+            patch("app.services.billing.redis_client") as mock_redis,
+            patch("app.services.billing.principal_cache") as mock_principal_cache,
+        ):
+            mock_redis.delete = AsyncMock(return_value=1)
+            mock_principal_cache.invalidate = AsyncMock()
+
+            await BillingService().invalidate_user_caches(user_id)
+
+        mock_principal_cache.invalidate.assert_called_once_with(user_id)
+        mock_redis.delete.assert_called_once_with(f"cache:plan:user:{user_id}")
+
 
 class TestBillingServiceCreatePayment:
     """Tests for BillingService create_payment method."""
@@ -0,0 +1,172 @@
+"""Tests for the capacity planner."""
+
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import pytest
+
+from app.capacity_planner.__main__ import parse_args
+from app.capacity_planner.planner import (
+    PlannedSchedule,
+    expand_fire_times,
+    peak_concurrency,
+    plan_capacity,
+    required_slots_for_lag,
+)
+from app.capacity_planner.sources import load_snapshot
+
+START = datetime(2026, 1, 1, 0, 0)
+
+
+def cron(schedule: str, duration: float | None = None, **kwargs) -> PlannedSchedule:
+    kwargs.setdefault("timezone", "UTC")
+    return PlannedSchedule(
+        kind="cron", id=kwargs.pop("id", "t"), name="t", schedule=schedule, avg_duration_seconds=duration, **kwargs
+    )
+
+
+class TestExpandFireTimes:
+    """Tests for expand_fire_times."""
+
+    def test_includes_start_excludes_end(self):
+        """Test the horizon is half-open."""
+        fires = expand_fire_times(cron("*/30 * * * *"), START, START + timedelta(hours=1))
+
+        assert fires == [START, START + timedelta(minutes=30)]
+
+    def test_offset_applied(self):
+        """Test jitter offsets shift every fire, including one from before the start."""
+        fires = expand_fire_times(cron("*/30 * * * *", offset_seconds=120), START, START + timedelta(hours=1))
+
+        assert fires == [START + timedelta(minutes=2), START + timedelta(minutes=32)]
+
+    def test_timezone(self):
+        """Test local schedules are expanded in UTC."""
+        fires = expand_fire_times(cron("0 3 * * *", timezone="Europe/Moscow"), START, START + timedelta(days=1))
+
+        assert fires == [datetime(2026, 1, 1, 0, 0)]
+
+    def test_shared_expansion(self):
+        """Test schedules with the same expression reuse one expansion."""
+        cache = {}
+        end = START + timedelta(hours=1)
+
+        expand_fire_times(cron("* * * * *"), START, end, cache)
+        expand_fire_times(cron("* * * * *", offset_seconds=5), START, end, cache)
+
+        assert list(cache) == [("* * * * *", "UTC")]
+
+    def test_interval_monitor(self):
+        """Test process monitors are expanded with their own schedule logic."""
+        monitor = PlannedSchedule(
+            kind="monitor", id="m", name="m", timezone="UTC", schedule_type="interval", schedule_interval=1200
+        )
+
+        fires = expand_fire_times(monitor, START, START + timedelta(hours=1))
+
+        assert len(fires) == 3
+
+
+class TestSimulation:
+    """Tests for the concurrency and lag simulation."""
+
+    def test_peak_concurrency(self):
+        """Test overlapping runs are counted and back-to-back runs are not."""
+        jobs = [(START, 10.0), (START, 10.0), (START + timedelta(seconds=10), 5.0)]
+
+        assert peak_concurrency(jobs) == 2
+
+    def test_required_slots(self):
+        """Test the fewest slots meeting the lag target are found."""
+        jobs = [(START, 10.0)] * 4
+
+        assert required_slots_for_lag(jobs, target_lag_seconds=0, upper=4) == (4, 0.0)
+        assert required_slots_for_lag(jobs, target_lag_seconds=10, upper=4) == (2, 10.0)
+        assert required_slots_for_lag([], target_lag_seconds=10, upper=0) == (0, 0.0)
+
+
+class TestPlanCapacity:
+    """Tests for plan_capacity."""
+
+    def test_report(self):
+        """Test runs, dispatch rates and sizing for a top-of-hour herd."""
+        items = [cron("0 * * * *", 30.0, id=str(i)) for i in range(20)]
+        items.append(cron("* * * * *", None))
+
+        report = plan_capacity(items, START, timedelta(hours=2), max_jobs=10, target_lag_seconds=0)
+
+        assert report.runs == 20 * 2 + 120
+        assert report.peak_dispatch_per_minute == 21
+        assert report.p95_dispatch_per_minute == 1
+        assert report.peak_concurrency == 21
+        assert report.required_slots == 21
+        assert report.required_replicas == 3
+        assert report.busiest_minutes[0] == (START, 21)
+
+    def test_external_and_invalid(self):
+        """Test external-worker runs don't need cloud slots and invalid schedules are reported."""
+        items = [cron("* * * * *", 1.0, uses_cloud_workers=False), cron("not cron", id="bad")]
+
+        report = plan_capacity(items, START, timedelta(hours=1))
+
+        assert report.runs == 60
+        assert report.cloud_runs == 0
+        assert report.required_replicas == 0
+        assert report.invalid[0].startswith("cron bad:")
+
+
+class TestLoadSnapshot:
+    """Tests for load_snapshot."""
+
+    def test_load(self):
+        """Test snapshot entries become planned schedules."""
+        task_id = str(UUID(int=45))
+        items = load_snapshot(
+            {
+                "version": 1,
+                "cron_tasks": [
+                    {
+                        "id": task_id,
+                        "name": "a",
+                        "schedule": "* * * * *",
+                        "timezone": "UTC",
+                        "jitter_window_seconds": 30,
+                        "avg_duration_ms": 1500,
+                        "external_worker": False,
+                    }
+                ],
+                "chains": [
+                    {"id": "c", "name": "c", "schedule": "0 * * * *", "timezone": "UTC", "external_worker": True}
+                ],
+                "process_monitors": [
+                    {"id": "m", "name": "m", "schedule_type": "cron", "schedule_cron": "0 1 * * *", "timezone": "UTC"}
+                ],
+            }
+        )
+
+        assert [item.kind for item in items] == ["cron", "chain", "monitor"]
+        assert items[0].offset_seconds == 15
+        assert items[0].avg_duration_seconds == 1.5
+        assert items[1].uses_cloud_workers is False
+        assert items[2].schedule == "0 1 * * *"
+
+    def test_unsupported_version(self):
+        """Test snapshots from another format version are rejected."""
+        with pytest.raises(ValueError, match="version"):
+            load_snapshot({"version": 99})
+
+
+class TestParseArgs:
+    """Tests for CLI argument parsing."""
+
+    def test_export_requires_database(self):
+        """Test exporting from a JSON snapshot is a usage error."""
+        with pytest.raises(SystemExit):
+            parse_args(["--from-json", "a.json", "--export", "b.json"])
+
+    def test_defaults(self):
+        """Test defaults match the worker settings."""
+        args = parse_args([])
+
+        assert args.max_jobs == 10
+        assert args.horizon_hours == 24
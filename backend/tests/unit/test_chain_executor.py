@@ -11,7 +11,9 @@ from app.models.cron_task import HttpMethod
 from app.models.task_chain import ChainStatus
 from app.services.chain_executor import (
     ChainExecutionContext,
+    StepScheduler,
     VariableSubstitutionError,
+    build_step_dependencies,
     determine_chain_status,
     evaluate_condition,
     extract_variable_from_jsonpath,
@@ -494,6 +496,131 @@ class TestPrepareStepRequest:
             prepare_step_request(step, {})
 
 
+def make_step(order: int, url: str = "https://api.example.com/", **kwargs):
+    """Create a mock chain step."""
+    step = MagicMock()
+    step.step_order = order
+    step.url = url
+    step.headers = kwargs.get("headers", {})
+    step.body = kwargs.get("body")
+    step.condition = kwargs.get("condition")
+    step.extract_variables = kwargs.get("extract_variables", {})
+    step.depends_on = kwargs.get("depends_on")
+    step.continue_on_failure = kwargs.get("continue_on_failure", False)
+    return step
+
+
+class TestBuildStepDependencies:
+    """Tests for build_step_dependencies function."""
+
+    def test_independent_steps(self):
+        """Test steps without references or conditions have no dependencies."""
+        steps = [make_step(0), make_step(1), make_step(2)]
+
+        assert build_step_dependencies(steps) == {0: set(), 1: set(), 2: set()}
+
+    def test_inferred_from_variables(self):
+        """Test a step depends on the latest earlier step extracting its variables."""
+        steps = [
+            make_step(0, extract_variables={"token": "$.token"}),
+            make_step(1, extract_variables={"token": "$.refreshed"}),
+            make_step(2, extract_variables={"order_id": "$.id"}),
+            make_step(3, url="https://api.example.com/orders/{{order_id}}", headers={"X-Token": "{{token}}"}),
+            make_step(4, body='{"user": "{{user_id}}"}'),
+        ]
+
+        deps = build_step_dependencies(steps)
+
+        assert deps[3] == {1, 2}
+        # Initial variables are not provided by any step
+        assert deps[4] == set()
+
+    def test_declared_dependencies(self):
+        """Test declared dependencies are kept, ignoring later or unknown steps."""
+        steps = [make_step(0), make_step(1), make_step(2, depends_on=[0, 2, 7])]
+
+        assert build_step_dependencies(steps)[2] == {0}
+
+    def test_condition_depends_on_previous_step(self):
+        """Test a conditional step waits for the step right before it."""
+        steps = [
+            make_step(0),
+            make_step(1),
+            make_step(2, condition={"operator": "status_code_in", "value": [200]}),
+        ]
+
+        assert build_step_dependencies(steps)[2] == {1}
+
+    def test_stop_on_failure_orders_after_stopping_steps(self):
+        """Test later steps wait for the latest step whose failure stops the chain."""
+        steps = [
+            make_step(0),
+            make_step(1, continue_on_failure=True),
+            make_step(2),
+            make_step(3),
+        ]
+
+        deps = build_step_dependencies(steps, stop_on_failure=True)
+
+        assert deps == {0: set(), 1: {0}, 2: {0}, 3: {2}}
+        assert build_step_dependencies(steps) == {0: set(), 1: set(), 2: set(), 3: set()}
+
+
+class TestStepScheduler:
+    """Tests for StepScheduler class."""
+
+    def test_sequential_by_default(self):
+        """Test max_parallel=1 runs independent steps one at a time in order."""
+        steps = [make_step(0), make_step(1), make_step(2)]
+        scheduler = StepScheduler(steps)
+
+        started = []
+        while ready := scheduler.next_ready():
+            assert len(ready) == 1
+            started.append(ready[0].step_order)
+            scheduler.finish(ready[0])
+
+        assert started == [0, 1, 2]
+
+    def test_parallel_respects_cap_and_dependencies(self):
+        """Test independent steps start together up to the cap."""
+        steps = [
+            make_step(0, extract_variables={"id": "$.id"}),
+            make_step(1),
+            make_step(2),
+            make_step(3, url="https://api.example.com/{{id}}"),
+        ]
+        scheduler = StepScheduler(steps, max_parallel=3)
+
+        assert [s.step_order for s in scheduler.next_ready()] == [0, 1, 2]
+        assert scheduler.next_ready() == []
+
+        scheduler.finish(steps[1])
+        # Step 3 still waits for step 0
+        assert scheduler.next_ready() == []
+
+        scheduler.finish(steps[0])
+        assert [s.step_order for s in scheduler.next_ready()] == [3]
+
+    def test_stop_prevents_new_steps(self):
+        """Test no steps start after stop."""
+        steps = [make_step(0), make_step(1)]
+        scheduler = StepScheduler(steps, max_parallel=1)
+
+        scheduler.finish(scheduler.next_ready()[0])
+        scheduler.stop()
+
+        assert scheduler.next_ready() == []
+
+    def test_previous_step_order(self):
+        """Test previous_step_order follows step order."""
+        steps = [make_step(0), make_step(3)]
+        scheduler = StepScheduler(steps)
+
+        assert scheduler.previous_step_order(steps[0]) is None
+        assert scheduler.previous_step_order(steps[1]) == 0
+
+
 class TestChainExecutionContext:
     """Tests for ChainExecutionContext class."""
 
@@ -611,6 +738,49 @@ class TestChainExecutionContext:
 
         assert context.should_continue(step, StepStatus.FAILED) is True
 
+    def test_variables_applied_in_step_order(self):
+        """Test variables from out-of-order completions match a sequential run."""
+        chain = self.create_mock_chain()
+        context = ChainExecutionContext(chain, {"token": "initial"})
+
+        context.update_from_step_result(StepStatus.SUCCESS, extracted_variables={"token": "late"}, step_order=2)
+        context.update_from_step_result(StepStatus.SUCCESS, extracted_variables={"token": "early"}, step_order=0)
+
+        assert context.variables == {"token": "late"}
+        assert context.get_variables_for_step(0) == {"token": "initial"}
+        assert context.get_variables_for_step(1) == {"token": "early"}
+
+    def test_get_step_response(self):
+        """Test responses are recorded per step."""
+        chain = self.create_mock_chain()
+        context = ChainExecutionContext(chain)
+
+        context.update_from_step_result(StepStatus.SUCCESS, status_code=201, response_body="{}", step_order=0)
+        context.update_from_step_result(StepStatus.SKIPPED, step_order=1)
+
+        assert context.get_step_response(0) == (201, "{}")
+        assert context.get_step_response(1) == (None, None)
+        assert context.get_step_response(None) == (None, None)
+
+    def test_checkpoint_round_trip(self):
+        """Test a context restored from a checkpoint continues where it left off."""
+        chain = self.create_mock_chain()
+        context = ChainExecutionContext(chain, {"a": 1})
+        context.update_from_step_result(
+            StepStatus.SUCCESS, status_code=200, response_body="{}", extracted_variables={"b": 2}, step_order=0
+        )
+        context.update_from_step_result(StepStatus.SKIPPED, step_order=1)
+
+        checkpoint = json.loads(json.dumps(context.to_checkpoint()))
+        restored = ChainExecutionContext.from_checkpoint(chain, checkpoint)
+
+        assert restored.variables == {"a": 1, "b": 2}
+        assert restored.initial_variables == {"a": 1}
+        assert restored.get_step_response(0) == (200, "{}")
+        assert restored.completed_steps == 1
+        assert restored.skipped_steps == 1
+        assert restored.started_at == context.started_at
+
     def test_get_final_status(self):
         """Test get_final_status."""
         chain = self.create_mock_chain()
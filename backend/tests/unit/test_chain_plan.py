@@ -0,0 +1,175 @@
+"""Tests for compiled chain execution plans."""
+
+import json
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.services import chain_plan
+from app.services.chain_executor import (
+    ResponseDocument,
+    VariableSubstitutionError,
+    evaluate_condition,
+    extract_variables_from_response,
+    prepare_step_request,
+)
+from app.services.chain_plan import (
+    CompiledTemplate,
+    clear_chain_plan_cache,
+    compile_step,
+    get_chain_plan,
+)
+
+
+def make_step(order: int = 0, **kwargs):
+    step = MagicMock()
+    step.id = uuid4()
+    step.step_order = order
+    step.updated_at = datetime(2026, 1, 1)
+    step.url = kwargs.get("url", "https://api.example.com/")
+    step.headers = kwargs.get("headers", {})
+    step.body = kwargs.get("body")
+    step.condition = kwargs.get("condition")
+    step.extract_variables = kwargs.get("extract_variables", {})
+    step.depends_on = None
+    return step
+
+
+def make_chain(steps):
+    chain = MagicMock()
+    chain.id = uuid4()
+    chain.updated_at = datetime(2026, 1, 1)
+    chain.steps = steps
+    return chain
+
+
+@pytest.fixture(autouse=True)
+def empty_plan_cache():
+    clear_chain_plan_cache()
+    yield
+    clear_chain_plan_cache()
+
+
+class TestCompiledTemplate:
+    """Tests for CompiledTemplate."""
+
+    def test_render(self):
+        """Test rendering matches substitute_variables."""
+        template = CompiledTemplate("{{a}}/x/{{b}}{{a}}")
+
+        assert template.variables == ["a", "b", "a"]
+        assert template.render({"a": 1, "b": None}) == "1/x/1"
+
+    def test_plain_text(self):
+        """Test templates without variables render as-is."""
+        assert CompiledTemplate("no vars").render({}) == "no vars"
+
+    def test_missing_variable(self):
+        """Test missing variables raise like substitute_variables."""
+        with pytest.raises(VariableSubstitutionError, match="'id'"):
+            CompiledTemplate("/items/{{id}}").render({})
+
+    def test_prepare_request_matches_uncompiled(self):
+        """Test compiled steps prepare the same request as prepare_step_request."""
+        step = make_step(
+            url="https://api.example.com/users/{{user_id}}",
+            headers={"Authorization": "Bearer {{token}}", "Accept": "application/json"},
+            body='{"action": "{{action}}"}',
+        )
+        variables = {"user_id": "123", "token": "abc", "action": "update"}
+
+        assert compile_step(step).prepare_request(variables) == prepare_step_request(step, variables)
+
+
+class TestResponseDocument:
+    """Tests for ResponseDocument sharing."""
+
+    def test_parsed_once_for_condition_and_extraction(self):
+        """Test one document is decoded once however many times it is used."""
+        document = ResponseDocument('{"status": "ok", "data": {"id": 5}}')
+        step = make_step(
+            condition={"operator": "equals", "field": "$.status", "value": "ok"},
+            extract_variables={"id": "$.data.id", "status": "$.status"},
+        )
+        compiled = compile_step(step)
+
+        with patch("app.services.chain_executor.json.loads", wraps=json.loads) as loads:
+            assert extract_variables_from_response(document, compiled.extractors) == {"id": 5, "status": "ok"}
+            assert evaluate_condition(compiled.condition, 200, document)[0] is True
+
+        assert loads.call_count == 1
+
+    def test_invalid_json(self):
+        """Test invalid bodies behave like raw strings."""
+        document = ResponseDocument("not json")
+
+        assert extract_variables_from_response(document, {"id": "$.id"}) == {}
+        assert evaluate_condition({"operator": "exists", "field": "$.id", "value": ""}, 200, document) == (
+            False,
+            "Response body is not valid JSON",
+        )
+
+
+class TestCompiledCondition:
+    """Tests for compiled conditions."""
+
+    def test_invalid_regex(self):
+        """Test invalid regexes are reported at evaluation time."""
+        compiled = compile_step(make_step(condition={"operator": "regex", "field": "$.a", "value": "[bad"})).condition
+
+        met, details = evaluate_condition(compiled, 200, '{"a": "x"}')
+
+        assert met is False
+        assert details.startswith("Invalid regex pattern")
+
+    def test_regex_compiled_once(self):
+        """Test the regex is compiled when the plan is built, not per evaluation."""
+        compiled = compile_step(make_step(condition={"operator": "regex", "field": "$.a", "value": "^ab"})).condition
+
+        with patch("app.services.chain_executor.re.compile") as compile_regex:
+            assert evaluate_condition(compiled, 200, '{"a": "abc"}')[0] is True
+
+        compile_regex.assert_not_called()
+
+
+class TestGetChainPlan:
+    """Tests for the chain plan cache."""
+
+    def test_cached_per_version(self):
+        """Test plans are reused until the chain or a step changes."""
+        chain = make_chain([make_step(0), make_step(1)])
+
+        plan = get_chain_plan(chain)
+        assert get_chain_plan(chain) is plan
+
+        chain.updated_at += timedelta(seconds=1)
+        recompiled = get_chain_plan(chain)
+        assert recompiled is not plan
+
+        chain.steps[1].updated_at += timedelta(seconds=1)
+        assert get_chain_plan(chain) is not recompiled
+
+    def test_dependencies(self):
+        """Test the plan carries the step dependency graph."""
+        chain = make_chain(
+            [
+                make_step(0, extract_variables={"id": "$.id"}),
+                make_step(1, url="https://api.example.com/{{id}}"),
+            ]
+        )
+
+        assert get_chain_plan(chain).dependencies == {0: set(), 1: {0}}
+
+    def test_evicts_least_recently_used(self):
+        """Test the cache is bounded."""
+        with patch.object(chain_plan, "CHAIN_PLAN_CACHE_SIZE", 2):
+            first, second, third = (make_chain([make_step()]) for _ in range(3))
+            first_plan = get_chain_plan(first)
+            get_chain_plan(second)
+            get_chain_plan(first)
+            get_chain_plan(third)
+
+            assert get_chain_plan(first) is first_plan
+            assert second.id not in chain_plan._plan_cache
@@ -0,0 +1,70 @@
+"""Unit tests for chain steps repository."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.db.repositories.task_chains import ChainStepRepository
+
+
+def make_step(order, depends_on=None, name=None):
+    step = MagicMock()
+    step.id = uuid4()
+    step.chain_id = uuid4()
+    step.name = name or f"Step {order}"
+    step.step_order = order
+    step.depends_on = depends_on
+    return step
+
+
+class TestReorderSteps:
+    """Tests for ChainStepRepository.reorder_steps."""
+
+    @pytest.mark.asyncio
+    async def test_remaps_depends_on(self):
+        """Test dependencies follow the steps they referenced to their new orders."""
+        a, b, c = make_step(0), make_step(1), make_step(2, depends_on=[0])
+        repo = ChainStepRepository(AsyncMock())
+
+        with patch.object(repo, "get_by_chain", AsyncMock(return_value=[a, b, c])):
+            # A, B, C -> B, A, C
+            await repo.reorder_steps(uuid4(), [{"step_id": b.id, "step_order": 0}, {"step_id": a.id, "step_order": 1}])
+
+        assert (a.step_order, b.step_order, c.step_order) == (1, 0, 2)
+        assert c.depends_on == [1]
+        repo.db.flush.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_rejects_step_before_its_dependency(self):
+        """Test moving a step ahead of a step it depends on is refused."""
+        a, b = make_step(0), make_step(1, depends_on=[0], name="Notify")
+        repo = ChainStepRepository(AsyncMock())
+
+        with patch.object(repo, "get_by_chain", AsyncMock(return_value=[a, b])):
+            with pytest.raises(ValueError, match="Notify"):
+                await repo.reorder_steps(
+                    uuid4(), [{"step_id": b.id, "step_order": 0}, {"step_id": a.id, "step_order": 1}]
+                )
+
+        # Nothing was changed
+        assert (a.step_order, b.step_order, b.depends_on) == (0, 1, [0])
+        repo.db.flush.assert_not_called()
+
+
+class TestDeleteStep:
+    """Tests for ChainStepRepository.delete_step."""
+
+    @pytest.mark.asyncio
+    async def test_dependents_inherit_dependencies(self):
+        """Test steps depending on a deleted step wait for its dependencies instead."""
+        a, b = make_step(0), make_step(1, depends_on=[0])
+        c, d = make_step(2, depends_on=[1]), make_step(3, depends_on=[1, 2])
+        repo = ChainStepRepository(AsyncMock())
+
+        with patch.object(repo, "get_by_chain", AsyncMock(return_value=[a, b, c, d])):
+            await repo.delete_step(b)
+
+        assert c.depends_on == [0]
+        assert d.depends_on == [0, 2]
+        repo.db.delete.assert_called_once_with(b)
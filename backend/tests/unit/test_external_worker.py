@@ -0,0 +1,258 @@
+"""Tests for the external worker runtime."""
+
+import asyncio
+import json
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from app.external_worker.__main__ import parse_args
+from app.external_worker.runtime import ExternalWorker, WorkerConfig
+
+
+def make_task(**kwargs) -> dict:
+    task = {
+        "task_id": str(uuid4()),
+        "task_type": "cron",
+        "url": "https://target.example.com/hook",
+        "method": "GET",
+        "headers": {},
+        "body": None,
+        "timeout_seconds": 5,
+    }
+    task.update(kwargs)
+    return task
+
+
+def make_worker(api_handler=None, http_handler=None, **config) -> ExternalWorker:
+    defaults = {
+        "api_url": "https://api.example.com/v1",
+        "worker_key": "wk_test",
+        "result_retry_delay": 0,
+        "result_flush_interval": 0.01,
+    }
+    defaults.update(config)
+    return ExternalWorker(
+        WorkerConfig(**defaults),
+        api_transport=httpx.MockTransport(api_handler or (lambda request: httpx.Response(200, json={}))),
+        http_transport=httpx.MockTransport(http_handler or (lambda request: httpx.Response(200, text="ok"))),
+    )
+
+
+class TestExecuteTask:
+    """Tests for ExternalWorker.execute_task."""
+
+    @pytest.mark.asyncio
+    async def test_success(self):
+        """Test successful request produces a result without error."""
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(201, text="created")
+
+        worker = make_worker(http_handler=handler)
+        task = make_task(method="POST", body='{"a": 1}')
+
+        result = await worker.execute_task(task)
+
+        assert result["task_id"] == task["task_id"]
+        assert result["status_code"] == 201
+        assert result["response_body"] == "created"
+        assert "error" not in result
+        # The worker key must never be sent to task targets
+        assert "X-Worker-Key" not in seen[0].headers
+        await worker.close()
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        """Test timeouts are reported with error_type."""
+
+        def handler(request):
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        worker = make_worker(http_handler=handler)
+
+        result = await worker.execute_task(make_task())
+
+        assert result["error_type"] == "timeout"
+        assert "status_code" not in result
+        await worker.close()
+
+    @pytest.mark.asyncio
+    async def test_connection_error(self):
+        """Test connection errors are reported with error_type."""
+
+        def handler(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        worker = make_worker(http_handler=handler)
+
+        result = await worker.execute_task(make_task())
+
+        assert result["error_type"] == "connection_error"
+        await worker.close()
+
+
+class TestSubmitResults:
+    """Tests for batched result submission."""
+
+    @pytest.mark.asyncio
+    async def test_retries_server_errors(self):
+        """Test 5xx responses are retried until the batch is accepted."""
+        responses = [httpx.Response(503), httpx.Response(200, json={"accepted": 1, "rejected": []})]
+        calls = []
+
+        def handler(request):
+            calls.append(json.loads(request.content))
+            return responses.pop(0)
+
+        worker = make_worker(api_handler=handler)
+
+        assert await worker.submit_results([{"task_id": "1"}]) is True
+        assert len(calls) == 2
+        assert calls[0] == {"results": [{"task_id": "1"}]}
+        await worker.close()
+
+    @pytest.mark.asyncio
+    async def test_client_error_not_retried(self):
+        """Test 4xx responses drop the batch without retrying."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(422)
+
+        worker = make_worker(api_handler=handler)
+
+        assert await worker.submit_results([{"task_id": "1"}]) is False
+        assert len(calls) == 1
+        await worker.close()
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        """Test transport errors are retried up to result_max_attempts."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            raise httpx.ConnectError("down", request=request)
+
+        worker = make_worker(api_handler=handler, result_max_attempts=3)
+
+        assert await worker.submit_results([{"task_id": "1"}]) is False
+        assert len(calls) == 3
+        await worker.close()
+
+
+class TestRun:
+    """Tests for the poll/execute/submit pipeline and graceful drain."""
+
+    @pytest.mark.asyncio
+    async def test_runs_tasks_and_flushes_results_on_stop(self):
+        """Test polled tasks run concurrently and all results are flushed on drain."""
+        tasks = [make_task() for _ in range(5)]
+        submitted = []
+        polls = []
+
+        def api_handler(request):
+            if request.url.path.endswith("/worker/info"):
+                return httpx.Response(200, json={"id": "w1", "name": "test"})
+            if request.url.path.endswith("/worker/tasks"):
+                polls.append(dict(request.url.params))
+                batch = tasks[:] if len(polls) == 1 else []
+                return httpx.Response(200, json={"tasks": batch, "poll_interval_seconds": 0 if batch else 1})
+            if request.url.path.endswith("/worker/tasks/results"):
+                submitted.extend(json.loads(request.content)["results"])
+                return httpx.Response(200, json={"accepted": 1, "rejected": []})
+            return httpx.Response(200, json={"acknowledged": True})
+
+        async def http_handler(request):
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, text="ok")
+
+        worker = make_worker(api_handler=api_handler, http_handler=http_handler, concurrency=10, heartbeat_interval=60)
+
+        runner = asyncio.create_task(worker.run())
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if polls and not worker.in_flight:
+                break
+        worker.stop()
+        await asyncio.wait_for(runner, timeout=5)
+
+        assert polls[0]["max_tasks"] == "10"
+        assert polls[0]["wait"] == "20"
+        assert sorted(r["task_id"] for r in submitted) == sorted(t["task_id"] for t in tasks)
+        assert worker.running is False
+
+    @pytest.mark.asyncio
+    async def test_poll_requests_only_free_slots(self):
+        """Test the poller never asks for more tasks than free pool slots."""
+        worker = make_worker(concurrency=3)
+        requested = []
+
+        async def fake_poll(max_tasks):
+            requested.append(max_tasks)
+            worker.stop()
+            return [], 0
+
+        worker.poll_tasks = fake_poll
+        worker._in_flight = {object()}
+
+        await worker._poll_loop()
+
+        assert requested == [2]
+        await worker.close()
+
+    @pytest.mark.asyncio
+    async def test_stop_lets_poll_in_progress_finish(self):
+        """Test tasks returned by a long-poll that outlasts stop() are still run and reported."""
+        task = make_task()
+        submitted = []
+        polling = asyncio.Event()
+
+        async def api_handler(request):
+            if request.url.path.endswith("/worker/info"):
+                return httpx.Response(200, json={"id": "w1", "name": "test"})
+            if request.url.path.endswith("/worker/tasks"):
+                polling.set()
+                # The server pops the task, then answers after stop() was called
+                await asyncio.sleep(0.1)
+                return httpx.Response(200, json={"tasks": [task], "poll_interval_seconds": 0})
+            if request.url.path.endswith("/worker/tasks/results"):
+                submitted.extend(json.loads(request.content)["results"])
+                return httpx.Response(200, json={"accepted": 1, "rejected": []})
+            return httpx.Response(200, json={"acknowledged": True})
+
+        worker = make_worker(api_handler=api_handler, heartbeat_interval=60)
+
+        runner = asyncio.create_task(worker.run())
+        await asyncio.wait_for(polling.wait(), timeout=5)
+        worker.stop()
+        await asyncio.wait_for(runner, timeout=5)
+
+        assert [r["task_id"] for r in submitted] == [task["task_id"]]
+
+
+class TestParseArgs:
+    """Tests for CLI argument parsing."""
+
+    def test_args_override_env(self, monkeypatch):
+        """Test command line options take precedence over environment."""
+        monkeypatch.setenv("CRONBOX_WORKER_KEY", "wk_env")
+        monkeypatch.setenv("CRONBOX_MAX_CONCURRENT", "7")
+
+        config = parse_args(["--concurrency", "200", "--metrics-port", "9105"])
+
+        assert config.worker_key == "wk_env"
+        assert config.concurrency == 200
+        assert config.metrics_port == 9105
+
+    def test_key_required(self, monkeypatch):
+        """Test missing worker key is a usage error."""
+        monkeypatch.delenv("CRONBOX_WORKER_KEY", raising=False)
+
+        with pytest.raises(SystemExit):
+            parse_args([])
@@ -0,0 +1,151 @@
+"""Tests for HTTP request phase timings."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from app.services.http_timing import HttpTimings, HttpTimingTrace
+from app.workers.tasks import create_http_client, execute_http_task
+
+
+async def replay(trace: HttpTimingTrace, *events: tuple[str, float]) -> None:
+    """Feed trace events at the given perf_counter times."""
+    for name, at in events:
+        with patch("app.services.http_timing.time.perf_counter", return_value=at):
+            await trace(name, {})
+
+
+class TestHttpTimingTrace:
+    """Tests for HttpTimingTrace."""
+
+    @pytest.mark.asyncio
+    async def test_new_connection(self):
+        """Test every phase of a request on a new TLS connection."""
+        trace = HttpTimingTrace()
+        await replay(
+            trace,
+            ("connection.connect_tcp.started", 10.0),
+            ("connection.connect_tcp.complete", 10.02),
+            ("connection.start_tls.started", 10.02),
+            ("connection.start_tls.complete", 10.05),
+            ("http11.send_request_headers.started", 10.05),
+            ("http11.send_request_body.complete", 10.06),
+            ("http11.receive_response_headers.started", 10.06),
+            ("http11.receive_response_headers.complete", 10.26),
+            ("http11.receive_response_body.started", 10.26),
+            ("http11.receive_response_body.complete", 10.27),
+        )
+
+        timings = trace.timings(dns_ms=1.0)
+
+        assert timings == HttpTimings(
+            dns_ms=1.0,
+            connect_ms=20.0,
+            tls_ms=30.0,
+            ttfb_ms=200.0,
+            transfer_ms=10.0,
+            connection_reused=False,
+        )
+
+    @pytest.mark.asyncio
+    async def test_reused_connection(self):
+        """Test a request without connect events is on a reused connection."""
+        trace = HttpTimingTrace()
+        await replay(
+            trace,
+            ("http11.send_request_body.complete", 1.0),
+            ("http11.receive_response_headers.complete", 1.1),
+        )
+
+        timings = trace.timings()
+
+        assert timings.connection_reused is True
+        assert timings.connect_ms is None
+        assert timings.tls_ms is None
+
+    def test_no_request(self):
+        """Test nothing is known about a request that never started."""
+        assert HttpTimingTrace().timings() == HttpTimings()
+
+    @pytest.mark.asyncio
+    async def test_local_server(self):
+        """Test httpcore reports the phases of real requests."""
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            try:
+                while True:
+                    await reader.readuntil(b"\r\n\r\n")
+                    writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+                    await writer.drain()
+            except asyncio.IncompleteReadError:
+                writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            async with create_http_client() as client:
+                timings = []
+                for _ in range(2):
+                    trace = HttpTimingTrace()
+                    await client.get(f"http://127.0.0.1:{port}/", extensions={"trace": trace})
+                    timings.append(trace.timings())
+        finally:
+            server.close()
+
+        assert timings[0].connection_reused is False
+        assert timings[0].connect_ms is not None
+        assert timings[0].ttfb_ms is not None
+        assert timings[0].tls_ms is None
+        assert timings[1].connection_reused is True
+
+
+class TestExecuteHttpTaskTimings:
+    """Tests for phase timings of execute_http_task."""
+
+    @pytest.mark.asyncio
+    async def test_shared_client(self):
+        """Test the worker's shared client is used and timings are returned."""
+        response = MagicMock(status_code=200, headers={}, text="ok", content=b"ok")
+        client = MagicMock()
+        client.request = AsyncMock(return_value=response)
+
+        with (
+            patch("app.workers.tasks.httpx.AsyncClient") as mock_client_class,
+            patch("app.workers.tasks.observe_http_timings") as mock_observe,
+        ):
+            result = await execute_http_task(
+                {"http_client": client}, url="https://api.example.com/test", method="GET", timeout_seconds=5
+            )
+
+        mock_client_class.assert_not_called()
+        kwargs = client.request.call_args.kwargs
+        assert kwargs["timeout"] == 5
+        assert isinstance(kwargs["extensions"]["trace"], HttpTimingTrace)
+        assert result["timings"]["dns_ms"] >= 0
+        mock_observe.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_request_has_timings(self):
+        """Test failed requests still return the phases that happened."""
+        client = MagicMock()
+        client.request = AsyncMock(side_effect=httpx.ConnectTimeout("timed out"))
+
+        result = await execute_http_task({"http_client": client}, url="https://api.example.com/test", method="GET")
+
+        assert result["error_type"] == "timeout"
+        assert result["timings"]["connection_reused"] is None
+
+    def test_shared_client_stores_no_cookies(self):
+        """Test cookies set by one task's target are not sent for others."""
+        client = create_http_client()
+        response = httpx.Response(
+            200,
+            headers={"set-cookie": "session=abc; Path=/"},
+            request=httpx.Request("GET", "https://api.example.com/"),
+        )
+
+        client.cookies.extract_cookies(response)
+
+        assert not client.cookies
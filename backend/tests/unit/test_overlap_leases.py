@@ -0,0 +1,336 @@
+"""Tests for Redis lease-based overlap slots and queues."""
+
+import json
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.models.cron_task import OverlapPolicy
+from app.models.task_queue import TaskQueue
+from app.services.overlap import OverlapAction, OverlapService
+from app.services.overlap_leases import (
+    ACQUIRE_SCRIPT,
+    PRUNE_SCRIPT,
+    PUSH_SCRIPT,
+    RENEW_SCRIPT,
+    RedisOverlapStore,
+    _serialize_item,
+)
+
+
+@pytest.fixture
+def mock_redis():
+    """Patch the Redis client with one mock script per Lua source."""
+    scripts = {}
+
+    def register_script(source):
+        return scripts.setdefault(source, AsyncMock())
+
+    client = MagicMock()
+    client.register_script.side_effect = register_script
+    client.scripts = scripts
+    with patch("app.services.overlap_leases.redis_client") as redis_client:
+        redis_client.client = client
+        yield client
+
+
+@pytest.fixture
+def redis_backend():
+    """Switch overlap prevention to the redis backend."""
+    with patch("app.services.overlap.settings") as settings:
+        settings.overlap_backend = "redis"
+        settings.overlap_lease_ttl_seconds = 15
+        settings.overlap_pending_lease_ttl_seconds = 300
+        yield settings
+
+
+def make_item(**overrides) -> TaskQueue:
+    values = {
+        "id": uuid4(),
+        "workspace_id": uuid4(),
+        "task_type": "cron",
+        "task_id": uuid4(),
+        "task_name": "Task",
+        "priority": 0,
+        "queued_at": datetime(2026, 1, 1, 12, 0),
+        "scheduled_for": None,
+        "retry_attempt": 0,
+        "initial_variables": {},
+        "created_at": datetime(2026, 1, 1, 12, 0),
+    }
+    values.update(overrides)
+    return TaskQueue(**values)
+
+
+def make_task(policy: OverlapPolicy = OverlapPolicy.SKIP) -> MagicMock:
+    task = MagicMock()
+    task.id = uuid4()
+    task.workspace_id = uuid4()
+    task.overlap_policy = policy
+    task.max_instances = 2
+    task.max_queue_size = 5
+    task.worker_id = None
+    return task
+
+
+class TestRedisOverlapStore:
+    """Tests for RedisOverlapStore."""
+
+    @pytest.mark.asyncio
+    async def test_acquire(self, mock_redis):
+        """Test a lease ID is returned when the script takes a slot."""
+        store = RedisOverlapStore()
+        task_id = uuid4()
+        mock_redis.register_script(ACQUIRE_SCRIPT).return_value = 1
+
+        lease_id = await store.acquire("cron", task_id, 3, 60)
+
+        assert lease_id
+        mock_redis.scripts[ACQUIRE_SCRIPT].assert_awaited_once_with(
+            keys=[f"overlap:slots:cron:{task_id}"], args=[lease_id, 3, 60000, ""]
+        )
+
+    @pytest.mark.asyncio
+    async def test_acquire_full(self, mock_redis):
+        """Test no lease is returned when all slots are held."""
+        mock_redis.register_script(ACQUIRE_SCRIPT).return_value = 0
+
+        assert await RedisOverlapStore().acquire("chain", uuid4(), 1, 60) is None
+
+    @pytest.mark.asyncio
+    async def test_renew_expired(self, mock_redis):
+        """Test renewing an expired lease fails."""
+        mock_redis.register_script(RENEW_SCRIPT).return_value = 0
+
+        assert await RedisOverlapStore().renew("cron", uuid4(), "lease", 15) is False
+
+    @pytest.mark.asyncio
+    async def test_release(self, mock_redis):
+        """Test releasing removes the lease from the slots set."""
+        task_id = uuid4()
+        mock_redis.zrem = AsyncMock(return_value=1)
+
+        assert await RedisOverlapStore().release("cron", task_id, "lease") is True
+
+        mock_redis.zrem.assert_awaited_once_with(f"overlap:slots:cron:{task_id}", "lease")
+
+    @pytest.mark.asyncio
+    async def test_push(self, mock_redis):
+        """Test items are pushed to the task queue and indexed."""
+        item = make_item()
+        mock_redis.register_script(PUSH_SCRIPT).return_value = [1, 2]
+
+        assert await RedisOverlapStore().push(item, 5) == (True, 2)
+
+        queue_name = f"cron:{item.task_id}"
+        mock_redis.scripts[PUSH_SCRIPT].assert_awaited_once_with(
+            keys=[f"overlap:queue:{queue_name}", f"overlap:queues:{item.workspace_id}", "overlap:queued"],
+            args=[_serialize_item(item), 5, queue_name],
+        )
+
+    @pytest.mark.asyncio
+    async def test_pop_roundtrip(self, mock_redis):
+        """Test popped payloads become TaskQueue instances."""
+        item = make_item(task_type="chain", initial_variables={"a": 1})
+        mock_redis.lpop = AsyncMock(return_value=_serialize_item(item))
+
+        popped = await RedisOverlapStore().pop("chain", item.task_id)
+
+        assert isinstance(popped, TaskQueue)
+        assert popped.id == item.id
+        assert popped.task_id == item.task_id
+        assert popped.queued_at == item.queued_at
+        assert popped.initial_variables == {"a": 1}
+
+    @pytest.mark.asyncio
+    async def test_list_workspace(self, mock_redis):
+        """Test a workspace's items are merged in order and drained queues pruned."""
+        workspace_id = uuid4()
+        late = make_item(workspace_id=workspace_id, queued_at=datetime(2026, 1, 1, 13, 0))
+        early = make_item(workspace_id=workspace_id)
+        mock_redis.smembers = AsyncMock(return_value={"cron:a", "cron:b", "chain:c"})
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[[], [_serialize_item(late)], [_serialize_item(early)]])
+        mock_redis.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+        mock_redis.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        items = await RedisOverlapStore().list_workspace(workspace_id)
+
+        assert [item.id for item in items] == [early.id, late.id]
+        mock_redis.scripts[PRUNE_SCRIPT].assert_awaited_once_with(
+            keys=["overlap:queue:chain:c", f"overlap:queues:{workspace_id}", "overlap:queued"], args=["chain:c"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_remove(self, mock_redis):
+        """Test an item is removed by its ID."""
+        item = make_item()
+        raw = _serialize_item(item)
+        mock_redis.smembers = AsyncMock(return_value={f"cron:{item.task_id}"})
+        mock_redis.lrange = AsyncMock(return_value=[_serialize_item(make_item()), raw])
+        mock_redis.lrem = AsyncMock(return_value=1)
+
+        assert await RedisOverlapStore().remove(item.workspace_id, item.id) is True
+
+        mock_redis.lrem.assert_awaited_once_with(f"overlap:queue:cron:{item.task_id}", 1, raw)
+        assert json.loads(raw)["id"] == str(item.id)
+
+
+class TestOverlapServiceLeases:
+    """Tests for OverlapService with the redis backend."""
+
+    @pytest.mark.asyncio
+    async def test_check_acquires_lease(self, redis_backend):
+        """Test a free slot allows execution with a lease."""
+        service = OverlapService()
+        task = make_task()
+
+        with patch("app.services.overlap.overlap_lease_store") as store:
+            store.acquire = AsyncMock(return_value="lease")
+            result = await service.check_cron_task_overlap(AsyncMock(), task)
+
+        assert result.should_execute is True
+        assert result.lease_id == "lease"
+        store.acquire.assert_awaited_once_with("cron", task.id, 2, 300)
+
+    @pytest.mark.asyncio
+    async def test_check_skip(self, redis_backend):
+        """Test the skip policy skips when all slots are held."""
+        service = OverlapService()
+        task = make_task()
+
+        with (
+            patch("app.services.overlap.overlap_lease_store") as store,
+            patch.object(service, "_increment_skipped_count", new_callable=AsyncMock) as skipped,
+        ):
+            store.acquire = AsyncMock(return_value=None)
+            result = await service.check_chain_overlap(AsyncMock(), task)
+
+        assert result.action == OverlapAction.SKIP
+        assert result.lease_id is None
+        skipped.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_check_queue(self, redis_backend):
+        """Test the queue policy pushes to the Redis queue instead of the session."""
+        service = OverlapService()
+        task = make_task(OverlapPolicy.QUEUE)
+        db = MagicMock()
+
+        with (
+            patch("app.services.overlap.overlap_lease_store") as store,
+            patch.object(service, "_increment_queued_count", new_callable=AsyncMock),
+        ):
+            store.acquire = AsyncMock(return_value=None)
+            store.push = AsyncMock(return_value=(True, 3))
+            result = await service.check_cron_task_overlap(db, task)
+
+        assert result.action == OverlapAction.QUEUE
+        assert result.queue_position == 3
+        item = store.push.call_args.args[0]
+        assert item.id is not None
+        assert item.retry_attempt == 0
+        db.add.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_check_queue_full(self, redis_backend):
+        """Test a full Redis queue skips the execution."""
+        service = OverlapService()
+        task = make_task(OverlapPolicy.QUEUE)
+
+        with (
+            patch("app.services.overlap.overlap_lease_store") as store,
+            patch.object(service, "_increment_skipped_count", new_callable=AsyncMock),
+        ):
+            store.acquire = AsyncMock(return_value=None)
+            store.push = AsyncMock(return_value=(False, 5))
+            result = await service.check_cron_task_overlap(AsyncMock(), task)
+
+        assert result.action == OverlapAction.QUEUED_FULL
+        assert result.message == "Queue full (5/5)"
+
+    @pytest.mark.asyncio
+    async def test_release_transfers_lease(self, redis_backend):
+        """Test the finished execution's lease is swapped for the queued one's."""
+        service = OverlapService()
+        task = make_task(OverlapPolicy.QUEUE)
+        arq_redis = AsyncMock()
+
+        with patch("app.services.overlap.overlap_lease_store") as store:
+            store.pop = AsyncMock(return_value=make_item(task_id=task.id))
+            store.transfer = AsyncMock(return_value="next")
+            await service.release_cron_task(AsyncMock(), task, arq_redis, lease_id="done")
+
+        store.transfer.assert_awaited_once_with("cron", task.id, "done", 2, 300)
+        assert arq_redis.enqueue_job.call_args.kwargs["lease_id"] == "next"
+
+    @pytest.mark.asyncio
+    async def test_release_transfer_lost(self, redis_backend):
+        """Test the item is requeued when the expired lease's slot was taken."""
+        service = OverlapService()
+        task = make_task(OverlapPolicy.QUEUE)
+        arq_redis = AsyncMock()
+        item = make_item(task_id=task.id)
+
+        with patch("app.services.overlap.overlap_lease_store") as store:
+            store.pop = AsyncMock(return_value=item)
+            store.transfer = AsyncMock(return_value=None)
+            store.push_front = AsyncMock()
+            await service.release_cron_task(AsyncMock(), task, arq_redis, lease_id="expired")
+
+        store.push_front.assert_awaited_once_with(item)
+        arq_redis.enqueue_job.assert_not_called()
+
+    def test_external_worker_lease_ttl(self, redis_backend):
+        """Test external worker executions get a lease covering all attempts."""
+        task = make_task()
+        task.worker_id = uuid4()
+        task.timeout_seconds = 200
+        task.retry_count = 2
+        task.retry_delay_seconds = 60
+
+        assert OverlapService().lease_ttl(task) == 200 * 3 + 60 * 2
+
+
+class TestHoldLease:
+    """Tests for OverlapService.hold_lease."""
+
+    @pytest.mark.asyncio
+    async def test_without_lease(self):
+        """Test executions without a lease don't touch Redis."""
+        with patch("app.services.overlap.overlap_lease_store") as store:
+            async with OverlapService().hold_lease("cron", uuid4(), None) as lease:
+                assert lease is None
+
+        store.renew.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_renews_and_releases(self, redis_backend):
+        """Test the lease switches to the running TTL and is released on exit."""
+        task_id = uuid4()
+
+        with patch("app.services.overlap.overlap_lease_store") as store:
+            store.renew = AsyncMock(return_value=True)
+            store.release = AsyncMock(return_value=True)
+            with pytest.raises(ValueError):
+                async with OverlapService().hold_lease("cron", str(task_id), "lease"):
+                    raise ValueError("boom")
+
+        store.renew.assert_awaited_once_with("cron", task_id, "lease", 15)
+        store.release.assert_awaited_once_with("cron", task_id, "lease")
+
+    @pytest.mark.asyncio
+    async def test_hand_off(self, redis_backend):
+        """Test a handed off lease is extended instead of released."""
+        task_id = uuid4()
+
+        with patch("app.services.overlap.overlap_lease_store") as store:
+            store.renew = AsyncMock(return_value=True)
+            store.release = AsyncMock()
+            async with OverlapService().hold_lease("chain", task_id, "lease") as lease:
+                lease.hand_off(420)
+
+        assert store.renew.await_args_list[-1].args == ("chain", task_id, "lease", 420)
+        store.release.assert_not_called()
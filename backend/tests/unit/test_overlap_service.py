@@ -240,13 +240,13 @@ class TestOverlapServiceRelease:
         mock_task.overlap_policy = OverlapPolicy.SKIP
 
         with patch.object(service, "_decrement_running_instances", new_callable=AsyncMock) as mock_dec:
-            await service.release_cron_task(mock_db, mock_task)
+            await service.release_cron_task(mock_db, mock_task, AsyncMock())
 
         mock_dec.assert_called_once_with(mock_db, "cron", mock_task.id)
 
     @pytest.mark.asyncio
     async def test_release_cron_task_checks_queue(self):
-        """Test releasing cron task checks for queued items."""
+        """Test releasing cron task with an empty queue frees the slot."""
         service = OverlapService()
         mock_db = AsyncMock()
 
@@ -254,31 +254,117 @@ class TestOverlapServiceRelease:
         mock_task.id = uuid4()
         mock_task.overlap_policy = OverlapPolicy.QUEUE
 
-        with patch.object(service, "_decrement_running_instances", new_callable=AsyncMock):
+        with patch.object(service, "_decrement_running_instances", new_callable=AsyncMock) as mock_dec:
             with patch.object(service, "_pop_from_queue", new_callable=AsyncMock) as mock_pop:
                 mock_pop.return_value = None
-                await service.release_cron_task(mock_db, mock_task)
+                await service.release_cron_task(mock_db, mock_task, AsyncMock())
 
         mock_pop.assert_called_once_with(db=mock_db, task_type="cron", task_id=mock_task.id)
+        mock_dec.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_release_cron_task_hands_off_slot(self):
+        """Test the next queued execution takes over the slot and is enqueued."""
+        service = OverlapService()
+        mock_db = AsyncMock()
+        arq_redis = AsyncMock()
+
+        mock_task = MagicMock()
+        mock_task.id = uuid4()
+        mock_task.overlap_policy = OverlapPolicy.QUEUE
+        mock_task.worker_id = None
+        mock_queued = MagicMock(retry_attempt=0)
+
+        with patch.object(service, "_decrement_running_instances", new_callable=AsyncMock) as mock_dec:
+            with patch.object(service, "_pop_from_queue", new_callable=AsyncMock, return_value=mock_queued):
+                await service.release_cron_task(mock_db, mock_task, arq_redis)
+
+        mock_dec.assert_not_called()
+        arq_redis.enqueue_job.assert_called_once_with(
+            "execute_cron_task",
+            task_id=str(mock_task.id),
+            retry_attempt=0,
+            lease_id=None,
+            _queue_name="arq:queue:executions",
+        )
+
+    @pytest.mark.asyncio
+    async def test_release_cron_task_external_worker(self):
+        """Test a queued execution of an external worker task goes to its worker queue."""
+        service = OverlapService()
+        arq_redis = AsyncMock()
+
+        mock_task = MagicMock()
+        mock_task.id = uuid4()
+        mock_task.overlap_policy = OverlapPolicy.QUEUE
+        mock_task.worker_id = uuid4()
+        mock_task.url = "https://example.com"
+        mock_task.method.value = "GET"
+        mock_task.headers = {}
+        mock_task.body = None
+        mock_task.timeout_seconds = 30
+        mock_task.retry_count = 0
+        mock_task.retry_delay_seconds = 60
+        mock_task.workspace_id = uuid4()
+        mock_task.name = "Task"
+
+        with (
+            patch.object(service, "_pop_from_queue", new_callable=AsyncMock, return_value=MagicMock()),
+            patch("app.services.overlap.worker_service") as mock_worker_service,
+        ):
+            mock_worker_service.enqueue_task_for_worker = AsyncMock()
+            await service.release_cron_task(AsyncMock(), mock_task, arq_redis)
+
+        mock_worker_service.enqueue_task_for_worker.assert_called_once()
+        arq_redis.enqueue_job.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_release_enqueue_failure_requeues(self):
+        """Test a failed enqueue puts the item back and frees the slot."""
+        service = OverlapService()
+        mock_db = MagicMock()
+        arq_redis = AsyncMock()
+        arq_redis.enqueue_job.side_effect = Exception("Redis down")
+
+        mock_chain = MagicMock()
+        mock_chain.id = uuid4()
+        mock_chain.overlap_policy = OverlapPolicy.QUEUE
+        mock_queued = MagicMock()
+
+        with patch.object(service, "_decrement_running_instances", new_callable=AsyncMock) as mock_dec:
+            with patch.object(service, "_pop_from_queue", new_callable=AsyncMock, return_value=mock_queued):
+                result = await service.release_chain(mock_db, mock_chain, arq_redis)
+
+        assert result is None
+        mock_db.expunge.assert_called_once_with(mock_queued)
+        mock_dec.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_release_chain_returns_queued_item(self):
-        """Test releasing chain returns queued item if present."""
+        """Test releasing chain starts and returns the queued item if present."""
         service = OverlapService()
         mock_db = AsyncMock()
+        arq_redis = AsyncMock()
 
         mock_chain = MagicMock()
         mock_chain.id = uuid4()
         mock_chain.overlap_policy = OverlapPolicy.QUEUE
 
-        mock_queued = MagicMock()
+        mock_queued = MagicMock(initial_variables={"a": 1})
 
         with patch.object(service, "_decrement_running_instances", new_callable=AsyncMock):
             with patch.object(service, "_pop_from_queue", new_callable=AsyncMock) as mock_pop:
                 mock_pop.return_value = mock_queued
-                result = await service.release_chain(mock_db, mock_chain)
+                result = await service.release_chain(mock_db, mock_chain, arq_redis)
 
         assert result == mock_queued
+        arq_redis.enqueue_job.assert_called_once_with(
+            "execute_chain",
+            chain_id=str(mock_chain.id),
+            initial_variables={"a": 1},
+            lease_id=None,
+            _queue_name="arq:queue:chains",
+        )
 
 
 class TestOverlapServiceQueueManagement:
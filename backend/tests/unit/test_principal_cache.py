@@ -0,0 +1,212 @@
+"""Tests for principal cache."""
+
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import inspect
+
+from app.models.subscription import SubscriptionStatus
+from app.models.user import User
+from app.services.principal_cache import (
+    PRINCIPAL_CACHE_TTL,
+    Principal,
+    PrincipalCache,
+    _deserialize_user,
+    _serialize_user,
+)
+
+
+def make_user(**kwargs) -> User:
+    defaults = {
+        "id": uuid4(),
+        "email": "user@example.com",
+        "password_hash": "secret-hash",
+        "name": "User",
+        "email_verified": True,
+        "is_active": True,
+        "is_superuser": False,
+        "preferred_language": "en",
+        "failed_login_attempts": 0,
+        "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+        "updated_at": datetime(2024, 1, 2, tzinfo=timezone.utc),
+        "last_login_at": None,
+    }
+    defaults.update(kwargs)
+    return User(**defaults)
+
+
+def make_db() -> MagicMock:
+    db = MagicMock()
+    db.identity_map = {}
+    return db
+
+
+class TestUserSerialization:
+    """Tests for user (de)serialization."""
+
+    def test_roundtrip_excludes_password_hash(self):
+        """Test serialization roundtrip keeps columns except the password hash."""
+        user = make_user()
+
+        data = json.loads(json.dumps(_serialize_user(user)))
+        restored = _deserialize_user(data)
+
+        assert "password_hash" not in data
+        assert restored.id == user.id
+        assert restored.email == user.email
+        assert restored.created_at == user.created_at
+        assert restored.last_login_at is None
+
+    def test_deserialized_user_is_detached(self):
+        """Test restored user is persistent-ready with the hash left unloaded."""
+        restored = _deserialize_user(_serialize_user(make_user()))
+
+        state = inspect(restored)
+        assert state.detached
+        assert "password_hash" in state.unloaded
+
+
+class TestPrincipalCacheGet:
+    """Tests for PrincipalCache.get."""
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_attaches_user_without_query(self):
+        """Test cache hit rebuilds the principal and attaches the user to the session."""
+        cache = PrincipalCache()
+        user = make_user()
+        cached = json.dumps(
+            {
+                "user": _serialize_user(user),
+                "subscription_status": "active",
+            }
+        )
+        db = make_db()
+
+        with (
+            patch("app.services.principal_cache.redis_client") as mock_redis,
+            patch("app.db.repositories.users.UserRepository.get_principal", new_callable=AsyncMock) as mock_load,
+        ):
+            mock_redis.get = AsyncMock(return_value=cached)
+
+            principal = await cache.get(db, user.id)
+
+        assert principal.user.id == user.id
+        assert principal.subscription_status == SubscriptionStatus.ACTIVE
+        db.add.assert_called_once_with(principal.user)
+        mock_load.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cache_miss_loads_and_stores(self):
+        """Test cache miss loads the principal in one query and caches it."""
+        cache = PrincipalCache()
+        user = make_user()
+        db = make_db()
+
+        with (
+            patch("app.services.principal_cache.redis_client") as mock_redis,
+            patch("app.db.repositories.users.UserRepository.get_principal", new_callable=AsyncMock) as mock_load,
+        ):
+            mock_redis.get = AsyncMock(return_value=None)
+            mock_redis.set = AsyncMock()
+            mock_load.return_value = (user, None)
+
+            principal = await cache.get(db, user.id)
+
+        assert principal.user is user
+        assert principal.subscription_status is None
+        args, kwargs = mock_redis.set.call_args
+        assert args[0] == f"cache:principal:{user.id}"
+        assert kwargs["expire"] == PRINCIPAL_CACHE_TTL
+        assert "secret-hash" not in args[1]
+
+    @pytest.mark.asyncio
+    async def test_cache_miss_unknown_user(self):
+        """Test unknown user returns None."""
+        cache = PrincipalCache()
+
+        with (
+            patch("app.services.principal_cache.redis_client") as mock_redis,
+            patch("app.db.repositories.users.UserRepository.get_principal", new_callable=AsyncMock) as mock_load,
+        ):
+            mock_redis.get = AsyncMock(return_value=None)
+            mock_load.return_value = None
+
+            assert await cache.get(make_db(), uuid4()) is None
+
+    @pytest.mark.asyncio
+    async def test_redis_error_falls_back_to_db(self):
+        """Test Redis errors fall back to loading from the database."""
+        cache = PrincipalCache()
+        user = make_user()
+
+        with (
+            patch("app.services.principal_cache.redis_client") as mock_redis,
+            patch("app.db.repositories.users.UserRepository.get_principal", new_callable=AsyncMock) as mock_load,
+        ):
+            mock_redis.get = AsyncMock(side_effect=Exception("Redis down"))
+            mock_redis.set = AsyncMock(side_effect=Exception("Redis down"))
+            mock_load.return_value = (user, SubscriptionStatus.EXPIRED)
+
+            principal = await cache.get(make_db(), user.id)
+
+        assert principal.user is user
+        assert principal.subscription_status == SubscriptionStatus.EXPIRED
+
+
+class TestPrincipalCacheInvalidate:
+    """Tests for PrincipalCache.invalidate."""
+
+    @pytest.mark.asyncio
+    async def test_invalidate_deletes_keys(self):
+        """Test invalidation deletes all given users' keys in one call."""
+        cache = PrincipalCache()
+        first, second = uuid4(), uuid4()
+
+        with patch("app.services.principal_cache.redis_client") as mock_redis:
+            mock_redis.client.delete = AsyncMock(return_value=2)
+
+            await cache.invalidate(first, second)
+
+        mock_redis.client.delete.assert_called_once_with(f"cache:principal:{first}", f"cache:principal:{second}")
+
+    @pytest.mark.asyncio
+    async def test_invalidate_swallows_errors(self):
+        """Test invalidation is best-effort."""
+        cache = PrincipalCache()
+
+        with patch("app.services.principal_cache.redis_client") as mock_redis:
+            mock_redis.client.delete = AsyncMock(side_effect=Exception("Redis down"))
+
+            await cache.invalidate(uuid4())
+
+
+class TestRequireActiveSubscription:
+    """Tests for the subscription check using the cached principal."""
+
+    @pytest.mark.asyncio
+    async def test_expired_subscription_returns_402(self):
+        """Test expired subscription status from cache blocks writes."""
+        from app.api.deps import require_active_subscription
+
+        workspace = MagicMock(is_blocked=False)
+        principal = Principal(user=make_user(), subscription_status=SubscriptionStatus.EXPIRED)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await require_active_subscription(workspace, principal)
+
+        assert exc_info.value.status_code == 402
+        assert exc_info.value.detail["subscription_status"] == "expired"
+
+    @pytest.mark.asyncio
+    async def test_no_subscription_allowed(self):
+        """Test free users (no subscription) are allowed."""
+        from app.api.deps import require_active_subscription
+
+        workspace = MagicMock(is_blocked=False)
+        principal = Principal(user=make_user())
+
+        assert await require_active_subscription(workspace, principal) is workspace
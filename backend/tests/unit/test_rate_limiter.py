@@ -1,15 +1,16 @@
 """Tests for rate limiter module."""
 
-from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import Request, status
 
 from app.core.rate_limiter import (
+    LOCAL_BUDGET_TTL,
     RateLimiter,
     RateLimitExceeded,
     RateLimitMiddleware,
+    RateLimitResult,
     enterprise_limiter,
     free_limiter,
     get_limiter_for_plan,
@@ -56,95 +57,107 @@ class TestRateLimiter:
         """Test key generation format."""
         limiter = RateLimiter(key_prefix="test")
 
-        with patch("app.core.rate_limiter.datetime") as mock_dt:
-            mock_dt.utcnow.return_value = datetime(2024, 1, 15, 10, 30)
-            key = limiter._get_key("user123")
-
-            assert key == "test:user123:202401151030"
+        assert limiter._get_key("user123") == "test:user123"
 
     @pytest.mark.asyncio
-    async def test_is_allowed_first_request(self):
-        """Test first request is always allowed."""
-        limiter = RateLimiter(requests_per_minute=10)
+    async def test_is_allowed_single_round_trip(self):
+        """Test a check is one script call with limit, window and cost."""
+        limiter = RateLimiter(requests_per_minute=10, key_prefix="test")
+        script = AsyncMock(return_value=[1, 9, 0, 6000])
 
         with patch("app.core.rate_limiter.redis_client") as mock_redis:
-            mock_redis.incr = AsyncMock(return_value=1)
-            mock_redis.expire = AsyncMock()
+            mock_redis.client.register_script.return_value = script
 
-            is_allowed, count, remaining = await limiter.is_allowed("user1")
+            result = await limiter.is_allowed("user1")
 
-            assert is_allowed is True
-            assert count == 1
-            assert remaining == 9
-            mock_redis.expire.assert_called_once()
+        assert result == RateLimitResult(allowed=True, remaining=9, reset_after=6, retry_after=0)
+        script.assert_called_once_with(keys=["test:user1"], args=[10, 60000, 1])
 
     @pytest.mark.asyncio
-    async def test_is_allowed_under_limit(self):
-        """Test request under limit is allowed."""
+    async def test_is_allowed_over_limit(self):
+        """Test request over limit is blocked with retry-after from the script."""
         limiter = RateLimiter(requests_per_minute=10)
 
         with patch("app.core.rate_limiter.redis_client") as mock_redis:
-            mock_redis.incr = AsyncMock(return_value=5)
+            mock_redis.client.register_script.return_value = AsyncMock(return_value=[0, 0, 5500, 60000])
 
-            is_allowed, count, remaining = await limiter.is_allowed("user1")
+            result = await limiter.is_allowed("user1")
 
-            assert is_allowed is True
-            assert count == 5
-            assert remaining == 5
+        assert result.allowed is False
+        assert result.remaining == 0
+        assert result.retry_after == 6
+        assert result.reset_after == 60
 
     @pytest.mark.asyncio
-    async def test_is_allowed_at_limit(self):
-        """Test request at limit is still allowed."""
+    async def test_is_allowed_retry_after_at_least_one_second(self):
+        """Test sub-second waits are rounded up to a valid Retry-After."""
         limiter = RateLimiter(requests_per_minute=10)
 
         with patch("app.core.rate_limiter.redis_client") as mock_redis:
-            mock_redis.incr = AsyncMock(return_value=10)
+            mock_redis.client.register_script.return_value = AsyncMock(return_value=[0, 0, 0, 100])
 
-            is_allowed, count, remaining = await limiter.is_allowed("user1")
+            result = await limiter.is_allowed("user1")
 
-            assert is_allowed is True
-            assert count == 10
-            assert remaining == 0
+        assert result.retry_after == 1
 
     @pytest.mark.asyncio
-    async def test_is_allowed_over_limit(self):
-        """Test request over limit is blocked."""
+    async def test_is_allowed_redis_failure(self):
+        """Test fail-open when Redis fails."""
         limiter = RateLimiter(requests_per_minute=10)
 
         with patch("app.core.rate_limiter.redis_client") as mock_redis:
-            mock_redis.incr = AsyncMock(return_value=11)
+            mock_redis.client.register_script.return_value = AsyncMock(side_effect=Exception("Redis error"))
 
-            is_allowed, count, remaining = await limiter.is_allowed("user1")
+            result = await limiter.is_allowed("user1")
 
-            assert is_allowed is False
-            assert count == 11
-            assert remaining == 0
+        # Should fail open
+        assert result.allowed is True
+        assert result.remaining == 10
 
     @pytest.mark.asyncio
-    async def test_is_allowed_redis_failure(self):
-        """Test fail-open when Redis fails."""
-        limiter = RateLimiter(requests_per_minute=10)
+    async def test_local_budget_skips_redis(self):
+        """Test reserved tokens are spent locally before calling Redis again."""
+        limiter = RateLimiter(requests_per_minute=100, local_budget=3)
+        script = AsyncMock(return_value=[3, 97, 0, 1800])
 
         with patch("app.core.rate_limiter.redis_client") as mock_redis:
-            mock_redis.incr = AsyncMock(side_effect=Exception("Redis error"))
+            mock_redis.client.register_script.return_value = script
 
-            is_allowed, count, remaining = await limiter.is_allowed("user1")
+            results = [await limiter.is_allowed("user1") for _ in range(4)]
 
-            # Should fail open
-            assert is_allowed is True
-            assert count == 0
-            assert remaining == 10
+        assert all(result.allowed for result in results)
+        assert [result.remaining for result in results[:3]] == [99, 98, 97]
+        assert script.call_count == 2
+        assert script.call_args.kwargs["args"] == [100, 60000, 3]
+
+    @pytest.mark.asyncio
+    async def test_local_budget_expires(self):
+        """Test stale local budgets are discarded."""
+        limiter = RateLimiter(requests_per_minute=100, local_budget=5)
+        script = AsyncMock(return_value=[5, 95, 0, 3000])
+
+        with (
+            patch("app.core.rate_limiter.redis_client") as mock_redis,
+            patch("app.core.rate_limiter.time.monotonic") as mock_monotonic,
+        ):
+            mock_redis.client.register_script.return_value = script
+            mock_monotonic.return_value = 100.0
+            await limiter.is_allowed("user1")
+            mock_monotonic.return_value = 100.0 + LOCAL_BUDGET_TTL
+            await limiter.is_allowed("user1")
+
+        assert script.call_count == 2
 
     @pytest.mark.asyncio
     async def test_check_raises_on_limit_exceeded(self):
         """Test check method raises exception when limit exceeded."""
         limiter = RateLimiter(requests_per_minute=10)
 
-        with patch.object(limiter, "is_allowed", return_value=(False, 11, 0)):
+        with patch.object(limiter, "is_allowed", return_value=RateLimitResult(False, 0, 60, 6)):
             with pytest.raises(RateLimitExceeded) as exc:
                 await limiter.check("user1")
 
-            assert exc.value.retry_after == 60
+            assert exc.value.retry_after == 6
 
 
 class TestDefaultLimiters:
@@ -300,3 +313,24 @@ class TestRateLimitMiddleware:
         await middleware.dispatch(mock_request, mock_call_next)
 
         mock_call_next.assert_called_once_with(mock_request)
+
+    @pytest.mark.asyncio
+    async def test_dispatch_rate_limited_sets_retry_after(self):
+        """Test 429 response carries Retry-After from the limiter result."""
+        mock_app = MagicMock()
+        middleware = RateLimitMiddleware(mock_app)
+        middleware.default_limiter.is_allowed = AsyncMock(return_value=RateLimitResult(False, 0, 42, 7))
+
+        mock_request = MagicMock(spec=Request)
+        mock_request.url.path = "/v1/tasks"
+        mock_request.headers = {}
+        mock_request.client.host = "192.0.2.1"
+
+        mock_call_next = AsyncMock()
+
+        response = await middleware.dispatch(mock_request, mock_call_next)
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "7"
+        assert response.headers["X-RateLimit-Reset"] == "42"
+        mock_call_next.assert_not_called()
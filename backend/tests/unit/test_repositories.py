@@ -438,6 +438,35 @@ class TestExecutionRepository:
         assert mock_execution.completed_at is not None
         mock_db.flush.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_complete_execution_stores_http_timings(self):
+        """Test HTTP phase timings are stored on the execution."""
+        from app.db.repositories.executions import ExecutionRepository
+
+        repo = ExecutionRepository(AsyncMock())
+        mock_execution = MagicMock()
+        mock_execution.started_at = datetime.utcnow()
+
+        await repo.complete_execution(
+            execution=mock_execution,
+            status=TaskStatus.SUCCESS,
+            http_timings={
+                "dns_ms": 1.5,
+                "connect_ms": 2.0,
+                "tls_ms": None,
+                "ttfb_ms": 40.0,
+                "transfer_ms": 0.5,
+                "connection_reused": False,
+            },
+        )
+
+        assert mock_execution.http_dns_time == 1.5
+        assert mock_execution.http_connect_time == 2.0
+        assert mock_execution.http_tls_time is None
+        assert mock_execution.http_first_byte_time == 40.0
+        assert mock_execution.http_transfer_time == 0.5
+        assert mock_execution.http_connection_reused is False
+
     @pytest.mark.asyncio
     async def test_get_by_workspace(self):
         """Test getting executions by workspace."""
@@ -0,0 +1,194 @@
+"""Tests for the cron schedule engine."""
+
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+
+import pytest
+import pytz
+from croniter import croniter
+
+from app.services.schedule import (
+    calculate_min_interval_minutes,
+    calculate_next_run,
+    calculate_next_runs,
+    get_jitter_offset,
+    get_schedule,
+    get_task_jitter_offset,
+)
+
+
+def reference_next_run(schedule: str, tz_name: str, after: datetime) -> datetime:
+    """The inline computation the engine replaced."""
+    tz = pytz.timezone(tz_name)
+    now = pytz.UTC.localize(after).astimezone(tz)
+    return croniter(schedule, now).get_next(datetime).astimezone(pytz.UTC).replace(tzinfo=None)
+
+
+class TestCalculateNextRun:
+    """Tests for calculate_next_run."""
+
+    def test_utc(self):
+        """Test next run in UTC."""
+        assert calculate_next_run("0 * * * *", "UTC", datetime(2026, 1, 1, 10, 15)) == datetime(2026, 1, 1, 11, 0)
+
+    def test_timezone(self):
+        """Test local schedules are returned as naive UTC."""
+        result = calculate_next_run("30 12 * * *", "Europe/Moscow", datetime(2026, 1, 1, 8, 0))
+
+        assert result == datetime(2026, 1, 1, 9, 30)
+        assert result.tzinfo is None
+
+    def test_defaults_to_now(self):
+        """Test the start time defaults to now."""
+        result = calculate_next_run("* * * * *", "UTC")
+
+        assert datetime.utcnow() < result <= datetime.utcnow() + timedelta(minutes=1)
+
+    def test_invalid_expression(self):
+        """Test invalid expressions raise ValueError."""
+        with pytest.raises(ValueError):
+            calculate_next_run("not a cron", "UTC")
+
+    def test_invalid_timezone(self):
+        """Test unknown timezones raise."""
+        with pytest.raises(pytz.UnknownTimeZoneError):
+            calculate_next_run("* * * * *", "Invalid/Zone")
+
+    def test_compiled_once(self):
+        """Test the same expression and timezone share one compiled schedule."""
+        assert get_schedule("*/5 * * * *", "UTC") is get_schedule("*/5 * * * *", "UTC")
+        assert get_schedule("*/5 * * * *", "UTC") is not get_schedule("*/5 * * * *", "Europe/Moscow")
+
+
+class TestDaylightSavingTime:
+    """DST behaviour must match the previous inline croniter computation."""
+
+    @pytest.mark.parametrize(
+        "tz_name,start",
+        [
+            # US spring forward: 2026-03-08 02:00 local is skipped
+            ("America/New_York", datetime(2026, 3, 8, 5, 0)),
+            # US fall back: 2026-11-01 01:00-02:00 local happens twice
+            ("America/New_York", datetime(2026, 11, 1, 4, 0)),
+            # EU spring forward: 2026-03-29 02:00 local is skipped
+            ("Europe/Berlin", datetime(2026, 3, 28, 23, 0)),
+            # EU fall back: 2026-10-25 02:00-03:00 local happens twice
+            ("Europe/Berlin", datetime(2026, 10, 24, 23, 0)),
+        ],
+    )
+    @pytest.mark.parametrize("schedule", ["*/15 * * * *", "30 2 * * *", "0 * * * *", "0 1,2,3 * * *"])
+    def test_matches_reference(self, schedule, tz_name, start):
+        """Test fire times across a transition are identical to the old computation."""
+        for minutes in range(0, 6 * 60, 7):
+            after = start + timedelta(minutes=minutes)
+            assert calculate_next_run(schedule, tz_name, after) == reference_next_run(schedule, tz_name, after)
+
+    def test_skipped_hour(self):
+        """Test a daily job in the skipped hour still fires once that day."""
+        result = calculate_next_run("30 2 * * *", "America/New_York", datetime(2026, 3, 8, 5, 0))
+
+        assert result == reference_next_run("30 2 * * *", "America/New_York", datetime(2026, 3, 8, 5, 0))
+        assert result.date() == datetime(2026, 3, 8).date()
+
+    def test_consecutive_fires_match_reference(self):
+        """Test sampled consecutive fire times match chained croniter calls."""
+        after = datetime(2026, 11, 1, 4, 0)
+        tz = pytz.timezone("America/New_York")
+        cron = croniter("*/20 * * * *", pytz.UTC.localize(after).astimezone(tz))
+        expected = [cron.get_next(datetime).astimezone(pytz.UTC).replace(tzinfo=None) for _ in range(12)]
+
+        assert get_schedule("*/20 * * * *", "America/New_York").next_fires(12, after) == expected
+
+
+class TestCalculateNextRuns:
+    """Tests for the bulk API."""
+
+    def test_matches_single_calls(self):
+        """Test bulk results match per-item calculation in input order."""
+        after = datetime(2026, 6, 1, 12, 7)
+        schedules = [
+            ("*/5 * * * *", "UTC", 0),
+            ("0 9 * * 1-5", "Europe/Moscow", 0),
+            ("*/5 * * * *", "UTC", 0),
+            ("*/5 * * * *", "UTC", 42),
+            ("0 0 1 * *", "America/New_York", 0),
+        ]
+
+        assert calculate_next_runs(schedules, after) == [
+            calculate_next_run(s, tz, after, offset) for s, tz, offset in schedules
+        ]
+
+    def test_invalid_items_yield_none(self):
+        """Test one invalid schedule does not fail the batch."""
+        after = datetime(2026, 6, 1, 12, 7)
+
+        result = calculate_next_runs(
+            [("bad", "UTC", 0), ("0 * * * *", "Invalid/Zone", 0), ("0 * * * *", "UTC", 0)], after
+        )
+
+        assert result == [None, None, datetime(2026, 6, 1, 13, 0)]
+
+    def test_empty(self):
+        """Test an empty batch."""
+        assert calculate_next_runs([]) == []
+
+
+class TestJitter:
+    """Tests for deterministic schedule jitter."""
+
+    def test_offset_is_stable_and_bounded(self):
+        """Test the offset depends only on the task id and stays in the window."""
+        task_id = uuid4()
+
+        offset = get_jitter_offset(task_id, 60)
+
+        assert 0 <= offset < 60
+        assert get_jitter_offset(UUID(str(task_id)), 60) == offset
+
+    def test_disabled(self):
+        """Test a zero or missing window disables jitter."""
+        assert get_jitter_offset(uuid4(), 0) == 0
+        assert get_jitter_offset(uuid4(), None) == 0
+
+    def test_spreads_tasks(self):
+        """Test many tasks spread across the window."""
+        offsets = {get_jitter_offset(uuid4(), 30) for _ in range(500)}
+
+        assert len(offsets) == 30
+
+    def test_task_override(self):
+        """Test the task window overrides the workspace default, including 0."""
+        task_id = UUID(int=125)
+
+        assert get_task_jitter_offset(task_id, None, 100) == 25
+        assert get_task_jitter_offset(task_id, 50, 100) == 25 % 50
+        assert get_task_jitter_offset(task_id, 0, 100) == 0
+
+    def test_shifts_every_slot(self):
+        """Test every fire time is shifted by the offset, without skipping slots."""
+        after = datetime(2026, 1, 1, 10, 0, 10)
+
+        # The 10:00 slot plus a 30s offset is still ahead
+        assert calculate_next_run("* * * * *", "UTC", after, offset_seconds=30) == datetime(2026, 1, 1, 10, 0, 30)
+        # Computed again right after running, the next slot follows
+        assert calculate_next_run("* * * * *", "UTC", datetime(2026, 1, 1, 10, 0, 31), 30) == datetime(
+            2026, 1, 1, 10, 1, 30
+        )
+
+    def test_offset_longer_than_interval(self):
+        """Test offsets longer than the interval still run once per slot."""
+        after = datetime(2026, 1, 1, 10, 2, 30)
+
+        assert calculate_next_run("* * * * *", "UTC", after, offset_seconds=90) == datetime(2026, 1, 1, 10, 3, 30)
+
+
+class TestCalculateMinIntervalMinutes:
+    """Tests for calculate_min_interval_minutes."""
+
+    @pytest.mark.parametrize(
+        "schedule,expected",
+        [("*/5 * * * *", 5), ("0 * * * *", 60), ("0 0 * * *", 1440), ("0,10 * * * *", 10)],
+    )
+    def test_min_interval(self, schedule, expected):
+        """Test the minimum gap between consecutive runs."""
+        assert calculate_min_interval_minutes(schedule, "UTC") == expected
@@ -2,10 +2,11 @@
 
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import pytest
 
+from app.models.cron_task import CatchUpPolicy
 from app.workers.scheduler import TaskScheduler
 
 
@@ -163,6 +164,8 @@ class TestProcessDueCronTasks:
         mock_task.name = "Test Task"
         mock_task.worker_id = None
         mock_task.timezone = "UTC"
+        mock_task.schedule_jitter_seconds = None
+        mock_task.workspace.schedule_jitter_seconds = 0
         mock_task.schedule = "* * * * *"
         mock_task.url = "https://example.com"
         mock_task.method = MagicMock(value="GET")
@@ -175,6 +178,10 @@ class TestProcessDueCronTasks:
         mock_task.overlap_policy = "allow"
         mock_task.running_instances = 0
         mock_task.max_instances = 1
+        # Missed run fields
+        mock_task.next_run_at = datetime.utcnow()
+        mock_task.catch_up_policy = CatchUpPolicy.RUN_ONCE
+        mock_task.max_staleness_seconds = None
 
         mock_cron_repo = AsyncMock()
         mock_cron_repo.get_due_tasks.side_effect = [[mock_task], []]
@@ -206,6 +213,8 @@ class TestProcessDueCronTasks:
         mock_task.worker_id = worker_id
         mock_task.workspace_id = uuid4()
         mock_task.timezone = "UTC"
+        mock_task.schedule_jitter_seconds = None
+        mock_task.workspace.schedule_jitter_seconds = 0
         mock_task.schedule = "* * * * *"
         mock_task.url = "https://example.com"
         mock_task.method = MagicMock(value="GET")
@@ -218,6 +227,10 @@ class TestProcessDueCronTasks:
         mock_task.overlap_policy = "allow"
         mock_task.running_instances = 0
         mock_task.max_instances = 1
+        # Missed run fields
+        mock_task.next_run_at = datetime.utcnow()
+        mock_task.catch_up_policy = CatchUpPolicy.RUN_ONCE
+        mock_task.max_staleness_seconds = None
 
         mock_cron_repo = AsyncMock()
         mock_cron_repo.get_due_tasks.side_effect = [[mock_task], []]
@@ -246,6 +259,8 @@ class TestProcessDueCronTasks:
         mock_task.name = "Test Task"
         mock_task.worker_id = None
         mock_task.timezone = "UTC"
+        mock_task.schedule_jitter_seconds = None
+        mock_task.workspace.schedule_jitter_seconds = 0
         mock_task.schedule = "* * * * *"
 
         mock_cron_repo = AsyncMock()
@@ -329,6 +344,8 @@ class TestCalculateNextRunTimes:
         mock_task = MagicMock()
         mock_task.id = uuid4()
         mock_task.timezone = "UTC"
+        mock_task.schedule_jitter_seconds = None
+        mock_task.workspace.schedule_jitter_seconds = 0
         mock_task.schedule = "0 * * * *"  # Every hour
 
         mock_cron_repo = AsyncMock()
@@ -349,6 +366,33 @@ class TestCalculateNextRunTimes:
         assert mock_task.next_run_at is not None
         mock_session.commit.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_calculate_next_run_times_applies_workspace_jitter(self):
+        """Test tasks inheriting the workspace jitter window get their offset."""
+        scheduler = TaskScheduler()
+
+        mock_task = MagicMock()
+        mock_task.id = UUID(int=30)
+        mock_task.timezone = "UTC"
+        mock_task.schedule_jitter_seconds = None
+        mock_task.workspace.schedule_jitter_seconds = 60
+        mock_task.schedule = "0 * * * *"
+
+        mock_cron_repo = AsyncMock()
+        mock_cron_repo.get_tasks_needing_next_run_update.return_value = [mock_task]
+
+        mock_chain_repo = AsyncMock()
+        mock_chain_repo.get_chains_needing_next_run_update.return_value = []
+
+        with patch("app.workers.scheduler.async_session_factory") as mock_factory:
+            mock_factory.return_value.__aenter__.return_value = AsyncMock()
+
+            with patch("app.workers.scheduler.CronTaskRepository", return_value=mock_cron_repo):
+                with patch("app.workers.scheduler.TaskChainRepository", return_value=mock_chain_repo):
+                    await scheduler._calculate_next_run_times()
+
+        assert (mock_task.next_run_at.minute, mock_task.next_run_at.second) == (0, 30)
+
     @pytest.mark.asyncio
     async def test_calculate_next_run_times_handles_error(self):
         """Test error handling when calculating next run times."""
@@ -357,6 +401,8 @@ class TestCalculateNextRunTimes:
         mock_task = MagicMock()
         mock_task.id = uuid4()
         mock_task.timezone = "Invalid/Timezone"  # Invalid timezone
+        mock_task.schedule_jitter_seconds = None
+        mock_task.workspace.schedule_jitter_seconds = 0
         mock_task.schedule = "0 * * * *"
 
         mock_cron_repo = AsyncMock()
@@ -470,7 +516,7 @@ class TestCleanupOldExecutions:
                         return_value=mock_chain_repo,
                     ):
                         with patch("app.services.billing.billing_service") as mock_billing:
-                            mock_billing.get_user_plan = AsyncMock(return_value=mock_plan)
+                            mock_billing.get_user_plans = AsyncMock(return_value={owner_id: mock_plan})
 
                             with patch("asyncio.sleep", side_effect=stop_scheduler):
                                 await scheduler._cleanup_old_executions()
@@ -539,7 +585,7 @@ class TestCleanupOldExecutions:
                         return_value=mock_chain_repo,
                     ):
                         with patch("app.services.billing.billing_service") as mock_billing:
-                            mock_billing.get_user_plan = AsyncMock(return_value=mock_plan)
+                            mock_billing.get_user_plans = AsyncMock(return_value={owner_id: mock_plan})
 
                             with patch("asyncio.sleep", side_effect=stop_scheduler):
                                 await scheduler._cleanup_old_executions()
@@ -0,0 +1,222 @@
+"""Tests for admission of overdue scheduler work."""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.db.repositories.cron_tasks import CronTaskRepository
+from app.models.cron_task import CatchUpPolicy
+from app.workers.admission import TokenBucket, is_missed_run_stale, staleness_limit
+from app.workers.scheduler import CRON_POLL_INTERVAL, TaskScheduler
+
+
+@pytest.fixture
+def admission_settings():
+    """Patch the admission settings."""
+    with patch("app.workers.admission.settings") as settings:
+        settings.scheduler_backlog_threshold_seconds = 60
+        settings.scheduler_max_staleness_seconds = 0
+        yield settings
+
+
+def make_task(**overrides) -> MagicMock:
+    task = MagicMock()
+    task.id = uuid4()
+    task.name = "Task"
+    task.worker_id = None
+    task.timezone = "UTC"
+    task.schedule = "* * * * *"
+    task.schedule_jitter_seconds = None
+    task.workspace.schedule_jitter_seconds = 0
+    task.overlap_policy = "allow"
+    task.catch_up_policy = CatchUpPolicy.RUN_ONCE
+    task.max_staleness_seconds = None
+    task.next_run_at = datetime.utcnow()
+    for name, value in overrides.items():
+        setattr(task, name, value)
+    return task
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_rate(self):
+        """Test tokens are used up and refill at the rate."""
+        with patch("app.workers.admission.time.monotonic", return_value=100.0) as monotonic:
+            bucket = TokenBucket(rate=2)
+            bucket.take()
+            bucket.take()
+            assert bucket.has_token() is False
+
+            monotonic.return_value = 100.5
+            assert bucket.has_token() is True
+
+    def test_unlimited(self):
+        """Test a rate of 0 allows everything."""
+        bucket = TokenBucket(rate=0)
+        for _ in range(10):
+            bucket.take()
+
+        assert bucket.has_token() is True
+
+
+class TestStaleness:
+    """Tests for skipping stale missed runs."""
+
+    def test_run_once_without_limit(self, admission_settings):
+        """Test run-once tasks run however late they are by default."""
+        task = make_task()
+        now = datetime.utcnow()
+
+        assert staleness_limit(task) is None
+        assert is_missed_run_stale(task, now - timedelta(days=1), now) is False
+
+    def test_run_once_with_limit(self, admission_settings):
+        """Test a task's own limit overrides the scheduler default."""
+        admission_settings.scheduler_max_staleness_seconds = 3600
+        task = make_task(max_staleness_seconds=600)
+        now = datetime.utcnow()
+
+        assert is_missed_run_stale(task, now - timedelta(seconds=599), now) is False
+        assert is_missed_run_stale(task, now - timedelta(seconds=601), now) is True
+
+    def test_skip_missed(self, admission_settings):
+        """Test skip-missed tasks skip every run that became backlog."""
+        task = make_task(catch_up_policy=CatchUpPolicy.SKIP_MISSED)
+        now = datetime.utcnow()
+
+        assert is_missed_run_stale(task, now - timedelta(seconds=30), now) is False
+        assert is_missed_run_stale(task, now - timedelta(seconds=61), now) is True
+
+
+class TestGetDueTasksBacklog:
+    """Tests for backlog ordering of due cron task claims."""
+
+    @pytest.mark.asyncio
+    async def test_on_time_first(self):
+        """Test on-time tasks are claimed before the backlog, each by an index-ordered query."""
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=MagicMock())
+        now = datetime(2026, 1, 1, 12, 0)
+
+        await CronTaskRepository(db).get_due_tasks(now, limit=1, backlog_before=now - timedelta(minutes=1))
+
+        on_time, backlog = (
+            str(call.args[0].compile(dialect=postgresql.dialect())) for call in db.execute.call_args_list
+        )
+        assert "cron_tasks.next_run_at >=" in on_time
+        assert "cron_tasks.next_run_at < " in backlog
+        for sql in (on_time, backlog):
+            assert "ORDER BY cron_tasks.next_run_at \n LIMIT" in sql
+
+    @pytest.mark.asyncio
+    async def test_backlog_not_queried_when_on_time_fills_claim(self):
+        """Test the backlog query is skipped when on-time tasks fill the claim."""
+        task = MagicMock()
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [task]
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=result)
+        now = datetime(2026, 1, 1, 12, 0)
+
+        tasks = await CronTaskRepository(db).get_due_tasks(now, limit=1, backlog_before=now - timedelta(minutes=1))
+
+        assert tasks == [task]
+        db.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_without_backlog(self):
+        """Test the backlog can be left out of the claim."""
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=MagicMock())
+        now = datetime(2026, 1, 1, 12, 0)
+
+        await CronTaskRepository(db).get_due_tasks(
+            now, limit=1, backlog_before=now - timedelta(minutes=1), include_backlog=False
+        )
+
+        db.execute.assert_awaited_once()
+        sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "cron_tasks.next_run_at >=" in sql
+
+
+class TestSchedulerAdmission:
+    """Tests for admission in the due cron task claims."""
+
+    async def _process(self, scheduler: TaskScheduler, *tasks) -> AsyncMock:
+        mock_cron_repo = AsyncMock()
+        mock_cron_repo.get_due_tasks.side_effect = [[task] for task in tasks] + [[]]
+
+        with (
+            patch("app.workers.scheduler.async_session_factory") as mock_factory,
+            patch("app.workers.scheduler.CronTaskRepository", return_value=mock_cron_repo),
+            patch("app.workers.scheduler.WorkspaceRepository") as mock_workspace_repo,
+        ):
+            mock_factory.return_value.__aenter__.return_value = AsyncMock()
+            mock_workspace_repo.return_value.increment_executions_skipped = AsyncMock()
+            await scheduler._process_due_cron_tasks()
+
+        self.increment_skipped = mock_workspace_repo.return_value.increment_executions_skipped
+        return mock_cron_repo
+
+    @pytest.mark.asyncio
+    async def test_stale_run_skipped(self, admission_settings):
+        """Test a stale missed run is counted as skipped and not enqueued."""
+        scheduler = TaskScheduler()
+        scheduler.redis_pool = AsyncMock()
+        task = make_task(catch_up_policy=CatchUpPolicy.SKIP_MISSED, next_run_at=datetime.utcnow() - timedelta(hours=2))
+
+        await self._process(scheduler, task)
+
+        scheduler.redis_pool.enqueue_job.assert_not_called()
+        self.increment_skipped.assert_awaited_once_with(task.workspace_id)
+        assert task.next_run_at > datetime.utcnow()
+
+    @pytest.mark.asyncio
+    async def test_backlog_rate_limited(self, admission_settings):
+        """Test backlog starts take tokens and the backlog is left out without one."""
+        scheduler = TaskScheduler()
+        scheduler.redis_pool = AsyncMock()
+        scheduler.cron_backlog = TokenBucket(rate=1, burst=1)
+        task = make_task(next_run_at=datetime.utcnow() - timedelta(hours=2))
+
+        mock_cron_repo = await self._process(scheduler, task)
+
+        scheduler.redis_pool.enqueue_job.assert_called_once()
+        first, second = mock_cron_repo.get_due_tasks.call_args_list
+        assert first.kwargs["include_backlog"] is True
+        assert second.kwargs["include_backlog"] is False
+
+    @pytest.mark.asyncio
+    async def test_backlog_drained_at_rate(self, admission_settings):
+        """Test a backlog drained over several poll cycles is started at the configured rate."""
+        clock = 100.0
+
+        async def get_due_tasks(now, limit, partition_filter, backlog_before, include_backlog):
+            # Only backlog is due, so a cycle ends once its tokens run out
+            return [make_task(next_run_at=datetime.utcnow() - timedelta(hours=2))] if include_backlog else []
+
+        mock_cron_repo = AsyncMock()
+        mock_cron_repo.get_due_tasks.side_effect = get_due_tasks
+
+        with (
+            patch("app.workers.admission.time.monotonic", side_effect=lambda: clock),
+            patch("app.workers.scheduler.settings.scheduler_backlog_rate", 5),
+            patch("app.workers.scheduler.async_session_factory") as mock_factory,
+            patch("app.workers.scheduler.CronTaskRepository", return_value=mock_cron_repo),
+        ):
+            mock_factory.return_value.__aenter__.return_value = AsyncMock()
+            scheduler = TaskScheduler()
+            scheduler.redis_pool = AsyncMock()
+
+            await scheduler._process_due_cron_tasks()
+            started = scheduler.redis_pool.enqueue_job.call_count
+            for _ in range(4):
+                clock += CRON_POLL_INTERVAL
+                await scheduler._process_due_cron_tasks()
+
+        rate = (scheduler.redis_pool.enqueue_job.call_count - started) / (4 * CRON_POLL_INTERVAL)
+        assert rate == 5
@@ -0,0 +1,203 @@
+"""Tests for sharded scheduler replicas coordinated through Redis leases."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.cron_task import CronTask
+from app.workers.coordination import (
+    CLAIM_LOOP_SCRIPT,
+    HEARTBEAT_SCRIPT,
+    LEAVE_SCRIPT,
+    SchedulerCoordinator,
+    partition_clause,
+)
+from app.workers.scheduler import TaskScheduler
+
+
+@pytest.fixture
+def mock_redis():
+    """Patch the Redis client with one mock script per Lua source."""
+    scripts = {}
+
+    def register_script(source):
+        return scripts.setdefault(source, AsyncMock())
+
+    client = MagicMock()
+    client.register_script.side_effect = register_script
+    client.scripts = scripts
+    with patch("app.workers.coordination.redis_client") as redis_client:
+        redis_client.client = client
+        yield client
+
+
+class TestSchedulerCoordinator:
+    """Tests for SchedulerCoordinator."""
+
+    @pytest.mark.asyncio
+    async def test_heartbeat(self, mock_redis):
+        """Test the heartbeat registers the replica and records its leases."""
+        coordinator = SchedulerCoordinator(partitions=4, lease_ttl_seconds=9)
+        script = mock_redis.register_script(HEARTBEAT_SCRIPT)
+        script.return_value = [1, 0, 2]
+
+        await coordinator.heartbeat()
+
+        assert coordinator.is_leader is True
+        assert coordinator.owned_partitions == [0, 2]
+        assert coordinator.heartbeat_interval == 3
+        script.assert_awaited_once_with(
+            keys=[
+                "scheduler:replicas",
+                "scheduler:leader",
+                "scheduler:partition:0",
+                "scheduler:partition:1",
+                "scheduler:partition:2",
+                "scheduler:partition:3",
+            ],
+            args=[coordinator.replica_id, 9000],
+        )
+
+    @pytest.mark.asyncio
+    async def test_follower(self, mock_redis):
+        """Test a replica without the leader lease is not the leader."""
+        coordinator = SchedulerCoordinator(partitions=4, lease_ttl_seconds=9)
+        mock_redis.register_script(HEARTBEAT_SCRIPT).return_value = [0, 1, 3]
+
+        await coordinator.heartbeat()
+
+        assert coordinator.is_leader is False
+        assert coordinator.owned_partitions == [1, 3]
+
+    @pytest.mark.asyncio
+    async def test_expired_leases(self, mock_redis):
+        """Test leases are not trusted once they could have expired."""
+        coordinator = SchedulerCoordinator(partitions=2, lease_ttl_seconds=9)
+        mock_redis.register_script(HEARTBEAT_SCRIPT).return_value = [1, 0, 1]
+
+        with patch("app.workers.coordination.time.monotonic", side_effect=[100.0, 110.0, 110.0]):
+            await coordinator.heartbeat()
+
+            assert coordinator.is_leader is False
+            assert coordinator.owned_partitions == []
+
+    @pytest.mark.asyncio
+    async def test_leave(self, mock_redis):
+        """Test leaving drops the leases locally and in Redis."""
+        coordinator = SchedulerCoordinator(partitions=1, lease_ttl_seconds=9)
+        mock_redis.register_script(HEARTBEAT_SCRIPT).return_value = [1, 0]
+        await coordinator.heartbeat()
+
+        await coordinator.leave()
+
+        assert coordinator.is_leader is False
+        assert coordinator.owned_partitions == []
+        mock_redis.register_script(LEAVE_SCRIPT).assert_awaited_once_with(
+            keys=["scheduler:replicas", "scheduler:leader", "scheduler:partition:0"],
+            args=[coordinator.replica_id],
+        )
+
+    @pytest.mark.asyncio
+    async def test_claim_loop_run(self, mock_redis):
+        """Test a loop run is claimed for its interval, or the time left is returned."""
+        coordinator = SchedulerCoordinator(partitions=1, lease_ttl_seconds=9)
+        script = mock_redis.register_script(CLAIM_LOOP_SCRIPT)
+        script.side_effect = [0, 1500]
+
+        assert await coordinator.claim_loop_run("subscriptions", 3600) == 0
+        assert await coordinator.claim_loop_run("subscriptions", 3600) == 1.5
+        script.assert_awaited_with(keys=["scheduler:loop:subscriptions"], args=[coordinator.replica_id, 3600000])
+
+
+def test_partition_clause():
+    """Test the partition filter hashes the id into the owned partitions."""
+    clause = partition_clause(CronTask.id, 8, [1, 5])
+
+    sql = str(clause.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    assert sql.startswith("(hashtext(CAST(cron_tasks.id AS VARCHAR)) & 2147483647) %")
+    assert sql.endswith("8 IN (1, 5)")
+
+
+class TestShardedScheduler:
+    """Tests for the scheduler running as one of several replicas."""
+
+    def test_single_replica(self):
+        """Test without partitions the scheduler leads and claims every row."""
+        scheduler = TaskScheduler()
+
+        assert scheduler.coordinator is None
+        assert scheduler.is_leader is True
+        assert scheduler._partition_filter(CronTask.id) is None
+
+    @pytest.mark.asyncio
+    async def test_claims_own_partitions(self):
+        """Test due rows are claimed with the replica's partition filter."""
+        scheduler = TaskScheduler()
+        scheduler.coordinator = SchedulerCoordinator(partitions=4, lease_ttl_seconds=9)
+        mock_cron_repo = AsyncMock()
+        mock_cron_repo.get_due_tasks.return_value = []
+
+        with (
+            patch("app.workers.scheduler.async_session_factory") as mock_factory,
+            patch("app.workers.scheduler.CronTaskRepository", return_value=mock_cron_repo),
+        ):
+            mock_factory.return_value.__aenter__.return_value = AsyncMock()
+            await scheduler._process_due_cron_tasks()
+
+        partition_filter = mock_cron_repo.get_due_tasks.call_args.kwargs["partition_filter"]
+        assert "hashtext" in str(partition_filter.compile(dialect=postgresql.dialect()))
+
+    @pytest.mark.asyncio
+    async def test_follower_skips_singleton_loops(self):
+        """Test a follower waits for leadership instead of running leader-only loops."""
+        scheduler = TaskScheduler()
+        scheduler.coordinator = SchedulerCoordinator(partitions=4, lease_ttl_seconds=9)
+        scheduler.running = True
+        scheduler._process_subscription_checks = AsyncMock()
+
+        async def stop(*args):
+            scheduler.running = False
+
+        with patch("asyncio.sleep", side_effect=stop) as mock_sleep:
+            await scheduler._check_subscriptions()
+
+        scheduler._process_subscription_checks.assert_not_called()
+        mock_sleep.assert_called_once_with(5)
+
+    @pytest.mark.asyncio
+    async def test_stop_leaves(self):
+        """Test stopping the scheduler gives up its leases."""
+        scheduler = TaskScheduler()
+        scheduler.coordinator = MagicMock()
+        scheduler.coordinator.leave = AsyncMock()
+
+        with patch("app.workers.scheduler.redis_client") as mock_redis:
+            mock_redis.close = AsyncMock()
+            await scheduler.stop()
+
+        scheduler.coordinator.leave.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_new_leader_waits_out_previous_run(self):
+        """Test a replica that became leader does not rerun a loop the previous leader just ran."""
+        scheduler = TaskScheduler()
+        scheduler.coordinator = MagicMock(is_leader=True)
+        scheduler.coordinator.claim_loop_run = AsyncMock(side_effect=[1200.0, 0])
+
+        with patch("app.workers.scheduler.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            assert await scheduler._leader_turn("subscriptions", 3600) is False
+            # Leadership is re-checked while waiting
+            mock_sleep.assert_awaited_once_with(5)
+
+            assert await scheduler._leader_turn("subscriptions", 3600) is True
+
+    @pytest.mark.asyncio
+    async def test_leader_turn_without_redis(self):
+        """Test loops still run when the last run cannot be checked."""
+        scheduler = TaskScheduler()
+        scheduler.coordinator = MagicMock(is_leader=True)
+        scheduler.coordinator.claim_loop_run = AsyncMock(side_effect=Exception("Redis down"))
+
+        assert await scheduler._leader_turn("subscriptions", 3600) is True
@@ -0,0 +1,130 @@
+"""Tests for scheduler metrics."""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.workers.metrics import (
+    QUEUE_DEPTH,
+    WORKER_QUEUE_DEPTH,
+    DueTaskCounter,
+    observe_dispatch_lag,
+    observe_loop,
+    registry,
+)
+from app.workers.scheduler import TaskScheduler
+
+
+def observed(histogram: MagicMock) -> list[int]:
+    return [call.args[0] for call in histogram.observe.call_args_list]
+
+
+class TestDueTaskCounter:
+    """Tests for DueTaskCounter."""
+
+    def test_counts_per_second_including_idle_seconds(self):
+        """Test settled seconds are observed with their counts, empty ones as 0."""
+        histogram = MagicMock()
+        counter = DueTaskCounter(histogram, settle_seconds=5)
+        start = datetime(2026, 1, 1, 10, 0, 0)
+
+        for _ in range(3):
+            counter.record(start)
+        counter.record(start + timedelta(seconds=2, milliseconds=500))
+        counter.flush(start + timedelta(seconds=8))
+
+        assert observed(histogram) == [3, 0, 1]
+
+    def test_seconds_observed_once(self):
+        """Test each second is observed exactly once across flushes."""
+        histogram = MagicMock()
+        counter = DueTaskCounter(histogram, settle_seconds=0)
+        start = datetime(2026, 1, 1, 10, 0, 0)
+
+        counter.record(start)
+        counter.flush(start + timedelta(seconds=1))
+        counter.flush(start + timedelta(seconds=1))
+        counter.record(start + timedelta(seconds=2))
+        counter.flush(start + timedelta(seconds=3))
+
+        assert observed(histogram) == [1, 0, 1]
+
+    def test_late_tasks_count_towards_next_second(self):
+        """Test tasks due in an already observed second are not lost."""
+        histogram = MagicMock()
+        counter = DueTaskCounter(histogram, settle_seconds=0)
+        start = datetime(2026, 1, 1, 10, 0, 0)
+
+        counter.flush(start)
+        counter.record(start - timedelta(minutes=5))
+        counter.flush(start + timedelta(seconds=1))
+
+        assert observed(histogram) == [1]
+
+
+def sample(name: str, **labels) -> float:
+    return registry.get_sample_value(name, labels) or 0.0
+
+
+class TestSchedulerMetrics:
+    """Tests for the scheduler and worker metrics."""
+
+    def test_observe_loop_counts_errors(self):
+        """Test failed loop cycles are counted and timed."""
+        errors = sample("cronbox_scheduler_loop_errors_total", loop="test_loop")
+        cycles = sample("cronbox_scheduler_loop_duration_seconds_count", loop="test_loop")
+
+        with observe_loop("test_loop"):
+            pass
+        with pytest.raises(ValueError), observe_loop("test_loop"):
+            raise ValueError("boom")
+
+        assert sample("cronbox_scheduler_loop_errors_total", loop="test_loop") == errors + 1
+        assert sample("cronbox_scheduler_loop_duration_seconds_count", loop="test_loop") == cycles + 2
+
+    def test_observe_dispatch_lag(self):
+        """Test the lag is measured from the naive UTC due time."""
+        before = sample("cronbox_scheduler_dispatch_lag_seconds_bucket", kind="delayed", le="10.0")
+
+        observe_dispatch_lag("delayed", datetime.utcnow() - timedelta(seconds=7))
+        observe_dispatch_lag("delayed", None)
+
+        assert sample("cronbox_scheduler_dispatch_lag_seconds_bucket", kind="delayed", le="10.0") == before + 1
+        assert sample("cronbox_scheduler_dispatch_lag_seconds_bucket", kind="delayed", le="5.0") == 0
+
+    @pytest.mark.asyncio
+    async def test_claim_batch_size(self):
+        """Test each poll cycle records how many rows it claimed."""
+        scheduler = TaskScheduler()
+        cycles = sample("cronbox_scheduler_claim_batch_size_count", kind="chain")
+        mock_chain_repo = AsyncMock()
+        mock_chain_repo.get_due_chains.return_value = []
+
+        with (
+            patch("app.workers.scheduler.async_session_factory") as mock_factory,
+            patch("app.workers.scheduler.TaskChainRepository", return_value=mock_chain_repo),
+        ):
+            mock_factory.return_value.__aenter__.return_value = AsyncMock()
+            await scheduler._process_due_chains()
+
+        assert sample("cronbox_scheduler_claim_batch_size_count", kind="chain") == cycles + 1
+
+    @pytest.mark.asyncio
+    async def test_record_queue_depths(self):
+        """Test the arq queue and worker list depths are exported."""
+        scheduler = TaskScheduler()
+        scheduler.redis_pool = AsyncMock()
+        scheduler.redis_pool.zcount.side_effect = [0, 12, 3, 1]
+        WORKER_QUEUE_DEPTH.labels(worker_id="gone").set(5)
+
+        with patch("app.workers.scheduler.worker_service") as mock_worker_service:
+            mock_worker_service.get_queue_depths = AsyncMock(return_value={"w1": 4})
+            await scheduler._record_queue_depths()
+
+        assert QUEUE_DEPTH.labels(queue="arq:queue")._value.get() == 0
+        assert QUEUE_DEPTH.labels(queue="arq:queue:executions")._value.get() == 12
+        assert QUEUE_DEPTH.labels(queue="arq:queue:chains")._value.get() == 3
+        assert QUEUE_DEPTH.labels(queue="arq:queue:notifications")._value.get() == 1
+        assert sample("cronbox_external_worker_queue_depth", worker_id="w1") == 4
+        assert registry.get_sample_value("cronbox_external_worker_queue_depth", {"worker_id": "gone"}) is None
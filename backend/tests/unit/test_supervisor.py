@@ -0,0 +1,59 @@
+"""Tests for the multi-process supervisor."""
+
+import threading
+from unittest.mock import patch
+
+from app.core.supervisor import Supervisor, pool_environment
+
+
+class TestPoolEnvironment:
+    """Tests for pool_environment."""
+
+    def test_splits_budget(self):
+        """Test the connection budget is split between the processes."""
+        with patch("app.config.settings") as mock_settings:
+            mock_settings.database_max_connections = 90
+            env = pool_environment(4)
+
+        # 22 connections per process
+        assert env == {"DATABASE_POOL_SIZE": "14", "DATABASE_MAX_OVERFLOW": "8"}
+
+    def test_no_budget(self):
+        """Test processes keep the configured pool without a budget."""
+        with patch("app.config.settings") as mock_settings:
+            mock_settings.database_max_connections = 0
+            mock_settings.database_pool_size = 20
+            mock_settings.database_max_overflow = 10
+            assert pool_environment(4) == {}
+
+
+class TestSupervisor:
+    """Tests for Supervisor with real child processes."""
+
+    def test_stop_terminates_children(self):
+        """Test stopping the supervisor stops every child."""
+        supervisor = Supervisor("time:sleep", (60,), processes=2, shutdown_timeout=5)
+        threading.Timer(1.0, supervisor.stop).start()
+
+        supervisor.run()
+
+        assert supervisor.restarts == 0
+        assert all(not child.is_alive() for child in supervisor._children)
+
+    def test_restarts_crashed_children(self):
+        """Test children that exit are started again."""
+        env = []
+        supervisor = Supervisor(
+            "os:_exit",
+            (3,),
+            processes=1,
+            child_env=lambda index: env.append(index) or {"CHILD_INDEX": str(index)},
+            shutdown_timeout=5,
+        )
+        threading.Timer(4.0, supervisor.stop).start()
+
+        with patch("app.core.supervisor.MAX_RESTART_DELAY_SECONDS", 0.5):
+            supervisor.run()
+
+        assert supervisor.restarts >= 1
+        assert env[:2] == [0, 0]
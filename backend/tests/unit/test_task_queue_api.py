@@ -39,11 +39,7 @@ class TestListQueuedTasks:
 
         with patch("app.api.v1.task_queue.overlap_service") as mock_service:
             mock_service.get_queued_tasks = AsyncMock(return_value=mock_items)
-
-            # Mock count query
-            mock_result = MagicMock()
-            mock_result.scalar.return_value = 1
-            mock_db.execute.return_value = mock_result
+            mock_service.count_queued_tasks = AsyncMock(return_value=1)
 
             result = await list_queued_tasks(workspace=mock_workspace, db=mock_db, limit=50)
 
@@ -61,10 +57,7 @@ class TestListQueuedTasks:
 
         with patch("app.api.v1.task_queue.overlap_service") as mock_service:
             mock_service.get_queued_tasks = AsyncMock(return_value=[])
-
-            mock_result = MagicMock()
-            mock_result.scalar.return_value = 0
-            mock_db.execute.return_value = mock_result
+            mock_service.count_queued_tasks = AsyncMock(return_value=0)
 
             result = await list_queued_tasks(workspace=mock_workspace, db=mock_db, limit=50)
 
@@ -85,16 +78,14 @@ class TestRemoveFromQueue:
         mock_workspace.id = uuid4()
 
         queue_id = uuid4()
-        mock_item = MagicMock()
 
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_item
-        mock_db.execute.return_value = mock_result
+        with patch("app.api.v1.task_queue.overlap_service") as mock_service:
+            mock_service.remove_from_queue = AsyncMock(return_value=True)
 
-        # Should not raise
-        await remove_from_queue(workspace=mock_workspace, queue_id=queue_id, db=mock_db)
+            # Should not raise
+            await remove_from_queue(workspace=mock_workspace, queue_id=queue_id, db=mock_db)
 
-        mock_db.delete.assert_called_once_with(mock_item)
+        mock_service.remove_from_queue.assert_called_once_with(mock_db, queue_id, workspace_id=mock_workspace.id)
         mock_db.commit.assert_called_once()
 
     @pytest.mark.asyncio
@@ -110,11 +101,11 @@ class TestRemoveFromQueue:
 
         queue_id = uuid4()
 
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db.execute.return_value = mock_result
-
-        with pytest.raises(HTTPException) as exc_info:
+        with (
+            patch("app.api.v1.task_queue.overlap_service") as mock_service,
+            pytest.raises(HTTPException) as exc_info,
+        ):
+            mock_service.remove_from_queue = AsyncMock(return_value=False)
             await remove_from_queue(workspace=mock_workspace, queue_id=queue_id, db=mock_db)
 
         assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
@@ -132,10 +123,13 @@ class TestClearWorkspaceQueue:
         mock_workspace = MagicMock()
         mock_workspace.id = uuid4()
 
-        # Should not raise
-        await clear_workspace_queue(workspace=mock_workspace, db=mock_db)
+        with patch("app.api.v1.task_queue.overlap_service") as mock_service:
+            mock_service.clear_workspace_queue = AsyncMock(return_value=2)
+
+            # Should not raise
+            await clear_workspace_queue(workspace=mock_workspace, db=mock_db)
 
-        mock_db.execute.assert_called_once()
+        mock_service.clear_workspace_queue.assert_called_once_with(mock_db, mock_workspace.id)
         mock_db.commit.assert_called_once()
 
 
@@ -153,11 +147,10 @@ class TestGetOverlapStats:
         mock_workspace.executions_skipped = 10
         mock_workspace.executions_queued = 20
 
-        mock_result = MagicMock()
-        mock_result.scalar.return_value = 5
-        mock_db.execute.return_value = mock_result
+        with patch("app.api.v1.task_queue.overlap_service") as mock_service:
+            mock_service.count_queued_tasks = AsyncMock(return_value=5)
 
-        result = await get_overlap_stats(workspace=mock_workspace, db=mock_db)
+            result = await get_overlap_stats(workspace=mock_workspace, db=mock_db)
 
         assert result.executions_skipped == 10
         assert result.executions_queued == 20
@@ -175,11 +168,10 @@ class TestGetOverlapStats:
         mock_workspace.executions_skipped = 0
         mock_workspace.executions_queued = 0
 
-        mock_result = MagicMock()
-        mock_result.scalar.return_value = 0
-        mock_db.execute.return_value = mock_result
+        with patch("app.api.v1.task_queue.overlap_service") as mock_service:
+            mock_service.count_queued_tasks = AsyncMock(return_value=0)
 
-        result = await get_overlap_stats(workspace=mock_workspace, db=mock_db)
+            result = await get_overlap_stats(workspace=mock_workspace, db=mock_db)
 
         assert result.executions_skipped == 0
         assert result.executions_queued == 0
@@ -254,11 +246,12 @@ class TestGetTaskQueue:
             )
         ]
 
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = mock_items
-        mock_db.execute.return_value = mock_result
+        with patch("app.api.v1.task_queue.overlap_service") as mock_service:
+            mock_service.get_task_queue = AsyncMock(return_value=mock_items)
+
+            result = await get_cron_task_queue(workspace=mock_workspace, task_id=task_id, db=mock_db)
 
-        result = await get_cron_task_queue(workspace=mock_workspace, task_id=task_id, db=mock_db)
+        mock_service.get_task_queue.assert_called_once_with(mock_db, mock_workspace.id, "cron", task_id)
 
         assert result.total == 1
         assert len(result.items) == 1
@@ -273,11 +266,10 @@ class TestGetTaskQueue:
         mock_workspace.id = uuid4()
         chain_id = uuid4()
 
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = []
-        mock_db.execute.return_value = mock_result
+        with patch("app.api.v1.task_queue.overlap_service") as mock_service:
+            mock_service.get_task_queue = AsyncMock(return_value=[])
 
-        result = await get_chain_queue(workspace=mock_workspace, chain_id=chain_id, db=mock_db)
+            result = await get_chain_queue(workspace=mock_workspace, chain_id=chain_id, db=mock_db)
 
         assert result.total == 0
         assert len(result.items) == 0
@@ -0,0 +1,107 @@
+"""Tests for write-behind user activity tracking."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.services.user_activity import (
+    ACTIVITY_PENDING_KEY,
+    ACTIVITY_THROTTLE_SECONDS,
+    UserActivityService,
+)
+
+
+class TestRecordActivity:
+    """Tests for UserActivityService.record."""
+
+    @pytest.mark.asyncio
+    async def test_first_visit_in_window_is_buffered(self):
+        """Test first visit in the throttle window writes to the pending hash."""
+        service = UserActivityService()
+        user_id = uuid4()
+
+        with patch("app.services.user_activity.redis_client") as mock_redis:
+            mock_redis.client.set = AsyncMock(return_value=True)
+            mock_redis.client.hset = AsyncMock()
+
+            assert await service.record(user_id) is True
+
+        mock_redis.client.set.assert_called_once_with(
+            f"activity:throttle:{user_id}", "1", ex=ACTIVITY_THROTTLE_SECONDS, nx=True
+        )
+        args = mock_redis.client.hset.call_args.args
+        assert args[0] == ACTIVITY_PENDING_KEY
+        assert args[1] == str(user_id)
+
+    @pytest.mark.asyncio
+    async def test_throttled_visit_is_skipped(self):
+        """Test repeated visits inside the window don't touch the pending hash."""
+        service = UserActivityService()
+
+        with patch("app.services.user_activity.redis_client") as mock_redis:
+            mock_redis.client.set = AsyncMock(return_value=None)
+            mock_redis.client.hset = AsyncMock()
+
+            assert await service.record(uuid4()) is True
+
+        mock_redis.client.hset.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_redis_error_returns_false(self):
+        """Test Redis errors tell the caller to fall back."""
+        service = UserActivityService()
+
+        with patch("app.services.user_activity.redis_client") as mock_redis:
+            mock_redis.client.set = AsyncMock(side_effect=Exception("Redis down"))
+
+            assert await service.record(uuid4()) is False
+
+
+class TestFlushActivity:
+    """Tests for UserActivityService.flush."""
+
+    def _mock_pipeline(self, mock_redis, pending: dict) -> MagicMock:
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[pending, 1])
+        context = MagicMock()
+        context.__aenter__ = AsyncMock(return_value=pipe)
+        context.__aexit__ = AsyncMock(return_value=False)
+        mock_redis.client.pipeline.return_value = context
+        return pipe
+
+    @pytest.mark.asyncio
+    async def test_flush_nothing_pending(self):
+        """Test flush with empty buffer does not touch the database."""
+        service = UserActivityService()
+        db = AsyncMock()
+
+        with patch("app.services.user_activity.redis_client") as mock_redis:
+            self._mock_pipeline(mock_redis, {})
+
+            assert await service.flush(db) == 0
+
+        db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_bulk_update(self):
+        """Test flush writes all pending timestamps in a single executemany."""
+        service = UserActivityService()
+        db = AsyncMock()
+        first, second = uuid4(), uuid4()
+        pending = {
+            str(first): "2024-01-15T10:30:00+00:00",
+            str(second): "2024-01-15T10:31:00+00:00",
+        }
+
+        with patch("app.services.user_activity.redis_client") as mock_redis:
+            pipe = self._mock_pipeline(mock_redis, pending)
+
+            assert await service.flush(db) == 2
+
+        pipe.hgetall.assert_called_once_with(ACTIVITY_PENDING_KEY)
+        pipe.delete.assert_called_once_with(ACTIVITY_PENDING_KEY)
+        db.execute.assert_called_once()
+        rows = db.execute.call_args.args[1]
+        assert {row["user_id"] for row in rows} == {first, second}
+        db.commit.assert_called_once()
@@ -0,0 +1,142 @@
+"""Tests for adaptive concurrency of the queue workers."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.workers.concurrency import ConcurrencyController, LoadSample, db_pool_usage, sample_load
+from app.workers.metrics import WORKER_CONCURRENCY_LIMIT
+from app.workers.runner import serve_queues
+
+HEALTHY = LoadSample(loop_lag_ms=1, cpu_percent=10, db_pool_usage=0.1)
+
+
+def make_worker(job_counter: int = 0) -> MagicMock:
+    worker = MagicMock()
+    worker.job_counter = job_counter
+    return worker
+
+
+class TestLoadSample:
+    """Tests for LoadSample."""
+
+    @pytest.mark.parametrize(
+        "sample",
+        [
+            LoadSample(loop_lag_ms=500, cpu_percent=10, db_pool_usage=0.1),
+            LoadSample(loop_lag_ms=1, cpu_percent=95, db_pool_usage=0.1),
+            LoadSample(loop_lag_ms=1, cpu_percent=10, db_pool_usage=0.9),
+        ],
+    )
+    def test_overloaded(self, sample):
+        """Test any signal over its threshold overloads the process."""
+        assert sample.overloaded is True
+
+    def test_healthy(self):
+        """Test a sample under every threshold is healthy."""
+        assert HEALTHY.overloaded is False
+
+    @pytest.mark.asyncio
+    async def test_sample_load(self):
+        """Test the loop lag is how late the sampling sleep resumes."""
+        with (
+            patch("app.workers.concurrency.time.monotonic", side_effect=[10.0, 10.35]),
+            patch("app.workers.concurrency.time.process_time", side_effect=[1.0, 1.07]),
+            patch("app.workers.concurrency.asyncio.sleep", new_callable=AsyncMock),
+            patch("app.workers.concurrency.db_pool_usage", return_value=0.5),
+        ):
+            sample = await sample_load(0.25)
+
+        assert sample.loop_lag_ms == pytest.approx(100)
+        assert sample.cpu_percent == pytest.approx(20)
+        assert sample.db_pool_usage == 0.5
+
+    def test_db_pool_usage(self):
+        """Test the pool usage is relative to its size plus overflow."""
+        with patch("app.db.database.engine") as mock_engine:
+            mock_engine.pool.checkedout.return_value = 15
+            assert db_pool_usage() == 0.5
+
+
+class TestConcurrencyController:
+    """Tests for ConcurrencyController."""
+
+    def test_initial_limit(self):
+        """Test the worker starts at its configured max jobs."""
+        worker = make_worker()
+        ConcurrencyController(worker, "executions", initial=10, maximum=200)
+
+        assert worker.max_jobs == 10
+        assert WORKER_CONCURRENCY_LIMIT.labels(queue="executions")._value.get() == 10
+
+    def test_grows_while_full(self):
+        """Test the limit grows while jobs fill it and the process is healthy."""
+        worker = make_worker(job_counter=20)
+        controller = ConcurrencyController(worker, "executions", initial=20, maximum=200)
+
+        controller.adjust(HEALTHY)
+
+        assert worker.max_jobs == 22
+
+    def test_holds_while_idle(self):
+        """Test the limit does not grow while it is not holding jobs back."""
+        worker = make_worker(job_counter=3)
+        controller = ConcurrencyController(worker, "executions", initial=20, maximum=200)
+
+        controller.adjust(HEALTHY)
+
+        assert worker.max_jobs == 20
+
+    def test_capped(self):
+        """Test the limit never exceeds the upper bound."""
+        worker = make_worker(job_counter=199)
+        controller = ConcurrencyController(worker, "executions", initial=199, maximum=200)
+
+        controller.adjust(HEALTHY)
+
+        assert worker.max_jobs == 200
+
+    def test_backs_off(self):
+        """Test the limit drops by a quarter when overloaded, down to one job."""
+        worker = make_worker(job_counter=40)
+        controller = ConcurrencyController(worker, "executions", initial=40, maximum=200)
+        overloaded = LoadSample(loop_lag_ms=500, cpu_percent=10, db_pool_usage=0.1)
+
+        controller.adjust(overloaded)
+        assert worker.max_jobs == 30
+
+        for _ in range(20):
+            controller.adjust(overloaded)
+        assert worker.max_jobs == 1
+
+
+class TestAdaptiveWorkers:
+    """Tests for adaptive concurrency in the queue worker runner."""
+
+    @pytest.mark.asyncio
+    async def test_workers_sized_for_upper_bound(self):
+        """Test adaptive workers are built for the upper bound and start at their max jobs."""
+        worker = MagicMock()
+        worker.async_run = AsyncMock()
+        worker.close = AsyncMock()
+        stopped = asyncio.Event()
+
+        async def adjust_forever(controllers):
+            await stopped.wait()
+
+        with (
+            patch("app.workers.runner.settings") as mock_settings,
+            patch("app.workers.queues.settings") as mock_queue_settings,
+            patch("app.workers.runner.init_worker_context", new_callable=AsyncMock),
+            patch("app.workers.runner.close_worker_context", new_callable=AsyncMock),
+            patch("app.workers.runner.create_worker", return_value=worker) as mock_create,
+            patch("app.workers.runner.run_adaptive_concurrency", side_effect=adjust_forever),
+        ):
+            mock_settings.worker_adaptive_concurrency = True
+            mock_settings.worker_adaptive_max_jobs = 150
+            mock_queue_settings.worker_executions_max_jobs = 10
+            await serve_queues(["executions"])
+
+        assert mock_create.call_args_list[0].kwargs["max_jobs"] == 150
+        assert worker.max_jobs == 10
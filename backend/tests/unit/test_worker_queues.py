@@ -0,0 +1,122 @@
+"""Tests for named arq queues and the workers serving them."""
+
+import argparse
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.cli import parse_queues
+from app.workers.queues import JOB_QUEUES, QUEUE_NAMES, queue_for
+from app.workers.runner import serve_queues
+from app.workers.settings import WorkerSettings, queue_worker_options
+
+
+class TestQueueRouting:
+    """Tests for routing jobs to named queues."""
+
+    def test_queue_for(self):
+        """Test jobs are routed by class."""
+        assert queue_for("execute_cron_task") == "arq:queue:executions"
+        assert queue_for("execute_delayed_task") == "arq:queue:executions"
+        assert queue_for("execute_chain") == "arq:queue:chains"
+        assert queue_for("send_task_notification") == "arq:queue:notifications"
+
+    def test_every_function_is_routed(self):
+        """Test every registered job function has a queue."""
+        assert {function.__name__ for function in WorkerSettings.functions} == set(JOB_QUEUES)
+
+    def test_queue_worker_options(self):
+        """Test a queue worker only runs the functions of its queue."""
+        with patch("app.workers.queues.settings") as mock_settings:
+            mock_settings.worker_chains_max_jobs = 3
+            options = queue_worker_options("chains")
+
+        assert options["queue_name"] == "arq:queue:chains"
+        assert [function.__name__ for function in options["functions"]] == ["execute_chain"]
+        assert options["max_jobs"] == 3
+        assert options["health_check_key"] == "cronbox:worker:health:chains"
+
+
+class TestParseQueues:
+    """Tests for the --queues option of the worker command."""
+
+    def test_subset(self):
+        """Test a subset of queues is parsed in order without duplicates."""
+        assert parse_queues("notifications, executions,notifications") == ["notifications", "executions"]
+
+    def test_unknown_queue(self):
+        """Test unknown queue names are rejected."""
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_queues("executions,callbacks")
+
+    def test_empty(self):
+        """Test an empty list is rejected."""
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_queues(",")
+
+
+class TestServeQueues:
+    """Tests for running several queue workers in one process."""
+
+    @pytest.mark.asyncio
+    async def test_failed_worker_stops_the_others(self):
+        """Test one worker stopping closes every worker and the shared resources."""
+        stopped = asyncio.Event()
+        failing = MagicMock()
+        failing.async_run = AsyncMock(side_effect=RuntimeError("Redis down"))
+        failing.close = AsyncMock()
+        running = MagicMock()
+        running.async_run = AsyncMock(side_effect=stopped.wait)
+        running.close = AsyncMock(side_effect=stopped.set)
+        drain = MagicMock()
+        drain.async_run = AsyncMock()
+        drain.close = AsyncMock()
+
+        with (
+            patch("app.workers.runner.init_worker_context", new_callable=AsyncMock) as mock_init,
+            patch("app.workers.runner.close_worker_context", new_callable=AsyncMock) as mock_close,
+            patch("app.workers.runner.create_worker", side_effect=[failing, running, drain]) as mock_create,
+        ):
+            with pytest.raises(RuntimeError, match="Redis down"):
+                await serve_queues(QUEUE_NAMES[:2])
+
+        mock_init.assert_awaited_once()
+        mock_close.assert_awaited_once()
+        failing.close.assert_awaited_once()
+        running.close.assert_awaited_once()
+        kwargs = mock_create.call_args_list[1].kwargs
+        assert kwargs["queue_name"] == "arq:queue:chains"
+        assert kwargs["handle_signals"] is False
+        assert kwargs["on_startup"] is None
+
+    @pytest.mark.asyncio
+    async def test_default_queue_drained_alongside(self):
+        """Test a burst worker for every function drains the default queue while the queues run on."""
+        stopped = asyncio.Event()
+        running = MagicMock()
+        running.async_run = AsyncMock(side_effect=stopped.wait)
+        running.close = AsyncMock(side_effect=stopped.set)
+        drained = asyncio.Event()
+        drain = MagicMock()
+        drain.async_run = AsyncMock()
+        drain.close = AsyncMock(side_effect=drained.set)
+
+        async def stop_after_drain():
+            await drained.wait()
+            # The named queue keeps running after the drain worker exits
+            assert not stopped.is_set()
+            stopped.set()
+
+        with (
+            patch("app.workers.runner.init_worker_context", new_callable=AsyncMock),
+            patch("app.workers.runner.close_worker_context", new_callable=AsyncMock),
+            patch("app.workers.runner.create_worker", side_effect=[running, drain]) as mock_create,
+        ):
+            await asyncio.gather(serve_queues(["executions"]), stop_after_drain())
+
+        kwargs = mock_create.call_args_list[1].kwargs
+        assert kwargs["burst"] is True
+        assert "queue_name" not in kwargs
+        assert "functions" not in kwargs
+        drain.async_run.assert_awaited_once()
@@ -324,6 +324,31 @@ class TestWorkerServiceTaskQueue:
             mock_redis.set.assert_called_once()
             mock_redis.rpush.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_get_queue_depths(self):
+        """Test queue depths are read for every worker list in one pipeline."""
+        from app.services.worker import WorkerService
+
+        service = WorkerService()
+        first, second = uuid4(), uuid4()
+
+        async def scan_iter(match, count):
+            assert match == "worker:*:tasks"
+            yield f"worker:{first}:tasks"
+            yield f"worker:{second}:tasks"
+
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[3, 1])
+        mock_redis = MagicMock()
+        mock_redis.scan_iter = scan_iter
+        mock_redis.pipeline.return_value.__aenter__.return_value = pipe
+
+        with patch("app.services.worker.get_redis", AsyncMock(return_value=mock_redis)):
+            depths = await service.get_queue_depths()
+
+        assert depths == {str(first): 3, str(second): 1}
+        assert pipe.llen.call_count == 2
+
     @pytest.mark.asyncio
     async def test_poll_tasks(self):
         """Test polling tasks for worker."""
@@ -348,14 +373,19 @@ class TestWorkerServiceTaskQueue:
         )
 
         mock_redis = AsyncMock()
-        mock_redis.lpop.side_effect = [task_id.encode(), None]
-        mock_redis.get.return_value = task_info.model_dump_json()
+        mock_redis.lpop.return_value = [task_id]
+        pop_script = AsyncMock(return_value=[task_info.model_dump_json()])
+        mock_redis.register_script = MagicMock(return_value=pop_script)
 
         with patch("app.services.worker.get_redis", return_value=mock_redis):
             result = await service.poll_tasks(worker_id, max_tasks=10)
 
             assert len(result) == 1
             assert str(result[0].task_id) == task_id
+            # Whole batch fetched in one script call, no blocking wait
+            mock_redis.lpop.assert_called_once_with(f"worker:{worker_id}:tasks", 10)
+            pop_script.assert_called_once_with(keys=[f"worker:task:{task_id}"])
+            mock_redis.blmpop.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_poll_tasks_empty(self):
@@ -368,11 +398,66 @@ class TestWorkerServiceTaskQueue:
 
         mock_redis = AsyncMock()
         mock_redis.lpop.return_value = None
+        pop_script = AsyncMock(return_value=[])
+        mock_redis.register_script = MagicMock(return_value=pop_script)
 
         with patch("app.services.worker.get_redis", return_value=mock_redis):
             result = await service.poll_tasks(worker_id, max_tasks=10)
 
             assert len(result) == 0
+            mock_redis.blmpop.assert_not_called()
+            pop_script.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_poll_tasks_long_poll(self):
+        """Test long-poll blocks on an empty queue and fetches popped payloads."""
+        from app.schemas.worker import WorkerTaskInfo
+        from app.services.worker import WorkerService
+
+        service = WorkerService()
+
+        worker_id = uuid4()
+        task_id = str(uuid4())
+        task_info = WorkerTaskInfo(
+            task_id=task_id,
+            task_type="delayed",
+            url="https://api.example.com/webhook",
+            method="POST",
+            workspace_id=uuid4(),
+        )
+        queue_key = f"worker:{worker_id}:tasks"
+
+        mock_redis = AsyncMock()
+        mock_redis.lpop.return_value = None
+        pop_script = AsyncMock(return_value=[task_info.model_dump_json()])
+        mock_redis.register_script = MagicMock(return_value=pop_script)
+        mock_redis.blmpop.return_value = [queue_key, [task_id]]
+
+        with patch("app.services.worker.get_redis", return_value=mock_redis):
+            result = await service.poll_tasks(worker_id, max_tasks=5, wait_seconds=20)
+
+        assert [str(task.task_id) for task in result] == [task_id]
+        mock_redis.blmpop.assert_called_once_with(20, 1, queue_key, direction="LEFT", count=5)
+        pop_script.assert_called_once_with(keys=[f"worker:task:{task_id}"])
+
+    @pytest.mark.asyncio
+    async def test_poll_tasks_long_poll_timeout(self):
+        """Test long-poll returns nothing when the wait expires."""
+        from app.services.worker import WorkerService
+
+        service = WorkerService()
+
+        mock_redis = AsyncMock()
+        mock_redis.lpop.return_value = None
+        pop_script = AsyncMock(return_value=[])
+        mock_redis.register_script = MagicMock(return_value=pop_script)
+        mock_redis.blmpop.return_value = None
+
+        with patch("app.services.worker.get_redis", return_value=mock_redis):
+            result = await service.poll_tasks(uuid4(), wait_seconds=1)
+
+        assert result == []
+        pop_script.assert_not_called()
 
 
 class TestWorkerServiceProcessTaskResult:
@@ -419,6 +504,202 @@ class TestWorkerServiceProcessTaskResult:
         assert is_success is False
 
 
+def _make_result(task_id, task_type="cron", **kwargs):
+    from app.schemas.worker import WorkerTaskResult
+
+    defaults = {
+        "status_code": 200,
+        "response_body": "ok",
+        "started_at": datetime(2024, 1, 15, 10, 0, tzinfo=timezone.utc),
+        "finished_at": datetime(2024, 1, 15, 10, 0, 1, tzinfo=timezone.utc),
+        "duration_ms": 1000,
+    }
+    defaults.update(kwargs)
+    return WorkerTaskResult(task_id=task_id, task_type=task_type, **defaults)
+
+
+def _mock_scalars_result(items):
+    result = MagicMock()
+    result.scalars.return_value = items
+    return result
+
+
+def _mock_recorded_result(keys=()):
+    """Result of the lookup of (task_id, started_at) pairs already recorded."""
+    result = MagicMock()
+    result.all.return_value = list(keys)
+    return result
+
+
+class TestWorkerServiceProcessTaskResults:
+    """Tests for batch task result processing."""
+
+    @pytest.mark.asyncio
+    async def test_batch_bulk_inserts_and_updates_counters_once(self):
+        """Test batch loads tasks per type, bulk-inserts executions and commits once."""
+        from app.models.cron_task import CronTask, HttpMethod, TaskStatus
+        from app.models.delayed_task import DelayedTask
+        from app.services.worker import WorkerService
+
+        worker = MagicMock(workspace_id=uuid4(), tasks_completed=10, tasks_failed=2)
+        cron_task = CronTask(
+            id=uuid4(), name="Cron", url="https://example.com/a", method=HttpMethod.GET, consecutive_failures=3
+        )
+        delayed_task = DelayedTask(id=uuid4(), name="Delayed", url="https://example.com/b", method=HttpMethod.POST)
+
+        mock_db = AsyncMock()
+        mock_db.execute.side_effect = [
+            MagicMock(),
+            _mock_recorded_result(),
+            _mock_scalars_result([cron_task]),
+            _mock_scalars_result([delayed_task]),
+            MagicMock(),
+        ]
+
+        results = [
+            _make_result(cron_task.id),
+            _make_result(delayed_task.id, "delayed", status_code=None, error="timeout", error_type="timeout"),
+        ]
+
+        accepted, rejected = await WorkerService().process_task_results(mock_db, worker, results)
+
+        assert accepted == 2
+        assert rejected == []
+        assert mock_db.execute.call_count == 5
+        rows = mock_db.execute.call_args.args[1]
+        cron_row = next(row for row in rows if row["task_type"] == "cron")
+        assert cron_row["response_status_code"] == 200
+        assert cron_row["cron_task_id"] == cron_task.id
+        assert cron_row["request_url"] == "https://example.com/a"
+        assert cron_row["started_at"].tzinfo is None
+        assert "response_status" not in cron_row
+        assert "delayed_task_id" not in cron_row
+        delayed_row = next(row for row in rows if row["task_type"] == "delayed")
+        assert delayed_row["status"] == TaskStatus.FAILED
+        assert delayed_row["error_type"] == "timeout"
+
+        assert cron_task.last_status == TaskStatus.SUCCESS
+        assert cron_task.consecutive_failures == 0
+        assert delayed_task.status == TaskStatus.FAILED
+        assert worker.tasks_completed == 11
+        assert worker.tasks_failed == 3
+        mock_db.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_batch_orders_mixed_naive_and_aware_timestamps(self):
+        """Test a batch mixing naive and offset-aware timestamps is applied in completion order."""
+        from app.models.cron_task import CronTask, HttpMethod, TaskStatus
+        from app.services.worker import WorkerService
+
+        worker = MagicMock(workspace_id=uuid4(), tasks_completed=0, tasks_failed=0)
+        cron_task = CronTask(
+            id=uuid4(), name="Cron", url="https://example.com/a", method=HttpMethod.GET, consecutive_failures=0
+        )
+
+        mock_db = AsyncMock()
+        mock_db.execute.side_effect = [
+            MagicMock(),
+            _mock_recorded_result(),
+            _mock_scalars_result([cron_task]),
+            MagicMock(),
+        ]
+
+        results = [
+            # Later result, naive UTC
+            _make_result(cron_task.id, finished_at=datetime(2024, 1, 15, 10, 0, 5)),
+            # Earlier result, offset-aware: 13:00:02+03:00 is 10:00:02 UTC
+            _make_result(
+                cron_task.id,
+                status_code=None,
+                error="timeout",
+                finished_at=datetime(2024, 1, 15, 13, 0, 2, tzinfo=timezone(timedelta(hours=3))),
+            ),
+        ]
+
+        accepted, rejected = await WorkerService().process_task_results(mock_db, worker, results)
+
+        assert accepted == 2
+        assert rejected == []
+        assert cron_task.last_status == TaskStatus.SUCCESS
+        assert cron_task.last_run_at == datetime(2024, 1, 15, 10, 0, 5)
+        mock_db.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_batch_rejects_unknown_tasks(self):
+        """Test results for tasks outside the worker's workspace are rejected."""
+        from app.services.worker import WorkerService
+
+        worker = MagicMock(workspace_id=uuid4(), tasks_completed=0, tasks_failed=0)
+        unknown_id = uuid4()
+
+        mock_db = AsyncMock()
+        mock_db.execute.side_effect = [MagicMock(), _mock_recorded_result(), _mock_scalars_result([])]
+
+        accepted, rejected = await WorkerService().process_task_results(mock_db, worker, [_make_result(unknown_id)])
+
+        assert accepted == 0
+        assert rejected == [unknown_id]
+        # Lock, duplicate and task lookups, no insert
+        assert mock_db.execute.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_batch_skips_results_already_recorded(self):
+        """Test a resubmitted batch does not record executions twice."""
+        from app.models.cron_task import CronTask, HttpMethod
+        from app.services.worker import WorkerService
+
+        worker = MagicMock(workspace_id=uuid4(), tasks_completed=5, tasks_failed=0)
+        cron_task = CronTask(
+            id=uuid4(), name="Cron", url="https://example.com/a", method=HttpMethod.GET, consecutive_failures=0
+        )
+        retried = _make_result(cron_task.id)
+        fresh = _make_result(cron_task.id, started_at=datetime(2024, 1, 15, 10, 1, tzinfo=timezone.utc))
+
+        mock_db = AsyncMock()
+        mock_db.execute.side_effect = [
+            MagicMock(),
+            # The first attempt committed the retried result; started_at is stored as naive UTC
+            _mock_recorded_result([(cron_task.id, datetime(2024, 1, 15, 10, 0))]),
+            _mock_scalars_result([cron_task]),
+            MagicMock(),
+        ]
+
+        accepted, rejected = await WorkerService().process_task_results(mock_db, worker, [retried, fresh, fresh])
+
+        assert accepted == 3
+        assert rejected == []
+        rows = mock_db.execute.call_args.args[1]
+        assert [row["started_at"] for row in rows] == [datetime(2024, 1, 15, 10, 1)]
+        assert worker.tasks_completed == 6
+
+    @pytest.mark.asyncio
+    async def test_batch_rolls_back_on_error(self):
+        """Test database errors roll back and reject the whole batch."""
+        from app.services.worker import WorkerService
+
+        worker = MagicMock(workspace_id=uuid4())
+        task_id = uuid4()
+
+        mock_db = AsyncMock()
+        mock_db.execute.side_effect = Exception("DB error")
+
+        accepted, rejected = await WorkerService().process_task_results(mock_db, worker, [_make_result(task_id)])
+
+        assert accepted == 0
+        assert rejected == [task_id]
+        mock_db.rollback.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_single_result_delegates_to_batch(self):
+        """Test the single-result path reports whether the result was recorded."""
+        from app.services.worker import WorkerService
+
+        service = WorkerService()
+        service.process_task_results = AsyncMock(return_value=(1, []))
+
+        assert await service.process_task_result(AsyncMock(), MagicMock(), _make_result(uuid4())) is True
+
+
 class TestWorkerServiceGlobalInstance:
     """Tests for global worker_service instance."""
 
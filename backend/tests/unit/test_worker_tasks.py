@@ -1,5 +1,6 @@
 """Tests for worker tasks module."""
 
+import asyncio
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
@@ -8,6 +9,7 @@ import httpx
 import pytest
 
 from app.core.url_validator import SSRFError
+from app.models.cron_task import OverlapPolicy
 from app.workers.tasks import execute_http_task
 
 
@@ -491,6 +493,24 @@ class TestExecuteCronTask:
             assert result["success"] is False
             assert "not found" in result["error"].lower()
 
+    @pytest.mark.asyncio
+    async def test_observes_schedule_to_start_lag(self, mock_db_context):
+        """Test scheduled runs record how late they started."""
+        from app.workers.tasks import execute_cron_task
+
+        ctx = {"db_factory": mock_db_context["db_factory"], "redis": mock_db_context["redis"]}
+        scheduled_at = datetime(2026, 1, 1, 12, 0)
+
+        with (
+            patch("app.workers.tasks.CronTaskRepository") as mock_repo_class,
+            patch("app.workers.tasks.observe_start_lag") as mock_observe,
+        ):
+            mock_repo_class.return_value.get_by_id = AsyncMock(return_value=None)
+
+            await execute_cron_task(ctx, task_id=str(uuid4()), scheduled_at=scheduled_at.isoformat())
+
+        mock_observe.assert_called_once_with("cron", scheduled_at)
+
     @pytest.mark.asyncio
     async def test_task_not_active(self, mock_db_context):
         """Test execute_cron_task when task is not active."""
@@ -569,6 +589,7 @@ class TestExecuteCronTask:
                 with patch("app.workers.tasks.execute_http_task") as mock_execute:
                     mock_cron_repo = AsyncMock()
                     mock_cron_repo.get_by_id.return_value = mock_task
+                    mock_cron_repo.get_schedule_jitter_seconds.return_value = 0
                     mock_cron_repo_class.return_value = mock_cron_repo
 
                     mock_exec_repo = AsyncMock()
@@ -628,6 +649,7 @@ class TestExecuteCronTask:
                 with patch("app.workers.tasks.execute_http_task") as mock_execute:
                     mock_cron_repo = AsyncMock()
                     mock_cron_repo.get_by_id.return_value = mock_task
+                    mock_cron_repo.get_schedule_jitter_seconds.return_value = 0
                     mock_cron_repo_class.return_value = mock_cron_repo
 
                     mock_exec_repo = AsyncMock()
@@ -1187,6 +1209,7 @@ class TestCronTaskWithProtocols:
                 with patch("app.workers.tasks.execute_icmp_task") as mock_execute_icmp:
                     mock_cron_repo = AsyncMock()
                     mock_cron_repo.get_by_id.return_value = mock_task
+                    mock_cron_repo.get_schedule_jitter_seconds.return_value = 0
                     mock_cron_repo_class.return_value = mock_cron_repo
 
                     mock_exec_repo = AsyncMock()
@@ -1251,6 +1274,7 @@ class TestCronTaskWithProtocols:
                 with patch("app.workers.tasks.execute_tcp_task") as mock_execute_tcp:
                     mock_cron_repo = AsyncMock()
                     mock_cron_repo.get_by_id.return_value = mock_task
+                    mock_cron_repo.get_schedule_jitter_seconds.return_value = 0
                     mock_cron_repo_class.return_value = mock_cron_repo
 
                     mock_exec_repo = AsyncMock()
@@ -1393,3 +1417,240 @@ class TestDelayedTaskWithProtocols:
                     assert result["success"] is True
                     mock_execute_tcp.assert_called_once()
                     mock_exec_repo.complete_tcp_execution.assert_called_once()
+
+
+class TestExecuteChain:
+    """Tests for dependency-aware execute_chain."""
+
+    def make_chain(self, steps, max_parallel_steps=1, stop_on_failure=True):
+        from app.models.task_chain import TriggerType
+
+        chain = MagicMock()
+        chain.id = uuid4()
+        chain.workspace_id = uuid4()
+        chain.name = "Test Chain"
+        chain.is_active = True
+        chain.is_paused = False
+        chain.trigger_type = TriggerType.MANUAL
+        chain.overlap_policy = OverlapPolicy.ALLOW
+        chain.stop_on_failure = stop_on_failure
+        chain.max_parallel_steps = max_parallel_steps
+        chain.notify_on_success = False
+        chain.notify_on_failure = False
+        chain.notify_on_partial = False
+        chain.steps = steps
+        return chain
+
+    def make_step(self, order, url=None, **kwargs):
+        from app.models.cron_task import HttpMethod
+
+        step = MagicMock()
+        step.id = uuid4()
+        step.step_order = order
+        step.name = f"Step {order}"
+        step.url = url or f"https://api.example.com/{order}"
+        step.method = HttpMethod.GET
+        step.headers = {}
+        step.body = None
+        step.timeout_seconds = 30
+        step.retry_count = kwargs.get("retry_count", 0)
+        step.retry_delay_seconds = kwargs.get("retry_delay_seconds", 5)
+        step.condition = kwargs.get("condition")
+        step.extract_variables = kwargs.get("extract_variables", {})
+        step.depends_on = None
+        step.continue_on_failure = kwargs.get("continue_on_failure", False)
+        step.is_enabled = True
+        return step
+
+    async def run_chain(self, chain, http, exec_repo=None, redis=None, **kwargs):
+        """Run execute_chain with mocked repositories and HTTP."""
+        from app.workers.tasks import execute_chain
+
+        db = AsyncMock()
+        db_factory = MagicMock()
+        db_factory.return_value.__aenter__ = AsyncMock(return_value=db)
+        db_factory.return_value.__aexit__ = AsyncMock(return_value=None)
+        ctx = {"db_factory": db_factory, "redis": redis or AsyncMock()}
+
+        chain_repo = AsyncMock()
+        chain_repo.get_with_steps.return_value = chain
+        step_exec_repo = AsyncMock()
+        step_exec_repo.create_step_execution.return_value.id = uuid4()
+
+        with (
+            patch("app.db.repositories.task_chains.TaskChainRepository", return_value=chain_repo),
+            patch(
+                "app.db.repositories.chain_executions.ChainExecutionRepository",
+                return_value=exec_repo or AsyncMock(),
+            ),
+            patch("app.db.repositories.chain_executions.StepExecutionRepository", return_value=step_exec_repo),
+            patch("app.workers.tasks.execute_http_task", side_effect=http),
+        ):
+            result = await execute_chain(ctx, chain_id=str(chain.id), **kwargs)
+        return result, step_exec_repo
+
+    @pytest.mark.asyncio
+    async def test_independent_steps_run_concurrently(self):
+        """Test fan-out steps overlap up to max_parallel_steps."""
+        running = 0
+        peak = 0
+
+        async def http(ctx, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return {"success": True, "status_code": 200, "body": "{}"}
+
+        chain = self.make_chain([self.make_step(i) for i in range(5)], max_parallel_steps=3, stop_on_failure=False)
+
+        result, _ = await self.run_chain(chain, http)
+
+        assert result["status"] == "success"
+        assert result["completed_steps"] == 5
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_dependent_step_waits_for_variables(self):
+        """Test a step using an extracted variable runs after its provider."""
+        calls = []
+
+        async def http(ctx, *, url, **kwargs):
+            calls.append(url)
+            if url.endswith("/login"):
+                await asyncio.sleep(0.02)
+                return {"success": True, "status_code": 200, "body": '{"token": "abc"}'}
+            return {"success": True, "status_code": 200, "body": "{}"}
+
+        steps = [
+            self.make_step(0, url="https://api.example.com/login", extract_variables={"token": "$.token"}),
+            self.make_step(1, url="https://api.example.com/other"),
+            self.make_step(2, url="https://api.example.com/items/{{token}}"),
+        ]
+        chain = self.make_chain(steps, max_parallel_steps=3)
+
+        result, _ = await self.run_chain(chain, http)
+
+        assert result["status"] == "success"
+        assert calls.index("https://api.example.com/items/abc") > calls.index("https://api.example.com/login")
+
+    @pytest.mark.asyncio
+    async def test_stop_on_failure_starts_no_new_steps(self):
+        """Test a stopping failure prevents later steps from starting."""
+        calls = []
+
+        async def http(ctx, *, url, **kwargs):
+            calls.append(url)
+            return {"success": False, "status_code": 500, "body": None, "error": "HTTP 500"}
+
+        steps = [self.make_step(0, extract_variables={"id": "$.id"}), self.make_step(1, url="https://x.io/{{id}}")]
+        chain = self.make_chain(steps, max_parallel_steps=4)
+
+        result, step_exec_repo = await self.run_chain(chain, http)
+
+        assert calls == ["https://api.example.com/0"]
+        assert result["status"] == "failed"
+        assert result["error"].startswith("Chain stopped at step 0")
+        assert step_exec_repo.create_step_execution.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_on_failure_keeps_independent_steps_sequential(self):
+        """Test a step after a stopping step is never started when that step fails."""
+        calls = []
+
+        async def http(ctx, *, url, **kwargs):
+            calls.append(url)
+            await asyncio.sleep(0.01)
+            return {"success": False, "status_code": 500, "body": None, "error": "HTTP 500"}
+
+        chain = self.make_chain([self.make_step(0), self.make_step(1)], max_parallel_steps=4)
+
+        result, step_exec_repo = await self.run_chain(chain, http)
+
+        assert calls == ["https://api.example.com/0"]
+        assert result["status"] == "failed"
+        assert step_exec_repo.create_step_execution.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_retry_defers_and_resumes(self):
+        """Test a delayed retry checkpoints the run and the resumed job completes it."""
+        attempts = []
+
+        async def http(ctx, *, url, **kwargs):
+            attempts.append(url)
+            if len(attempts) == 1:
+                return {"success": False, "status_code": 503, "body": None, "error": "HTTP 503"}
+            return {"success": True, "status_code": 200, "body": '{"id": 7}'}
+
+        steps = [
+            self.make_step(0, extract_variables={"token": "$.token"}),
+            self.make_step(1, retry_count=2, retry_delay_seconds=120, extract_variables={"id": "$.id"}),
+        ]
+        chain = self.make_chain(steps, max_parallel_steps=2)
+
+        async def first_http(ctx, *, url, **kwargs):
+            if url.endswith("/0"):
+                return {"success": True, "status_code": 200, "body": '{"token": "t"}'}
+            return await http(ctx, url=url, **kwargs)
+
+        exec_repo = AsyncMock()
+        exec_repo.create_execution.return_value.id = uuid4()
+        redis = AsyncMock()
+        result, _ = await self.run_chain(
+            chain, first_http, exec_repo=exec_repo, redis=redis, initial_variables={"a": 1}
+        )
+
+        assert result["deferred"] is True
+        assert result["status"] == "running"
+        exec_repo.complete_execution.assert_not_called()
+        chain_execution = exec_repo.create_execution.return_value
+        redis.enqueue_job.assert_called_once_with(
+            "execute_chain",
+            chain_id=str(chain.id),
+            chain_execution_id=str(chain_execution.id),
+            manual_run=False,
+            lease_id=None,
+            _defer_by=120,
+            _queue_name="arq:queue:chains",
+        )
+        checkpoint = exec_repo.save_checkpoint.call_args.args[1]
+        assert checkpoint["finished"] == [0]
+        assert checkpoint["retries"]["1"]["attempt"] == 1
+        assert checkpoint["step_variables"] == {"0": {"token": "t"}}
+
+        # The deferred job resumes at the retried step once it is due
+        checkpoint["retries"]["1"]["retry_at"] = 0
+        chain_execution.checkpoint = checkpoint
+        resume_repo = AsyncMock()
+        resume_repo.get_by_id.return_value = chain_execution
+
+        result, step_exec_repo = await self.run_chain(
+            chain, http, exec_repo=resume_repo, chain_execution_id=str(chain_execution.id)
+        )
+
+        assert result["status"] == "success"
+        assert result["completed_steps"] == 2
+        assert len(attempts) == 2
+        step_exec_repo.create_step_execution.assert_not_called()
+        assert step_exec_repo.complete_step_execution.call_args.kwargs["retry_attempt"] == 1
+        resume_repo.update_variables.assert_called_once_with(chain_execution, {"a": 1, "token": "t", "id": 7})
+
+    @pytest.mark.asyncio
+    async def test_short_retry_runs_inline(self):
+        """Test retries due immediately are not deferred."""
+        results = [
+            {"success": False, "status_code": 500, "body": None, "error": "HTTP 500"},
+            {"success": True, "status_code": 200, "body": "{}"},
+        ]
+
+        async def http(ctx, **kwargs):
+            return results.pop(0)
+
+        chain = self.make_chain([self.make_step(0, retry_count=1, retry_delay_seconds=0)])
+        redis = AsyncMock()
+
+        result, _ = await self.run_chain(chain, http, redis=redis)
+
+        assert result["status"] == "success"
+        redis.enqueue_job.assert_not_called()
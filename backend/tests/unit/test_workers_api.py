@@ -345,7 +345,7 @@ class TestPollTasks:
         with patch("app.api.v1.workers.worker_service") as mock_service:
             mock_service.poll_tasks = AsyncMock(return_value=mock_tasks)
 
-            result = await poll_tasks(worker=mock_worker, max_tasks=10)
+            result = await poll_tasks(worker=mock_worker, db=AsyncMock(), max_tasks=10)
 
             assert len(result.tasks) == 2
             assert result.poll_interval_seconds == 5
@@ -360,10 +360,42 @@ class TestPollTasks:
         with patch("app.api.v1.workers.worker_service") as mock_service:
             mock_service.poll_tasks = AsyncMock(return_value=[])
 
-            result = await poll_tasks(worker=mock_worker, max_tasks=10)
+            result = await poll_tasks(worker=mock_worker, db=AsyncMock(), max_tasks=10)
 
             assert len(result.tasks) == 0
 
+    @pytest.mark.asyncio
+    async def test_poll_tasks_long_poll(self):
+        """Test long-poll passes the wait through and asks for an immediate re-poll."""
+        from app.api.v1.workers import poll_tasks
+
+        mock_worker = create_mock_worker()
+
+        with patch("app.api.v1.workers.worker_service") as mock_service:
+            mock_service.poll_tasks = AsyncMock(return_value=[])
+
+            result = await poll_tasks(worker=mock_worker, db=AsyncMock(), max_tasks=10, wait=20)
+
+            mock_service.poll_tasks.assert_called_once_with(mock_worker.id, 10, wait_seconds=20)
+            assert result.poll_interval_seconds == 0
+
+    @pytest.mark.asyncio
+    async def test_poll_tasks_releases_db_before_waiting(self):
+        """Test the database session is closed before the long-poll blocks."""
+        from app.api.v1.workers import poll_tasks
+
+        mock_worker = create_mock_worker()
+        mock_db = AsyncMock()
+
+        async def fake_poll(*args, **kwargs):
+            mock_db.close.assert_awaited_once()
+            return []
+
+        with patch("app.api.v1.workers.worker_service") as mock_service:
+            mock_service.poll_tasks = fake_poll
+
+            await poll_tasks(worker=mock_worker, db=mock_db, max_tasks=10, wait=20)
+
 
 class TestSubmitTaskResult:
     """Tests for submit_task_result endpoint."""
@@ -438,6 +470,45 @@ class TestSubmitTaskResult:
             assert exc_info.value.status_code == 500
 
 
+class TestSubmitTaskResults:
+    """Tests for submit_task_results batch endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_submit_results_batch(self):
+        """Test batch submission returns accepted count and rejected ids."""
+        from app.api.v1.workers import submit_task_results
+        from app.schemas.worker import WorkerTaskResult, WorkerTaskResultBatch
+
+        mock_db = AsyncMock()
+        mock_worker = create_mock_worker()
+        now = datetime.now(timezone.utc)
+        results = [
+            WorkerTaskResult(
+                task_id=uuid4(),
+                task_type="cron",
+                status_code=200,
+                started_at=now,
+                finished_at=now,
+                duration_ms=10,
+            )
+            for _ in range(3)
+        ]
+        rejected_id = results[2].task_id
+
+        with patch("app.api.v1.workers.worker_service") as mock_service:
+            mock_service.process_task_results = AsyncMock(return_value=(2, [rejected_id]))
+
+            response = await submit_task_results(
+                worker=mock_worker,
+                batch=WorkerTaskResultBatch(results=results),
+                db=mock_db,
+            )
+
+            mock_service.process_task_results.assert_called_once_with(mock_db, mock_worker, results)
+            assert response.accepted == 2
+            assert response.rejected == [rejected_id]
+
+
 class TestGetWorkerInfo:
     """Tests for get_worker_info endpoint."""
 
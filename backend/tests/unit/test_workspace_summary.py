@@ -0,0 +1,205 @@
+"""Tests for the cached workspace summary."""
+
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.services.workspace_summary import (
+    WORKSPACE_SUMMARY_CACHE_TTL,
+    WorkspaceSummaryService,
+    build_entity_counts_query,
+    compute_workspace_summary,
+)
+
+
+def mock_result(**row) -> MagicMock:
+    """Create a mock single-row query result."""
+    result = MagicMock()
+    result.one.return_value = MagicMock(_mapping=row)
+    return result
+
+
+def entity_counts(**values) -> dict:
+    """Get a zeroed entity counts row with overrides."""
+    row = {column.name: 0 for column in build_entity_counts_query(uuid4()).selected_columns}
+    row.update(values)
+    return row
+
+
+@pytest.fixture
+def executions_db():
+    """Patch the session factory used for the concurrent executions query."""
+    session = MagicMock()
+    session.execute = AsyncMock(
+        return_value=mock_result(executions_today=4, executions_7d=20, successful_7d=15),
+    )
+
+    @asynccontextmanager
+    async def factory():
+        yield session
+
+    with patch("app.services.workspace_summary.async_session_factory", factory):
+        yield session
+
+
+class TestComputeWorkspaceSummary:
+    """Tests for compute_workspace_summary."""
+
+    @pytest.mark.asyncio
+    async def test_summary(self, executions_db):
+        """Test counts and execution stats are combined."""
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=mock_result(**entity_counts(heartbeats_unhealthy=2, chains_total=3)))
+
+        summary = await compute_workspace_summary(db, uuid4())
+
+        db.execute.assert_awaited_once()
+        executions_db.execute.assert_awaited_once()
+        assert summary["chains_total"] == 3
+        assert summary["executions_today"] == 4
+        assert summary["success_rate_7d"] == 75.0
+        assert summary["attention_heartbeats"] == 2
+
+    @pytest.mark.asyncio
+    async def test_no_executions(self, executions_db):
+        """Test the success rate is 0 without executions."""
+        executions_db.execute.return_value = mock_result(executions_today=0, executions_7d=0, successful_7d=0)
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=mock_result(**entity_counts()))
+
+        summary = await compute_workspace_summary(db, uuid4())
+
+        assert summary["success_rate_7d"] == 0.0
+
+    def test_summary_matches_response_schema(self):
+        """Test every summary field is a WorkspaceWithStats field."""
+        from app.schemas.workspace import WorkspaceWithStats
+
+        fields = set(entity_counts()) | {"executions_today", "success_rate_7d", "attention_heartbeats"}
+
+        assert fields <= set(WorkspaceWithStats.model_fields)
+
+
+class TestWorkspaceSummaryService:
+    """Tests for WorkspaceSummaryService."""
+
+    @pytest.mark.asyncio
+    async def test_get_cached(self):
+        """Test a cached summary is returned without querying."""
+        service = WorkspaceSummaryService()
+        db = MagicMock()
+        db.execute = AsyncMock()
+        workspace_id = uuid4()
+
+        with patch("app.services.workspace_summary.redis_client") as mock_redis:
+            mock_redis.get = AsyncMock(return_value=json.dumps({"chains_total": 1}))
+
+            assert await service.get(db, workspace_id) == {"chains_total": 1}
+
+        mock_redis.get.assert_called_once_with(f"cache:workspace:summary:{workspace_id}")
+        db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_miss_computes_and_stores(self):
+        """Test a miss computes the summary and caches it with the TTL."""
+        service = WorkspaceSummaryService()
+        workspace_id = uuid4()
+
+        with (
+            patch("app.services.workspace_summary.redis_client") as mock_redis,
+            patch(
+                "app.services.workspace_summary.compute_workspace_summary",
+                AsyncMock(return_value={"chains_total": 2}),
+            ),
+        ):
+            mock_redis.get = AsyncMock(return_value=None)
+            mock_redis.set = AsyncMock()
+
+            assert await service.get(MagicMock(), workspace_id) == {"chains_total": 2}
+
+        mock_redis.set.assert_called_once_with(
+            f"cache:workspace:summary:{workspace_id}", '{"chains_total": 2}', expire=WORKSPACE_SUMMARY_CACHE_TTL
+        )
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self):
+        """Test invalidation deletes every given workspace's summary."""
+        service = WorkspaceSummaryService()
+        first, second = uuid4(), uuid4()
+
+        with patch("app.services.workspace_summary.redis_client") as mock_redis:
+            mock_redis.delete = AsyncMock()
+
+            await service.invalidate(first, second)
+
+        mock_redis.delete.assert_called_once_with(
+            f"cache:workspace:summary:{first}", f"cache:workspace:summary:{second}"
+        )
+
+    @pytest.mark.asyncio
+    async def test_invalidate_redis_error(self):
+        """Test invalidation errors are swallowed."""
+        service = WorkspaceSummaryService()
+
+        with patch("app.services.workspace_summary.redis_client") as mock_redis:
+            mock_redis.delete = AsyncMock(side_effect=Exception("Redis down"))
+
+            await service.invalidate(uuid4())
+
+
+class TestInvalidateWorkspaceSummaryDependency:
+    """Tests for the router dependency invalidating summaries on writes."""
+
+    async def _run(self, method: str, error: Exception | None = None) -> AsyncMock:
+        from app.api.deps import invalidate_workspace_summary
+
+        request = MagicMock()
+        request.method = method
+        workspace = MagicMock(id=uuid4())
+
+        with patch("app.api.deps.workspace_summary_service") as mock_service:
+            mock_service.invalidate = AsyncMock()
+            dependency = invalidate_workspace_summary(request, workspace)
+            await dependency.__anext__()
+            if error:
+                with pytest.raises(type(error)):
+                    await dependency.athrow(error)
+            else:
+                with pytest.raises(StopAsyncIteration):
+                    await dependency.__anext__()
+
+        return mock_service.invalidate
+
+    @pytest.mark.asyncio
+    async def test_write_invalidates(self):
+        """Test successful writes invalidate the summary."""
+        invalidate = await self._run("POST")
+
+        invalidate.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_read_does_not_invalidate(self):
+        """Test reads keep the cached summary."""
+        invalidate = await self._run("GET")
+
+        invalidate.assert_not_called()
+
+    def test_requires_authorized_workspace(self):
+        """Test the dependency resolves get_workspace, so unauthorized requests never reach it."""
+        from fastapi.dependencies.utils import get_dependant
+
+        from app.api.deps import get_workspace, invalidate_workspace_summary
+
+        dependant = get_dependant(path="/workspaces/{workspace_id}", call=invalidate_workspace_summary)
+
+        assert [dependency.call for dependency in dependant.dependencies] == [get_workspace]
+
+    @pytest.mark.asyncio
+    async def test_failed_write_does_not_invalidate(self):
+        """Test failed writes keep the cached summary."""
+        invalidate = await self._run("DELETE", ValueError("boom"))
+
+        invalidate.assert_not_called()